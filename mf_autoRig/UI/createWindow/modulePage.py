@@ -162,13 +162,12 @@ class FormFromDict:
 
 def value_dict_from_class(instance, key):
     data = {}
-    for attr in instance.meta_args[key]:
+    for attr in instance.meta_plan.group(key):
         attr_dict = {}
-        meta_attr = instance.metaNode.attr(attr)
-        attr_dict['niceName'] = pm.attributeName(meta_attr, n=True)
-        attr_dict['type'] = meta_attr.type()
-        attr_dict['value'] = meta_attr.get()
-        data[attr] = attr_dict
+        attr_dict['niceName'] = attr.nice_name
+        attr_dict['type'] = attr.attr_type
+        attr_dict['value'] = instance.read_meta(attr.name)
+        data[attr.name] = attr_dict
 
     print(data)
     return data
@@ -181,7 +180,8 @@ class CreatePage(QtWidgets.QWidget):
         self.main_layout = QtWidgets.QVBoxLayout()
         # self.main_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.form = FormFromDict(self.module.meta_args['creation_attrs'])
+        creation_attrs = {attr.name: {'type': attr.attr_type} for attr in self.module.meta_plan.group('creation_attrs')}
+        self.form = FormFromDict(creation_attrs)
 
         self.create_button = QtWidgets.QPushButton("create")
         self.create_button.clicked.connect(self.create_module)
@@ -78,7 +78,12 @@ class ModifyWindow(UITemplate):
         self.ui.tree.customContextMenuRequested.connect(self.context_menu)
 
         # Button connections
-        self.ui.btn_updateLists.clicked.connect(self.update_tree)
+        self.ui.btn_updateLists.clicked.connect(self.rebuild_tree)
+        self.update_tree()
+
+    def rebuild_tree(self):
+        # Manual refresh also rebuilds the META index, in case it went out of sync with the scene
+        module_tools.rebuild_index()
         self.update_tree()
     
     def update_tree(self):
@@ -92,14 +97,21 @@ class ModifyWindow(UITemplate):
 
         self.ui.tree.clear()
 
-        self.modules = module_tools.get_all_modules(create=True)
-        if self.modules is None:
+        cache = Module.instances
+        cache.reset_stats()
+
+        # Lazy modules, the tree only needs the name, type and links
+        graph = module_tools.load_module_graph(lazy=True)
+        log.info(f"Modify window loaded {len(graph)} modules with {graph.queries} scene queries, "
+                  f"module cache: {cache.hits} hits, {cache.misses} misses")
+        if len(graph) == 0:
             return
 
+        self.modules = graph.modules
         self.modules_ref = {module.name: module for module in self.modules}
 
         # Get root modules (the ones with no parents)
-        root_modules = [module for module in self.modules if module.get_parent() is None]
+        root_modules = graph.get_roots()
 
         def validate(tree_item, module):
             # Get information about the selected module
@@ -112,7 +124,7 @@ class ModifyWindow(UITemplate):
                 toolTip = f"Module mirrored from {module.mirrored_from.name}, cannot be edited"
                 tree_item.setText(1, f'Mirrored from {module.mirrored_from.name}')
 
-            elif module.guides is None or len(module.guides) < 2:
+            elif module.count_meta('guides') < 2:
                 # Modules with no guides are red
                 color = Qt.red
                 toolTip = "Warning: No guides found, delete or recreate module"
@@ -353,11 +365,7 @@ class ModifyWindow(UITemplate):
             return
 
         log.info(f"Rigging: {mdl_to_rig}")
-        for module in mdl_to_rig:
-            is_rigged, _, _ = module.get_info()
-            if not is_rigged:
-                module.create_joints()
-                module.rig()
+        module_tools.rig_modules(mdl_to_rig)
 
         # Hide guides grp
         pm.hide(df.rig_guides_grp)
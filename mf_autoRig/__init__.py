@@ -1,3 +1,10 @@
 import logging
+import os
+
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
+
+# MF_AUTORIG_BACKEND=standin runs the tool on the pure-Python Maya stand-in, see mf_autoRig.standin
+if os.environ.get('MF_AUTORIG_BACKEND') == 'standin':
+    from mf_autoRig import standin
+    standin.install()
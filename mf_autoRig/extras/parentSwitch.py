@@ -1,7 +1,13 @@
 import re
+import maya.cmds as cmds
+import numpy as np
 import pymel.core as pm
 import pymel.core.datatypes as dt
 
+from mf_autoRig.modules.Module import Module
+from mf_autoRig.utils import transform_cache
+from mf_autoRig.utils.batch import MelBatch
+
 def get_base_name(name):
     search = re.search('[A-Za-z]', name)
     return search.group(1)
@@ -64,7 +70,10 @@ def parent_switch_locators(obj, drivers, hasGroup=True):
         condition.outColorR.connect(weight)
 
 
-def parent_switch_matrix(obj, drivers, names=None):
+SWITCH_MODES = ('blend', 'choice')
+
+
+def parent_switch_matrix(obj, drivers, names=None, mode='blend'):
     """
     Creates a parent switch using matrix multiplication, this is a much cleaner way of doing it, compared to the locator method.
 
@@ -74,7 +83,12 @@ def parent_switch_matrix(obj, drivers, names=None):
     @param obj: The object to be parent switched
     @param drivers: The objects that will drive the parent switching
     @param names: The names of the drivers, if not provided, it will use the drivers names
+    @param mode: 'blend' a blendMatrix target and a condition for each driver,
+                 'choice' one choice node the enum selects the driver matrix with
     """
+    if mode not in SWITCH_MODES:
+        raise ValueError(f"Unknown switch mode {mode}, use blend or choice")
+
     switch_name = 'spaceSwitch'
 
     # If it has switch attribute already, it attempts to connect to the existing switch and to the existing blend matrix
@@ -107,8 +121,8 @@ def parent_switch_matrix(obj, drivers, names=None):
 
     # Get or create blend and switch for connecting later
     if has_switch:
-        # Try and get the blend matrix node
-        inputs = obj.offsetParentMatrix.inputs(type='blendMatrix')
+        # Try and get the blend matrix or choice node, it decides the mode
+        inputs = obj.offsetParentMatrix.inputs(type=['blendMatrix', 'choice'])
         if len(inputs) == 1:
             blend = inputs[0]
         else:
@@ -121,15 +135,22 @@ def parent_switch_matrix(obj, drivers, names=None):
 
     else:
         # Create blend and switch
-        blend = pm.createNode("blendMatrix", name=f'{obj.name()}_spaceSwitch_blend')
+        if mode == 'choice':
+            # Connected to the object once it has inputs, see below
+            blend = pm.createNode('choice', name=f'{obj.name()}_spaceSwitch_choice')
+        else:
+            blend = pm.createNode("blendMatrix", name=f'{obj.name()}_spaceSwitch_blend')
 
-        # Connect blend to object
-        blend.outputMatrix.connect(obj.offsetParentMatrix)
+            # Connect blend to object
+            blend.outputMatrix.connect(obj.offsetParentMatrix)
 
         # Add enum attribute for object
         pm.addAttr(obj, ln=switch_name, attributeType='enum', en=enum_names, k=True)
         switch = obj.attr(switch_name)
 
+        if mode == 'choice':
+            switch.connect(blend.selector)
+
     # Do the switch
     for i, driver in enumerate(drivers):
         # Offset i
@@ -137,11 +158,89 @@ def parent_switch_matrix(obj, drivers, names=None):
 
         mtx = _get_matrices(obj, driver)
 
+        if blend.type() == 'choice':
+            mtx.matrixSum.connect(blend.input[index])
+            continue
+
         # Connect the result to blend
         mtx.matrixSum.connect(blend.target[index].targetMatrix)
 
         _connect_to_switch(switch, blend, index)
 
+    if blend.type() == 'choice' and not has_switch:
+        blend.output.connect(obj.offsetParentMatrix)
+
+
+def parent_switch_table(table, mode='choice'):
+    """
+    Parent switches of many objects in one go, see parent_switch_matrix. The matrices of all the objects and drivers
+    are read with one query and every connection is made with one MEL batch.
+
+    @param table: rows of (obj, spaces), spaces are (name, driver) pairs in enum order.
+                  obj can be a module, the switch goes on each of its space_ctrls(), eg. the Limb ik ctrls
+    @param mode: 'choice' or 'blend', like parent_switch_matrix
+    @return: {obj: choice or blendMatrix node}
+    """
+    if mode not in SWITCH_MODES:
+        raise ValueError(f"Unknown switch mode {mode}, use blend or choice")
+
+    rows = []
+    for obj, spaces in table:
+        spaces = list(spaces)
+        for ctrl in (obj.space_ctrls() if isinstance(obj, Module) else [obj]):
+            if ctrl.hasAttr('spaceSwitch'):
+                pm.error(f'{ctrl.name()} already has a spaceSwitch attribute, use parent_switch_matrix to add drivers')
+            rows.append((ctrl, spaces))
+    if not rows:
+        return {}
+
+    # World matrices of every object and driver
+    nodes = list(dict.fromkeys([ctrl for ctrl, _ in rows] + [driver for _, spaces in rows for _, driver in spaces]))
+    world = dict(zip(nodes, transform_cache.world_matrices(nodes)))
+
+    batch = MelBatch()
+    switches = {}
+    for ctrl, spaces in rows:
+        name = ctrl.longName()
+        pm.addAttr(ctrl, ln='spaceSwitch', attributeType='enum', en=':'.join(n for n, _ in spaces), k=True)
+
+        if mode == 'choice':
+            switch = pm.createNode('choice', name=f'{ctrl.nodeName()}_spaceSwitch_choice', skipSelect=True)
+            batch.connect(f'{name}.spaceSwitch', f'{switch}.selector')
+            batch.connect(f'{switch}.output', f'{name}.offsetParentMatrix')
+        else:
+            switch = pm.createNode('blendMatrix', name=f'{ctrl.nodeName()}_spaceSwitch_blend', skipSelect=True)
+            batch.connect(f'{switch}.outputMatrix', f'{name}.offsetParentMatrix')
+        switches[ctrl] = switch
+
+        # Driver offsets keep the object where it is, like _get_matrices
+        local = np.reshape(cmds.getAttr(f'{name}.matrix'), (4, 4))
+        base = world[ctrl] @ np.linalg.inv(local)
+        parent = ctrl.getParent()
+
+        for index, (space, driver) in enumerate(spaces):
+            mult = pm.createNode('multMatrix', name=f'{ctrl.nodeName()}_{space}_space_multMatrix', skipSelect=True)
+            batch.set_matrix(f'{mult}.matrixIn[0]', (base @ np.linalg.inv(world[driver])).flatten().tolist())
+            batch.connect(f'{driver.longName()}.worldMatrix[0]', f'{mult}.matrixIn[1]')
+            if parent is not None:
+                batch.connect(f'{parent.longName()}.worldInverseMatrix[0]', f'{mult}.matrixIn[2]')
+
+            if mode == 'choice':
+                batch.connect(f'{mult}.matrixSum', f'{switch}.input[{index}]')
+                continue
+
+            condition = pm.createNode('condition', name=f'{ctrl.nodeName()}_{space}_space_condition', skipSelect=True)
+            batch.connect(f'{name}.spaceSwitch', f'{condition}.firstTerm')
+            batch.set(f'{condition}.secondTerm', index)
+            batch.set(f'{condition}.colorIfTrueR', 1)
+            batch.set(f'{condition}.colorIfFalseR', 0)
+            batch.connect(f'{condition}.outColorR', f'{switch}.target[{index}].weight')
+            batch.connect(f'{mult}.matrixSum', f'{switch}.target[{index}].targetMatrix')
+    batch.run()
+
+    return switches
+
+
 def _get_matrices(obj, driver):
     # Multiply matrices
     mult = pm.createNode("multMatrix")
@@ -172,9 +271,8 @@ def _connect_to_switch(switch, blend, index):
     condition.outColorR.connect(blend.target[index].weight)
 
 
+if __name__ == '__main__':
+    child = pm.PyNode('L_arm03_ik_ctrl')
+    driverss = [pm.PyNode("M_spine02_ctrl")]
 
-
-child = pm.PyNode('L_arm03_ik_ctrl')
-driverss = [pm.PyNode("M_spine02_ctrl")]
-
-parent_switch_matrix(child, driverss)
+    parent_switch_matrix(child, driverss)
@@ -43,8 +43,8 @@ class AutoClavicleArm(Module):
         self.arm.create_joints()
         self.clavicle.create_joints()
 
-    def rig(self):
-        self.arm.rig()
+    def rig(self, pole_position=None):
+        self.arm.rig(pole_position=pole_position)
         self.clavicle.rig()
 
         # Duplicate arm ik chain
@@ -8,6 +8,8 @@ from mf_autoRig.utils.defaults import *
 import importlib
 
 from mf_autoRig.utils.general import *
+import mf_autoRig.utils as utils
+from mf_autoRig.utils import joint_hierarchy, transform_cache
 
 
 # Import Modules
@@ -105,60 +107,66 @@ class Body(Module):
 
     def create_joints(self):
         log.info("Creating Joints")
-        self.spine.create_joints()
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            self.spine.create_joints()
 
-        self.arms[0].create_joints()
-        self.legs[0].create_joints()
+            self.arms[0].create_joints()
+            self.legs[0].create_joints()
 
-        if self.do_feet:
-            self.feet[0].create_joints()
+            if self.do_feet:
+                self.feet[0].create_joints()
 
-        if self.do_clavicles:
-            self.clavicles[0].create_joints()
+            if self.do_clavicles:
+                self.clavicles[0].create_joints()
 
-        if self.do_hands:
-            self.hands[0].create_joints(wrist=self.arms[0].joints[-1])
+            if self.do_hands:
+                self.hands[0].create_joints(wrist=self.arms[0].joints[-1])
 
 
     def rig(self):
         log.info("Rigging Body")
-        self.spine.rig()
-
-        self.arms[0].rig()
-        self.legs[0].rig()
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            self.spine.rig()
 
-        if self.do_feet:
-            self.feet[0].rig()
-
-        if self.do_hands:
-            self.hands[0].rig()
-        else:
-            # HACK: add empty list to avoid errors
-            self.hands = [1,2]
+            # Solve both poles at once
+            arm_pole, leg_pole = utils.solve_pole_vectors([self.arms[0].joints, self.legs[0].joints],
+                                                          [self.arms[0].jnt_orient_secondary,
+                                                           self.legs[0].jnt_orient_secondary])
+            self.arms[0].rig(pole_position=arm_pole)
+            self.legs[0].rig(pole_position=leg_pole)
 
-        if self.do_clavicles:
-            self.clavicles[0].rig()
-        else:
-            # HACK: add empty list to avoid errors
-            self.clavicles = [1,2]
+            if self.do_feet:
+                self.feet[0].rig()
 
-        self.mirror_modules()
+            if self.do_hands:
+                self.hands[0].rig()
+            else:
+                # HACK: add empty list to avoid errors
+                self.hands = [1,2]
 
-        # Do connections
-        for arm, leg, foot, hand, clavicle in zip(self.arms, self.legs, self.feet, self.hands, self.clavicles):
             if self.do_clavicles:
-                arm.connect(clavicle)
-                clavicle.connect(self.spine)
+                self.clavicles[0].rig()
             else:
-                arm.connect(self.spine)
+                # HACK: add empty list to avoid errors
+                self.clavicles = [1,2]
 
-            if self.do_hands:
-                hand.connect(arm)
+            self.mirror_modules()
 
-            if self.do_feet:
-                foot.connect(leg)
+            # Do connections
+            for arm, leg, foot, hand, clavicle in zip(self.arms, self.legs, self.feet, self.hands, self.clavicles):
+                if self.do_clavicles:
+                    arm.connect(clavicle)
+                    clavicle.connect(self.spine)
+                else:
+                    arm.connect(self.spine)
+
+                if self.do_hands:
+                    hand.connect(arm)
+
+                if self.do_feet:
+                    foot.connect(leg)
 
-            leg.connect(self.spine)
+                leg.connect(self.spine)
 
 
     def mirror_modules(self):
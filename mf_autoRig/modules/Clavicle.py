@@ -28,6 +28,7 @@ class Clavicle(Module):
     }
 
     connectable_to = ['Spine']
+    derived_attrs = ('all_ctrls',)
 
     def __init__(self, name, meta=True):
         super().__init__(name, self.meta_args, meta)
@@ -41,8 +42,7 @@ class Clavicle(Module):
         self.clavicle_ctrl = None
         self.joints = []
 
-    def update_from_meta(self):
-        super().update_from_meta()
+    def derive_from_meta(self):
         if self.clavicle_ctrl is not None:
             self.all_ctrls.append(self.clavicle_ctrl)
 
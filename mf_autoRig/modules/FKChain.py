@@ -17,7 +17,8 @@ class FKChain(Module):
 
         'config_attrs': {
             **Module.meta_args['config_attrs'],
-            'end_joint': {'attributeType': 'bool'}
+            'end_joint': {'attributeType': 'bool'},
+            'fk_drive': {'type': 'string'},
         },
         'info_attrs': {
             **Module.meta_args['info_attrs'],
@@ -28,6 +29,7 @@ class FKChain(Module):
     }
 
     connectable_to = ['Spine']  # List of modules this module can connect to
+    derived_attrs = ('all_ctrls',)
 
     def __init__(self, name, meta=True, **kwargs):
         super().__init__(name, self.meta_args, meta)
@@ -43,6 +45,7 @@ class FKChain(Module):
         self.guides = []
         self.fk_ctrls = []
         self.end_joint = False
+        self.fk_drive = 'constraint'
 
         self.reset()
 
@@ -52,8 +55,7 @@ class FKChain(Module):
         self.guides = []
         self.fk_ctrls = []
 
-    def update_from_meta(self, only=None):
-        super().update_from_meta(only)
+    def derive_from_meta(self):
         if self.fk_ctrls:
             self.all_ctrls.extend(self.fk_ctrls)
 
@@ -90,7 +92,7 @@ class FKChain(Module):
         self.control_grp = pm.createNode('transform', name=f'{self.name}{df.control_grp}')
         pm.parent(self.control_grp, utils.get_group(df.root))
 
-        self.fk_ctrls = utils.create_fk_ctrls(self.joints, skipEnd=self.end_joint)
+        self.fk_ctrls = utils.create_fk_ctrls(self.joints, skipEnd=self.end_joint, drive=self.fk_drive)
         pm.parent(self.fk_ctrls[0].getParent(1), self.control_grp)
 
 
@@ -8,6 +8,7 @@ from mf_autoRig.modules.Module import Module
 
 import mf_autoRig.utils.defaults as df
 import mf_autoRig.utils as utils
+from mf_autoRig.utils import joint_hierarchy, transform_cache
 
 
 class FKFoot(Module):
@@ -18,6 +19,7 @@ class FKFoot(Module):
     }
 
     connectable_to = ['Limb']
+    derived_attrs = ('all_ctrls',)
 
     def __init__(self, name, meta=True):
         super().__init__(name, self.meta_args, meta)
@@ -36,8 +38,7 @@ class FKFoot(Module):
         self.all_ctrls = []
 
 
-    def update_from_meta(self):
-        super().update_from_meta()
+    def derive_from_meta(self):
         self.all_ctrls = self.fk_ctrls
 
     def create_guides(self, ankle_guide=None, pos=None):
@@ -118,17 +119,18 @@ class FKFoot(Module):
         name = self.name.replace(f'{self.side}_', f'{self.side.opposite}_')
         mir_module = self.__class__(name)
 
-        # Mirror Joints
-        mir_module.joints = utils.mirrorJoints(self.joints, (self.side.side, self.side.opposite))
-        mir_module.__joints_cleanup()
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            # Mirror Joints
+            mir_module.joints = utils.mirrorJoints(self.joints, (self.side.side, self.side.opposite))
+            mir_module.__joints_cleanup()
 
 
-        if rig:
-            mir_module.rig()
+            if rig:
+                mir_module.rig()
 
-        # Mirror Ctrls
-        for src, dst in zip(self.fk_ctrls, mir_module.fk_ctrls):
-            utils.control_shape_mirror(src, dst)
+            # Mirror Ctrls
+            for src, dst in zip(self.fk_ctrls, mir_module.fk_ctrls):
+                utils.control_shape_mirror(src, dst)
 
         # Do mirror connection for metadata
         self.metaNode.mirrored_to.connect(mir_module.metaNode.mirrored_from)
@@ -3,8 +3,12 @@ from mf_autoRig.utils.general import *
 from mf_autoRig.utils.color_tools import set_color, auto_color
 from mf_autoRig.modules.Module import Module
 import mf_autoRig.utils as utils
+from mf_autoRig.utils import joint_hierarchy, rig_math, transform_cache
+from mf_autoRig.utils.batch import MelBatch
 from mf_autoRig import log
 
+import numpy as np
+
 class Hand(Module):
     meta_args = {
         'creation_attrs': {
@@ -22,6 +26,7 @@ class Hand(Module):
             **Module.meta_args['config_attrs'],
             'curl': {'attributeType': 'bool'},
             'spread': {'attributeType': 'bool'},
+            'fk_drive': {'type': 'string'},
         },
 
         'info_attrs': {
@@ -35,6 +40,7 @@ class Hand(Module):
     }
 
     connectable_to = ['Arm', 'Limb']
+    derived_attrs = ('orient_guides', 'jnt_guides')
 
     def __init__(self, name, meta=True, **kwargs):
         super().__init__(name, self.meta_args, meta)
@@ -72,6 +78,7 @@ class Hand(Module):
         # From config
         self.curl = True
         self.spread = True
+        self.fk_drive = 'constraint'
 
         # Guides
         self.orient_guides = []
@@ -88,9 +95,7 @@ class Hand(Module):
         self.hand_jnts = []
 
 
-    def update_from_meta(self):
-        super().update_from_meta()
-
+    def derive_from_meta(self):
         if not self.guides:
             return
 
@@ -164,19 +169,28 @@ class Hand(Module):
         else:
             finger_positions = guides_pos
 
-        # Create guides
+        # Create the guides of every finger, each under its own group, and the wrist guide in one batch
         guide_finger_grps = []
+        names = []
+        parents = []
         for index, name in enumerate(fingers):
             guide_finger_grp = pm.createNode('transform', name=f'{self.side}_{name}_guide_grp')
-
-            guide = utils.create_guide_chain(f'{self.name}_{name}', len(finger_positions[index]), finger_positions[index], parent= guide_finger_grp)
-            # pm.parent(guide, guide_finger_grp)
+            pm.xform(guide_finger_grp, worldSpace=True, translation=finger_positions[index][0])
             guide_finger_grps.append(guide_finger_grp)
 
-            self.jnt_guides.append(guide)
+            names += [f'{self.name}_{name}_{i}_guide' for i in range(len(finger_positions[index]))]
+            parents += [guide_finger_grp] * len(finger_positions[index])
+
+        all_positions = [p for positions in finger_positions for p in positions] + [wrist_pos]
+        guides = utils.create_guides_batch(names + [f'{self.name}_wrist_guide'], all_positions, parent=parents + [None])
+        self.wrist_guide = guides.pop()
+
+        for index, name in enumerate(fingers):
+            finger_guides = guides[:len(finger_positions[index])]
+            guides = guides[len(finger_positions[index]):]
 
-        # Create wrist guide
-        self.wrist_guide = utils.Guide(f'{self.name}_wrist_guide', wrist_pos).guide
+            utils.create_guide_curve(f'{self.name}_{name}', finger_guides, parent=guide_finger_grps[index])
+            self.jnt_guides.append(finger_guides)
 
         # Create guide grp
         self.guide_grp = pm.createNode('transform', name=f'{self.name}_guide_grp')
@@ -238,77 +252,74 @@ class Hand(Module):
         # Create finger joints based on guides
         self.finger_jnts = []
 
+        # Query every guide and orient guide matrix at once
+        guides = [guide for finger_guide in self.jnt_guides for guide in finger_guide]
+        matrices = transform_cache.world_matrices(guides + list(self.orient_guides))
+        positions = matrices[:len(guides), 3, :3]
+        orient_matrices = matrices[len(guides):]
+
         # Get joint radius from guide
         obj = self.jnt_guides[0][0]
-        scale = pm.xform(obj, q=True, ws=True, scale=True)[0]
+        scale = float(np.linalg.norm(matrices[0, 0, :3]))
         radius = obj.radius.get() * scale
 
-        for i, finger_guide in enumerate(self.jnt_guides):
+        # Fingers aim down the chain with the up vector towards the x axis of their orient guide,
+        # what an aimConstraint with worldUpType objectrotation does. All fingers are solved together.
+        chains = np.split(positions, np.cumsum([len(finger_guide) for finger_guide in self.jnt_guides])[:-1])
+        world_ups = orient_matrices[:, 0, :3]
+        solved = rig_math.solve_chains_orients(chains, self.jnt_orient_main, self.jnt_orient_secondary, world_ups)
+
+        batch = MelBatch()
+        for finger_guide, (translates, orients) in zip(self.jnt_guides, solved):
             # Get finger name
             match = re.search(f'({self.name}_([a-zA-Z]+))\d*_', finger_guide[0].name())
             base_name = match.group(1)
-            #jnts = create_joints_from_guides(base_name, finger)
 
-            # Create joints for guides
+            # Create the finger hierarchy, values are set by the batch
             jnts = []
-
-            for k, guide in enumerate(finger_guide):
+            for k in range(len(finger_guide)):
                 # Suffix is end if k is last
                 suff = df.skin_sff
                 if k == len(finger_guide) - 1:
                     suff = df.end_sff
 
-                jnt = pm.createNode('joint', name=f'{base_name}{k + 1:02}{suff}{df.jnt_sff}')
-                jnt.radius.set(radius)
-                pm.matchTransform(jnt, guide, pos=True, rot=False, scale=False)
+                flags = {'parent': jnts[-1]} if jnts else {}
+                jnt = pm.createNode('joint', name=f'{base_name}{k + 1:02}{suff}{df.jnt_sff}', skipSelect=True, **flags)
                 jnts.append(jnt)
 
-            # Orient joints based on orient guide
-            for j in range(len(jnts)-1):
-                jnt = jnts[j]
-                next_jnt = jnts[j+1]
-
-                # Set right orientation
-                constraint = pm.aimConstraint(next_jnt, jnt, aim = self.jnt_orient_main, upVector=self.jnt_orient_secondary, worldUpObject=self.orient_guides[i],
-                                              worldUpType="objectrotation", worldUpVector = [1,0,0])
-                pm.delete(constraint)
-
-                # Freeze rotation of jnt
-                pm.makeIdentity(jnt, apply=True, r=True)
-
-                # Parent
-                pm.parent(next_jnt, jnt)
-
-            # Orient last joint
-            pm.joint(jnts[-1], edit=True, orientJoint='none')
+            for jnt, translate, orient in zip(jnts, translates, orients):
+                name = jnt.longName()
+                batch.set(f'{name}.radius', radius)
+                batch.set(f'{name}.translate', translate.tolist())
+                batch.set(f'{name}.jointOrient', orient.tolist())
 
             self.finger_jnts.append(jnts[0])
 
+        batch.run()
+
     def __create_hand(self, wrist=None):
         if wrist is None:
             wrist = self.wrist_guide
 
         self.hand_jnts = []
         obj = self.wrist_guide
-        scale = pm.xform(obj, q=True, ws=True, scale=True)[0]
+
+        # Wrist, wrist guide and knuckles in one query
+        knuckles = [utils.get_joint_hierarchy(finger)[1] for finger in self.finger_jnts[1:]]
+        matrices = transform_cache.world_matrices([wrist, obj] + knuckles)
+
+        scale = float(np.linalg.norm(matrices[1, 0, :3]))
         radius = obj.radius.get() * scale
 
         # Create start jnt where the wrist is
-        mtx = pm.xform(wrist, q=True, ws=True, t=True)
+        mtx = matrices[0, 3, :3].tolist()
         hand_start = pm.joint(name=f'{self.name}{df.skin_sff}{df.jnt_sff}', p=mtx, radius=radius)
 
         self.hand_jnts.append(hand_start)
 
         # Create end jnt by averaging the knuckles position
-        sums = [0,0,0]
-        cnt = 0
-        for finger in self.finger_jnts[1:]:
-            jnts = utils.get_joint_hierarchy(finger)
-            pos = pm.xform(jnts[1], q=True, t=True, ws=True)
-            sums[0] += pos[0]
-            sums[1] += pos[1]
-            sums[2] += pos[2]
-            cnt += 1
+        sums = matrices[2:, 3, :3].sum(axis=0).tolist()
+        cnt = len(knuckles)
 
         average = [sums[0]/cnt, sums[1]/cnt, sums[2]/cnt]
         hand_end = pm.joint(name = f'{self.name}{df.end_sff}{df.jnt_sff}', position=average, radius=radius)
@@ -351,7 +362,7 @@ class Hand(Module):
         for finger_start in self.finger_jnts:
             # Get finger hierarchy
             finger = utils.get_joint_hierarchy(finger_start)
-            finger_ctrls = utils.create_fk_ctrls(finger, scale=0.2)
+            finger_ctrls = utils.create_fk_ctrls(finger, scale=0.2, drive=self.fk_drive)
 
             # Color finger ctrls
             auto_color(finger_ctrls)
@@ -387,6 +398,9 @@ class Hand(Module):
         if self.meta:
             self.save_metadata()
 
+    def space_ctrls(self):
+        return [self.hand_ctrl] if self.hand_ctrl is not None else []
+
     def __curl_switch(self, hand_ctrl, offset_grps):
         match = re.search(f'({self.name}_([a-zA-Z]+))\d*_', offset_grps[0].name())
         base_name = match.group(1)
@@ -448,22 +462,23 @@ class Hand(Module):
         name = self.name.replace(f'{self.side}_', f'{self.side.opposite}_')
         mir_module = self.__class__(name, meta=self.meta)
 
-        # Mirror finger_jnts
-        mir_module.finger_jnts = []
-        for finger_start in self.finger_jnts:
-            finger = utils.get_joint_hierarchy(finger_start)
-            mir_finger = utils.mirrorJoints(finger, (f'{self.side}_', f'{self.side.opposite}_'))
-            mir_module.finger_jnts.append(mir_finger[0])
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            # Mirror finger_jnts
+            mir_module.finger_jnts = []
+            for finger_start in self.finger_jnts:
+                finger = utils.get_joint_hierarchy(finger_start)
+                mir_finger = utils.mirrorJoints(finger, (f'{self.side}_', f'{self.side.opposite}_'))
+                mir_module.finger_jnts.append(mir_finger[0])
 
-        # Mirror hand_jnts
-        mir_module.hand_jnts = utils.mirrorJoints(self.hand_jnts, (f'{self.side}_', f'{self.side.opposite}_'))
+            # Mirror hand_jnts
+            mir_module.hand_jnts = utils.mirrorJoints(self.hand_jnts, (f'{self.side}_', f'{self.side.opposite}_'))
 
-        mir_module.__clean_up_joints()
-        # Rig hand
-        mir_module.rig()
+            mir_module.__clean_up_joints()
+            # Rig hand
+            mir_module.rig()
 
-        if mir_module.meta:
-            mir_module.save_metadata()
+            if mir_module.meta:
+                mir_module.save_metadata()
 
         # Do mirror connection for metadata
         self.metaNode.mirrored_to.connect(mir_module.metaNode.mirrored_from)
@@ -22,6 +22,7 @@ class IKFoot(Module):
 
         'config_attrs':{
             **Module.meta_args['config_attrs'],
+            'ikfk_blend': {'type': 'string'},
         },
         'info_attrs':{
             **Module.meta_args['info_attrs'],
@@ -45,6 +46,8 @@ class IKFoot(Module):
         self.locators = []
         self.all_ctrls = []
 
+        self.ikfk_blend = 'constraint'
+
         self.reset()
 
     def reset(self):
@@ -162,7 +165,11 @@ class IKFoot(Module):
         for i,jnt in enumerate(self.ik_jnts):
             pm.rename(jnt,f'{self.name}{i+1:02}{df.ik_sff}{df.jnt_sff}')
 
-        self.ikfk_constraints = utils.constraint_ikfk(self.joints, self.ik_jnts, self.fk_jnts)
+        # Group joints, matrix driven joints can't be reparented afterwards
+        self.joints_grp = pm.group(self.ik_jnts[0], self.fk_jnts[0], self.joints[0], name=f'{self.name}_{df.joints_grp}')
+        pm.parent(self.joints_grp, get_group(df.joints_grp))
+
+        self.ikfk_constraints = utils.constraint_ikfk(self.joints, self.ik_jnts, self.fk_jnts, blend=self.ikfk_blend)
 
         match = re.match('(^[A-Za-z]_)\w+', self.joints[0].name())
         side = match.group(1)
@@ -181,10 +188,6 @@ class IKFoot(Module):
         self.ik_jnts[0].visibility.set(0)
         self.fk_jnts[0].visibility.set(0)
 
-        # Group joints
-        self.joints_grp = pm.group(self.ik_jnts[0], self.fk_jnts[0], self.joints[0], name=f'{self.name}_{df.joints_grp}')
-        pm.parent(self.joints_grp, get_group(df.joints_grp))
-
         # Create control grp
         self.control_grp = pm.createNode('transform', name=f'{self.name}{df.control_grp}')
         pm.parent(self.fk_ctrls[0].getParent(1), self.control_grp)
@@ -230,26 +233,17 @@ class IKFoot(Module):
 
         # Get ik_ctrl
         ik_ctrl = leg.ik_ctrls[0]
+        # What the ik ctrl drives, the ikHandle or the goal of the analytic ik
+        leg_ik = leg.ik_goal if leg.ik_solver == 'analytic' else leg.ikHandle
 
         # Remove leg parent constraint for the ikHandle
-        for constraint in pm.listRelatives(leg.ikHandle):
+        for constraint in pm.listRelatives(leg_ik):
             if isinstance(constraint, pm.nodetypes.ParentConstraint):
                 pm.delete(constraint)
 
         # Connect foot ik fk constraints to leg switch
         reverse_sw = leg.switch.IkFkSwitch.listConnections(type='reverse')[0]
-
-        for constraint in self.ikfk_constraints:
-            weights = constraint.getWeightAliasList()
-            print(weights)
-            for weight in weights:
-                name = weight.longName(fullPath=False)
-                # If ik weight connect to reverse
-                if df.ik_sff in name:
-                    reverse_sw.outputX.connect(weight)
-                # If fk weight connect to switch
-                if df.fk_sff in name:
-                    leg.switch.IkFkSwitch.connect(weight)
+        utils.connect_ikfk_weights(leg.switch.IkFkSwitch, reverse_sw.outputX, self.ikfk_constraints)
 
         # Connect switch to visibility
         leg.switch.IkFkSwitch.connect(self.fk_ctrls[0].getParent(1).v)
@@ -261,7 +255,7 @@ class IKFoot(Module):
         # Locators order : outerbank, innerbank, heel, toe_tip, ball !!
         pm.parent(self.ball_ikHandle, self.locators[3])
         pm.parent(self.toe_ikHandle, self.locators[2])
-        pm.parent(leg.ikHandle, self.locators[4])
+        pm.parent(leg_ik, self.locators[4])
 
         self.__create_driven_keys(ik_ctrl)
 
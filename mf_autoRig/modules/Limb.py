@@ -7,6 +7,8 @@ from mf_autoRig.modules.Module import Module
 import mf_autoRig.utils as utils
 from mf_autoRig import log
 
+FOREARM_TWIST_MODES = ('aim', 'matrix')
+
 class Limb(Module):
     """
     Class representing a limb module for character rigging.
@@ -58,11 +60,17 @@ class Limb(Module):
         'config_attrs': {
             **Module.meta_args['config_attrs'],
             'forearm_twist': {'attributeType': 'bool'},
+            'forearm_twist_mode': {'type': 'string'},
+            'forearm_twist_joints': {'attributeType': 'long'},
+            'fk_drive': {'type': 'string'},
+            'ikfk_blend': {'type': 'string'},
+            'ik_solver': {'type': 'string'},
             'world_ik': {'attributeType': 'bool'}
         },
         'info_attrs':{
             **Module.meta_args['info_attrs'],
             'switch': {'attributeType': 'message'},
+            'ik_goal': {'attributeType': 'message'},
             'guides': {'attributeType': 'message', 'm': True},
             'joints': {'attributeType': 'message', 'm': True},
             'ik_joints': {'attributeType': 'message', 'm': True},
@@ -73,6 +81,7 @@ class Limb(Module):
     }
 
     connectable_to = ['Clavicle', 'Spine']
+    derived_attrs = ('guides', 'all_ctrls', 'ikHandle')
 
     def __init__(self, name, meta=True):
         super().__init__(name, self.meta_args, meta)
@@ -89,7 +98,16 @@ class Limb(Module):
         self.switch = []
         self.world_ik = False
 
+        # Goal transform of the analytic ik, it has no ikHandle
+        self.ik_goal = None
+        self.ikHandle = None
+
         self.forearm_twist = False
+        self.forearm_twist_mode = 'aim'
+        self.forearm_twist_joints = 1
+        self.fk_drive = 'constraint'
+        self.ikfk_blend = 'constraint'
+        self.ik_solver = 'handle'
 
         self.reset()
 
@@ -105,25 +123,26 @@ class Limb(Module):
         self.fk_joints = []
         self.fk_ctrls = []
         self.switch = []
+        self.ik_goal = None
+        self.ikHandle = None
 
         self.forearm_twist = False
 
 
-    def update_from_meta(self):
-        super().update_from_meta()
-
+    def derive_from_meta(self):
         if len(self.guides) != 3:
             log.warning(f"For {self.name}, couldn't find all guides. Found only: {self.guides}")
             self.guides = []
 
         #print(self.__dict__)
         if len(self.joints) != 0:
-            # Get ikHandle
-            iks = self.ik_joints[0].message.listConnections(d=True, type='ikHandle')
-            if len(iks) == 1:
-                self.ikHandle = iks[0]
-            else:
-                log.warning(f"{self.name} has {len(iks)} IKHandles")
+            # Get ikHandle, the analytic ik has its goal in ik_goal instead
+            if self.ik_solver == 'handle':
+                iks = self.ik_joints[0].message.listConnections(d=True, type='ikHandle')
+                if len(iks) == 1:
+                    self.ikHandle = iks[0]
+                else:
+                    log.warning(f"{self.name} has {len(iks)} IKHandles")
 
             # Recreate all_ctrls
             self.all_ctrls = self.fk_ctrls + self.ik_ctrls
@@ -161,15 +180,27 @@ class Limb(Module):
         if self.meta:
             self.save_metadata()
 
-    def rig(self):
+    def rig(self, pole_position=None):
+        """
+        pole_position: pole vector position if it was already solved, eg. with utils.solve_pole_vectors
+        """
         self.skin_jnts = self.joints[:-1]
         # IK
-        self.ik_joints, self.ik_ctrls, self.ik_ctrls_grp, self.ikHandle = utils.create_ik(self.joints, world_ik=self.world_ik)
+        self.ik_joints, self.ik_ctrls, self.ik_ctrls_grp, ik = utils.create_ik(
+            self.joints, world_ik=self.world_ik, up_vector=self.jnt_orient_secondary, pole_position=pole_position,
+            solver=self.ik_solver)
+        if self.ik_solver == 'analytic':
+            self.ik_goal = ik
+        else:
+            self.ikHandle = ik
         # FK
         self.fk_joints = utils.create_fk_jnts(self.joints)
-        self.fk_ctrls = utils.create_fk_ctrls(self.fk_joints)
+        # Matrix driven joints can't be reparented afterwards
+        self.__group_joints()
+        self.fk_ctrls = utils.create_fk_ctrls(self.fk_joints, drive=self.fk_drive)
 
-        self.ikfk_constraints = utils.constraint_ikfk(self.joints, self.ik_joints, self.fk_joints)
+        self.ikfk_constraints = utils.constraint_ikfk(self.joints, self.ik_joints, self.fk_joints,
+                                                      blend=self.ikfk_blend)
         self.switch = utils.ikfk_switch(self.ik_ctrls_grp, self.fk_ctrls, self.ikfk_constraints, self.joints[-1])
 
         self.all_ctrls.extend(self.fk_ctrls)
@@ -188,6 +219,10 @@ class Limb(Module):
 
         pm.select(clear=True)
 
+    def space_ctrls(self):
+        # The ik ctrl and the pole
+        return list(self.ik_ctrls)
+
     def __clean_up(self):
         # Color ctrls based on side
         if self.side == 'R':
@@ -200,14 +235,6 @@ class Limb(Module):
             set_color(self.ik_ctrls, viewport='blue')
             set_color(self.switch, viewport='cyan')
 
-        # Group joints only if group isn't already there
-        joint_grp_name = f'{self.name}_{df.joints_grp}'
-        self.joints_grp = get_group(joint_grp_name)
-        pm.parent(self.fk_joints[0], self.ik_joints[0], self.joints[0], self.joints_grp)
-
-        # Group joint grp under Joints grp
-        pm.parent(self.joints_grp, get_group(df.joints_grp))
-
         # Hide ik fk joints
         self.fk_joints[0].visibility.set(0)
         self.ik_joints[0].visibility.set(0)
@@ -223,6 +250,15 @@ class Limb(Module):
         # Clear selection
         pm.select(clear=True)
 
+    def __group_joints(self):
+        # Group joints only if group isn't already there
+        joint_grp_name = f'{self.name}_{df.joints_grp}'
+        self.joints_grp = get_group(joint_grp_name)
+        pm.parent(self.fk_joints[0], self.ik_joints[0], self.joints[0], self.joints_grp)
+
+        # Group joint grp under Joints grp
+        pm.parent(self.joints_grp, get_group(df.joints_grp))
+
     def __do_forearm_twist(self):
         # Get first hand from the children
         hand = None
@@ -233,18 +269,16 @@ class Limb(Module):
         if hand is None:
             log.warning(f'Cannot do forearm twist for {self.name}, no hand found in children')
             return
+        if self.forearm_twist_mode not in FOREARM_TWIST_MODES:
+            raise ValueError(f"Unknown forearm twist mode {self.forearm_twist_mode}, use aim or matrix")
 
-        # Create twist joint and parent it under the elbow
-        twist_jnt = pm.createNode('joint', n=self.name + '_twist_skin_jnt')
-        twist_jnt.radius.set(self.joints[1].radius.get())
-
-        _tmp_const = pm.parentConstraint(self.joints[1], self.joints[-1], twist_jnt)
-        pm.delete(_tmp_const)
+        # Create twist joints under the elbow
+        twist_jnts = utils.create_twist_joints(self.joints[1], self.joints[-1], self.forearm_twist_joints, self.name)
 
-        pm.parent(twist_jnt, self.joints[1])
-        pm.makeIdentity(twist_jnt, apply=True, r=True)
-        # pm.joint(twist_jnt, orientation=(0,0,0), edit=True)
-        # twist_jnt.jointOrient.set(0,0,0)
+        if self.forearm_twist_mode == 'matrix':
+            utils.drive_twist(hand.hand_jnts[0], self.joints[-1], twist_jnts, self.jnt_orient_main,
+                              f'{self.name}_forearm')
+            return
 
         # Create locator at arm end
         wrist_aim_loc = pm.spaceLocator(name = self.name + '_wrist_aim_loc')
@@ -266,12 +300,14 @@ class Limb(Module):
 
         pm.aimConstraint(self.joints[1], aim_jnt, aimVector=self.jnt_orient_main * -1, upVector=self.jnt_orient_third * -1, worldUpType='object', worldUpObject=wrist_aim_loc)
 
-        # Connect aim_jnt rotataion to twist jnt
-        mult_divide = pm.createNode('multiplyDivide', n=self.name + '_twist_mult')
-        mult_divide.input2Y.set(0.5) # divide by 2
+        # Connect aim_jnt rotataion to twist jnts, each gets its share
+        for twist_jnt, weight in zip(twist_jnts, utils.twist_weights(len(twist_jnts))):
+            mult_name = twist_jnt.nodeName().replace(df.skin_sff + df.jnt_sff, '_mult')
+            mult_divide = pm.createNode('multiplyDivide', n=mult_name)
+            mult_divide.input2Y.set(weight)
 
-        aim_jnt.rotateY.connect(mult_divide.input1Y)
-        mult_divide.outputY.connect(twist_jnt.rotateY)
+            aim_jnt.rotateY.connect(mult_divide.input1Y)
+            mult_divide.outputY.connect(twist_jnt.rotateY)
 
         # Create drivers grp
         self.drivers_grp = pm.createNode('transform', name=f'{self.name}_{df.drivers_grp}')
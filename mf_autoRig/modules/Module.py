@@ -9,7 +9,10 @@ from mf_autoRig.utils.controllers_tools import apply_curve_info, save_curve_info
 from mf_autoRig.utt.Side import Side
 import mf_autoRig.utils as utils
 from mf_autoRig.modules import module_tools
+from mf_autoRig.modules.module_cache import ModuleCache
 from mf_autoRig.utils import defaults as df
+from mf_autoRig.utils import joint_hierarchy, transform_cache
+from mf_autoRig.utils.undo import UndoStack
 from pprint import pprint
 
 class Module(abc.ABC):
@@ -84,10 +87,26 @@ class Module(abc.ABC):
 
     }
 
-    # Class level dictionary that keeps track of all instances
-    instances = {}
+    # Class level cache that keeps track of all instances, keyed by metaNode uuid
+    instances = ModuleCache()
+
+    # meta_args compiled into a MetaPlan, every subclass gets its own when it's created
+    meta_plan = None
+
+    # Default for create_from_meta, lazy modules only read a meta attribute the first time it's accessed
+    lazy_meta = False
+
+    # Attributes computed by derive_from_meta, reading one of them loads the whole lazy module
+    derived_attrs = ()
 
     def __init__(self, name, args, meta):
+        # Lazy fetch state, values read from the metaNode and the node version they were read at
+        self.lazy = False
+        self._fetched = {}
+        self._fetched_version = None
+        # Meta attributes the metaNode doesn't have yet: their default, see migrate_metadata
+        self._missing_meta = {}
+
         self.name = name
         self.moduleType = self.__class__.__name__
         self.side = Side(name.split('_')[0])
@@ -105,7 +124,10 @@ class Module(abc.ABC):
 
         elif meta is True:
             log.debug(f"Creating metadata for {name}")
-            self.metaNode = mdata.create_metadata(name, self.moduleType, self.meta_args,True)
+            self.metaNode = mdata.create_metadata(name, self.moduleType, self.meta_plan, True)
+
+        # Writes only what changed since the last save
+        self.meta_writer = mdata.MetaWriter(self.metaNode, self.meta_plan)
 
         # Parent - child
         self.parent = None
@@ -116,7 +138,6 @@ class Module(abc.ABC):
         # Joint orient
         self.jnt_orient_main = pm.dt.Vector([0,1,0])
         self.jnt_orient_secondary = pm.dt.Vector([0,0,1])
-        self.jnt_orient_third = pm.dt.Vector([1,0,0])
 
         # init other values
         self.guides = []
@@ -133,8 +154,33 @@ class Module(abc.ABC):
         self.all_ctrls = []
 
         # Save instance
-        self.instances[self.metaNode.name()] = self
+        self.instances.add(self)
+
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.meta_plan = mdata.compile_plan(cls.meta_args)
+        cls._install_meta_fields()
+
+    @classmethod
+    def _install_meta_fields(cls):
+        # Every meta attribute becomes a MetaField, so lazy modules can fetch it on access
+        for attr in cls.meta_plan:
+            if not isinstance(getattr(cls, attr.name, None), mdata.MetaField):
+                setattr(cls, attr.name, mdata.MetaField(attr.name))
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, derived attributes of a lazy module are missing until it's loaded
+        if name in type(self).derived_attrs and self.__dict__.get('lazy'):
+            self.materialize()
+            return getattr(self, name)
+
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    @property
+    def jnt_orient_third(self):
+        # The axis that is neither the main nor the secondary one
+        return pm.dt.Vector([1,1,1]) - abs(self.jnt_orient_main) - abs(self.jnt_orient_secondary)
 
     @abstractmethod
     def reset(self):
@@ -163,6 +209,12 @@ class Module(abc.ABC):
     def rig(self):
         pass
 
+    def space_ctrls(self):
+        """
+        Ctrls that get a space switch, see extras.parentSwitch.parent_switch_table
+        """
+        return []
+
     # GUIDES METHODS
     def connect_guides(self, dest):
         if self.check_if_connected(dest):
@@ -206,32 +258,56 @@ class Module(abc.ABC):
 
     # METADATA METHODS
     @classmethod
-    def create_from_meta(cls, metaNode):
+    def create_from_meta(cls, metaNode, lazy=None, resolve_links=True):
         """
         Creates a Module instance from existing metadata node.
 
         Args:
             metaNode (pymel.core.nt.Network): The metadata node to create the module from.
+            lazy (bool): Read meta attributes only when they're accessed, defaults to Module.lazy_meta.
+            resolve_links (bool): Create the parent and mirrored_from modules, when False they're left
+                for the caller to wire, like module_tools.load_module_graph does.
 
         Returns:
             Module: An instance of the Module class.
         """
+        if lazy is None:
+            lazy = Module.lazy_meta
 
-        name = pm.getAttr(metaNode + '.name')
+        name = mdata.get(metaNode, 'name')
         general_obj = cls(name, meta=metaNode)
 
-        general_obj.moduleType = metaNode.moduleType.get()
+        # Nodes created before an attribute was added to meta_args use the default from __init__,
+        # the attribute is only added to the node when the module is saved or migrated
+        missing = mdata.missing_attrs(metaNode, general_obj.meta_plan)
+        general_obj._missing_meta = {attr.name: general_obj.__dict__.get(attr.name) for attr in missing}
+        if missing:
+            log.info(f"{name} - Metadata has no {list(general_obj._missing_meta)}, using the defaults")
+
+        moduleType = mdata.get(metaNode, 'moduleType')
+        general_obj.moduleType = moduleType
 
         general_obj.metaNode = metaNode
         general_obj.meta = True
+        general_obj.lazy = lazy
         # general_obj.update_from_meta(only=['creation_attrs', 'config_attrs', 'info_attrs']) # Skip module_attrs
-        general_obj.update_from_meta()
+        general_obj.update_from_meta(resolve_links=resolve_links)
+
+        if lazy:
+            # Already read, no need to fetch them again
+            general_obj._memoize('name', name)
+            general_obj._memoize('moduleType', moduleType)
 
         return general_obj
 
-    def update_from_meta(self, only=None):
+    def update_from_meta(self, only=None, resolve_links=True):
         # Reset the class so we start with clean values
         self.reset()
+        self.meta_writer.clear()
+
+        if self.lazy:
+            self._unload_meta()
+            return
 
         if only is None:
             only = []
@@ -240,63 +316,221 @@ class Module(abc.ABC):
 
         # Validate skip attr
         for o in only:
-            if o not in self.meta_args:
+            if o not in self.meta_plan.groups:
                 raise ValueError(f"Invalid skip value: {o}")
 
         # Get the attributes from the saved metadata
-        for typ in self.meta_args:
-            if typ == 'module_attrs':
-                for attribute in self.meta_args[typ]:
-                    # Skip children and mirrored_from attr to avoid cycles
-                    if attribute in ['children', 'mirrored_to']:
-                        continue
-
-                    data = self.metaNode.attr(attribute).get()
+        for attr in self.meta_plan:
+            if attr.link:
+                # Children and mirrored_to are skipped to avoid cycles
+                if not attr.follow or not resolve_links:
+                    continue
 
-                    # If it's a metadata node, create the corresponding class
-                    if isinstance(data, pm.nt.Network) and data.name().startswith(df.meta_prf):
-                        data_class = module_tools.createModule(data)
-                        setattr(self, attribute, data_class)
-                        if attribute == 'parent' and self not in data_class.children:
-                            data_class.children.append(self)
+                data = self.read_meta(attr.name)
 
-                        elif attribute == 'mirrored_from':
-                            data_class.mirrored_to = self
+                data_class = self._link_module(attr, data)
+                if data_class is not None:
+                    setattr(self, attr.name, data_class)
+                    if attr.name == 'parent' and self not in data_class.children:
+                        data_class.children.append(self)
 
-                    elif data is not None:
-                        raise ValueError(f"Invalid data type for {attribute}: {data}, module_attrs should link to a meta node")
+                    elif attr.name == 'mirrored_from':
+                        data_class.mirrored_to = self
 
                 continue
 
-            for attribute in self.meta_args[typ]:
-                data = self.metaNode.attr(attribute).get()
-                setattr(self, attribute, data)
+            data = self.read_meta(attr.name)
+            setattr(self, attr.name, data)
+            if attr.name not in self._missing_meta:
+                self.meta_writer.seed(attr.name, data)
+
+        self.derive_from_meta()
+
+    def derive_from_meta(self):
+        """
+        Computes the attributes that depend on the metadata, runs after the meta attributes are read
+        """
+        pass
+
+    def _link_module(self, attr, data):
+        """
+        Returns the module for the metaNode linked by a module attr, None if nothing is linked
+        """
+        if data is None:
+            return None
+
+        # If it's a metadata node, create the corresponding class
+        if isinstance(data, pm.nt.Network) and data.name().startswith(df.meta_prf):
+            return module_tools.createModule(data, lazy=self.lazy)
+
+        raise ValueError(f"Invalid data type for {attr.name}: {data}, module_attrs should link to a meta node")
+
+    # LAZY METHODS
+    def fetch_meta(self, name, resolve_links=True):
+        """
+        Reads a meta attribute of a lazy module from the metaNode.
+        The value is memoized until the metaNode changes.
+        With resolve_links False, module links return the linked metaNodes and aren't memoized.
+        """
+        if not self.__dict__.get('lazy'):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        if name in self.derived_attrs:
+            self.materialize()
+            return getattr(self, name)
+
+        self._check_fetched()
+        if name not in self._fetched:
+            attr = self.meta_plan[name]
+            data = self.read_meta(name)
+
+            if attr.link and not resolve_links:
+                return data
+
+            if attr.link:
+                if attr.multi:
+                    data = [self._link_module(attr, node) for node in data or []]
+                else:
+                    data = self._link_module(attr, data)
+            elif name not in self._missing_meta:
+                self.meta_writer.seed(name, data)
+
+            self._fetched[name] = data
+
+        return self._fetched[name]
+
+    def is_loaded(self, name):
+        """
+        Checks if a meta attribute holds a value in memory, always True for modules that aren't lazy
+        """
+        if not self.lazy:
+            return True
+
+        self._check_fetched()
+        return name in self.__dict__ or name in self._fetched
+
+    def count_meta(self, name):
+        """
+        Returns the number of nodes in a message meta attribute.
+        Lazy modules count the connections on the metaNode instead of loading the attribute.
+        """
+        if not self.is_loaded(name) and name not in self._missing_meta:
+            return mdata.count_connections(self.metaNode, name)
+
+        value = getattr(self, name)
+        if value is None:
+            return 0
+        if isinstance(value, list):
+            return len(value)
+        return 1
+
+    def materialize(self):
+        """
+        Loads every meta attribute of a lazy module and computes the derived attributes.
+        The module isn't lazy anymore after that.
+        """
+        if not self.lazy:
+            return
+
+        # Links aren't reset, keep the ones that are already known
+        for attr in self.meta_plan:
+            if attr.link and attr.name not in self.__dict__:
+                self.__dict__[attr.name] = self.fetch_meta(attr.name)
+
+        self.lazy = False
+        self._fetched = {}
+        self.update_from_meta()
+
+    def _unload_meta(self):
+        # Drop the in memory values, the fields are fetched again on access
+        for attr in self.meta_plan:
+            self.__dict__.pop(attr.name, None)
+
+        for name in self.derived_attrs:
+            self.__dict__.pop(name, None)
+
+        self._fetched = {}
+        self._fetched_version = self.instances.version(self)
 
-        # Get jnt orient third based on the others
-        self.jnt_orient_third = pm.dt.Vector([1,1,1]) - abs(self.jnt_orient_main) - abs(self.jnt_orient_secondary)
+    def _check_fetched(self):
+        # Fetched values are out of date once the metaNode changed
+        version = self.instances.version(self)
+        if version != self._fetched_version:
+            self._fetched = {}
+            self._fetched_version = version
 
+    def _memoize(self, name, value):
+        self._check_fetched()
+        self._fetched[name] = value
+
+
+    def read_meta(self, name):
+        """
+        Reads a meta attribute from the metaNode, or its default if the metaNode doesn't have it yet
+        """
+        if name in self._missing_meta:
+            return self._missing_meta[name]
+
+        attr = self.meta_plan[name]
+        return attr.read(self.metaNode, attr.name)
+
+    def migrate_metadata(self):
+        """
+        Adds the meta attributes the metaNode doesn't have, set to the module's values, in one undo chunk.
+        Loading an older metaNode doesn't write to it, only this and save_metadata do.
+
+        Returns:
+            list: Names of the added attributes.
+        """
+        if not self._missing_meta:
+            return []
+
+        attrs = [self.meta_plan[name] for name in self._missing_meta]
+        values = {attr.name: getattr(self, attr.name) for attr in attrs if not attr.link}
+        with UndoStack(f"Migrate {self.name} metadata"):
+            mdata.add_attrs(self.metaNode, attrs, values)
+
+        added = list(self._missing_meta)
+        self._missing_meta = {}
+        log.info(f"{self.name} - Added {added} to the metadata")
+        return added
 
     def save_metadata(self):
         """
         Do the appropriate connections to the metaNode, based on the meta_args
-        Skip connections that already made to avoid warnings
-        """
-        for typ in self.meta_args:
-            for attribute in self.meta_args[typ]:
-                src = getattr(self, attribute)
-                dst = self.metaNode.attr(attribute)
-                if isinstance(src, list) and not src:
-                    # Skip if list is empty
-                    continue
+        Only values that changed since the last save are written, in one batch
+        Older metaNodes get the attributes they're missing first, see migrate_metadata
+        """
+        self.migrate_metadata()
 
-                if src is None:
-                    continue
+        values = {}
+        for attr in self.meta_plan.values:
+            if not self.is_loaded(attr.name):
+                # Never read on a lazy module, the metaNode already has it
+                continue
 
-                if isinstance(src, Module):
-                    continue
+            src = getattr(self, attr.name)
+            if isinstance(src, list) and not src:
+                # Skip if list is empty
+                continue
+
+            if src is None:
+                continue
+
+            if isinstance(src, Module):
+                continue
 
-                mdata.add(src, dst)
-                log.debug(f"{self.name} - Metadata connected {src} to {dst}")
+            values[attr.name] = src
+
+        if self.instances.is_dirty(self):
+            # The metaNode changed since it was last read or saved, compare against what is on it
+            self.meta_writer.seed_from_node(values.keys())
+
+        count = self.meta_writer.write(values)
+        log.debug(f"{self.name} - Metadata saved, {count} changes")
+
+        # The metaNode now matches the instance
+        self.instances.mark_clean(self)
 
     # CONNECTION METHODS
     def connect_metadata(self, dest):
@@ -310,11 +544,19 @@ class Module(abc.ABC):
         self.parent = dest
         dest.children.append(self)
 
+        # Both instances already hold the new link
+        self.instances.mark_clean(self)
+        self.instances.mark_clean(dest)
+
     def disconnect_metadata(self):
-        self.parent.children.remove(self)
+        parent = self.parent
+        parent.children.remove(self)
         self.parent = None
         self.metaNode.parent.disconnect()
 
+        self.instances.mark_clean(self)
+        self.instances.mark_clean(parent)
+
     def check_if_connected(self, dest):
         if self.meta:
             if self.metaNode.parent.get() == dest.metaNode:
@@ -387,7 +629,7 @@ class Module(abc.ABC):
         """
         # self.update_from_meta()
 
-        if len(self.all_ctrls) == 0:
+        if self.count_meta('all_ctrls') == 0:
             # This means the module is not rigged
             is_rigged = False
         else:
@@ -434,12 +676,13 @@ class Module(abc.ABC):
             log.debug(f"Deleting {self.drivers_grp}")
             pm.delete(self.drivers_grp)
 
+        # Remove
+        self.instances.remove(self)
+
         if not keep_meta_node:
             pm.delete(self.metaNode)
 
-        # Remove
         self.parent.children.remove(self)
-        del self.instances[self.metaNode.name()]
         del self
 
         print(f"Succesfully deleted")
@@ -468,8 +711,9 @@ class Module(abc.ABC):
         if self.mirrored_from is not None:
             return
 
-        self.create_joints()
-        self.rig()
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            self.create_joints()
+            self.rig()
 
         if self.curve_info is not None:
             apply_curve_info(self.all_ctrls, self.curve_info)
@@ -478,6 +722,73 @@ class Module(abc.ABC):
             mirrored_to = module_tools.createModule(self.mirrored_to)
             mirrored_to.update_mirrored(destroy=False)
 
+    def get_guide_hierarchy(self):
+        """
+        Returns every guide transform and joint under guide_grp, without the cluster handles and curves,
+        eg. the guide curves and the curves connect_guides adds.
+        Two modules created with the same args return their guides in the same order.
+        """
+        if self.guide_grp is None:
+            return []
+
+        keep = ['joint', 'transform']
+        hierarchy = self.guide_grp.getChildren(ad=True)
+        # Transforms of curves and cluster handles, by their shape
+        skip = {h.getParent() for h in hierarchy if h.type() in ('nurbsCurve', 'clusterHandle')}
+
+        guide_hierarchy = []
+        for h in hierarchy:
+            if h.type() in keep and h not in skip:
+                guide_hierarchy.append(h)
+
+        return guide_hierarchy
+
+    # SNAPSHOT METHODS
+    def to_snapshot(self):
+        """
+        Returns the module as a dict of plain python values, used by module_tools.export_snapshot
+        """
+        def plain(value):
+            if isinstance(value, pm.dt.Vector):
+                return [float(v) for v in value]
+            return value
+
+        guides = self.get_guide_hierarchy()
+        matrices = [[round(v, 6) for v in pm.xform(guide, q=True, ws=True, m=True)] for guide in guides]
+
+        return {
+            'name': self.name,
+            'moduleType': self.moduleType,
+            'creation_args': {attr.name: plain(getattr(self, attr.name)) for attr in self.meta_plan.creation_args},
+            'config': {attr.name: plain(getattr(self, attr.name)) for attr in self.meta_plan.config},
+            'parent': self.parent.name if self.parent is not None else None,
+            'mirrored_from': self.mirrored_from.name if self.mirrored_from is not None else None,
+            'guides': {
+                'names': [guide.nodeName() for guide in guides],
+                'matrices': matrices,
+            },
+        }
+
+    @classmethod
+    def from_snapshot(cls, data):
+        """
+        Creates the module and its guides from a to_snapshot dict.
+        The guides are created at their default positions, module_tools.import_snapshot moves them.
+        """
+        module = cls(data['name'], **data['creation_args'])
+
+        for key, value in data['config'].items():
+            if key not in cls.meta_plan:
+                log.warning(f"{data['name']}: {key} is not a config attr of {cls.__name__}, skipping")
+                continue
+
+            if cls.meta_plan[key].kind == 'vector':
+                value = pm.dt.Vector(value)
+            setattr(module, key, value)
+
+        module.create_guides()
+        return module
+
     def mirror_guides(self):
         if self.side.opposite is None:
             log.warning(f"{self.name} is a middle module, cannot mirror")
@@ -486,16 +797,14 @@ class Module(abc.ABC):
         log.info(f"Mirroring {self.name} <{self.moduleType}>")
         # Copy creation args
         creation_args = {}
-        for key in self.meta_args['creation_attrs']:
-            if key == 'name' or key == 'moduleType':
-                continue
-            creation_args[key] = self.metaNode.attr(key).get()
+        for attr in self.meta_plan.creation_args:
+            creation_args[attr.name] = self.read_meta(attr.name)
 
         mir_module = self.__class__(name, **creation_args)
 
         # Copy attributes
-        for attr in self.meta_args['config_attrs']:
-            setattr(mir_module, attr, getattr(self, attr))
+        for attr in self.meta_plan.config:
+            setattr(mir_module, attr.name, getattr(self, attr.name))
 
         # Change orient
         mir_module.jnt_orient_main = self.jnt_orient_main * -1
@@ -510,18 +819,8 @@ class Module(abc.ABC):
 
         utils.mirror_guides_transforms([self.guide_grp], [mir_module.guide_grp])
 
-        # Get guide hierarchy
-        keep = ['joint', 'transform']
-        guide_hierarchy = []
-        for h in (self.guide_grp.getChildren(ad=True)):
-            if h.type() in keep and not h.endswith('_clusterHandle') and not h.endswith('_guide_crv'):
-                guide_hierarchy.append(h)
-
-        # Get mir hierarchy
-        mir_hierarchy = []
-        for h in mir_module.guide_grp.getChildren(ad=True):
-            if h.type() in keep and not h.endswith('_clusterHandle') and not h.endswith('_guide_crv'):
-                mir_hierarchy.append(h)
+        guide_hierarchy = self.get_guide_hierarchy()
+        mir_hierarchy = mir_module.get_guide_hierarchy()
 
         for guide, mir_guide in zip(guide_hierarchy, mir_hierarchy):
             pm.xform(mir_guide, m=identity_mtx)
@@ -588,11 +887,12 @@ class Module(abc.ABC):
         if destroy:
             self.destroy_rig()
 
-        self.joints = utils.mirrorJoints(source.joints, (self.side.opposite, self.side.side))
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            self.joints = utils.mirrorJoints(source.joints, (self.side.opposite, self.side.side))
 
-        self.rig()
+            self.rig()
 
-        self.mirror_ctrls(source)
+            self.mirror_ctrls(source)
 
 
     # DEBUG METHODS
@@ -606,3 +906,6 @@ class Module(abc.ABC):
     def __str__(self):
         return str(self.__dict__)
 
+
+Module.meta_plan = mdata.compile_plan(Module.meta_args)
+Module._install_meta_fields()
@@ -17,6 +17,7 @@ class Spine(Module):
 
         'config_attrs': {
             **Module.meta_args['config_attrs'],
+            'fk_drive': {'type': 'string'},
         },
         'info_attrs':{
             **Module.meta_args['info_attrs'],
@@ -29,6 +30,7 @@ class Spine(Module):
     }
 
     connectable_to = []
+    derived_attrs = ('all_ctrls',)
     attachment_pts = ['Chest', 'Hip']
 
     def __init__(self, name, meta=True, **kwargs):
@@ -41,6 +43,8 @@ class Spine(Module):
         for key, value in default_args.items():
             setattr(self, key, value)
 
+        self.fk_drive = 'constraint'
+
         self.reset()
         # self.save_metadata()
 
@@ -54,9 +58,7 @@ class Spine(Module):
         self.hip_jnt = None
         self.fk_ctrls = []
 
-    def update_from_meta(self):
-        super().update_from_meta()
-
+    def derive_from_meta(self):
         self.all_ctrls = self.fk_ctrls
     def create_guides(self, pos=None):
         if pos is None:
@@ -96,8 +98,8 @@ class Spine(Module):
             self.save_metadata()
 
     def rig(self):
-        self.fk_ctrls = utils.create_fk_ctrls(self.joints, skipEnd=False, shape='square')
-        self.hip_ctrl = utils.create_fk_ctrls(self.hip_jnt, shape='star', scale=1.5)
+        self.fk_ctrls = utils.create_fk_ctrls(self.joints, skipEnd=False, shape='square', drive=self.fk_drive)
+        self.hip_ctrl = utils.create_fk_ctrls(self.hip_jnt, shape='star', scale=1.5, drive=self.fk_drive)
 
         # Color ctrls
         set_color(self.fk_ctrls, viewport='yellow')
@@ -4,6 +4,7 @@ from mf_autoRig.utils.VectorNodes import VectorNodes
 from mf_autoRig.utils.general import *
 from mf_autoRig.modules.Module import Module
 import mf_autoRig.utils as utils
+from mf_autoRig.utils import joint_hierarchy, transform_cache
 
 from mf_autoRig.utils.color_tools import set_color
 
@@ -70,8 +71,9 @@ class BendyLimb(Module):
         self.guides = None
 
     @classmethod
-    def create_from_meta(cls, metaNode):
-        obj = super().create_from_meta(metaNode)
+    def create_from_meta(cls, metaNode, lazy=None, resolve_links=True):
+        # all_ctrls is rebuilt from the control group, which needs the whole module
+        obj = super().create_from_meta(metaNode, lazy=False, resolve_links=resolve_links)
 
 
         ctrls = obj.control_grp.listRelatives(allDescendents=True, type='nurbsCurve')
@@ -106,9 +108,11 @@ class BendyLimb(Module):
         if self.meta:
             self.save_metadata()
 
-    def rig(self, bend_joints=7):
+    def rig(self, bend_joints=7, pole_position=None):
         self.bend_joints = bend_joints
-        ik_joints, ik_ctrls, ik_ctrl_grp, ikHandle = utils.create_ik(self.joints, create_new=False)
+        ik_joints, ik_ctrls, ik_ctrl_grp, ikHandle = utils.create_ik(self.joints, create_new=False,
+                                                                     up_vector=self.jnt_orient_secondary,
+                                                                     pole_position=pole_position)
 
         # Add bendy attribute to the ik_ctrl
         pm.addAttr(ik_ctrls[0], ln="upperArmBendyWeight", at="double", min=0, max=1, dv=0.5, k=True)
@@ -234,13 +238,14 @@ class BendyLimb(Module):
         name = self.name.replace(f'{self.side}_', f'{self.side.opposite}_')
         mir_module = self.__class__(name)
 
-        # Mirror Joints
-        mir_module.joints = utils.mirrorJoints(self.joints, (self.side.side, self.side.opposite))
-        print("Mirrored joints:", mir_module.joints)
-        mir_module.rig()
+        with transform_cache.build_cache(), joint_hierarchy.build_index():
+            # Mirror Joints
+            mir_module.joints = utils.mirrorJoints(self.joints, (self.side.side, self.side.opposite))
+            print("Mirrored joints:", mir_module.joints)
+            mir_module.rig()
 
-        # Mirror Ctrls
-        for src, dst in zip(self.all_ctrls, mir_module.all_ctrls):
-            utils.control_shape_mirror(src, dst)
+            # Mirror Ctrls
+            for src, dst in zip(self.all_ctrls, mir_module.all_ctrls):
+                utils.control_shape_mirror(src, dst)
 
         return mir_module
\ No newline at end of file
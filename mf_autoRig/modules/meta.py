@@ -1,62 +1,377 @@
+import re
+from types import MappingProxyType
+from typing import NamedTuple, Callable
+
+import maya.cmds as cmds
 import pymel.core as pm
+from mf_autoRig.utils.batch import MelBatch, mel_value
 
-def create_metadata(name, moduleType, meta_attrs, can_mirror):
-    metaNode = pm.createNode('network', name="META_" + name)
+# Number of metadata reads done through get(), used to measure how many scene queries loading takes
+query_count = 0
+
+def get(metaNode, attribute):
+    """
+    Reads an attribute from a metadata node and counts the query
+    """
+    global query_count
+    query_count += 1
+    return metaNode.attr(attribute).get()
+
+def count_connections(metaNode, attribute):
+    """
+    Returns the number of nodes connected to a message attribute, without creating them
+    """
+    global query_count
+    query_count += 1
+    return len(cmds.listConnections(f'{metaNode}.{attribute}', source=True, destination=False) or [])
+
+def reset_query_count():
+    global query_count
+    query_count = 0
+
+# MEL flags for the addAttr keywords used in meta_args
+_ADD_ATTR_FLAGS = {
+    'attributeType': 'at',
+    'at': 'at',
+    'dataType': 'dt',
+    'dt': 'dt',
+    'parent': 'p',
+    'p': 'p',
+    'niceName': 'nn',
+    'nn': 'nn',
+    'readable': 'r',
+    'r': 'r',
+    'writable': 'w',
+    'w': 'w',
+    'keyable': 'k',
+    'k': 'k',
+    'defaultValue': 'dv',
+    'dv': 'dv',
+    'minValue': 'min',
+    'min': 'min',
+    'maxValue': 'max',
+    'max': 'max',
+}
+
+# Attribute types that have to be added with -dataType
+_DATA_TYPES = ['string', 'stringArray', 'matrix', 'doubleArray', 'Int32Array', 'vectorArray']
 
-    attrs = meta_attrs
+def _add_attr_command(key, attr):
+    """
+    Returns the MEL addAttr command for one meta_args entry, without the node name
+    """
+    flags = [f'-ln {mel_value(key)}']
+    for flag, value in attr.items():
+        if flag == 'type':
+            flag = 'dt' if value in _DATA_TYPES else 'at'
+            flags.append(f'-{flag} {mel_value(value)}')
+
+        elif flag in ('m', 'multi'):
+            if value:
+                flags.append('-m')
+
+        elif flag in _ADD_ATTR_FLAGS:
+            flags.append(f'-{_ADD_ATTR_FLAGS[flag]} {mel_value(value)}')
+
+        else:
+            raise ValueError(f"Unsupported addAttr flag {flag} for {key}")
+
+    return 'addAttr ' + ' '.join(flags)
+
+def compile_schema(meta_attrs):
+    """
+    Compiles meta_args into the list of addAttr commands needed to build a metaNode
+    """
+    commands = []
+    for typ in meta_attrs:
+        for key in meta_attrs[typ]:
+            attr = meta_attrs[typ][key]
+            commands.append(_add_attr_command(key, attr))
 
-    # Config args
-    for typ in attrs:
-        for key in attrs[typ]:
-            attr = attrs[typ][key]
-            metaNode.addAttr(key, **attr)
             # Add extra attrs for double3
-            if 'attributeType' in attr and attr['attributeType'] == 'double3':
+            if attr.get('attributeType') == 'double3':
                 for axis in ['X', 'Y', 'Z']:
-                    metaNode.addAttr(key + axis, **{'attributeType': 'double', 'p': key})
+                    commands.append(_add_attr_command(key + axis, {'attributeType': 'double', 'p': key}))
+
+    return commands
+
+# META ATTRIBUTE PLANS
+# Groups of meta_args, in the order they are read and written
+GROUPS = ('creation_attrs', 'module_attrs', 'config_attrs', 'info_attrs')
+
+# Module links that are not followed when loading, to avoid cycles
+NOT_FOLLOWED = ('children', 'mirrored_to')
+
+# Creation attrs that are set by the module itself
+NOT_CREATION_ARGS = ('name', 'moduleType')
+
+def _read_attr(metaNode, attribute):
+    return get(metaNode, attribute)
+
+def _write_message(batch, plug, value):
+    if isinstance(value, pm.PyNode):
+        batch.connect(f'{value}.message', plug)
+
+def _write_value(batch, plug, value):
+    if isinstance(value, (bool, float, int, str, pm.dt.Vector)):
+        batch.set(plug, value)
+
+# kind: write function, the same read function is used for every kind
+_KIND_WRITERS = {
+    'message': _write_message,
+    'multi_message': _write_message,
+    'vector': _write_value,
+    'string': _write_value,
+    'scalar': _write_value,
+}
+
+class MetaAttr(NamedTuple):
+    """
+    One attribute of a compiled meta plan
+    """
+    name: str
+    group: str
+    kind: str
+    attr_type: str
+    nice_name: str
+    spec: MappingProxyType
+    link: bool
+    follow: bool
+    read: Callable
+    write: Callable
+
+    @property
+    def multi(self):
+        return self.kind == 'multi_message'
+
+def _nice_name(name):
+    # Same rules as maya nice names: jnt_orient_main -> Jnt Orient Main, finger_num -> Finger Num
+    words = re.sub(r'([a-z0-9])([A-Z])', r'\1 \2', name).replace('_', ' ').split()
+    return ' '.join(word[0].upper() + word[1:] for word in words)
+
+def _attr_kind(spec):
+    attr_type = spec.get('attributeType', spec.get('at', spec.get('type', spec.get('dt'))))
+    if attr_type == 'message':
+        if spec.get('m') or spec.get('multi'):
+            return 'multi_message', attr_type
+        return 'message', attr_type
+    if attr_type == 'double3':
+        return 'vector', attr_type
+    if attr_type == 'string':
+        return 'string', attr_type
+    return 'scalar', attr_type
+
+def _is_attr_spec(value):
+    return any(key in value for key in ('attributeType', 'at', 'type', 'dt'))
+
+class MetaPlan:
+    """
+    Flattened, immutable version of a module's meta_args, compiled once per class.
 
-    metaNode.attr('name').set(name)
-    metaNode.moduleType.set(moduleType)
-    # # Create separator
-    # metaNode.addAttr('info', at='compound', nc=len(info_args))
-    #
-    # # Custom args
-    # for key in info_args:
-    #     # Parent to info attr
-    #     info_args[key]['p'] = 'info'
-    #
-    #     metaNode.addAttr(key, **info_args[key])
+    Attributes:
+        attrs (tuple): Every MetaAttr, in meta_args order.
+        links (tuple): Module links that are followed when loading (parent, mirrored_from).
+        values (tuple): Attributes that are read and written as values, everything except module links.
+        creation_args (tuple): Creation attrs that are passed to the class when recreating it.
+        config (tuple): Config attrs, copied when mirroring.
+        schema (tuple): addAttr commands that build a metaNode for this plan.
+    """
+    def __init__(self, meta_args):
+        # Old style modules have a flat meta_args, treat it as info attrs
+        if meta_args and all(isinstance(v, dict) and _is_attr_spec(v) for v in meta_args.values()):
+            meta_args = {'info_attrs': meta_args}
 
+        attrs = []
+        for group in meta_args:
+            for name, spec in meta_args[group].items():
+                kind, attr_type = _attr_kind(spec)
+                link = group == 'module_attrs'
+                attrs.append(MetaAttr(
+                    name=name,
+                    group=group,
+                    kind=kind,
+                    attr_type=attr_type,
+                    nice_name=_nice_name(name),
+                    spec=MappingProxyType(dict(spec)),
+                    link=link,
+                    follow=link and name not in NOT_FOLLOWED,
+                    read=_read_attr,
+                    write=_KIND_WRITERS[kind],
+                ))
+
+        self.attrs = tuple(attrs)
+        self.groups = tuple(meta_args)
+        self.links = tuple(attr for attr in self.attrs if attr.follow)
+        self.values = tuple(attr for attr in self.attrs if not attr.link)
+        self.creation_args = tuple(attr for attr in self.group('creation_attrs') if attr.name not in NOT_CREATION_ARGS)
+        self.config = self.group('config_attrs')
+        self.schema = tuple(compile_schema(meta_args))
+        self._by_name = MappingProxyType({attr.name: attr for attr in self.attrs})
+
+    def group(self, group):
+        return tuple(attr for attr in self.attrs if attr.group == group)
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self.attrs)
+
+class MetaField:
+    """
+    Data descriptor for a meta attribute on a Module.
+    Assigned values are stored on the instance like a normal attribute.
+    Lazy modules leave the fields unset, those are fetched by the owner's fetch_meta the first time they're read.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            return obj.fetch_meta(self.name)
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+    def __delete__(self, obj):
+        obj.__dict__.pop(self.name, None)
+
+def compile_plan(meta_args):
+    return MetaPlan(meta_args)
+
+def create_metadata(name, moduleType, meta_plan, can_mirror):
+    """
+    Creates the metaNode for a module.
+    Every attribute of the module's MetaPlan is added in a single batch.
+    """
+    metaNode = pm.createNode('network', name="META_" + name)
+
+    batch = MelBatch()
+    for command in meta_plan.schema:
+        batch.add(f'{command} {metaNode};')
+
+    batch.set(f'{metaNode}.name', name)
+    batch.set(f'{metaNode}.moduleType', moduleType)
+    batch.run()
 
     return metaNode
 
-def add(nodes, dst):
-    if not nodes:
-        return
+def missing_attrs(metaNode, meta_plan):
+    """
+    Returns the MetaAttrs of the plan that the metaNode doesn't have, eg. config attrs added to meta_args
+    after the node was created. Only reads the scene, see add_attrs.
+    """
+    global query_count
+    query_count += 1
+    existing = set(pm.listAttr(str(metaNode), userDefined=True) or [])
+
+    return [attr for attr in meta_plan if attr.name not in existing]
+
+def add_attrs(metaNode, attrs, values):
+    """
+    Adds the MetaAttrs to an existing metaNode in one batch, value attributes are set from the values dict
+    """
+    batch = MelBatch()
+    for attr in attrs:
+        for command in compile_schema({attr.group: {attr.name: dict(attr.spec)}}):
+            batch.add(f'{command} {metaNode};')
+
+        value = values.get(attr.name)
+        if not attr.link and value is not None:
+            attr.write(batch, f'{metaNode}.{attr.name}', value)
+    batch.run()
+
+def _freeze(value):
+    """
+    Returns a copy of value that can be compared later
+    """
+    if isinstance(value, list):
+        return [_freeze(v) for v in value]
+    if isinstance(value, pm.dt.Vector):
+        return tuple(value)
+    return value
+
+def _same_value(old, new):
+    if isinstance(new, pm.PyNode):
+        if not isinstance(old, pm.PyNode):
+            return False
+        try:
+            # Deleted nodes don't match anything, even if a new node got the same name
+            return old.exists() and old == new
+        except pm.MayaNodeError:
+            return False
+
+    return old == _freeze(new)
+
+
+class MetaWriter:
+    """
+    Writes module values to a metadata node.
+
+    Keeps a snapshot of the last written values and only sends what changed,
+    all connections and values are applied with one batched command.
+    """
+    def __init__(self, metaNode, plan):
+        self.metaNode = metaNode
+        self.plan = plan
+        self.snapshot = {}
+
+    def clear(self):
+        self.snapshot = {}
+
+    def seed(self, attribute, value):
+        """
+        Records a value that is already on the metaNode, eg. after reading it
+        """
+        self.snapshot[attribute] = _freeze(value)
 
-    def connect(src, dest):
-        # If it's a pynode connect message attr
-        if isinstance(src, pm.PyNode):
-            if not pm.isConnected(src.message, dest):
-                src.message.connect(dest)
+    def seed_from_node(self, attributes):
+        """
+        Reads the attributes from the metaNode, used when the node was changed outside the writer
+        """
+        self.clear()
+        for attribute in attributes:
+            self.seed(attribute, get(self.metaNode, attribute))
 
-        # If it's an int just set the value
-        elif isinstance(src, (float, int, str)):
-            dest.set(src)
+    def write(self, values):
+        """
+        Writes a dict of attribute: value to the metaNode
+        Returns the number of changes written
+        """
+        batch = MelBatch()
 
-        elif isinstance(src, bool):
-            dest.set(src)
+        for attribute, value in values.items():
+            write = self.plan[attribute].write
+            dst = f'{self.metaNode}.{attribute}'
+            old = self.snapshot.get(attribute)
 
-        # Set vector type variables
-        elif isinstance(src, pm.dt.Vector):
-            dest.set(src)
+            if isinstance(value, list):
+                if not isinstance(old, list):
+                    old = []
+                for i, element in enumerate(value):
+                    if i < len(old) and _same_value(old[i], element):
+                        continue
+                    write(batch, f'{dst}[{i}]', element)
 
-    # If it's a list of nodes connect each one to the destination
-    if isinstance(nodes, list):
-        for i, node in enumerate(nodes):
-            connect(node, dst[i])
-    else:
-        connect(nodes, dst)
+            elif old is None or not _same_value(old, value):
+                write(batch, dst, value)
 
+        try:
+            count = batch.run()
+        except RuntimeError:
+            # Don't know what made it to the node, next write compares against nothing
+            self.clear()
+            raise
 
+        for attribute, value in values.items():
+            self.seed(attribute, value)
 
+        return count
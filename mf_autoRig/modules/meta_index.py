@@ -0,0 +1,234 @@
+import itertools
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import pymel.core as pm
+
+import mf_autoRig.utils.defaults as df
+from mf_autoRig import log
+
+
+def _uuid(mobj):
+    return om.MFnDependencyNode(mobj).uuid().asString()
+
+
+class MetaIndex:
+    """
+    Index of the META_ network nodes in the scene, by moduleType and by name.
+
+    Network node added/removed callbacks and name changed callbacks on the indexed nodes keep it current,
+    so queries cost O(result) instead of listing the whole scene. Nodes are kept in the order they were indexed,
+    scene order after a rebuild, so queries return them in the same order as ls.
+    Nodes are added before their attributes exist, so new network nodes are kept as pending
+    and classified the first time the index is queried.
+    """
+    def __init__(self):
+        self._handles = {}
+        self._types = {}
+        self._node_types = {}
+        self._names = {}
+        self._node_names = {}
+        self._pending = {}
+        self._positions = {}
+        self._counter = itertools.count()
+
+        self._callbacks = []
+        self._node_callbacks = {}
+        self.built = False
+
+    # QUERIES
+    def get_nodes(self, module_types=None):
+        """
+        Returns the META_ nodes of the given module types, all of them if module_types is None
+        """
+        self._ensure_built()
+
+        if module_types is None:
+            uuids = list(self._node_types)
+        else:
+            if isinstance(module_types, str):
+                module_types = [module_types]
+            uuids = []
+            for module_type in module_types:
+                uuids.extend(self._types.get(module_type, ()))
+
+            if len(module_types) > 1:
+                # Mixed types come back in index order, like a single type
+                uuids.sort(key=self._positions.__getitem__)
+
+        return [self._to_pynode(uuid) for uuid in uuids]
+
+    def get_nodes_by_type(self):
+        """
+        Returns a dict of moduleType: META_ nodes
+        """
+        self._ensure_built()
+        return {module_type: [self._to_pynode(uuid) for uuid in uuids]
+                for module_type, uuids in self._types.items() if uuids}
+
+    def get_node(self, name):
+        """
+        Returns the META_ node with the given name, None if it doesn't exist
+        """
+        self._ensure_built()
+        uuid = self._names.get(name)
+        if uuid is None:
+            return None
+        return self._to_pynode(uuid)
+
+    def get_type(self, node):
+        self._ensure_built()
+        return self._node_types.get(cmds.ls(str(node), uuid=True)[0])
+
+    def __len__(self):
+        self._ensure_built()
+        return len(self._node_types)
+
+    # BUILD
+    def rebuild(self):
+        """
+        Clears the index and reads every META_ node in the scene again
+        """
+        self._clear_nodes()
+        self._install()
+
+        sel = om.MSelectionList()
+        for name in cmds.ls(f'{df.meta_prf}*', type='network') or []:
+            sel.add(name)
+
+        for i in range(sel.length()):
+            mobj = sel.getDependNode(i)
+            self._pending[_uuid(mobj)] = om.MObjectHandle(mobj)
+
+        self.built = True
+        self._resolve_pending()
+        log.debug(f"Rebuilt META index with {len(self._node_types)} nodes")
+
+    def uninstall(self):
+        """
+        Removes all callbacks, eg. before reloading the package
+        """
+        self._clear_nodes()
+        if self._callbacks:
+            om.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+        self.built = False
+
+    def _ensure_built(self):
+        if not self.built:
+            self.rebuild()
+        else:
+            self._resolve_pending()
+
+    def _install(self):
+        if self._callbacks:
+            return
+
+        self._callbacks = [
+            om.MDGMessage.addNodeAddedCallback(self._node_added, 'network'),
+            om.MDGMessage.addNodeRemovedCallback(self._node_removed, 'network'),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._scene_changed),
+        ]
+
+    def _clear_nodes(self):
+        for ids in self._node_callbacks.values():
+            om.MMessage.removeCallbacks(ids)
+
+        self._handles = {}
+        self._types = {}
+        self._node_types = {}
+        self._names = {}
+        self._node_names = {}
+        self._pending = {}
+        self._positions = {}
+        self._node_callbacks = {}
+
+    def _resolve_pending(self):
+        """
+        Classifies the network nodes added since the last query
+        """
+        for uuid, handle in list(self._pending.items()):
+            if not handle.isValid():
+                del self._pending[uuid]
+                continue
+
+            fn = om.MFnDependencyNode(handle.object())
+            if not fn.name().startswith(df.meta_prf) or not fn.hasAttribute('moduleType'):
+                del self._pending[uuid]
+                continue
+
+            module_type = fn.findPlug('moduleType', False).asString()
+            if not module_type:
+                # Still being built, try again next query
+                continue
+
+            del self._pending[uuid]
+            self._add(uuid, handle, fn.name(), module_type)
+
+    def _add(self, uuid, handle, name, module_type):
+        self._handles[uuid] = handle
+        self._node_types[uuid] = module_type
+        # Insertion ordered, dict keys instead of a set
+        self._types.setdefault(module_type, {})[uuid] = None
+        self._positions[uuid] = next(self._counter)
+        self._node_names[uuid] = name
+        self._names[name] = uuid
+
+        self._node_callbacks[uuid] = [om.MNodeMessage.addNameChangedCallback(handle.object(), self._name_changed, uuid)]
+
+    def _remove(self, uuid):
+        self._pending.pop(uuid, None)
+        self._handles.pop(uuid, None)
+
+        module_type = self._node_types.pop(uuid, None)
+        if module_type is not None:
+            self._types[module_type].pop(uuid, None)
+        self._positions.pop(uuid, None)
+
+        name = self._node_names.pop(uuid, None)
+        if name is not None and self._names.get(name) == uuid:
+            del self._names[name]
+
+        ids = self._node_callbacks.pop(uuid, None)
+        if ids:
+            om.MMessage.removeCallbacks(ids)
+
+    def _to_pynode(self, uuid):
+        return pm.PyNode(om.MFnDependencyNode(self._handles[uuid].object()).name())
+
+    # CALLBACKS
+    def _node_added(self, mobj, client_data):
+        self._pending[_uuid(mobj)] = om.MObjectHandle(mobj)
+
+    def _node_removed(self, mobj, client_data):
+        self._remove(_uuid(mobj))
+
+    def _name_changed(self, mobj, prev_name, uuid):
+        new_name = om.MFnDependencyNode(mobj).name()
+        if not new_name.startswith(df.meta_prf):
+            self._remove(uuid)
+            return
+
+        if self._names.get(prev_name) == uuid:
+            del self._names[prev_name]
+        self._names[new_name] = uuid
+        self._node_names[uuid] = new_name
+
+    def _scene_changed(self, client_data):
+        self._clear_nodes()
+        self.built = False
+
+
+# Index shared by the whole tool
+_index = MetaIndex()
+
+def get_index():
+    return _index
+
+def rebuild_index():
+    """
+    Rebuilds the META index from the scene
+    """
+    _index.rebuild()
+    return _index
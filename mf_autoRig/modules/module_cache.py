@@ -0,0 +1,183 @@
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+from mf_autoRig import log
+
+# Attribute changes that make the cached module out of date. Evaluation messages are ignored.
+_DIRTY_MESSAGES = (om.MNodeMessage.kAttributeSet |
+                   om.MNodeMessage.kConnectionMade |
+                   om.MNodeMessage.kConnectionBroken |
+                   om.MNodeMessage.kAttributeAdded |
+                   om.MNodeMessage.kAttributeRemoved)
+
+
+def get_uuid(metaNode):
+    """
+    Returns the uuid of a node as a string
+    """
+    return cmds.ls(str(metaNode), uuid=True)[0]
+
+
+class ModuleCache:
+    """
+    Cache of Module instances keyed by the uuid of their metaNode.
+
+    Every cached metaNode gets attribute changed, name changed and pre removal callbacks.
+    The callbacks bump a version stamp for the node, a module is dirty when the current version
+    is newer than the version it was last synced at. Deleted nodes are evicted, and the whole cache is
+    emptied on a new or opened scene, where nodes come back with the same uuids.
+
+    Attributes:
+        hits (int): Number of lookups that returned a clean module.
+        misses (int): Number of lookups that had to create or rehydrate a module.
+    """
+    def __init__(self):
+        self._modules = {}
+        self._versions = {}
+        self._synced = {}
+        self._callbacks = {}
+        self._uuids = {}
+
+        self._scene_callbacks = []
+
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, module):
+        self._install()
+
+        uuid = get_uuid(module.metaNode)
+        if uuid in self._modules:
+            self._remove_callbacks(uuid)
+
+        self._modules[uuid] = module
+        self._uuids[id(module)] = uuid
+        self._versions[uuid] = 0
+        self._synced[uuid] = 0
+        self._add_callbacks(uuid, module.metaNode)
+
+    def remove(self, module):
+        uuid = self._get_module_uuid(module)
+        if uuid is not None:
+            self._evict(uuid)
+
+    def get(self, metaNode):
+        """
+        Returns the cached module for the metaNode, None if not cached
+        """
+        uuids = cmds.ls(str(metaNode), uuid=True)
+        if not uuids:
+            return None
+
+        return self._modules.get(uuids[0])
+
+    def is_dirty(self, module):
+        uuid = self._get_module_uuid(module)
+        if uuid is None:
+            return True
+
+        return self._versions[uuid] != self._synced[uuid]
+
+    def version(self, module):
+        """
+        Returns the version stamp of the module's metaNode, None if the module isn't cached
+        """
+        uuid = self._get_module_uuid(module)
+        if uuid is None:
+            return None
+
+        return self._versions[uuid]
+
+    def mark_clean(self, module):
+        uuid = self._get_module_uuid(module)
+        if uuid is not None:
+            self._synced[uuid] = self._versions[uuid]
+
+    def mark_dirty(self, module):
+        uuid = self._get_module_uuid(module)
+        if uuid is not None:
+            self._versions[uuid] += 1
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._clear_modules()
+        self.reset_stats()
+
+    def uninstall(self):
+        """
+        Empties the cache and removes all callbacks, eg. before reloading the package
+        """
+        self._clear_modules()
+        if self._scene_callbacks:
+            om.MMessage.removeCallbacks(self._scene_callbacks)
+        self._scene_callbacks = []
+
+    def values(self):
+        return list(self._modules.values())
+
+    def __contains__(self, metaNode):
+        return self.get(metaNode) is not None
+
+    def __len__(self):
+        return len(self._modules)
+
+    def _get_module_uuid(self, module):
+        return self._uuids.get(id(module))
+
+    def _clear_modules(self):
+        for uuid in list(self._modules):
+            self._evict(uuid)
+
+    def _install(self):
+        if self._scene_callbacks:
+            return
+
+        self._scene_callbacks = [
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._scene_changed),
+        ]
+
+    def _scene_changed(self, client_data):
+        log.debug(f"Scene changed, evicting {len(self._modules)} modules from module cache")
+        self._clear_modules()
+
+    def _evict(self, uuid):
+        self._remove_callbacks(uuid)
+        module = self._modules.pop(uuid, None)
+        if module is not None:
+            self._uuids.pop(id(module), None)
+        self._versions.pop(uuid, None)
+        self._synced.pop(uuid, None)
+
+    def _bump(self, uuid):
+        if uuid in self._versions:
+            self._versions[uuid] += 1
+
+    def _add_callbacks(self, uuid, metaNode):
+        sel = om.MSelectionList()
+        sel.add(str(metaNode))
+        mobj = sel.getDependNode(0)
+
+        def attribute_changed(msg, plug, other_plug, client_data):
+            if msg & _DIRTY_MESSAGES:
+                self._bump(client_data)
+
+        def name_changed(node, prev_name, client_data):
+            self._bump(client_data)
+
+        def pre_removal(node, client_data):
+            log.debug(f"Evicting {om.MFnDependencyNode(node).name()} from module cache")
+            self._evict(client_data)
+
+        self._callbacks[uuid] = [
+            om.MNodeMessage.addAttributeChangedCallback(mobj, attribute_changed, uuid),
+            om.MNodeMessage.addNameChangedCallback(mobj, name_changed, uuid),
+            om.MNodeMessage.addNodePreRemovalCallback(mobj, pre_removal, uuid),
+        ]
+
+    def _remove_callbacks(self, uuid):
+        ids = self._callbacks.pop(uuid, [])
+        if ids:
+            om.MMessage.removeCallbacks(ids)
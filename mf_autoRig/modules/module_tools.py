@@ -1,12 +1,23 @@
+import json
+
 import pymel.core as pm
+from mf_autoRig import log
+import mf_autoRig.modules.meta as mdata
+import mf_autoRig.utils.defaults as df
+from mf_autoRig.modules.meta_index import get_index, rebuild_index
+from mf_autoRig.utils import joint_hierarchy, transform_cache
+from mf_autoRig.utils.batch import MelBatch, mel_value
 
+# Version of the file written by export_snapshot, bump it when the layout changes
+# 2: guides don't include the curves connect_guides creates
+SNAPSHOT_VERSION = 2
 
 
-def createModule(metaNode):
+def get_module_classes():
     """
-    Function to create corresponding class from metadata node
+    Returns a dict of moduleType: class for every module that can be created from metadata
     """
-    from mf_autoRig.modules import Hand, Limb, Clavicle, Spine, IKFoot, Module, FKChain
+    from mf_autoRig.modules import Hand, Limb, Clavicle, Spine, IKFoot, FKChain
     from mf_autoRig.modules import FKFoot
 
     from mf_autoRig.modules.Toon import BendyLimb
@@ -22,37 +33,323 @@ def createModule(metaNode):
         'FKChain': FKChain.FKChain
     }
 
-    if metaNode.name() in Module.Module.instances:
-        obj = Module.Module.instances[metaNode.name()]
-        obj.update_from_meta()
-    else:
-        module = modules[metaNode.moduleType.get()]
-        obj = module.create_from_meta(metaNode)
+    return modules
+
+def createModule(metaNode, lazy=None, resolve_links=True):
+    """
+    Function to create corresponding class from metadata node
+    lazy is passed to create_from_meta when the module isn't cached yet
+    resolve_links False doesn't create the linked modules, the caller wires parent and mirrored_from
+    """
+    from mf_autoRig.modules import Module
+
+    cache = Module.Module.instances
+    obj = cache.get(metaNode)
 
+    if obj is None:
+        cache.misses += 1
+        module = get_module_classes()[mdata.get(metaNode, 'moduleType')]
+        obj = module.create_from_meta(metaNode, lazy=lazy, resolve_links=resolve_links)
+        cache.mark_clean(obj)
+
+    elif cache.is_dirty(obj):
+        # Only rehydrate modules whose metaNode changed since they were last read or saved
+        cache.misses += 1
+        obj.update_from_meta(resolve_links=resolve_links)
+        cache.mark_clean(obj)
+
+    else:
+        cache.hits += 1
 
     return obj
 
-def get_all_modules(module_types=None, create=False):
-    metaNodes = pm.ls(regex='META_.*', type='network')
+
+class ModuleGraph:
+    """
+    Result of load_module_graph
+
+    Attributes:
+        modules (list): All loaded modules, parents and mirror sources come before the modules that depend on them.
+        queries (int): Number of scene queries done while loading.
+    """
+    def __init__(self, modules, queries):
+        self.modules = modules
+        self.queries = queries
+
+    def get_roots(self):
+        """
+        Returns the modules that have no parent
+        """
+        return [module for module in self.modules if module.get_parent() is None]
+
+    def __len__(self):
+        return len(self.modules)
+
+    def __iter__(self):
+        return iter(self.modules)
+
+
+def load_module_graph(lazy=False):
+    """
+    Loads every module in the scene in a single pass.
+
+    All META_ nodes and the message connections between them are read with one query each,
+    then every module is created once, in topological order, and the parent/children/mirror
+    links are wired in memory. The number of scene queries grows linearly with the number of modules.
+
+    Args:
+        lazy (bool): Create the modules that aren't cached yet as lazy modules, their other
+            meta attributes are only read when they're accessed.
+
+    Returns:
+        ModuleGraph: the loaded modules and the number of scene queries it took
+    """
+
+    mdata.reset_query_count()
+    queries = 0
+
+    metaNodes = get_index().get_nodes()
+    queries += 1
 
     if not metaNodes:
+        return ModuleGraph([], queries)
+
+    # All incoming connections of all meta nodes, as (meta plug, source plug) pairs
+    connections = pm.listConnections(metaNodes, source=True, destination=False,
+                                     connections=True, plugs=True, type='network')
+    queries += 1
+
+    # Node name: name of the node it depends on, for each link type
+    node_names = {node.name() for node in metaNodes}
+    links = {'parent': {}, 'mirrored_from': {}}
+    for meta_plug, src_plug in connections:
+        attr_name = meta_plug.attrName(longName=True)
+        src_name = src_plug.node().name()
+        if attr_name in links and src_name in node_names:
+            links[attr_name][meta_plug.node().name()] = src_name
+
+    # Topological sort, a module comes after its parent and the module it's mirrored from
+    dependents = {name: [] for name in node_names}
+    in_degree = {name: 0 for name in node_names}
+    for link in links.values():
+        for name, depends_on in link.items():
+            dependents[depends_on].append(name)
+            in_degree[name] += 1
+
+    nodes_by_name = {node.name(): node for node in metaNodes}
+    ordered = [node.name() for node in metaNodes if in_degree[node.name()] == 0]
+    for name in ordered:
+        for dependent in dependents[name]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                ordered.append(dependent)
+
+    if len(ordered) != len(node_names):
+        cycle = [name for name in node_names if in_degree[name] > 0]
+        log.warning(f"Cycle found in module connections, skipping: {cycle}")
+
+    # Create every module once, without following the links
+    module_classes = get_module_classes()
+    loaded = {}
+    for name in ordered:
+        metaNode = nodes_by_name[name]
+        module_type = mdata.get(metaNode, 'moduleType')
+        if module_type not in module_classes:
+            log.warning(f"{name} has unknown module type: {module_type}")
+            continue
+
+        loaded[name] = createModule(metaNode, lazy=lazy, resolve_links=False)
+
+    # Wire links in memory
+    for module in loaded.values():
+        module.parent = None
+        module.children = []
+        module.mirrored_to = None
+        module.mirrored_from = None
+
+    for name in ordered:
+        if name not in loaded:
+            continue
+
+        module = loaded[name]
+        parent_name = links['parent'].get(name)
+        if parent_name in loaded:
+            module.parent = loaded[parent_name]
+            module.parent.children.append(module)
+
+        source_name = links['mirrored_from'].get(name)
+        if source_name in loaded:
+            module.mirrored_from = loaded[source_name]
+            module.mirrored_from.mirrored_to = module
+
+    queries += mdata.query_count
+    log.debug(f"Loaded {len(loaded)} modules with {queries} scene queries")
+
+    return ModuleGraph(list(loaded.values()), queries)
+
+
+def get_all_modules(module_types=None, create=False):
+    """
+    Returns the META_ nodes of the given module types, or the modules if create is True.
+    The nodes come from the META index, so the cost depends on the number of results, not the scene size.
+    Only the matching modules are created, as lazy modules that read their other attributes on access.
+    """
+    index = get_index()
+    if len(index) == 0:
         pm.warning("No metadata nodes found")
         return None
 
-    if module_types is not None:
-        nodes = []
-        for node in metaNodes:
-            if node.moduleType.get() in module_types:
-                nodes.append(node)
-    else:
-        nodes = metaNodes
+    nodes = index.get_nodes(module_types)
 
     if create:
-        return [createModule(node) for node in nodes]
+        return [createModule(node, lazy=True) for node in nodes]
 
     return nodes
 
 
+def rig_modules(modules):
+    """
+    Creates the joints and rigs every module that isn't rigged yet, in order.
+    The whole build shares one transform cache and joint hierarchy index.
+    """
+    with transform_cache.build_cache(), joint_hierarchy.build_index():
+        for module in modules:
+            is_rigged, _, _ = module.get_info()
+            if not is_rigged:
+                module.create_joints()
+                module.rig()
+
+
+def export_snapshot(path, graph=None):
+    """
+    Writes the whole module graph to a json file.
+    For every module it stores the creation args, config attrs, parent, mirror source
+    and the world matrix of every guide. Modules are written parents first.
+
+    Args:
+        path (str): File to write.
+        graph (ModuleGraph): Graph to export, loads the scene's graph if None.
+
+    Returns:
+        dict: The data that was written
+    """
+    if graph is None:
+        graph = load_module_graph()
+
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'modules': [module.to_snapshot() for module in graph],
+    }
+
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+
+    log.info(f"Exported {len(data['modules'])} modules to {path}")
+    return data
+
+
+def read_snapshot(path):
+    """
+    Reads a file written by export_snapshot and checks its version
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    version = data.get('version')
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} in {path}, expected {SNAPSHOT_VERSION}")
+
+    return data
+
+
+def import_snapshot(path):
+    """
+    Recreates the modules of a snapshot file in the current scene.
+    Guides are created first and moved to their saved world matrices in a single batch,
+    then modules are connected, mirrored modules are mirrored from their source and connected last.
+    Guides are matched by name, raises ValueError if a module doesn't create the guides of the snapshot.
+
+    Returns:
+        dict: name: module, for every created module
+    """
+    data = read_snapshot(path)
+    module_classes = get_module_classes()
+
+    modules = {}
+    mirrored = []
+    batch = MelBatch()
+
+    for entry in data['modules']:
+        if entry['mirrored_from'] is not None:
+            mirrored.append(entry)
+            continue
+
+        module_class = module_classes.get(entry['moduleType'])
+        if module_class is None:
+            log.warning(f"{entry['name']} has unknown module type: {entry['moduleType']}")
+            continue
+
+        module = module_class.from_snapshot(entry)
+        modules[entry['name']] = module
+
+        # Match the guides by name, the module must have created the same ones
+        guides = {guide.nodeName(): guide for guide in module.get_guide_hierarchy()}
+        names = entry['guides']['names']
+        if sorted(guides) != sorted(names):
+            missing = sorted(set(names) - set(guides))
+            extra = sorted(set(guides) - set(names))
+            raise ValueError(f"{module.name}: snapshot has {len(names)} guides, module created {len(guides)}. "
+                             f"Missing: {missing}, not in snapshot: {extra}")
+
+        # Parents before children, so setting a parent doesn't move a child that was already placed
+        placed = sorted(zip([guides[name] for name in names], entry['guides']['matrices']),
+                        key=lambda item: item[0].longName().count('|'))
+        for guide, matrix in placed:
+            values = ' '.join(mel_value(float(v)) for v in matrix)
+            batch.add(f'xform -ws -m {values} {mel_value(guide.longName())};')
+
+    count = batch.run()
+    log.debug(f"Placed {count} guides")
+
+    def connect(entries):
+        # Returns the entries whose parent doesn't exist yet
+        waiting = []
+        for entry in entries:
+            if entry['parent'] is None or entry['name'] not in modules:
+                continue
+
+            parent = modules.get(entry['parent'])
+            if parent is None:
+                waiting.append(entry)
+                continue
+
+            modules[entry['name']].connect_guides(parent)
+
+        return waiting
+
+    # Connect first so mirrored modules copy connected guides, like when building by hand
+    waiting = connect(data['modules'])
+
+    for entry in mirrored:
+        source = modules.get(entry['mirrored_from'])
+        if source is None:
+            log.warning(f"{entry['name']}: mirror source {entry['mirrored_from']} was not imported")
+            continue
+
+        module = source.mirror_guides()
+        if module is None:
+            continue
+
+        if module.name != entry['name']:
+            log.warning(f"Mirrored {source.name} to {module.name}, snapshot has {entry['name']}")
+        modules[entry['name']] = module
+
+    for entry in connect(waiting + mirrored):
+        log.warning(f"{entry['name']}: parent {entry['parent']} was not imported")
+
+    log.info(f"Imported {len(modules)} modules from {path}")
+    return modules
+
 
 def get_connections(metaNode):
     def get_con(metaNodes, conns):
@@ -1,4 +1,5 @@
 from mf_autoRig.modules import Limb, Hand, Clavicle, Spine, FKFoot, IKFoot, FKChain
+from mf_autoRig.utils import joint_hierarchy, transform_cache
 
 pos = {
     'clavicle': [(3.642359972000122, 138.716552734375, -1.464443445205686), (15.314141273498537, 138.29847717285156, -2.8424408435821515)],
@@ -27,41 +28,42 @@ pos = {
 def biped():
     positions = pos
 
-    L_arm = Limb.Limb('L_arm')
-    L_leg = Limb.Limb('L_leg')
-    spine = Spine.Spine('M_spine', num=4)
-    M_neck = FKChain.FKChain('M_neck', num=3)
-    L_clavicle = Clavicle.Clavicle('L_clavicle')
-    L_hand = Hand.Hand('L_hand')
-    L_foot = IKFoot.IKFoot('L_foot')
+    with transform_cache.build_cache(), joint_hierarchy.build_index():
+        L_arm = Limb.Limb('L_arm')
+        L_leg = Limb.Limb('L_leg')
+        spine = Spine.Spine('M_spine', num=4)
+        M_neck = FKChain.FKChain('M_neck', num=3)
+        L_clavicle = Clavicle.Clavicle('L_clavicle')
+        L_hand = Hand.Hand('L_hand')
+        L_foot = IKFoot.IKFoot('L_foot')
 
-    L_arm.create_guides(pos=positions['arm'])
-    L_leg.create_guides(pos=positions['leg'])
-    spine.create_guides(pos=positions['spine'])
-    L_clavicle.create_guides(pos=positions['clavicle'])
-    L_hand.create_guides(pos = positions['hand'])
-    L_foot.create_guides(pos=positions['foot'])
-    M_neck.create_guides(pos=positions['neck'])
+        L_arm.create_guides(pos=positions['arm'])
+        L_leg.create_guides(pos=positions['leg'])
+        spine.create_guides(pos=positions['spine'])
+        L_clavicle.create_guides(pos=positions['clavicle'])
+        L_hand.create_guides(pos = positions['hand'])
+        L_foot.create_guides(pos=positions['foot'])
+        M_neck.create_guides(pos=positions['neck'])
 
-    L_leg.attach_index = 0
-    L_leg.metaNode.attach_index.set(0)
-    # L_leg.save_metadata() TODO: debug and see why this isn't working?
-    L_arm.connect_guides(L_clavicle)
-    L_clavicle.connect_guides(spine)
-    L_leg.connect_guides(spine)
-    L_hand.connect_guides(L_arm)
-    L_foot.connect_guides(L_leg)
-    M_neck.connect_guides(spine)
+        L_leg.attach_index = 0
+        L_leg.metaNode.attach_index.set(0)
+        # L_leg.save_metadata() TODO: debug and see why this isn't working?
+        L_arm.connect_guides(L_clavicle)
+        L_clavicle.connect_guides(spine)
+        L_leg.connect_guides(spine)
+        L_hand.connect_guides(L_arm)
+        L_foot.connect_guides(L_leg)
+        M_neck.connect_guides(spine)
 
-    ## Right side
-    R_arm = L_arm.mirror_guides()
-    R_leg = L_leg.mirror_guides()
-    R_clavicle = L_clavicle.mirror_guides()
-    R_hand = L_hand.mirror_guides()
-    R_foot = L_foot.mirror_guides()
+        ## Right side
+        R_arm = L_arm.mirror_guides()
+        R_leg = L_leg.mirror_guides()
+        R_clavicle = L_clavicle.mirror_guides()
+        R_hand = L_hand.mirror_guides()
+        R_foot = L_foot.mirror_guides()
 
-    R_arm.connect_guides(R_clavicle)
-    R_clavicle.connect_guides(spine)
-    R_leg.connect_guides(spine)
-    R_hand.connect_guides(R_arm)
-    R_foot.connect_guides(R_leg)
\ No newline at end of file
+        R_arm.connect_guides(R_clavicle)
+        R_clavicle.connect_guides(spine)
+        R_leg.connect_guides(spine)
+        R_hand.connect_guides(R_arm)
+        R_foot.connect_guides(R_leg)
@@ -0,0 +1,290 @@
+"""
+Stand-in for maya.api.OpenMaya: the selection list, function sets and messages the module cache and meta index use.
+Callbacks are registered on the stand-in scene events.
+"""
+from mf_autoRig.standin import commands
+from mf_autoRig.standin import graph
+from mf_autoRig.standin.graph import GraphError
+
+
+class MObject:
+    def __init__(self, node=None):
+        self._node = node
+
+    def isNull(self):
+        return self._node is None
+
+    def hasFn(self, fn):
+        return self._node is not None and self._node.is_a(fn)
+
+    def apiTypeStr(self):
+        return self._node.type.name if self._node is not None else 'kInvalid'
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._node is other._node
+
+    def __hash__(self):
+        return hash(id(self._node))
+
+
+MObject.kNullObj = MObject()
+
+
+class MFn:
+    """
+    Function set types are the node type names, MObject.hasFn checks the node type inheritance
+    """
+    kDependencyNode = 'dependNode'
+    kDagNode = 'dagNode'
+    kTransform = 'transform'
+    kJoint = 'joint'
+    kConstraint = 'constraint'
+    kShape = 'shape'
+
+
+class MDagPath:
+    def __init__(self, node=None):
+        self._node = node
+
+    def node(self):
+        return MObject(self._node)
+
+    def isValid(self):
+        return self._node is not None and self._node.alive
+
+    def fullPathName(self):
+        return self._node.long_name() if self._node is not None else ''
+
+    def partialPathName(self):
+        return self._node.name if self._node is not None else ''
+
+
+class MObjectHandle:
+    def __init__(self, mobj=None):
+        self._mobj = mobj if mobj is not None else MObject()
+
+    def isValid(self):
+        return self._mobj._node is not None and self._mobj._node.alive
+
+    isAlive = isValid
+
+    def object(self):
+        return self._mobj
+
+    def hashCode(self):
+        return id(self._mobj._node)
+
+
+class MUuid:
+    def __init__(self, value):
+        self._value = value
+
+    def asString(self):
+        return self._value
+
+    def __eq__(self, other):
+        return isinstance(other, MUuid) and self._value == other._value
+
+    def __hash__(self):
+        return hash(self._value)
+
+
+class MPlug:
+    def __init__(self, plug=None):
+        self._plug = plug
+
+    def isNull(self):
+        return self._plug is None
+
+    def name(self):
+        return str(self._plug)
+
+    def partialName(self, includeNodeName=False, includeNonMandatoryIndices=False, includeInstancedIndices=False,
+                    useAlias=False, useFullAttributePath=False, useLongNames=False):
+        path = self._plug.path(long=useLongNames)
+        return f'{self._plug.node.name}.{path}' if includeNodeName else path
+
+    def node(self):
+        return MObject(self._plug.node)
+
+    def isArray(self):
+        return self._plug.spec.multi and not self._plug.is_indexed()
+
+    def isElement(self):
+        return self._plug.spec.multi and self._plug.is_indexed()
+
+    def logicalIndex(self):
+        return self._plug.index()
+
+    def asString(self):
+        value = commands.scene.get(self._plug)
+        return '' if value is None else str(value)
+
+    def asDouble(self):
+        return float(commands.scene.get(self._plug))
+
+    asFloat = asDouble
+
+    def asInt(self):
+        return int(commands.scene.get(self._plug))
+
+    def asBool(self):
+        return bool(commands.scene.get(self._plug))
+
+
+class MSelectionList:
+    def __init__(self):
+        self._nodes = []
+
+    def add(self, name):
+        node = commands.scene.find(str(name))
+        if node is None:
+            raise RuntimeError(f"(kInvalidParameter): Object does not exist: {name}")
+        self._nodes.append(node)
+        return self
+
+    def length(self):
+        return len(self._nodes)
+
+    def getDependNode(self, index):
+        return MObject(self._nodes[index])
+
+    def getDagPath(self, index):
+        node = self._nodes[index]
+        if not node.type.dag:
+            raise TypeError(f"Item {index} is not a DAG path")
+        return MDagPath(node)
+
+    def clear(self):
+        self._nodes = []
+
+
+class MFnDependencyNode:
+    def __init__(self, mobj=None):
+        self._node = mobj._node if mobj is not None else None
+
+    def setObject(self, mobj):
+        self._node = mobj._node
+        return self
+
+    def object(self):
+        return MObject(self._node)
+
+    def name(self):
+        return self._node.name
+
+    def typeName(self):
+        return self._node.type.name
+
+    def uuid(self):
+        return MUuid(self._node.uuid)
+
+    def hasAttribute(self, name):
+        return self._node.find_spec(name) is not None
+
+    def findPlug(self, name, wantNetworkedPlug=False):
+        try:
+            return MPlug(self._node.plug(name, create=False))
+        except GraphError:
+            raise RuntimeError(f"(kInvalidParameter): No attribute {name} on {self._node.name}") from None
+
+
+# MESSAGES
+def _callback(kind, func, node=None, node_type=None):
+    return commands.scene.events.add(kind, func, node=node, node_type=node_type)
+
+
+class MMessage:
+    @staticmethod
+    def removeCallback(callback_id):
+        commands.scene.events.remove(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            commands.scene.events.remove(callback_id)
+
+
+class MNodeMessage(MMessage):
+    kConnectionMade = graph.kConnectionMade
+    kConnectionBroken = graph.kConnectionBroken
+    kAttributeEval = graph.kAttributeEval
+    kAttributeSet = graph.kAttributeSet
+    kAttributeLocked = graph.kAttributeLocked
+    kAttributeUnlocked = graph.kAttributeUnlocked
+    kAttributeAdded = graph.kAttributeAdded
+    kAttributeRemoved = graph.kAttributeRemoved
+    kAttributeRenamed = graph.kAttributeRenamed
+    kAttributeKeyable = graph.kAttributeKeyable
+    kAttributeUnkeyable = graph.kAttributeUnkeyable
+    kIncomingDirection = graph.kIncomingDirection
+    kAttributeArrayAdded = graph.kAttributeArrayAdded
+    kAttributeArrayRemoved = graph.kAttributeArrayRemoved
+    kOtherPlugSet = graph.kOtherPlugSet
+
+    @staticmethod
+    def addAttributeChangedCallback(mobj, func, clientData=None):
+        def callback(node, msg, plug, other):
+            func(msg, MPlug(plug), MPlug(other), clientData)
+        return _callback('attr_changed', callback, node=mobj._node)
+
+    @staticmethod
+    def addNameChangedCallback(mobj, func, clientData=None):
+        def callback(node, prev):
+            func(MObject(node), prev, clientData)
+        return _callback('name_changed', callback, node=mobj._node)
+
+    @staticmethod
+    def addNodeDirtyPlugCallback(mobj, func, clientData=None):
+        def callback(node):
+            # Dirty messages are per node, they come with the world matrix or the message plug
+            plug = node.plug('worldMatrix[0]' if node.type.dag else 'message', create=False)
+            func(MObject(node), MPlug(plug), clientData)
+        return _callback('node_dirty', callback, node=mobj._node)
+
+    @staticmethod
+    def addNodePreRemovalCallback(mobj, func, clientData=None):
+        def callback(node):
+            func(MObject(node), clientData)
+        return _callback('pre_removal', callback, node=mobj._node)
+
+
+class MDGMessage(MMessage):
+    @staticmethod
+    def addNodeAddedCallback(func, nodeType='dependNode', clientData=None):
+        def callback(node):
+            func(MObject(node), clientData)
+        return _callback('node_added', callback, node_type=nodeType)
+
+    @staticmethod
+    def addNodeRemovedCallback(func, nodeType='dependNode', clientData=None):
+        def callback(node):
+            func(MObject(node), clientData)
+        return _callback('node_removed', callback, node_type=nodeType)
+
+
+class MDagMessage(MMessage):
+    @staticmethod
+    def addParentAddedCallback(func, clientData=None):
+        def callback(node, parent):
+            func(MDagPath(node), MDagPath(parent), clientData)
+        return _callback('parent_added', callback)
+
+    @staticmethod
+    def addParentRemovedCallback(func, clientData=None):
+        def callback(node, parent):
+            func(MDagPath(node), MDagPath(parent), clientData)
+        return _callback('parent_removed', callback)
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = 'before_new'
+    kAfterNew = 'after_new'
+    kBeforeOpen = 'before_open'
+    kAfterOpen = 'after_open'
+
+    @staticmethod
+    def addCallback(message, func, clientData=None):
+        def callback(node):
+            func(clientData)
+        return _callback(message, callback)
@@ -0,0 +1,70 @@
+"""
+Pure-Python stand-in for the parts of Maya and pymel the build pipeline uses.
+
+install() registers the stand-in as maya, maya.cmds, maya.mel, maya.api.OpenMaya, maya.standalone and pymel.core
+so Module, utils and the presets can be imported and built under plain CPython, e.g. for benchmarks or to test
+the rigging math without a Maya licence. It's enabled for the whole package with MF_AUTORIG_BACKEND=standin.
+
+The scene is an in-memory DG: nodes, typed attributes, connections and pull evaluation of the nodes the rig uses
+(transforms, joints, constraints, matrix and utility nodes). Known approximations:
+    - xyz rotate order only, pivots and shear are ignored
+    - node names are unique in the whole scene, there are no namespaces or duplicate short names
+    - ikHandles are recorded with their effector but don't solve the chain
+    - uvPin, skinCluster and the history nodes aren't evaluated
+    - no files, UI or undo
+"""
+import sys
+import types
+
+_MODULES = {}
+
+
+def _package(name, **attrs):
+    module = types.ModuleType(name)
+    module.__path__ = []
+    module.__dict__.update(attrs)
+    return module
+
+
+def install():
+    """
+    Makes `import maya` and `import pymel` resolve to the stand-in, does nothing if it's already installed
+    """
+    if is_installed():
+        return
+    if 'maya' in sys.modules or 'pymel' in sys.modules:
+        raise RuntimeError("Maya is already imported, the stand-in backend can't replace it")
+
+    from mf_autoRig.standin import OpenMaya, cmds, core, datatypes, mel, nodetypes, standalone
+
+    api = _package('maya.api', OpenMaya=OpenMaya)
+    maya = _package('maya', cmds=cmds, mel=mel, api=api, standalone=standalone, OpenMaya=OpenMaya)
+    pymel = _package('pymel', core=core)
+    core.datatypes = datatypes
+    core.nodetypes = nodetypes
+
+    _MODULES.update({
+        'maya': maya,
+        'maya.cmds': cmds,
+        'maya.mel': mel,
+        'maya.api': api,
+        'maya.api.OpenMaya': OpenMaya,
+        'maya.OpenMaya': OpenMaya,
+        'maya.standalone': standalone,
+        'pymel': pymel,
+        'pymel.core': core,
+        'pymel.core.datatypes': datatypes,
+        'pymel.core.nodetypes': nodetypes,
+    })
+    sys.modules.update(_MODULES)
+
+
+def uninstall():
+    for name, module in _MODULES.items():
+        if sys.modules.get(name) is module:
+            del sys.modules[name]
+    _MODULES.clear()
+
+
+def is_installed():
+    return bool(_MODULES) and sys.modules.get('maya') is _MODULES['maya']
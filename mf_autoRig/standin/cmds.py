@@ -0,0 +1,163 @@
+"""
+Stand-in for maya.cmds, works with names like cmds and returns None instead of empty lists where Maya does.
+"""
+from mf_autoRig.standin import commands
+from mf_autoRig.standin import core
+from mf_autoRig.standin.graph import GraphError
+from mf_autoRig.standin.nodetypes import Attribute, Component, PyNode, to_node
+
+VERSION = 'standin'
+
+
+def _names(objects):
+    return [str(obj) for obj in objects]
+
+
+def _plug(name):
+    """
+    Plug of 'node.attr', transforms fall back to the attributes of their shape like Maya
+    """
+    node_name, path = str(name).split('.', 1)
+    node = to_node(node_name)
+    try:
+        return node.plug(path, create=False)
+    except GraphError:
+        for shape in commands.get_shapes(node):
+            try:
+                return shape.plug(path, create=False)
+            except GraphError:
+                pass
+    return node.plug(path)
+
+
+def about(version=False, **kwargs):
+    if version:
+        return VERSION
+    return ''
+
+
+# Plugins whose node types the stand-in registers
+PLUGINS = ('matrixNodes', 'quatNodes')
+
+
+def loadPlugin(*args, **kwargs):
+    for name in args:
+        if name not in PLUGINS:
+            raise RuntimeError(f'Plug-in, "{name}", was not found on MAYA_PLUG_IN_PATH.')
+    return list(args)
+
+
+def file(*args, **kwargs):
+    if kwargs.get('new') or kwargs.get('n'):
+        commands.new_scene()
+        return 'untitled'
+    if kwargs.get('query') or kwargs.get('q'):
+        return ''
+    raise NotImplementedError("The stand-in backend can't read or write scene files")
+
+
+def ls(*args, **kwargs):
+    uuid = kwargs.pop('uuid', False)
+    long = kwargs.pop('long', kwargs.pop('l', False))
+    flatten = kwargs.get('flatten', kwargs.get('fl', False))
+    result = core.ls(*args, **kwargs)
+
+    if uuid:
+        return [to_node(obj).uuid for obj in result]
+    if long:
+        return [obj.longName() if isinstance(obj, PyNode) and not isinstance(obj, Component) else str(obj)
+                for obj in result]
+
+    names = []
+    for obj in result:
+        if isinstance(obj, Component) and flatten:
+            names.extend(str(c) for c in obj)
+        else:
+            names.append(str(obj))
+    return names
+
+
+def objExists(name):
+    return core.objExists(name)
+
+
+def nodeType(name, **kwargs):
+    return core.nodeType(name)
+
+
+def createNode(type_name, **kwargs):
+    return str(core.createNode(type_name, **kwargs))
+
+
+def delete(*args, **kwargs):
+    core.delete(*args, **kwargs)
+
+
+def select(*args, **kwargs):
+    core.select(*args, **kwargs)
+
+
+def rename(obj, name):
+    return str(core.rename(obj, name))
+
+
+def parent(*args, **kwargs):
+    return _names(core.parent(*args, **kwargs))
+
+
+def listRelatives(*args, **kwargs):
+    return _names(core.listRelatives(*args, **kwargs)) or None
+
+
+def getAttr(name, **kwargs):
+    name = str(name)
+    if '.cv[' in name or '.vtx[' in name:
+        component = Component(name)
+        return [tuple(commands.scene.get(plug)) for plug in component.plugs()]
+
+    plug = _plug(name)
+    if plug.spec.type == 'message':
+        raise GraphError(f"getAttr: Message attributes have no data values: {name}")
+    if kwargs.get('type'):
+        return Attribute(plug).type()
+
+    value = commands.scene.get(plug)
+    if plug.spec.children:
+        return [tuple(value)]
+    return value
+
+
+def setAttr(name, *args, **kwargs):
+    core.setAttr(Attribute(_plug(name)), *args, **kwargs)
+
+
+def addAttr(*args, **kwargs):
+    core.addAttr(*args, **kwargs)
+
+
+def connectAttr(source, destination, **kwargs):
+    core.connectAttr(Attribute(_plug(source)), Attribute(_plug(destination)), **kwargs)
+
+
+def disconnectAttr(source, destination, **kwargs):
+    core.disconnectAttr(Attribute(_plug(source)), Attribute(_plug(destination)))
+
+
+def isConnected(source, destination, **kwargs):
+    return Attribute(_plug(source)).isConnectedTo(Attribute(_plug(destination)))
+
+
+def listConnections(*args, **kwargs):
+    objects = [Attribute(_plug(arg)) if '.' in str(arg) else PyNode(arg) for arg in args]
+    result = core.listConnections(*objects, **kwargs)
+    if not result:
+        return None
+
+    names = []
+    for item in result:
+        names.extend(_names(item) if isinstance(item, tuple) else [str(item)])
+    return names
+
+
+def xform(*args, **kwargs):
+    return core.xform(*args, **kwargs)
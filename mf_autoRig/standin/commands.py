@@ -0,0 +1,715 @@
+"""
+Scene operations of the stand-in backend, shared by the pymel and cmds stand-ins.
+
+Everything works on graph.Node objects of the current scene. The transform math follows Maya:
+world = local * offsetParentMatrix * parent world, joints are scale * rotate * jointOrient * translate.
+Approximations: no pivots, xyz rotate order only, ikHandles are recorded but don't solve the chain.
+"""
+import copy
+import math
+
+from mf_autoRig.standin import mmath
+from mf_autoRig.standin import nodes as node_types
+from mf_autoRig.standin.graph import GraphError, Plug, Scene, AttrSpec
+
+scene = Scene()
+
+AXES = 'xyz'
+
+# Mirror plane: index of the axis that gets negated
+MIRROR_AXIS = {'YZ': 0, 'XZ': 1, 'XY': 2}
+
+
+def get_scene():
+    return scene
+
+
+def new_scene():
+    scene.clear()
+
+
+# NODES
+def create_node(type_name, name=None, parent=None):
+    node = scene.create(type_name, name, parent)
+    if node.type.shape and parent is None:
+        # Shapes always live under a transform
+        xform = scene.create('transform', 'transform1')
+        scene.reparent(node, xform)
+    return node
+
+
+def create_shape(type_name, name=None, parent=None):
+    """
+    Creates a transform and a shape under it, the shape is named after the transform
+    Returns (transform, shape)
+    """
+    xform = scene.create('transform', name or f'{type_name}1')
+    shape = scene.create(type_name, f'{xform.name}Shape', parent=xform)
+    return xform, shape
+
+
+def get_shapes(node):
+    return [child for child in node.children if child.type.shape]
+
+
+def plug(node, path):
+    return node.plug(path)
+
+
+def set_channel(node, name, values):
+    """
+    Sets a double3 channel like translate, skipping locks and connected children, like internal Maya edits
+    """
+    scene.set(node.plug(name), [float(v) for v in values], force=True)
+
+
+# MATRICES
+def world_matrix(node):
+    return node_types.world_matrix(node)
+
+
+def parent_matrix(node):
+    return node_types.parent_matrix(node)
+
+
+def local_matrix(node):
+    return node_types.local_matrix(node)
+
+
+def set_local_matrix(node, local, translate=True, rotate=True, scale=True, orient=False):
+    """
+    Splits a local matrix into the channels of the node
+    orient puts the rotation of a joint into the jointOrient and keeps the rotate values
+    """
+    t, r, s = mmath.decompose(local)
+    if translate:
+        set_channel(node, 'translate', t)
+    if scale:
+        set_channel(node, 'scale', s)
+    if rotate:
+        if node.is_a('joint'):
+            rotation = mmath.rotate_matrix(r)
+            if orient:
+                rot = mmath.rotate_matrix(node_types.value(node, 'rotate'))
+                set_channel(node, 'jointOrient', mmath.rotation_to_euler(mmath.mult(mmath.inverse(rot), rotation)))
+            else:
+                jo = mmath.rotate_matrix(node_types.value(node, 'jointOrient'))
+                set_channel(node, 'rotate', mmath.rotation_to_euler(mmath.mult(rotation, mmath.inverse(jo))))
+        else:
+            set_channel(node, 'rotate', r)
+
+
+def set_world_matrix(node, world, translate=True, rotate=True, scale=True, orient=False):
+    local = mmath.mult(world, mmath.inverse(parent_matrix(node)))
+    set_local_matrix(node, local, translate, rotate, scale, orient)
+
+
+def world_translation(node):
+    return mmath.translation(world_matrix(node))
+
+
+def set_world_translation(node, position):
+    parent = parent_matrix(node)
+    set_channel(node, 'translate', mmath.transform_point(position, mmath.inverse(parent)))
+
+
+def world_rotation(node):
+    return mmath.decompose(world_matrix(node))[1]
+
+
+def _keep_children(node):
+    """
+    Records the world matrix of the DAG children, returns a function that puts them back
+    """
+    saved = [(child, world_matrix(child)) for child in node.children if not child.type.shape]
+
+    def restore():
+        for child, world in saved:
+            set_world_matrix(child, world, orient=child.is_a('joint'))
+
+    return restore
+
+
+# DAG
+def parent(nodes, new_parent=None, relative=False):
+    """
+    Reparents nodes, keeping their world transform unless relative
+    Nodes that already are children of new_parent are skipped
+    """
+    result = []
+    for node in nodes:
+        if node.parent is new_parent:
+            result.append(node)
+            continue
+
+        if relative or node.type.shape or not node.is_a('transform'):
+            scene.reparent(node, new_parent)
+        else:
+            world = world_matrix(node)
+            scene.reparent(node, new_parent)
+            set_world_matrix(node, world, orient=node.is_a('joint'))
+
+        result.append(node)
+    return result
+
+
+def group(nodes, name=None, world=False, new_parent=None):
+    if new_parent is None and not world and nodes:
+        new_parent = nodes[0].parent
+
+    grp = scene.create('transform', name or 'group1', parent=new_parent)
+    parent(nodes, grp)
+    return grp
+
+
+def delete(nodes):
+    scene.delete(nodes)
+
+
+def _copy_spec(spec):
+    new = AttrSpec(spec.name, spec.short, spec.type, copy.deepcopy(spec.default), multi=spec.multi,
+                   children=[_copy_spec(c) for c in spec.children], compute=spec.compute, keyable=spec.keyable,
+                   dynamic=spec.dynamic, implicit=spec.implicit, min=spec.min, max=spec.max, enum=spec.enum)
+    return new
+
+
+def copy_node(node, name):
+    """
+    Copies the type, attributes and values of a node, without connections and DAG parent
+    Connected inputs keep their current value
+    """
+    new = scene.create(node.type.name, name)
+    for spec in node.dynamic_order:
+        new._add_spec(_copy_spec(spec))
+
+    new.values = copy.deepcopy(node.values)
+    new.elements = copy.deepcopy(node.elements)
+    new.locked = set(node.locked)
+    new.keyable = dict(node.keyable)
+    new.data = copy.deepcopy(node.data)
+
+    for key, src in node.inputs.items():
+        spec = node.find_spec(key[0])
+        if spec.type == 'message' or spec.children:
+            continue
+        try:
+            new.values[key] = scene.get(Plug(node, spec, key[1]))
+        except GraphError:
+            pass
+
+    return new
+
+
+def duplicate(nodes, parent_only=False, rename_children=False):
+    """
+    Duplicates nodes with their DAG children, connections between duplicated nodes are copied.
+    Returns the duplicates of the given nodes, a single node duplicated with rename_children also returns its descendants.
+    """
+    roots = [node for node in nodes if not any(a in nodes for a in node.ancestors())]
+
+    mapping = {}
+    order = []
+
+    def copy_tree(node, new_parent, copy_children):
+        new = copy_node(node, node.name)
+        if new_parent is not None:
+            scene.reparent(new, new_parent)
+        mapping[node] = new
+        order.append(node)
+        if copy_children:
+            for child in node.children:
+                copy_tree(child, new, True)
+        return new
+
+    for root in roots:
+        if parent_only:
+            for node in [n for n in nodes if n is root or root in n.ancestors()]:
+                if node in mapping:
+                    continue
+                new_parent = mapping.get(node.parent, node.parent)
+                copy_tree(node, new_parent, False)
+        else:
+            copy_tree(root, root.parent, True)
+
+    # Connections inside the duplicated nodes
+    for node, new in mapping.items():
+        for key, src in node.inputs.items():
+            if src.node in mapping:
+                src_new = mapping[src.node]
+                scene.connect(Plug(src_new, src_new.find_spec(src.spec.name), src.indices),
+                              Plug(new, new.find_spec(key[0]), key[1]), force=True)
+
+    if len(nodes) == 1 and rename_children and not parent_only:
+        return [mapping[node] for node in order if not node.type.shape]
+    return [mapping[node] for node in nodes]
+
+
+# TRANSFORMS
+def match_transform(node, target, position=True, rotation=True, scale=True):
+    target_t, target_r, target_s = mmath.decompose(world_matrix(target))
+    t, r, s = mmath.decompose(world_matrix(node))
+    world = mmath.compose(target_t if position else t, target_r if rotation else r, target_s if scale else s)
+    set_world_matrix(node, world, translate=position, rotate=rotation, scale=scale)
+
+
+def move(node, vector, relative=False, object_space=False):
+    vector = [float(v) for v in vector]
+    if not relative:
+        set_world_translation(node, vector)
+        return
+
+    if object_space:
+        vector = mmath.transform_vector(vector, mmath.rotation_only(world_matrix(node)))
+    position = [a + b for a, b in zip(world_translation(node), vector)]
+    set_world_translation(node, position)
+
+
+def rotate(node, rotation, relative=False, object_space=False):
+    if not relative:
+        if object_space:
+            set_channel(node, 'rotate', rotation)
+        else:
+            t, _, s = mmath.decompose(world_matrix(node))
+            set_world_matrix(node, mmath.compose(t, rotation, s), translate=False, scale=False)
+        return
+
+    delta = mmath.rotate_matrix(rotation)
+    if object_space:
+        current = mmath.rotate_matrix(node_types.value(node, 'rotate'))
+        set_channel(node, 'rotate', mmath.rotation_to_euler(mmath.mult(delta, current)))
+    else:
+        world = world_matrix(node)
+        t, r, s = mmath.decompose(world)
+        rotated = mmath.mult(mmath.rotate_matrix(r), delta)
+        set_world_matrix(node, mmath.compose(t, mmath.rotation_to_euler(rotated), s), translate=False, scale=False)
+
+
+def make_identity(node, translate=False, rotate=False, scale=False):
+    """
+    Freezes transforms. Joints move the rotation into the jointOrient,
+    transforms push the frozen part into their children and curve shapes
+    """
+    if not (translate or rotate or scale):
+        translate = rotate = scale = True
+
+    if node.is_a('joint'):
+        if rotate:
+            rotation = mmath.mult(mmath.rotate_matrix(node_types.value(node, 'rotate')),
+                                  mmath.rotate_matrix(node_types.value(node, 'jointOrient')))
+            set_channel(node, 'jointOrient', mmath.rotation_to_euler(rotation))
+            set_channel(node, 'rotate', [0, 0, 0])
+        if scale:
+            set_channel(node, 'scale', [1, 1, 1])
+        return
+
+    restore = _keep_children(node)
+    old = local_matrix(node)
+    if translate:
+        set_channel(node, 'translate', [0, 0, 0])
+    if rotate:
+        set_channel(node, 'rotate', [0, 0, 0])
+    if scale:
+        set_channel(node, 'scale', [1, 1, 1])
+    delta = mmath.mult(old, mmath.inverse(local_matrix(node)))
+
+    for shape in get_shapes(node):
+        if shape.is_a('nurbsCurve'):
+            for i, point in enumerate(curve_points(shape)):
+                cv = shape.plug(f'controlPoints[{i}]')
+                if not scene.is_driven(cv):
+                    scene.set(cv, mmath.transform_point(point, delta), force=True)
+    restore()
+
+
+def set_joint_orient(node, world_rotation):
+    """
+    Orients a joint to a world rotation with zero rotate values, the children keep their world transform
+    """
+    restore = _keep_children(node)
+    parent_rotation = mmath.rotation_only(parent_matrix(node))
+    local = mmath.mult(world_rotation, mmath.inverse(parent_rotation))
+    set_channel(node, 'rotate', [0, 0, 0])
+    set_channel(node, 'jointOrient', mmath.rotation_to_euler(local))
+    restore()
+
+
+def orient_joint(node, orient='xyz', secondary='yup', children=False):
+    """
+    joint -edit -orientJoint, 'none' aligns the joint with the world
+    Other orders aim the first axis at the first child joint and the second axis towards secondary
+    """
+    if orient == 'none':
+        set_joint_orient(node, mmath.identity())
+    else:
+        child_joints = [child for child in node.children if child.is_a('joint')]
+        if child_joints:
+            aim = [b - a for a, b in zip(world_translation(node), world_translation(child_joints[0]))]
+            up = _axis_vector(secondary)
+            primary, second, third = mmath.frame(aim, up)
+            if orient not in ('xyz', 'yzx', 'zxy'):
+                third = [-v for v in third]
+            rotation = mmath.identity()
+            for letter, axis in zip(orient, (primary, second, third)):
+                i = AXES.index(letter)
+                rotation[i * 4:i * 4 + 3] = axis
+            set_joint_orient(node, rotation)
+        else:
+            # End joints get the orientation of their parent
+            set_channel(node, 'rotate', [0, 0, 0])
+            set_channel(node, 'jointOrient', [0, 0, 0])
+
+    if children:
+        for child in node.children:
+            if child.is_a('joint'):
+                orient_joint(child, orient, secondary, children)
+
+
+def _axis_vector(name):
+    name = name or 'yup'
+    axis = [0.0, 0.0, 0.0]
+    axis[AXES.index(name[0])] = -1.0 if name.endswith('down') else 1.0
+    return axis
+
+
+def create_joint(name=None, position=None, radius=None, relative=False):
+    """
+    Creates a joint under the selected joint and selects it, like the joint command
+    """
+    selected = scene.selection[0] if scene.selection else None
+    new_parent = selected if selected is not None and selected.is_a('joint') else None
+
+    jnt = scene.create('joint', name or 'joint1', parent=new_parent)
+    if position is not None:
+        if relative:
+            set_channel(jnt, 'translate', position)
+        else:
+            set_world_translation(jnt, position)
+    if radius is not None:
+        scene.set(jnt.plug('radius'), radius)
+
+    scene.selection = [jnt]
+    return jnt
+
+
+# CONSTRAINTS
+CONSTRAINT_OUTPUTS = {
+    'parentConstraint': ('translate', 'rotate'),
+    'pointConstraint': ('translate',),
+    'orientConstraint': ('rotate',),
+    'aimConstraint': ('rotate',),
+    'poleVectorConstraint': (),
+}
+
+
+def _find_constraint(driven, kind):
+    for child in driven.children:
+        if child.type.name == kind:
+            return child
+    return None
+
+
+def constrain(kind, targets, driven, maintain_offset=False, weight=1.0, skip_translate=(), skip_rotate=(), name=None,
+              **settings):
+    """
+    Creates a constraint node under the driven object, or adds targets to the existing one
+    settings are set on the constraint before it's evaluated, eg. aimVector or worldUpType
+    """
+    node = _find_constraint(driven, kind)
+    new = node is None
+    driven_world = world_matrix(driven)
+    driven_translate = node_types.value(driven, 'translate')
+
+    if new:
+        node = scene.create(kind, name or f'{driven.name}_{kind}1', parent=driven)
+        node.plug('restTranslate').set(driven_translate)
+        node.plug('restRotate').set(node_types.value(driven, 'rotate'))
+
+        if kind == 'poleVectorConstraint':
+            scene.connect(driven.plug('parentInverseMatrix[0]'), node.plug('constraintParentInverseMatrix'))
+            start = scene.get(driven.plug('startJoint'))
+            if start is not None:
+                scene.connect(start.plug('worldMatrix[0]'), node.plug('pivotSpace'))
+        else:
+            scene.connect(driven.plug('parentInverseMatrix[0]'), node.plug('constraintParentInverseMatrix'))
+            scene.connect(driven.plug('offsetParentMatrix'), node.plug('constraintOffsetParentMatrix'))
+            if driven.is_a('joint'):
+                scene.connect(driven.plug('jointOrient'), node.plug('constraintJointOrient'))
+            if kind == 'aimConstraint':
+                scene.connect(driven.plug('translate'), node.plug('constraintTranslate'))
+
+    for key, value in settings.items():
+        if value is None:
+            continue
+        if key == 'worldUpObject':
+            scene.connect(value.plug('worldMatrix[0]'), node.plug('worldUpMatrix'), force=True)
+        elif key == 'worldUpType':
+            node.plug('worldUpType').set(node_types.WORLD_UP_TYPES.index(value))
+        else:
+            node.plug(key).set(list(value) if isinstance(value, (list, tuple)) else value)
+
+    first = len(node.element_indices(node.plug('target')))
+    for i, target in enumerate(targets, first):
+        scene.connect(target.plug('worldMatrix[0]'), node.plug(f'target[{i}].targetWorldMatrix'))
+        alias = AttrSpec(f'{target.name}W{i}', type='double', default=1.0, keyable=True)
+        node.add_attr(alias)
+        node.data.setdefault('weights', []).append(alias.name)
+        node.data.setdefault('targets', []).append(target)
+        node.plug(alias.name).set(weight)
+        scene.connect(node.plug(alias.name), node.plug(f'target[{i}].targetWeight'))
+
+        if maintain_offset and kind in ('parentConstraint', 'orientConstraint'):
+            target_world = world_matrix(target)
+            offset = mmath.mult(driven_world, mmath.inverse(target_world))
+            if kind == 'orientConstraint':
+                offset = mmath.mult(mmath.rotation_only(driven_world), mmath.inverse(mmath.rotation_only(target_world)))
+            node.plug(f'target[{i}].targetOffsetMatrix').set(offset)
+
+    if maintain_offset and new:
+        if kind == 'pointConstraint':
+            current = scene.get(node.plug('constraintTranslate'))
+            node.plug('offset').set([a - b for a, b in zip(driven_translate, current)])
+        elif kind == 'aimConstraint':
+            node.plug('offset').set([0, 0, 0])
+            rotation = mmath.rotate_matrix(scene.get(node.plug('constraintRotate')))
+            if driven.is_a('joint'):
+                rotation = mmath.mult(rotation, mmath.rotate_matrix(node_types.value(driven, 'jointOrient')))
+            world_rotation = mmath.mult(rotation, mmath.rotation_only(parent_matrix(driven)))
+            offset = mmath.mult(mmath.rotation_only(driven_world), mmath.inverse(world_rotation))
+            node.plug('offset').set(mmath.rotation_to_euler(offset))
+
+    if new:
+        if kind == 'poleVectorConstraint':
+            scene.connect(node.plug('constraintTranslate'), driven.plug('poleVector'), force=True)
+        for channel in CONSTRAINT_OUTPUTS[kind]:
+            skip = skip_translate if channel == 'translate' else skip_rotate
+            src = 'constraintTranslate' if channel == 'translate' else 'constraintRotate'
+            for axis in 'XYZ':
+                if axis.lower() in skip:
+                    continue
+                scene.connect(node.plug(src + axis), driven.plug(channel + axis), force=True)
+
+    return node
+
+
+def constraint_targets(node):
+    return [target for target in node.data.get('targets', []) if target.alive]
+
+
+def constraint_weights(node):
+    return [node.plug(name) for name in node.data.get('weights', []) if node.find_spec(name) is not None]
+
+
+# IK
+def ik_handle(start, end, name=None, solver='ikRPsolver'):
+    """
+    Creates an ikHandle and its effector. The handle records the chain, the joints are not solved
+    """
+    if start not in end.ancestors():
+        raise GraphError(f"{start.name} is not above {end.name} in the hierarchy")
+
+    handle = scene.create('ikHandle', name or 'ikHandle1')
+    effector = scene.create('ikEffector', 'effector1', parent=end.parent)
+    scene.connect(end.plug('translate'), effector.plug('translate'))
+
+    set_world_translation(handle, world_translation(end))
+
+    solver_node = scene.find(solver)
+    if solver_node is None or solver_node.type.name != solver:
+        solver_node = scene.create(solver, solver)
+
+    scene.connect(start.plug('message'), handle.plug('startJoint'))
+    scene.connect(effector.plug('message'), handle.plug('endEffector'))
+    scene.connect(handle.plug('message'), effector.plug('handlePath[0]'))
+    scene.connect(solver_node.plug('message'), handle.plug('ikSolver'))
+    handle.data['solver'] = solver
+
+    # Default pole vector of the rotate plane solver, from the start joint to the middle of the chain
+    if end.parent is not start:
+        a = world_translation(start)
+        b = world_translation(end.parent)
+        c = world_translation(end)
+        ac = mmath.normalize([y - x for x, y in zip(a, c)])
+        ab = [y - x for x, y in zip(a, b)]
+        projection = mmath.dot(ab, ac)
+        pole = mmath.normalize([v - w * projection for v, w in zip(ab, ac)])
+        if any(pole):
+            handle.plug('poleVector').set(pole)
+
+    return handle, effector
+
+
+def mirror_joint(root, plane='YZ', behavior=True, search_replace=None):
+    """
+    Mirrors a joint hierarchy across a plane through the origin
+    behavior negates the mirrored axes so rotations mirror, otherwise the orientation is copied
+    Returns the names of the new joints, parents first
+    """
+    axis = MIRROR_AXIS[plane.upper()]
+
+    def reflect(v):
+        v = list(v)
+        v[axis] = -v[axis]
+        return v
+
+    joints = [root] + [node for node in root.descendants() if node.is_a('joint')]
+    mapping = {}
+    names = []
+    for jnt in joints:
+        world = world_matrix(jnt)
+        name = jnt.name
+        if search_replace:
+            name = name.replace(search_replace[0], search_replace[1])
+
+        new = copy_node(jnt, name)
+        scene.reparent(new, mapping.get(jnt.parent, root.parent))
+        mapping[jnt] = new
+
+        mirrored = list(world)
+        for i in range(3):
+            row = world[i * 4:i * 4 + 3]
+            mirrored[i * 4:i * 4 + 3] = [-v for v in reflect(row)] if behavior else row
+        mirrored[12:15] = reflect(world[12:15])
+
+        set_world_matrix(new, mirrored, orient=True)
+        names.append(new.name)
+
+    return names
+
+
+# CURVES
+def curve_points(shape):
+    return [scene.get(shape.plug(f'controlPoints[{i}]'))
+            for i in shape.element_indices(shape.plug('controlPoints'))]
+
+
+def set_curve(shape, points, degree=1, periodic=False, knots=None):
+    cp = shape.plug('controlPoints')
+    for index in shape.element_indices(cp):
+        if index >= len(points):
+            for name in ('controlPoints', 'xValue', 'yValue', 'zValue'):
+                shape.values.pop((name, (index,)), None)
+            shape.elements.get(('controlPoints', ()), set()).discard(index)
+
+    for i, point in enumerate(points):
+        element = shape.plug(f'controlPoints[{i}]')
+        if not scene.is_driven(element):
+            scene.set(element, [float(v) for v in point], force=True)
+
+    shape.plug('degree').set(degree)
+    shape.plug('form').set(2 if periodic else 0)
+    shape.plug('spans').set(max(len(points) - degree, 1))
+    shape.data['knots'] = list(knots) if knots is not None else None
+
+
+def create_curve(points, degree=1, name=None, periodic=False, knots=None):
+    xform, shape = create_shape('nurbsCurve', name or 'curve1')
+    set_curve(shape, points, degree, periodic, knots)
+    return xform
+
+
+def circle(normal=(0, 0, 1), center=(0, 0, 0), radius=1.0, sweep=360.0, degree=3, sections=8, name=None):
+    normal = mmath.normalize(normal)
+    reference = [1.0, 0.0, 0.0] if abs(normal[0]) < 0.9 else [0.0, 1.0, 0.0]
+    u = mmath.normalize(mmath.cross(normal, reference))
+    v = mmath.cross(normal, u)
+
+    closed = abs(sweep) >= 360.0
+    count = sections if closed else sections + 1
+    step = math.radians(sweep) / sections
+    points = []
+    for i in range(count):
+        angle = step * i
+        points.append([c + radius * (math.cos(angle) * a + math.sin(angle) * b) for c, a, b in zip(center, u, v)])
+
+    return create_curve(points, degree, name or 'nurbsCircle1', periodic=closed)
+
+
+def cluster(shape, indices, name=None):
+    """
+    Creates a cluster deforming the given control points, the handle sits at their center
+    Returns (cluster, handle)
+    """
+    deformer = scene.create('cluster', name or 'cluster1')
+    handle, handle_shape = create_shape('clusterHandle', f'{deformer.name}Handle')
+
+    geometry = world_matrix(shape)
+    points = {i: scene.get(shape.plug(f'controlPoints[{i}]')) for i in indices}
+    world_points = [mmath.transform_point(p, geometry) for p in points.values()]
+    center = [sum(c) / len(world_points) for c in zip(*world_points)]
+    set_world_translation(handle, center)
+
+    deformer.data['points'] = points
+    deformer.plug('bindPreMatrix').set(mmath.inverse(world_matrix(handle)))
+    scene.connect(handle.plug('worldMatrix[0]'), deformer.plug('matrix'))
+    scene.connect(shape.plug('worldMatrix[0]'), deformer.plug('geomMatrix'))
+    for i in indices:
+        scene.connect(deformer.plug(f'outputPoint[{i}]'), shape.plug(f'controlPoints[{i}]'), force=True)
+
+    return deformer, handle
+
+
+# SURFACES
+def nurbs_plane(name=None, width=1.0, length_ratio=1.0, axis=(0, 1, 0)):
+    xform, shape = create_shape('nurbsSurface', name or 'nurbsPlane1')
+    history = scene.create('makeNurbPlane', 'makeNurbPlane1')
+    history.plug('width').set(width)
+    history.plug('lengthRatio').set(length_ratio)
+    shape.data['axis'] = list(axis)
+    return xform, history
+
+
+def poly_plane(name=None, width=1.0, height=1.0, subdivisions_width=1, subdivisions_height=1):
+    xform, shape = create_shape('mesh', name or 'pPlane1')
+    history = scene.create('polyPlane', 'polyPlane1')
+    index = 0
+    for row in range(subdivisions_height + 1):
+        for column in range(subdivisions_width + 1):
+            x = -width / 2.0 + width * column / subdivisions_width
+            z = height / 2.0 - height * row / subdivisions_height
+            shape.plug(f'pnts[{index}]').set([x, 0.0, z])
+            index += 1
+    return xform, history
+
+
+def skin_cluster(influences, geometry, name=None):
+    """
+    Records a skinCluster, the shape gets an intermediate Orig shape like in Maya
+    """
+    shape = get_shapes(geometry)[0]
+    orig = copy_node(shape, f'{shape.name}Orig')
+    scene.reparent(orig, geometry)
+    orig.plug('intermediateObject').set(True)
+
+    skin = scene.create('skinCluster', name or 'skinCluster1')
+    for i, influence in enumerate(influences):
+        scene.connect(influence.plug('worldMatrix[0]'), skin.plug(f'matrix[{i}]'))
+        skin.plug(f'bindPreMatrix[{i}]').set(mmath.inverse(world_matrix(influence)))
+    skin.data['weights'] = {}
+    return skin
+
+
+# ANIMATION
+ANIM_CURVE_TYPES = {'doubleAngle': 'animCurveUA', 'doubleLinear': 'animCurveUL'}
+
+
+def set_driven_key(driven, driver, driver_value=None, value=None):
+    """
+    Adds a key to the animCurve between driver and driven, creating it the first time
+    """
+    if driver_value is None:
+        driver_value = scene.get(driver)
+    if value is None:
+        value = scene.get(driven)
+
+    src = scene.source(driven)
+    if src is not None and src.node.is_a('animCurve'):
+        curve = src.node
+    else:
+        curve_type = ANIM_CURVE_TYPES.get(driven.spec.type, 'animCurveUU')
+        curve = scene.create(curve_type, f'{driven.node.name}_{driven.spec.name}')
+        scene.connect(driver, curve.plug('input'))
+        scene.connect(curve.plug('output'), driven, force=True)
+
+    curve.data.setdefault('keys', {})[float(driver_value)] = float(value)
+    scene.changed(curve)
+    return curve
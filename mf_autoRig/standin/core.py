@@ -0,0 +1,841 @@
+"""
+Stand-in for pymel.core, the commands the tool uses with their long and short flags.
+
+Commands return PyNodes like pymel and raise RuntimeError (GraphError) where Maya raises.
+"""
+import fnmatch
+
+from mf_autoRig import log
+from mf_autoRig.standin import commands
+from mf_autoRig.standin import datatypes
+from mf_autoRig.standin import mmath
+from mf_autoRig.standin import nodetypes
+from mf_autoRig.standin.graph import AttrSpec, GraphError, get_type
+from mf_autoRig.standin.nodetypes import (Attribute, Component, DagNode, DependNode, MayaAttributeError,
+                                          MayaNodeError, MayaObjectError, PyNode, Transform, to_node, to_plug,
+                                          wrap)
+
+dt = datatypes
+nt = nodetypes
+
+
+def _flag(kwargs, *names, default=None):
+    """
+    Pops a flag given by any of its names
+    """
+    value = default
+    for name in names:
+        if name in kwargs:
+            value = kwargs.pop(name)
+    return value
+
+
+def _objects(args):
+    """
+    Flattens the positional arguments of a command into graph nodes, uses the selection if empty
+    """
+    nodes = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)) and not _is_vector(arg):
+            nodes.extend(_objects(arg))
+        elif arg is not None:
+            nodes.append(to_node(arg))
+    return nodes
+
+
+def _is_vector(value):
+    return isinstance(value, (list, tuple, datatypes.Vector)) and len(value) == 3 and \
+        all(isinstance(v, (int, float)) for v in value)
+
+
+def _selected_or(args):
+    nodes = _objects(args)
+    return nodes if nodes else list(commands.scene.selection)
+
+
+def _select(nodes):
+    commands.scene.selection = [node for node in nodes if node is not None]
+
+
+# SCENE
+def newFile(force=False, **kwargs):
+    commands.new_scene()
+
+
+def objExists(name):
+    try:
+        PyNode(name)
+        return True
+    except (MayaNodeError, MayaAttributeError):
+        return False
+
+
+def ls(*args, **kwargs):
+    type_name = _flag(kwargs, 'type', 'typ')
+    flatten = _flag(kwargs, 'flatten', 'fl', default=False)
+    selection = _flag(kwargs, 'selection', 'sl', default=False)
+    dag = _flag(kwargs, 'dag', default=False)
+
+    if selection:
+        nodes = list(commands.scene.selection)
+    elif not args:
+        nodes = commands.scene.ls()
+    else:
+        nodes = []
+        for arg in args:
+            for pattern in (arg if isinstance(arg, (list, tuple)) else [arg]):
+                if isinstance(pattern, Component):
+                    nodes.extend(pattern if flatten else [pattern])
+                    continue
+                if isinstance(pattern, PyNode):
+                    nodes.append(to_node(pattern) if not isinstance(pattern, Attribute) else pattern)
+                    continue
+
+                pattern = str(pattern)
+                if '.' in pattern:
+                    obj = PyNode(pattern)
+                    nodes.extend(obj if flatten and isinstance(obj, Component) else [obj])
+                elif any(c in pattern for c in '*?['):
+                    nodes.extend(node for node in commands.scene.ls() if fnmatch.fnmatchcase(node.name, pattern))
+                else:
+                    node = commands.scene.find(pattern)
+                    if node is not None:
+                        nodes.append(node)
+
+    if dag:
+        # Every node with its DAG descendants, depth first
+        expanded = []
+        for node in nodes:
+            node = to_node(node) if isinstance(node, PyNode) else node
+            for n in [node] + (list(node.descendants()) if node.type.dag else []):
+                if n not in expanded:
+                    expanded.append(n)
+        nodes = expanded
+
+    result = []
+    for node in nodes:
+        if not isinstance(node, PyNode):
+            if type_name is not None and not node.is_a(type_name):
+                continue
+            node = wrap(node)
+        result.append(node)
+    return result
+
+
+def select(*args, **kwargs):
+    clear = _flag(kwargs, 'clear', 'cl', default=False)
+    add = _flag(kwargs, 'add', default=False)
+    deselect = _flag(kwargs, 'deselect', 'd', default=False)
+    if clear:
+        commands.scene.selection = []
+        return
+
+    nodes = _objects(args)
+    if add:
+        commands.scene.selection += [n for n in nodes if n not in commands.scene.selection]
+    elif deselect:
+        commands.scene.selection = [n for n in commands.scene.selection if n not in nodes]
+    else:
+        _select(nodes)
+
+
+def selected(**kwargs):
+    return [wrap(node) for node in commands.scene.selection]
+
+
+def delete(*args, **kwargs):
+    nodes = _selected_or(args)
+    if not nodes:
+        raise GraphError("delete: Not enough objects or values.")
+    commands.delete(nodes)
+
+
+def rename(obj, name, **kwargs):
+    node = to_node(obj)
+    commands.scene.rename(node, name)
+    return wrap(node)
+
+
+def nodeType(obj, **kwargs):
+    return to_node(obj).type.name
+
+
+def createNode(type_name, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    parent_node = _flag(kwargs, 'parent', 'p')
+    skip_select = _flag(kwargs, 'skipSelect', 'ss', default=False)
+
+    node = commands.create_node(type_name, name, to_node(parent_node) if parent_node is not None else None)
+    if not skip_select:
+        _select([node])
+    return wrap(node)
+
+
+def undoInfo(*args, **kwargs):
+    return None
+
+
+def refresh(*args, **kwargs):
+    return None
+
+
+def warning(*args):
+    log.warning(' '.join(str(a) for a in args))
+
+
+def displayInfo(*args):
+    log.info(' '.join(str(a) for a in args))
+
+
+def error(*args):
+    raise GraphError(' '.join(str(a) for a in args))
+
+
+# DAG
+def listRelatives(*args, **kwargs):
+    children = _flag(kwargs, 'children', 'c', default=False)
+    all_descendents = _flag(kwargs, 'allDescendents', 'ad', default=False)
+    shapes = _flag(kwargs, 'shapes', 's', default=False)
+    parent_flag = _flag(kwargs, 'parent', 'p', default=False)
+    all_parents = _flag(kwargs, 'allParents', 'ap', default=False)
+    type_name = _flag(kwargs, 'type', 'typ')
+
+    result = []
+    for node in _objects(args):
+        if parent_flag or all_parents:
+            found = [node.parent] if node.parent is not None else []
+        elif all_descendents:
+            # Maya lists the deepest nodes first
+            found = list(reversed(list(node.descendants())))
+        else:
+            found = list(node.children)
+
+        if shapes:
+            found = [n for n in found if n.type.shape]
+        if type_name is not None:
+            types = type_name if isinstance(type_name, (list, tuple)) else [type_name]
+            found = [n for n in found if any(n.is_a(t) for t in types)]
+        result.extend(n for n in found if n not in result)
+
+    return [wrap(node) for node in result]
+
+
+def parent(*args, **kwargs):
+    world = _flag(kwargs, 'world', 'w', default=False)
+    relative = _flag(kwargs, 'relative', 'r', default=False)
+    shape = _flag(kwargs, 'shape', 's', default=False)
+
+    # pymel parents to the world when the parent is None
+    if args and args[-1] is None:
+        args = args[:-1]
+        world = True
+
+    nodes = _objects(args)
+    if world:
+        new_parent = None
+    else:
+        if len(nodes) < 2:
+            raise GraphError("parent: Not enough objects or values.")
+        new_parent = nodes.pop()
+
+    return [wrap(node) for node in commands.parent(nodes, new_parent, relative=relative or shape)]
+
+
+def group(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    empty = _flag(kwargs, 'empty', 'em', default=False)
+    world = _flag(kwargs, 'world', 'w', default=False)
+    parent_node = _flag(kwargs, 'parent', 'p')
+
+    nodes = [] if empty else _selected_or(args)
+    grp = commands.group(nodes, name, world=world,
+                         new_parent=to_node(parent_node) if parent_node is not None else None)
+    _select([grp])
+    return wrap(grp)
+
+
+def duplicate(*args, **kwargs):
+    parent_only = _flag(kwargs, 'parentOnly', 'po', default=False)
+    rename_children = _flag(kwargs, 'renameChildren', 'rc', default=False)
+    name = _flag(kwargs, 'name', 'n')
+
+    nodes = _selected_or(args)
+    copies = commands.duplicate(nodes, parent_only=parent_only, rename_children=rename_children)
+    if name is not None:
+        commands.scene.rename(copies[0], name)
+    _select(copies[:len(nodes)])
+    return [wrap(node) for node in copies]
+
+
+def hide(*args, **kwargs):
+    for node in _selected_or(args):
+        commands.scene.set(node.plug('visibility'), False)
+
+
+def showHidden(*args, **kwargs):
+    for node in _selected_or(args):
+        commands.scene.set(node.plug('visibility'), True)
+
+
+# ATTRIBUTES
+_ATTRIBUTE_TYPES = {
+    'double3': ('double', 3), 'float3': ('float', 3), 'long3': ('long', 3),
+    'double2': ('double', 2), 'float2': ('float', 2),
+}
+
+_ATTRIBUTE_FLAGS = {
+    'longName': ('ln', 'longName'),
+    'shortName': ('sn', 'shortName'),
+    'attributeType': ('at', 'attributeType'),
+    'dataType': ('dt', 'dataType'),
+    'type': ('type',),
+    'parent': ('p', 'parent'),
+    'multi': ('m', 'multi'),
+    'keyable': ('k', 'keyable'),
+    'defaultValue': ('dv', 'defaultValue'),
+    'minValue': ('min', 'minValue'),
+    'maxValue': ('max', 'maxValue'),
+    'enumName': ('en', 'enumName'),
+    'niceName': ('nn', 'niceName'),
+    'readable': ('r', 'readable'),
+    'writable': ('w', 'writable'),
+    'numberOfChildren': ('nc', 'numberOfChildren'),
+    'hidden': ('h', 'hidden'),
+}
+
+
+def _read_flags(kwargs, table):
+    flags = {}
+    for name, aliases in table.items():
+        for alias in aliases:
+            if alias in kwargs:
+                flags[name] = kwargs.pop(alias)
+    return flags
+
+
+def add_attr(node, flags):
+    """
+    addAttr on a graph node, flags use the long names of _ATTRIBUTE_FLAGS
+    """
+    name = flags.get('longName') or flags.get('shortName')
+    typ = flags.get('attributeType') or flags.get('dataType') or flags.get('type') or 'double'
+    if typ in ('float', 'doubleLinear', 'doubleAngle', 'time'):
+        typ = 'double' if typ == 'doubleLinear' else typ
+    enum = flags.get('enumName')
+
+    if typ in _ATTRIBUTE_TYPES:
+        # Children are added after the parent with -parent, like Maya
+        spec = AttrSpec(name, flags.get('shortName'), 'compound', multi=bool(flags.get('multi')),
+                        keyable=bool(flags.get('keyable')))
+        spec.default = None
+    elif typ == 'compound':
+        spec = AttrSpec(name, flags.get('shortName'), 'compound', multi=bool(flags.get('multi')))
+    else:
+        spec = AttrSpec(name, flags.get('shortName'), typ, flags.get('defaultValue'), multi=bool(flags.get('multi')),
+                        keyable=bool(flags.get('keyable')), min=flags.get('minValue'), max=flags.get('maxValue'),
+                        enum=enum.split(':') if isinstance(enum, str) else enum)
+
+    node.add_attr(spec, parent=flags.get('parent'))
+
+
+def addAttr(*args, **kwargs):
+    flags = _read_flags(kwargs, _ATTRIBUTE_FLAGS)
+    for node in _selected_or(args):
+        add_attr(node, dict(flags))
+
+
+def deleteAttr(*args, **kwargs):
+    attribute = _flag(kwargs, 'attribute', 'at')
+    for arg in args:
+        if attribute is None:
+            plug = to_plug(arg)
+            plug.node.delete_attr(plug.spec.name)
+        else:
+            to_node(arg).delete_attr(attribute)
+
+
+def hasAttr(obj, attr, checkShape=True):
+    return wrap(to_node(obj)).hasAttr(attr)
+
+
+def attributeQuery(attr, **kwargs):
+    node = to_node(_flag(kwargs, 'node', 'n'))
+    exists = _flag(kwargs, 'exists', 'ex', default=False)
+    spec = node.find_spec(attr)
+    if exists:
+        return spec is not None and not spec.implicit
+    if spec is None:
+        raise MayaAttributeError(f"attributeQuery: No attribute named {attr}")
+    if _flag(kwargs, 'multi', 'm', default=False):
+        return spec.multi
+    if _flag(kwargs, 'minimum', 'min', default=False):
+        return [spec.min]
+    if _flag(kwargs, 'maximum', 'max', default=False):
+        return [spec.max]
+    if _flag(kwargs, 'attributeType', 'at', default=False):
+        return Attribute(node.plug(attr)).type()
+    if _flag(kwargs, 'listEnum', 'le', default=False):
+        return [':'.join(spec.enum or [])]
+    if _flag(kwargs, 'listChildren', 'lc', default=False):
+        return [child.name for child in spec.children]
+    return True
+
+
+def getAttr(attr, **kwargs):
+    return Attribute(attr).get(**kwargs)
+
+
+def setAttr(attr, *args, **kwargs):
+    attribute = Attribute(attr)
+    lock = _flag(kwargs, 'lock', 'l')
+    keyable = _flag(kwargs, 'keyable', 'k')
+    channel_box = _flag(kwargs, 'channelBox', 'cb')
+    typ = _flag(kwargs, 'type', 'typ')
+
+    if args:
+        attribute.set(*args, type=typ)
+    if lock is not None:
+        attribute.setLocked(lock)
+    if keyable is not None:
+        attribute.setKeyable(keyable)
+    if channel_box is not None:
+        attribute.showInChannelBox(channel_box)
+
+
+def connectAttr(source, destination, **kwargs):
+    force = _flag(kwargs, 'force', 'f', default=False)
+    nodetypes.connect_attr(source, destination, force)
+
+
+def disconnectAttr(source, destination=None, **kwargs):
+    if destination is None:
+        Attribute(source).disconnect()
+    else:
+        commands.scene.disconnect(to_plug(source), to_plug(destination))
+
+
+def isConnected(source, destination, **kwargs):
+    return Attribute(source).isConnectedTo(destination)
+
+
+def listConnections(*args, **kwargs):
+    objects = []
+    for arg in args:
+        objects.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+    return nodetypes.list_connections(objects, **kwargs)
+
+
+def listAttr(obj, **kwargs):
+    return [a.attrName(longName=True) for a in wrap(to_node(obj)).listAttr(**kwargs)]
+
+
+# TRANSFORMS
+def _vector_and_objects(args):
+    """
+    Splits the arguments of move/rotate into the vector and the objects, both (obj, vec) and (x, y, z, obj) work
+    """
+    numbers = [a for a in args if isinstance(a, (int, float))]
+    vector = numbers if numbers else None
+    objects = []
+    for arg in args:
+        if isinstance(arg, (int, float)):
+            continue
+        if vector is None and _is_vector(arg):
+            vector = [float(v) for v in arg]
+        else:
+            objects.append(arg)
+    return vector, _selected_or(objects)
+
+
+def move(*args, **kwargs):
+    relative = _flag(kwargs, 'relative', 'r', default=False)
+    object_space = _flag(kwargs, 'objectSpace', 'os', default=False)
+    _flag(kwargs, 'worldSpace', 'ws', 'absolute', 'a')
+
+    vector, nodes = _vector_and_objects(args)
+    for node in nodes:
+        commands.move(node, vector, relative=relative, object_space=object_space)
+
+
+def rotate(*args, **kwargs):
+    relative = _flag(kwargs, 'relative', 'r', default=False)
+    object_space = _flag(kwargs, 'objectSpace', 'os', default=False)
+    _flag(kwargs, 'worldSpace', 'ws', 'absolute', 'a')
+
+    vector, nodes = _vector_and_objects(args)
+    for node in nodes:
+        commands.rotate(node, vector, relative=relative, object_space=object_space)
+
+
+def scale(*args, **kwargs):
+    vector, nodes = _vector_and_objects(args)
+    for node in nodes:
+        commands.set_channel(node, 'scale', vector)
+
+
+def xform(*args, **kwargs):
+    query = _flag(kwargs, 'query', 'q', default=False)
+    world = _flag(kwargs, 'worldSpace', 'ws', default=False)
+    _flag(kwargs, 'objectSpace', 'os')
+    relative = _flag(kwargs, 'relative', 'r', default=False)
+    _flag(kwargs, 'absolute', 'a')
+    translation = _flag(kwargs, 'translation', 't')
+    rotation = _flag(kwargs, 'rotation', 'ro')
+    matrix = _flag(kwargs, 'matrix', 'm')
+    scale_value = _flag(kwargs, 'scale', 's')
+    rotate_pivot = _flag(kwargs, 'rotatePivot', 'rp')
+    _flag(kwargs, 'pivots', 'piv', 'scalePivot', 'sp')
+
+    objects = [arg for arg in args]
+    components = [obj for obj in objects if isinstance(obj, Component) or (isinstance(obj, str) and '.' in obj)]
+    if components:
+        return _xform_components([c if isinstance(c, Component) else PyNode(c) for c in components], query, world,
+                                 translation)
+
+    if query:
+        # Like Maya, the values of several objects are concatenated
+        values = []
+        for node in _selected_or(objects):
+            values.extend(_xform_query(node, world, translation, rotation, matrix, scale_value, rotate_pivot))
+        return values
+
+    for node in _selected_or(objects):
+        if matrix is not None:
+            values = datatypes.Matrix(matrix).flat()
+            if world:
+                commands.set_world_matrix(node, values)
+            else:
+                commands.set_local_matrix(node, values)
+        if translation is not None:
+            translation = [float(v) for v in translation]
+            if relative:
+                base = commands.world_translation(node) if world else node.get('translate')
+                translation = [a + b for a, b in zip(base, translation)]
+            if world:
+                commands.set_world_translation(node, translation)
+            else:
+                commands.set_channel(node, 'translate', translation)
+        if rotation is not None:
+            commands.rotate(node, [float(v) for v in rotation], relative=relative, object_space=not world)
+        if scale_value is not None:
+            commands.set_channel(node, 'scale', [float(v) for v in scale_value])
+
+
+def _xform_query(node, world, translation, rotation, matrix, scale_value, rotate_pivot):
+    if translation:
+        return commands.world_translation(node) if world else node.get('translate')
+    if rotation:
+        return commands.world_rotation(node) if world else node.get('rotate')
+    if matrix:
+        return commands.world_matrix(node) if world else commands.local_matrix(node)
+    if scale_value:
+        return mmath.decompose(commands.world_matrix(node))[2] if world else node.get('scale')
+    if rotate_pivot:
+        return commands.world_translation(node) if world else [0.0, 0.0, 0.0]
+    raise GraphError("xform: query needs a flag")
+
+
+def _xform_components(components, query, world, translation):
+    if query:
+        points = []
+        for component in components:
+            position = component.getPosition('world' if world else 'preTransform')
+            for point in (position if isinstance(position, list) else [position]):
+                points.extend(point)
+        return points
+
+    for component in components:
+        component.setPosition(translation, 'world' if world else 'preTransform')
+
+
+def matchTransform(*args, **kwargs):
+    position = _flag(kwargs, 'position', 'pos')
+    rotation = _flag(kwargs, 'rotation', 'rot')
+    scale_flag = _flag(kwargs, 'scale', 'scl')
+    if position is None and rotation is None and scale_flag is None:
+        position = rotation = scale_flag = True
+
+    nodes = _objects(args)
+    target = nodes[-1]
+    for node in nodes[:-1]:
+        commands.match_transform(node, target, bool(position), bool(rotation), bool(scale_flag))
+
+
+def makeIdentity(*args, **kwargs):
+    _flag(kwargs, 'apply', 'a')
+    translate = _flag(kwargs, 'translate', 't', default=False)
+    rotate_flag = _flag(kwargs, 'rotate', 'r', default=False)
+    scale_flag = _flag(kwargs, 'scale', 's', default=False)
+    for node in _selected_or(args):
+        commands.make_identity(node, translate, rotate_flag, scale_flag)
+
+
+# JOINTS
+def joint(*args, **kwargs):
+    edit = _flag(kwargs, 'edit', 'e', default=False)
+    name = _flag(kwargs, 'name', 'n')
+    position = _flag(kwargs, 'position', 'p')
+    radius = _flag(kwargs, 'radius', 'rad')
+    relative = _flag(kwargs, 'relative', 'r', default=False)
+    orient_joint = _flag(kwargs, 'orientJoint', 'oj')
+    secondary = _flag(kwargs, 'secondaryAxisOrient', 'sao')
+    children = _flag(kwargs, 'children', 'ch', default=False)
+    orientation = _flag(kwargs, 'orientation', 'o')
+    _flag(kwargs, 'zeroScaleOrient', 'zso')
+
+    if not edit:
+        jnt = commands.create_joint(name, _position(position), radius, relative)
+        if orientation is not None:
+            commands.set_channel(jnt, 'jointOrient', orientation)
+        return wrap(jnt)
+
+    for node in _selected_or(args):
+        if position is not None:
+            if relative:
+                commands.set_channel(node, 'translate', _position(position))
+            else:
+                commands.set_world_translation(node, _position(position))
+        if radius is not None:
+            node.set('radius', radius)
+        if orientation is not None:
+            commands.set_channel(node, 'jointOrient', orientation)
+        if orient_joint is not None:
+            commands.orient_joint(node, orient_joint, secondary, children)
+
+
+def _position(value):
+    """
+    A position flag, xform matrices give the translation
+    """
+    if value is None:
+        return None
+    values = list(value.flat() if isinstance(value, datatypes.Matrix) else value)
+    if len(values) == 16:
+        return values[12:15]
+    return [float(v) for v in values]
+
+
+def mirrorJoint(*args, **kwargs):
+    plane = 'YZ'
+    for flag, name in (('mirrorYZ', 'YZ'), ('myz', 'YZ'), ('mirrorXY', 'XY'), ('mxy', 'XY'),
+                       ('mirrorXZ', 'XZ'), ('mxz', 'XZ')):
+        if kwargs.pop(flag, False):
+            plane = name
+    behavior = _flag(kwargs, 'mirrorBehavior', 'mb', default=False)
+    search_replace = _flag(kwargs, 'searchReplace', 'sr')
+
+    root = _selected_or(args)[0]
+    return commands.mirror_joint(root, plane, behavior, search_replace)
+
+
+def ikHandle(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    start = _flag(kwargs, 'startJoint', 'sj')
+    end = _flag(kwargs, 'endEffector', 'ee')
+    solver = _flag(kwargs, 'solver', 'sol', default='ikRPsolver')
+    curve_flag = _flag(kwargs, 'curve', 'c')
+    create_curve = _flag(kwargs, 'createCurve', 'ccv', default=True)
+
+    handle, effector = commands.ik_handle(to_node(start), to_node(end), name, solver)
+    _select([handle])
+    result = [wrap(handle), wrap(effector)]
+    if solver == 'ikSplineSolver':
+        if curve_flag is not None:
+            result.append(PyNode(curve_flag))
+        elif create_curve:
+            chain = [to_node(end)] + list(to_node(end).ancestors())
+            chain = chain[:chain.index(to_node(start)) + 1]
+            points = [commands.world_translation(node) for node in reversed(chain)]
+            result.append(wrap(commands.create_curve(points, 3 if len(points) > 3 else 1, 'curve1')))
+    return result
+
+
+# CONSTRAINTS
+_AIM_FLAGS = {
+    'aimVector': ('aimVector', 'aim', 'a'),
+    'upVector': ('upVector', 'u'),
+    'worldUpVector': ('worldUpVector', 'wu'),
+    'worldUpType': ('worldUpType', 'wut'),
+    'worldUpObject': ('worldUpObject', 'wuo'),
+}
+
+
+def _axes(value):
+    if value is None or value == 'none':
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+def _constraint(kind, args, kwargs, aim=False):
+    query = _flag(kwargs, 'query', 'q', default=False)
+    nodes = _selected_or(args)
+    if query:
+        node = wrap(nodes[0])
+        if _flag(kwargs, 'targetList', 'tl', default=False):
+            return node.getTargetList()
+        if _flag(kwargs, 'weightAliasList', 'wal', default=False):
+            return node.getWeightAliasList()
+        raise GraphError(f"{kind}: query needs a flag")
+
+    maintain_offset = _flag(kwargs, 'maintainOffset', 'mo', default=False)
+    weight = _flag(kwargs, 'weight', 'w', default=1.0)
+    name = _flag(kwargs, 'name', 'n')
+    skip = _axes(_flag(kwargs, 'skip', 'sk'))
+    skip_translate = _axes(_flag(kwargs, 'skipTranslate', 'st')) or (skip if kind != 'orientConstraint' else ())
+    skip_rotate = _axes(_flag(kwargs, 'skipRotate', 'sr')) or (skip if kind != 'pointConstraint' else ())
+    settings = {}
+    if aim:
+        for key, value in _read_flags(kwargs, _AIM_FLAGS).items():
+            settings[key] = to_node(value) if key == 'worldUpObject' else value
+
+    if len(nodes) < 2:
+        raise GraphError(f"{kind}: Not enough objects or values.")
+    driven = nodes[-1]
+    node = commands.constrain(kind, nodes[:-1], driven, maintain_offset, weight, skip_translate, skip_rotate,
+                              name, **settings)
+    return wrap(node)
+
+
+def parentConstraint(*args, **kwargs):
+    return _constraint('parentConstraint', args, kwargs)
+
+
+def pointConstraint(*args, **kwargs):
+    return _constraint('pointConstraint', args, kwargs)
+
+
+def orientConstraint(*args, **kwargs):
+    return _constraint('orientConstraint', args, kwargs)
+
+
+def aimConstraint(*args, **kwargs):
+    return _constraint('aimConstraint', args, kwargs, aim=True)
+
+
+def poleVectorConstraint(*args, **kwargs):
+    return _constraint('poleVectorConstraint', args, kwargs)
+
+
+# SHAPES
+def spaceLocator(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    position = _flag(kwargs, 'position', 'p')
+    xform_node, shape = commands.create_shape('locator', name or 'locator1')
+    if position is not None:
+        shape.set('localPosition', list(position))
+    _select([xform_node])
+    return wrap(xform_node)
+
+
+def curve(*args, **kwargs):
+    replace = _flag(kwargs, 'replace', 'r', default=False)
+    degree = _flag(kwargs, 'degree', 'd', default=3)
+    points = _flag(kwargs, 'point', 'p')
+    knots = _flag(kwargs, 'knot', 'k')
+    periodic = _flag(kwargs, 'periodic', 'per', default=False)
+    name = _flag(kwargs, 'name', 'n')
+
+    points = [[float(v) for v in p] for p in points]
+    if replace:
+        node = to_node(args[0])
+        shape = node if node.type.shape else commands.get_shapes(node)[0]
+        commands.set_curve(shape, points, degree, periodic, knots)
+        return wrap(node)
+
+    xform_node = commands.create_curve(points, degree, name, periodic, knots)
+    _select([xform_node])
+    return wrap(xform_node)
+
+
+def circle(*args, **kwargs):
+    normal = _flag(kwargs, 'normal', 'nr', default=(0, 0, 1))
+    center = _flag(kwargs, 'center', 'c', default=(0, 0, 0))
+    radius = _flag(kwargs, 'radius', 'r', default=1.0)
+    sweep = _flag(kwargs, 'sweep', 'sw', default=360.0)
+    degree = _flag(kwargs, 'degree', 'd', default=3)
+    sections = _flag(kwargs, 'sections', 's', default=8)
+    history = _flag(kwargs, 'constructionHistory', 'ch', default=True)
+    name = _flag(kwargs, 'name', 'n')
+
+    xform_node = commands.circle(normal, center, radius, sweep, degree, sections, name)
+    _select([xform_node])
+    if history:
+        return [wrap(xform_node), wrap(commands.scene.create('makeNurbCircle', 'makeNurbCircle1'))]
+    return [wrap(xform_node)]
+
+
+def closeCurve(*args, **kwargs):
+    for node in _selected_or(args):
+        shape = node if node.type.shape else commands.get_shapes(node)[0]
+        shape.set('form', 2)
+    return [wrap(node) for node in _objects(args)]
+
+
+def cluster(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+
+    components = []
+    for arg in args:
+        components.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+    components = [c if isinstance(c, Component) else PyNode(c) for c in components]
+
+    shape = components[0]._node
+    indices = [i for c in components for i in c.indices()]
+    deformer, handle = commands.cluster(shape, indices, name)
+    _select([handle])
+    return [wrap(deformer), wrap(handle)]
+
+
+def nurbsPlane(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    width = _flag(kwargs, 'width', 'w', default=1.0)
+    length_ratio = _flag(kwargs, 'lengthRatio', 'lr', default=1.0)
+    axis = _flag(kwargs, 'axis', 'ax', default=(0, 1, 0))
+    xform_node, history = commands.nurbs_plane(name, width, length_ratio, axis)
+    _select([xform_node])
+    return [wrap(xform_node), wrap(history)]
+
+
+def polyPlane(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    width = _flag(kwargs, 'width', 'w', default=1.0)
+    height = _flag(kwargs, 'height', 'h', default=1.0)
+    subdivisions_width = _flag(kwargs, 'subdivisionsWidth', 'sw', 'sx', default=1)
+    subdivisions_height = _flag(kwargs, 'subdivisionsHeight', 'sh', 'sy', default=1)
+    xform_node, history = commands.poly_plane(name, width, height, subdivisions_width, subdivisions_height)
+    _select([xform_node])
+    return [wrap(xform_node), wrap(history)]
+
+
+def skinCluster(*args, **kwargs):
+    name = _flag(kwargs, 'name', 'n')
+    nodes = _objects(args)
+    return wrap(commands.skin_cluster(nodes[:-1], nodes[-1], name))
+
+
+def skinPercent(skin, *args, **kwargs):
+    """
+    Weights are recorded, the geometry isn't deformed
+    """
+    values = _flag(kwargs, 'transformValue', 'tv', default=[])
+    node = to_node(skin)
+    for component in args:
+        component = component if isinstance(component, Component) else PyNode(component)
+        for index in component.indices():
+            node.data['weights'][index] = [(str(influence), weight) for influence, weight in values]
+
+
+# ANIMATION
+def setDrivenKeyframe(*args, **kwargs):
+    driver = _flag(kwargs, 'currentDriver', 'cd')
+    driver_value = _flag(kwargs, 'driverValue', 'dv')
+    value = _flag(kwargs, 'value', 'v')
+    attribute = _flag(kwargs, 'attribute', 'at')
+
+    for arg in args:
+        plug = to_plug(f'{arg}.{attribute}' if attribute else arg)
+        driver_values = driver_value if isinstance(driver_value, (list, tuple)) else [driver_value]
+        for dv in driver_values:
+            commands.set_driven_key(plug, to_plug(driver), dv, value)
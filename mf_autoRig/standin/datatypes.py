@@ -0,0 +1,221 @@
+"""
+Stand-in for pymel.core.datatypes, only what the tool uses
+"""
+import math
+
+from mf_autoRig.standin import mmath
+
+
+class Vector:
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = args[0]
+            if isinstance(args, Vector):
+                args = args._values
+            args = list(args)
+        if len(args) == 0:
+            args = [0.0, 0.0, 0.0]
+        if len(args) != 3:
+            raise ValueError(f"Vector needs 3 values, got {args}")
+
+        self._values = [float(v) for v in args]
+
+    # Sequence
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        self._values[index] = float(value)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return 3
+
+    def get(self):
+        return tuple(self._values)
+
+    @property
+    def x(self):
+        return self._values[0]
+
+    @property
+    def y(self):
+        return self._values[1]
+
+    @property
+    def z(self):
+        return self._values[2]
+
+    # Math
+    def __add__(self, other):
+        return self.__class__([a + b for a, b in zip(self, _as_values(other))])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.__class__([a - b for a, b in zip(self, _as_values(other))])
+
+    def __rsub__(self, other):
+        return self.__class__([b - a for a, b in zip(self, _as_values(other))])
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            return self.__class__(mmath.transform_vector(self, other._values))
+        if isinstance(other, (Vector, list, tuple)):
+            # Vector * Vector is the dot product, like pymel
+            return mmath.dot(self, other)
+        return self.__class__([a * other for a in self])
+
+    def __rmul__(self, other):
+        if isinstance(other, (list, tuple)):
+            return mmath.dot(self, other)
+        return self.__class__([a * other for a in self])
+
+    def __truediv__(self, other):
+        return self.__class__([a / other for a in self])
+
+    def __neg__(self):
+        return self.__class__([-a for a in self])
+
+    def __abs__(self):
+        return self.__class__([abs(a) for a in self])
+
+    def __eq__(self, other):
+        try:
+            return mmath.is_close(self, _as_values(other), 1e-10) and len(_as_values(other)) == 3
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def length(self):
+        return math.sqrt(mmath.dot(self, self))
+
+    def normal(self):
+        return self.__class__(mmath.normalize(self._values))
+
+    def normalize(self):
+        self._values = mmath.normalize(self._values)
+
+    def cross(self, other):
+        return self.__class__(mmath.cross(self, _as_values(other)))
+
+    def dot(self, other):
+        return mmath.dot(self, _as_values(other))
+
+    def isParallel(self, other, tol=0.0001):
+        a = self.normal()
+        b = Vector(other).normal()
+        return abs(abs(mmath.dot(a, b)) - 1.0) <= tol
+
+    def distanceTo(self, other):
+        return (self - other).length()
+
+    def __repr__(self):
+        return f"dt.{self.__class__.__name__}({self._values})"
+
+    __str__ = __repr__
+
+
+class Point(Vector):
+    pass
+
+
+def _as_values(other):
+    if isinstance(other, (int, float)):
+        return [float(other)] * 3
+    return list(other)
+
+
+def cross(a, b):
+    return Vector(mmath.cross(_as_values(a), _as_values(b)))
+
+
+def dot(a, b):
+    return mmath.dot(_as_values(a), _as_values(b))
+
+
+class Matrix:
+    def __init__(self, *args):
+        if len(args) == 1:
+            args = args[0]
+        if isinstance(args, Matrix):
+            args = args._values
+        values = []
+        for v in args:
+            if isinstance(v, (list, tuple, Vector)):
+                values.extend(v)
+            else:
+                values.append(v)
+        if not values:
+            values = mmath.identity()
+        if len(values) != 16:
+            raise ValueError(f"Matrix needs 16 values, got {len(values)}")
+
+        self._values = [float(v) for v in values]
+
+    def __getitem__(self, index):
+        return tuple(self._values[index * 4:index * 4 + 4])
+
+    def __iter__(self):
+        for i in range(4):
+            yield self[i]
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            return Matrix(mmath.mult(self._values, other._values))
+        return Matrix([v * other for v in self._values])
+
+    def inverse(self):
+        return Matrix(mmath.inverse(self._values))
+
+    def get(self):
+        return tuple(self[i] for i in range(4))
+
+    def flat(self):
+        return list(self._values)
+
+    @property
+    def translate(self):
+        return Vector(mmath.translation(self._values))
+
+    def __eq__(self, other):
+        try:
+            return mmath.is_close(self._values, Matrix(other)._values, 1e-10)
+        except (TypeError, ValueError):
+            return False
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"dt.Matrix({[list(row) for row in self]})"
+
+
+class TransformationMatrix(Matrix):
+    def getTranslation(self, space='transform'):
+        return Vector(mmath.translation(self._values))
+
+    def getRotation(self):
+        _, r, _ = mmath.decompose(self._values)
+        return EulerRotation(r)
+
+    def getScale(self, space='transform'):
+        _, _, s = mmath.decompose(self._values)
+        return s
+
+
+class EulerRotation(Vector):
+    pass
+
+
+def degrees(value):
+    return math.degrees(value)
+
+
+def radians(value):
+    return math.radians(value)
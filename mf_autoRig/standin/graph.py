@@ -0,0 +1,963 @@
+"""
+In-memory dependency graph of the stand-in backend.
+
+Nodes have typed attributes, connections and an optional DAG parent. Values are pulled:
+a connected plug reads its source, a child of a connected or computed compound reads it from the parent,
+computed attributes (worldMatrix, constraint outputs, utility node outputs...) are evaluated on every read.
+Node names are unique in the whole scene, Maya only requires that from siblings.
+"""
+import collections
+import itertools
+import re
+import uuid
+
+# MNodeMessage attribute message bits, same values as Maya
+kConnectionMade = 1 << 0
+kConnectionBroken = 1 << 1
+kAttributeEval = 1 << 2
+kAttributeSet = 1 << 3
+kAttributeLocked = 1 << 4
+kAttributeUnlocked = 1 << 5
+kAttributeAdded = 1 << 6
+kAttributeRemoved = 1 << 7
+kAttributeRenamed = 1 << 8
+kAttributeKeyable = 1 << 9
+kAttributeUnkeyable = 1 << 10
+kIncomingDirection = 1 << 11
+kAttributeArrayAdded = 1 << 12
+kAttributeArrayRemoved = 1 << 13
+kOtherPlugSet = 1 << 14
+
+NUMERIC_TYPES = ('double', 'float', 'doubleLinear', 'doubleAngle', 'time')
+INTEGER_TYPES = ('long', 'short', 'byte', 'enum', 'char')
+
+MAX_DEPTH = 400
+
+_NAME_RE = re.compile(r'^(.*?)(\d*)$')
+_SEGMENT_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)(?:\[(\d+)\])?$')
+
+
+class GraphError(RuntimeError):
+    pass
+
+
+class AttrSpec:
+    """
+    Definition of an attribute, shared by every node of a type or owned by one node for dynamic attributes
+    """
+    __slots__ = ('name', 'short', 'type', 'default', 'multi', 'children', 'parent', 'compute',
+                 'keyable', 'dynamic', 'implicit', 'min', 'max', 'enum')
+
+    def __init__(self, name, short=None, type='double', default=None, multi=False, children=(), compute=None,
+                 keyable=False, dynamic=False, implicit=False, min=None, max=None, enum=None):
+        self.name = name
+        self.short = short or name
+        self.type = type
+        self.default = _default(type) if default is None else default
+        self.multi = multi
+        self.children = list(children)
+        self.parent = None
+        self.compute = compute
+        self.keyable = keyable
+        self.dynamic = dynamic
+        self.implicit = implicit
+        self.min = min
+        self.max = max
+        self.enum = enum
+
+        for child in self.children:
+            child.parent = self
+
+    def chain(self):
+        """
+        Specs from the top level attribute down to this one
+        """
+        chain = []
+        spec = self
+        while spec is not None:
+            chain.append(spec)
+            spec = spec.parent
+        chain.reverse()
+        return chain
+
+    def depth(self):
+        return sum(1 for spec in self.chain() if spec.multi)
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def find_child(self, name):
+        for spec in self.walk():
+            if spec is not self and name in (spec.name, spec.short):
+                return spec
+        return None
+
+    def computed(self):
+        spec = self
+        while spec is not None:
+            if spec.compute is not None:
+                return True
+            spec = spec.parent
+        return False
+
+    def __repr__(self):
+        return f'AttrSpec({self.name!r}, {self.type!r})'
+
+
+def _default(typ):
+    if typ in NUMERIC_TYPES:
+        return 0.0
+    if typ in INTEGER_TYPES:
+        return 0
+    if typ == 'bool':
+        return False
+    if typ == 'string':
+        return None
+    if typ == 'matrix':
+        return (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if typ == 'generic':
+        return 0.0
+    return None
+
+
+class NodeType:
+    """
+    Attributes and behaviour of a node type, inherited from the parent type
+
+    lenient types create a generic attribute the first time an unknown one is used,
+    strict types raise like Maya does.
+    """
+    def __init__(self, name, parent=None, attrs=(), dag=None, shape=None, lenient=None):
+        self.name = name
+        self.parent = parent
+        self.specs = dict(parent.specs) if parent else {}
+        self.order = list(parent.order) if parent else []
+        self.dag = parent.dag if dag is None and parent else bool(dag)
+        self.shape = parent.shape if shape is None and parent else bool(shape)
+        self.lenient = parent.lenient if lenient is None and parent else bool(lenient)
+
+        for spec in attrs:
+            self.add(spec)
+
+    def add(self, spec):
+        self.order.append(spec)
+        for s in spec.walk():
+            self.specs[s.name] = s
+            self.specs[s.short] = s
+
+    def is_a(self, name):
+        typ = self
+        while typ is not None:
+            if typ.name == name:
+                return True
+            typ = typ.parent
+        return False
+
+    def lineage(self):
+        names = []
+        typ = self
+        while typ is not None:
+            names.append(typ.name)
+            typ = typ.parent
+        return names
+
+    def __repr__(self):
+        return f'NodeType({self.name!r})'
+
+
+NODE_TYPES = {}
+
+
+def register(node_type):
+    NODE_TYPES[node_type.name] = node_type
+    return node_type
+
+
+def get_type(name):
+    try:
+        return NODE_TYPES[name]
+    except KeyError:
+        raise GraphError(f"Unknown object type: {name}") from None
+
+
+class Plug:
+    """
+    One attribute of one node, indices hold the logical index of every multi attribute in the spec chain
+    """
+    __slots__ = ('node', 'spec', 'indices')
+
+    def __init__(self, node, spec, indices=()):
+        self.node = node
+        self.spec = spec
+        self.indices = tuple(indices)
+
+    @property
+    def key(self):
+        return self.spec.name, self.indices
+
+    @property
+    def scene(self):
+        return self.node.scene
+
+    def is_indexed(self):
+        return len(self.indices) >= self.spec.depth()
+
+    def element(self, index):
+        if not self.spec.multi or self.is_indexed():
+            raise GraphError(f"{self} is not an array attribute")
+        return Plug(self.node, self.spec, self.indices + (index,))
+
+    def child(self, spec):
+        return Plug(self.node, spec, self.indices)
+
+    def children(self):
+        return [self.child(spec) for spec in self.spec.children]
+
+    def parent(self):
+        parent = self.spec.parent
+        if parent is None:
+            return None
+        indices = self.indices[:-1] if self.spec.multi and self.is_indexed() else self.indices
+        return Plug(self.node, parent, indices[:parent.depth()])
+
+    def array(self):
+        """
+        The array plug of an element
+        """
+        return Plug(self.node, self.spec, self.indices[:-1])
+
+    def index(self):
+        return self.indices[-1] if self.spec.multi and self.is_indexed() else None
+
+    def path(self, long=True):
+        chain = self.spec.chain()
+        start = 0
+        for i, spec in enumerate(chain):
+            if spec.multi:
+                start = i
+                break
+        else:
+            start = len(chain) - 1
+
+        parts = []
+        indices = iter(self.indices)
+        for i, spec in enumerate(chain):
+            index = next(indices, None) if spec.multi else None
+            if i < start:
+                continue
+            part = spec.name if long else spec.short
+            if index is not None:
+                part += f'[{index}]'
+            parts.append(part)
+
+        return '.'.join(parts)
+
+    # Shortcuts
+    def get(self):
+        return self.scene.get(self)
+
+    def set(self, value, force=False):
+        self.scene.set(self, value, force=force)
+
+    def source(self):
+        return self.scene.source(self)
+
+    def destinations(self):
+        return self.scene.destinations(self)
+
+    def elements(self):
+        return self.node.element_indices(self)
+
+    def __eq__(self, other):
+        return isinstance(other, Plug) and self.node is other.node and self.key == other.key
+
+    def __hash__(self):
+        return hash((id(self.node), self.key))
+
+    def __str__(self):
+        return f'{self.node.name}.{self.path()}'
+
+    __repr__ = __str__
+
+
+class Node:
+    def __init__(self, scene, node_type, name):
+        self.scene = scene
+        self.type = node_type
+        self.name = name
+        self.uuid = str(uuid.uuid4()).upper()
+        self.alive = True
+
+        self.parent = None
+        self.children = []
+
+        self.dynamic = {}
+        self.dynamic_order = []
+        self.values = {}
+        self.elements = {}
+        self.inputs = {}
+        self.outputs = {}
+        self.locked = set()
+        self.keyable = {}
+
+        # Extra state of some node types, eg. the keys of an animCurve
+        self.data = {}
+
+    # ATTRIBUTES
+    def find_spec(self, name, create=False):
+        spec = self.dynamic.get(name)
+        if spec is None:
+            spec = self.type.specs.get(name)
+        if spec is None and create and self.type.lenient and _SEGMENT_RE.match(name):
+            spec = AttrSpec(name, type='generic', implicit=True)
+            self._add_spec(spec)
+        return spec
+
+    def has_attr(self, name):
+        return self.find_spec(name) is not None
+
+    def _add_spec(self, spec):
+        old = self.dynamic.get(spec.name)
+        if old is not None and old.implicit:
+            self.dynamic_order.remove(old)
+        self.dynamic_order.append(spec)
+        for s in spec.walk():
+            self.dynamic[s.name] = s
+            self.dynamic[s.short] = s
+
+    def add_attr(self, spec, parent=None):
+        """
+        Adds a dynamic attribute, a child of a compound is added with parent
+        """
+        existing = self.find_spec(spec.name)
+        if existing is not None and not existing.implicit:
+            raise GraphError(f"Found an attribute with the name '{spec.name}' on {self.name}")
+
+        spec.dynamic = True
+        if parent is not None:
+            parent_spec = self.find_spec(parent)
+            if parent_spec is None:
+                raise GraphError(f"Attribute '{parent}' not found on {self.name}")
+            spec.parent = parent_spec
+            parent_spec.children.append(spec)
+            self.dynamic[spec.name] = spec
+            self.dynamic[spec.short] = spec
+        else:
+            self._add_spec(spec)
+
+        if spec.keyable:
+            self.keyable[spec.name] = True
+
+        self.scene.changed(self)
+        self.scene.emit_attr(self, kAttributeAdded, Plug(self, spec))
+        return spec
+
+    def delete_attr(self, name):
+        spec = self.find_spec(name)
+        if spec is None or not spec.dynamic:
+            raise GraphError(f"{self.name}.{name} is not a dynamic attribute")
+
+        for key in list(self.inputs):
+            if key[0] in {s.name for s in spec.walk()}:
+                self.scene.disconnect(self.inputs[key], Plug(self, self.find_spec(key[0]), key[1]))
+        for key in list(self.outputs):
+            if key[0] in {s.name for s in spec.walk()}:
+                for dst in list(self.outputs.get(key, ())):
+                    self.scene.disconnect(Plug(self, self.find_spec(key[0]), key[1]), dst)
+
+        for s in spec.walk():
+            self.dynamic.pop(s.name, None)
+            self.dynamic.pop(s.short, None)
+            for key in [k for k in self.values if k[0] == s.name]:
+                del self.values[key]
+        if spec in self.dynamic_order:
+            self.dynamic_order.remove(spec)
+
+        self.scene.changed(self)
+        self.scene.emit_attr(self, kAttributeRemoved, Plug(self, spec))
+
+    def plug(self, path, create=True):
+        """
+        Returns the Plug for an attribute path like 'translateX' or 'target[0].targetWeight'
+        Raises GraphError if the attribute doesn't exist
+        """
+        segments = path.split('.')
+        spec = None
+        indices = []
+        for i, segment in enumerate(segments):
+            match = _SEGMENT_RE.match(segment)
+            if match is None:
+                raise GraphError(f"Invalid attribute name {self.name}.{path}")
+            name, index = match.groups()
+
+            if spec is None:
+                spec = self.find_spec(name, create=create and len(segments) == 1)
+            else:
+                spec = spec.find_child(name)
+            if spec is None:
+                raise GraphError(f"No object matches name: {self.name}.{path}")
+
+            if index is not None:
+                if not spec.multi:
+                    raise GraphError(f"{self.name}.{name} is not an array attribute")
+                indices.append(int(index))
+
+        return Plug(self, spec, indices)
+
+    def attr_specs(self):
+        """
+        All top level attributes, static first
+        """
+        return [spec for spec in self.type.order] + list(self.dynamic_order)
+
+    def element_indices(self, plug):
+        return sorted(self.elements.get((plug.spec.name, plug.indices), ()))
+
+    def _touch(self, plug):
+        """
+        Marks the array elements of the plug as existing
+        """
+        indices = iter(plug.indices)
+        done = []
+        for spec in plug.spec.chain():
+            if not spec.multi:
+                continue
+            index = next(indices, None)
+            if index is None:
+                break
+            self.elements.setdefault((spec.name, tuple(done)), set()).add(index)
+            done.append(index)
+
+    # DAG
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def descendants(self):
+        """
+        Depth first, parents before children
+        """
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def long_name(self):
+        names = [self.name] + [node.name for node in self.ancestors()]
+        return '|' + '|'.join(reversed(names))
+
+    def is_a(self, type_name):
+        return self.type.is_a(type_name)
+
+    # Shortcuts
+    def get(self, path):
+        return self.scene.get(self.plug(path))
+
+    def set(self, path, value, force=False):
+        self.scene.set(self.plug(path), value, force=force)
+
+    def __repr__(self):
+        return f'<{self.type.name} {self.name}>'
+
+
+class Events:
+    """
+    Callback registry, the OpenMaya stand-in registers its message callbacks here
+    """
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._callbacks = {}
+        self._kinds = collections.Counter()
+
+    def add(self, kind, func, node=None, node_type=None):
+        callback_id = next(self._ids)
+        self._callbacks[callback_id] = (kind, func, node, node_type)
+        self._kinds[kind] += 1
+        return callback_id
+
+    def remove(self, callback_id):
+        callback = self._callbacks.pop(callback_id, None)
+        if callback is not None:
+            self._kinds[callback[0]] -= 1
+
+    def has(self, kind):
+        return self._kinds[kind] > 0
+
+    def targets(self, kind):
+        """
+        Nodes with callbacks of the given kind
+        """
+        return {target for k, _, target, _ in self._callbacks.values() if k == kind and target is not None}
+
+    def emit(self, kind, node=None, *args):
+        if not self._kinds[kind]:
+            return
+        for callback_id, (k, func, target, node_type) in list(self._callbacks.items()):
+            if k != kind or callback_id not in self._callbacks:
+                continue
+            if target is not None and target is not node:
+                continue
+            if node_type is not None and node is not None and not node.is_a(node_type):
+                continue
+            func(node, *args)
+
+    def __len__(self):
+        return len(self._callbacks)
+
+
+class Scene:
+    def __init__(self):
+        self.events = Events()
+        self.nodes = {}
+        self.selection = []
+        self.generation = 0
+        self._cache = {}
+        self._cache_generation = 0
+        self._depth = 0
+
+    # NODES
+    def create(self, type_name, name=None, parent=None):
+        node_type = get_type(type_name)
+        node = Node(self, node_type, self.unique_name(name or f'{type_name}1'))
+        self.nodes[node.name] = node
+        if parent is not None:
+            self.reparent(node, parent)
+
+        self.changed(node)
+        self.events.emit('node_added', node)
+        return node
+
+    def find(self, name):
+        """
+        Returns the node with the given short or long name, None if it doesn't exist
+        """
+        if isinstance(name, Node):
+            return name if name.alive else None
+
+        if '|' in name:
+            parts = [p for p in name.split('|') if p]
+            node = self.nodes.get(parts[-1]) if parts else None
+            if node is None:
+                return None
+            if name.startswith('|') and node.long_name() != name:
+                return None
+            return node
+
+        return self.nodes.get(name)
+
+    def unique_name(self, name, ignore=None):
+        name = _valid_name(name)
+        existing = self.nodes.get(name)
+        if existing is None or existing is ignore:
+            return name
+
+        base, number = _NAME_RE.match(name).groups()
+        number = int(number) + 1 if number else 1
+        while True:
+            candidate = f'{base}{number}'
+            existing = self.nodes.get(candidate)
+            if existing is None or existing is ignore:
+                return candidate
+            number += 1
+
+    def rename(self, node, name):
+        new_name = self.unique_name(name, ignore=node)
+        if new_name == node.name:
+            return node.name
+
+        prev = node.name
+        del self.nodes[prev]
+        node.name = new_name
+        self.nodes[new_name] = node
+
+        self.changed(node)
+        self.events.emit('name_changed', node, prev)
+        return new_name
+
+    def delete(self, nodes):
+        """
+        Deletes the nodes and their DAG descendants
+        """
+        doomed = []
+        for node in nodes:
+            if not node.alive or node in doomed:
+                continue
+            for n in [node] + list(node.descendants()):
+                if n not in doomed:
+                    doomed.append(n)
+
+        for node in doomed:
+            self.events.emit('pre_removal', node)
+
+        # Outputs first, the nodes they drive keep the values computed with all the inputs still there
+        for node in doomed:
+            for key, dsts in list(node.outputs.items()):
+                for dst in list(dsts):
+                    self.disconnect(Plug(node, node.find_spec(key[0]), key[1]), dst)
+        for node in doomed:
+            for key, src in list(node.inputs.items()):
+                self.disconnect(src, Plug(node, node.find_spec(key[0]), key[1]), bake=False)
+
+        for node in reversed(doomed):
+            if node.parent is not None and node.parent.alive:
+                node.parent.children.remove(node)
+                self.events.emit('parent_removed', node, node.parent)
+            node.alive = False
+            del self.nodes[node.name]
+            if node in self.selection:
+                self.selection.remove(node)
+            self.changed()
+            self.events.emit('node_removed', node)
+
+    def clear(self):
+        self.events.emit('before_new', None)
+        for node in self.nodes.values():
+            node.alive = False
+        self.nodes = {}
+        self.selection = []
+        self.changed()
+        self.events.emit('after_new', None)
+
+    def ls(self, type_name=None):
+        nodes = list(self.nodes.values())
+        if type_name is not None:
+            nodes = [node for node in nodes if node.is_a(type_name)]
+        return nodes
+
+    # DAG
+    def reparent(self, node, parent, index=None):
+        """
+        Moves node under parent (None for the world) without changing its local values
+        """
+        if not node.type.dag:
+            raise GraphError(f"{node.name} is not a DAG node")
+        if parent is not None:
+            if parent is node or node in parent.ancestors():
+                raise GraphError(f"Cannot parent {node.name} under its own descendant {parent.name}")
+            if not parent.type.dag or parent.type.shape:
+                raise GraphError(f"Cannot parent {node.name} under {parent.name}")
+
+        previous = node.parent
+        if previous is not None:
+            previous.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            if index is None:
+                parent.children.append(node)
+            else:
+                parent.children.insert(index, node)
+
+        self.changed(node)
+        if previous is not None:
+            self.events.emit('parent_removed', node, previous)
+        self.events.emit('parent_added', node, parent)
+
+    def roots(self):
+        return [node for node in self.nodes.values() if node.type.dag and node.parent is None]
+
+    # VALUES
+    def changed(self, node=None):
+        """
+        Invalidates the evaluation cache, node is the edited node or None for the whole scene
+        """
+        self.generation += 1
+        if self.events.has('node_dirty'):
+            self._emit_dirty(node)
+
+    def _emit_dirty(self, node):
+        """
+        Emits node_dirty for the nodes downstream of the edited one: through connections and to DAG children.
+        It's per node and not per plug like Maya, so it dirties more than Maya would.
+        """
+        targets = self.events.targets('node_dirty')
+        if node is None:
+            dirty = targets
+        else:
+            dirty = set()
+            seen = {node}
+            stack = [node]
+            while stack and len(dirty) < len(targets):
+                current = stack.pop()
+                if current in targets:
+                    dirty.add(current)
+
+                downstream = [dst.node for dsts in current.outputs.values() for dst in dsts] + current.children
+                for other in downstream:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+
+        for target in dirty:
+            self.events.emit('node_dirty', target)
+
+    def get(self, plug):
+        """
+        Evaluates a plug, computed values are cached until the scene changes
+        """
+        if plug.spec.compute is not None and plug.key not in plug.node.inputs and plug.is_indexed():
+            if self._cache_generation != self.generation:
+                self._cache = {}
+                self._cache_generation = self.generation
+
+            cache_key = (id(plug.node), plug.key)
+            try:
+                value = self._cache[cache_key]
+            except KeyError:
+                value = self._cache[cache_key] = self._evaluate(plug)
+            return list(value) if isinstance(value, list) else value
+
+        return self._evaluate(plug)
+
+    def is_cached(self, plug):
+        return self._cache_generation == self.generation and (id(plug.node), plug.key) in self._cache
+
+    def _evaluate(self, plug):
+        self._depth += 1
+        try:
+            if self._depth > MAX_DEPTH:
+                raise GraphError(f"Cycle or too deep evaluation at {plug}")
+            return self._get(plug)
+        finally:
+            self._depth -= 1
+
+    def _get(self, plug):
+        node = plug.node
+        spec = plug.spec
+        key = plug.key
+
+        src = node.inputs.get(key)
+        if src is not None:
+            if spec.type == 'message':
+                return src.node
+            return _convert(spec, self.get(src))
+
+        parent = plug.parent()
+        if parent is not None and self.is_driven(parent):
+            value = self.get(parent)
+            return value[parent.spec.children.index(spec)]
+
+        indexed = plug.is_indexed()
+        if spec.compute is not None:
+            if not indexed:
+                return [self.get(plug.element(i)) for i in (node.element_indices(plug) or [0])]
+            return spec.compute(node, plug)
+
+        if not indexed:
+            elements = [plug.element(i) for i in node.element_indices(plug)]
+            if spec.type == 'message':
+                return [n for n in (self.get(e) for e in elements) if n is not None]
+            return [self.get(e) for e in elements]
+
+        if spec.children:
+            return [self.get(child) for child in plug.children()]
+
+        if spec.type == 'message':
+            return None
+
+        value = node.values.get(key, spec.default)
+        return list(value) if isinstance(value, (list, tuple)) else value
+
+    def is_driven(self, plug):
+        """
+        True if the value of the plug comes from a connection or a compute
+        """
+        while plug is not None:
+            if plug.key in plug.node.inputs or plug.spec.compute is not None:
+                return True
+            plug = plug.parent()
+        return False
+
+    def set(self, plug, value, force=False):
+        """
+        Sets a value, force skips the lock check like internal Maya edits do
+        """
+        node = plug.node
+        spec = plug.spec
+
+        if spec.computed():
+            raise GraphError(f"setAttr: {plug} is an output and cannot be set")
+        if not force:
+            if self.is_driven(plug) or self._locked(plug):
+                raise GraphError(f"setAttr: The attribute '{plug}' is locked or connected and cannot be modified.")
+        elif self.is_driven(plug):
+            return
+
+        if spec.multi and not plug.is_indexed():
+            for i, v in enumerate(value):
+                self.set(plug.element(i), v, force=force)
+            return
+
+        if spec.children:
+            values = _flatten_compound(value, len(spec.children))
+            for child, v in zip(plug.children(), values):
+                if not (force and self.is_driven(child)):
+                    self.set(child, v, force=force)
+            return
+
+        if spec.type == 'message':
+            raise GraphError(f"setAttr: {plug} is a message attribute")
+
+        node.values[plug.key] = _convert(spec, value)
+        node._touch(plug)
+        self.changed(node)
+        self.emit_attr(node, kAttributeSet, plug)
+
+    def _locked(self, plug):
+        for spec in plug.spec.walk():
+            if spec.name in plug.node.locked:
+                return True
+        p = plug.parent()
+        while p is not None:
+            if p.spec.name in p.node.locked:
+                return True
+            p = p.parent()
+        return False
+
+    def lock(self, plug, locked=True):
+        if locked:
+            plug.node.locked.add(plug.spec.name)
+        else:
+            plug.node.locked.discard(plug.spec.name)
+        self.emit_attr(plug.node, kAttributeLocked if locked else kAttributeUnlocked, plug)
+
+    # CONNECTIONS
+    def source(self, plug):
+        return plug.node.inputs.get(plug.key)
+
+    def destinations(self, plug):
+        return list(plug.node.outputs.get(plug.key, ()))
+
+    def connect(self, src, dst, force=False):
+        if not src.is_indexed():
+            src = src.element(0)
+        if not dst.is_indexed():
+            used = set(dst.node.element_indices(dst)) | {k[1][-1] for k in dst.node.inputs
+                                                          if k[0] == dst.spec.name and k[1][:-1] == dst.indices}
+            dst = dst.element(next(i for i in itertools.count() if i not in used))
+
+        if dst.spec.computed():
+            raise GraphError(f"connectAttr: {dst} is an output and cannot be a destination")
+
+        current = dst.node.inputs.get(dst.key)
+        if current is not None:
+            if current == src:
+                raise GraphError(f"connectAttr: {src} is already connected to {dst}")
+            if not force:
+                raise GraphError(f"connectAttr: {dst} already has an incoming connection from {current}")
+            self.disconnect(current, dst)
+
+        dst.node.inputs[dst.key] = src
+        src.node.outputs.setdefault(src.key, []).append(dst)
+        src.node._touch(src)
+        dst.node._touch(dst)
+
+        self.changed(dst.node)
+        self.emit_attr(src.node, kConnectionMade, src, dst)
+        self.emit_attr(dst.node, kConnectionMade | kIncomingDirection, dst, src)
+        return src, dst
+
+    def disconnect(self, src, dst, bake=True):
+        """
+        Breaks a connection, the destination keeps its current value like in Maya
+        """
+        if dst.node.inputs.get(dst.key) != src:
+            raise GraphError(f"disconnectAttr: {src} is not connected to {dst}")
+
+        value = None
+        if bake and dst.spec.type != 'message' and not dst.spec.children and src.node.alive:
+            try:
+                value = self.get(dst)
+            except GraphError:
+                value = None
+
+        del dst.node.inputs[dst.key]
+        outputs = src.node.outputs.get(src.key, [])
+        if dst in outputs:
+            outputs.remove(dst)
+        if not outputs:
+            src.node.outputs.pop(src.key, None)
+
+        if value is not None:
+            dst.node.values[dst.key] = _convert(dst.spec, value)
+
+        self.changed(dst.node)
+        self.emit_attr(src.node, kConnectionBroken, src, dst)
+        self.emit_attr(dst.node, kConnectionBroken | kIncomingDirection, dst, src)
+
+    def connections(self, node, source=True, destination=True):
+        """
+        Returns (plug on node, other plug) pairs
+        """
+        pairs = []
+        if source:
+            for key, src in node.inputs.items():
+                pairs.append((Plug(node, node.find_spec(key[0]), key[1]), src))
+        if destination:
+            for key, dsts in node.outputs.items():
+                for dst in dsts:
+                    pairs.append((Plug(node, node.find_spec(key[0]), key[1]), dst))
+        return pairs
+
+    def plug_connections(self, plug, source=True, destination=True):
+        """
+        Connections of a plug and of its elements and children
+        """
+        names = {spec.name for spec in plug.spec.walk()}
+        prefix = plug.indices
+
+        def matches(key):
+            return key[0] in names and key[1][:len(prefix)] == prefix
+
+        return [(p, other) for p, other in self.connections(plug.node, source, destination) if matches(p.key)]
+
+    # EVENTS
+    def emit_attr(self, node, msg, plug, other=None):
+        self.events.emit('attr_changed', node, msg, plug, other)
+
+
+def _valid_name(name):
+    name = re.sub(r'[^A-Za-z0-9_]', '_', str(name))
+    if not name or name[0].isdigit():
+        name = '_' + name
+    return name
+
+
+def _flatten_compound(value, count):
+    if hasattr(value, 'flat') and callable(value.flat):
+        value = value.flat()
+    values = list(value)
+    if len(values) != count:
+        raise GraphError(f"Expected {count} values, got {values}")
+    return values
+
+
+def _convert(spec, value):
+    typ = spec.type
+    if typ in NUMERIC_TYPES:
+        if isinstance(value, (list, tuple)):
+            raise GraphError(f"Cannot set {spec.name} ({typ}) to {value}")
+        return float(value)
+    if typ in INTEGER_TYPES:
+        return int(round(float(value)))
+    if typ == 'bool':
+        return bool(value)
+    if typ == 'string':
+        return None if value is None else str(value)
+    if typ == 'matrix':
+        values = []
+        for v in (value.flat() if hasattr(value, 'flat') and callable(value.flat) else value):
+            if isinstance(v, (list, tuple)):
+                values.extend(float(x) for x in v)
+            else:
+                values.append(float(v))
+        if len(values) != 16:
+            raise GraphError(f"Matrix attribute {spec.name} needs 16 values")
+        return values
+    if isinstance(value, tuple):
+        return list(value)
+    if hasattr(value, 'flat') and callable(value.flat):
+        return value.flat()
+    return value
@@ -0,0 +1,101 @@
+"""
+Stand-in for maya.mel, only runs the MEL commands the tool generates (MelBatch and the module loaders).
+"""
+import re
+
+from mf_autoRig.standin import cmds
+from mf_autoRig.standin.graph import GraphError
+
+_NUMBER_RE = re.compile(r'^-?(\d+\.?\d*|\.\d+)(e-?\d+)?$')
+# Quoted string, end of statement or word
+_TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|(;)|([^\s;"]+)')
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+# Number of values taken by each flag, flags that aren't listed take one
+_FLAG_ARITY = {
+    'addAttr': {'m': 0, 'multi': 0, 'h': 1},
+    'setAttr': {},
+    'connectAttr': {'f': 0, 'force': 0},
+    'xform': {'ws': 0, 'os': 0, 'q': 0, 'r': 0, 'a': 0, 'm': 16, 't': 3, 'ro': 3, 's': 3, 'piv': 3},
+    'delete': {},
+    'select': {'cl': 0, 'add': 0},
+}
+
+
+class MelError(RuntimeError):
+    pass
+
+
+def _statements(script):
+    """
+    Splits a script in commands, ; inside strings are kept
+    """
+    statement = []
+    for quoted, end, word in _TOKEN_RE.findall(script):
+        if end:
+            if statement:
+                yield statement
+            statement = []
+        elif word:
+            statement.append(word)
+        else:
+            statement.append(_ESCAPE_RE.sub(r'\1', quoted))
+    if statement:
+        yield statement
+
+
+def _value(token):
+    if _NUMBER_RE.match(token):
+        return float(token) if any(c in token for c in '.e') else int(token)
+    return token
+
+
+def _parse(command, tokens):
+    """
+    Returns (flags, positional arguments)
+    """
+    arity = _FLAG_ARITY.get(command, {})
+    flags = {}
+    args = []
+    tokens = list(tokens)
+    while tokens:
+        token = tokens.pop(0)
+        if token.startswith('-') and not _NUMBER_RE.match(token):
+            flag = token[1:]
+            count = arity.get(flag, 1)
+            values = [_value(tokens.pop(0)) for _ in range(count)]
+            flags[flag] = True if count == 0 else values[0] if count == 1 else values
+        else:
+            args.append(_value(token))
+    return flags, args
+
+
+def _run(command, tokens):
+    flags, args = _parse(command, tokens)
+
+    if command == 'addAttr':
+        cmds.addAttr(*args, **flags)
+    elif command == 'setAttr':
+        plug, values = args[0], args[1:]
+        cmds.setAttr(plug, *values, **flags)
+    elif command == 'connectAttr':
+        cmds.connectAttr(args[0], args[1], **flags)
+    elif command == 'disconnectAttr':
+        cmds.disconnectAttr(args[0], args[1])
+    elif command == 'xform':
+        cmds.xform(*args, **flags)
+    elif command == 'delete':
+        cmds.delete(*args)
+    elif command == 'select':
+        cmds.select(*args, **flags)
+    else:
+        raise MelError(f"Cannot find procedure \"{command}\"")
+
+
+def eval(script):
+    for statement in _statements(script):
+        command, tokens = statement[0], statement[1:]
+        try:
+            _run(command, tokens)
+        except (GraphError, TypeError, ValueError, IndexError) as e:
+            raise MelError(f"Error while running {command}: {e}") from e
@@ -0,0 +1,304 @@
+"""
+Matrix math of the stand-in backend.
+
+Matrices are flat lists of 16 floats in Maya's layout: row vectors, the first three rows are the axes
+and the last row is the translation, points are transformed with p * M.
+Rotations are in degrees and use the xyz rotate order.
+"""
+import math
+
+IDENTITY = (1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0)
+
+EPSILON = 1e-9
+
+
+def identity():
+    return list(IDENTITY)
+
+
+def mult(a, b):
+    """
+    a * b, a is applied first
+    """
+    out = [0.0] * 16
+    for i in range(4):
+        a0, a1, a2, a3 = a[i * 4:i * 4 + 4]
+        for j in range(4):
+            out[i * 4 + j] = a0 * b[j] + a1 * b[4 + j] + a2 * b[8 + j] + a3 * b[12 + j]
+    return out
+
+
+def mult_all(matrices):
+    out = identity()
+    for m in matrices:
+        out = mult(out, m)
+    return out
+
+
+def inverse(m):
+    """
+    Inverse of a 4x4 matrix, gauss-jordan elimination
+    """
+    a = [list(m[i * 4:i * 4 + 4]) + [1.0 if i == j else 0.0 for j in range(4)] for i in range(4)]
+    for col in range(4):
+        pivot = max(range(col, 4), key=lambda r: abs(a[r][col]))
+        if abs(a[pivot][col]) < EPSILON:
+            raise ZeroDivisionError("Matrix is not invertible")
+        a[col], a[pivot] = a[pivot], a[col]
+
+        p = a[col][col]
+        a[col] = [v / p for v in a[col]]
+        for row in range(4):
+            if row != col:
+                f = a[row][col]
+                if f:
+                    a[row] = [v - f * pv for v, pv in zip(a[row], a[col])]
+
+    return [a[i][4 + j] for i in range(4) for j in range(4)]
+
+
+def transform_point(p, m):
+    x, y, z = p
+    return [x * m[0] + y * m[4] + z * m[8] + m[12],
+            x * m[1] + y * m[5] + z * m[9] + m[13],
+            x * m[2] + y * m[6] + z * m[10] + m[14]]
+
+
+def transform_vector(v, m):
+    x, y, z = v
+    return [x * m[0] + y * m[4] + z * m[8],
+            x * m[1] + y * m[5] + z * m[9],
+            x * m[2] + y * m[6] + z * m[10]]
+
+
+def translation(m):
+    return [m[12], m[13], m[14]]
+
+
+def translate_matrix(t):
+    out = identity()
+    out[12:15] = [float(v) for v in t]
+    return out
+
+
+def scale_matrix(s):
+    out = identity()
+    out[0], out[5], out[10] = (float(v) for v in s)
+    return out
+
+
+def rotate_matrix(r):
+    """
+    Rotation matrix from xyz euler angles in degrees, x is applied first
+    """
+    x, y, z = (math.radians(v) for v in r)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+
+    return [cy * cz, cy * sz, -sy, 0.0,
+            sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy, 0.0,
+            cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy, 0.0,
+            0.0, 0.0, 0.0, 1.0]
+
+
+# Axes of Maya's rotate orders by enum index, the first one is applied first
+ROTATE_ORDERS = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+
+def rotation_to_euler(m, order=0):
+    """
+    Euler angles in degrees (x, y, z) of the rotation part of a matrix without scale.
+    order is a rotate order enum index, only the middle axis of the order is limited to -90, 90.
+    """
+    i, j, k = ROTATE_ORDERS[order]
+    # Odd orders are a mirror of xyz, their angles flip
+    sign = 1.0 if (j - i) % 3 == 1 else -1.0
+
+    def at(row, column):
+        return m[row * 4 + column]
+
+    sin_middle = max(-1.0, min(1.0, -sign * at(i, k)))
+    middle = math.asin(sin_middle)
+    if abs(math.cos(middle)) > 1e-6:
+        first = math.atan2(sign * at(j, k), at(k, k))
+        last = math.atan2(sign * at(i, j), at(i, i))
+    else:
+        # Gimbal lock, put everything in the first axis
+        last = 0.0
+        first = math.atan2(at(j, i) * sin_middle, at(j, j))
+
+    angles = [0.0, 0.0, 0.0]
+    angles[i], angles[j], angles[k] = math.degrees(first), math.degrees(middle), math.degrees(last)
+    return angles
+
+
+def compose(t=(0, 0, 0), r=(0, 0, 0), s=(1, 1, 1), jo=None):
+    """
+    Local matrix of a transform, scale * rotate * (joint orient) * translate
+    """
+    m = mult(scale_matrix(s), rotate_matrix(r))
+    if jo is not None:
+        m = mult(m, rotate_matrix(jo))
+    m[12:15] = [float(v) for v in t]
+    return m
+
+
+def _length(v):
+    return math.sqrt(sum(c * c for c in v))
+
+
+def decompose(m):
+    """
+    Splits a matrix into translate, rotate (xyz degrees) and scale
+    A negative determinant is put in the x scale
+    """
+    rows = [list(m[i * 4:i * 4 + 3]) for i in range(3)]
+    scale = [_length(row) for row in rows]
+    if determinant3(m) < 0:
+        scale[0] = -scale[0]
+
+    rot = identity()
+    for i in range(3):
+        s = scale[i] if abs(scale[i]) > EPSILON else 1.0
+        rot[i * 4:i * 4 + 3] = [v / s for v in rows[i]]
+
+    return translation(m), rotation_to_euler(rot), scale
+
+
+def determinant3(m):
+    return (m[0] * (m[5] * m[10] - m[6] * m[9])
+            - m[1] * (m[4] * m[10] - m[6] * m[8])
+            + m[2] * (m[4] * m[9] - m[5] * m[8]))
+
+
+def rotation_only(m):
+    """
+    Rotation part of a matrix, without scale and translation
+    """
+    _, r, _ = decompose(m)
+    return rotate_matrix(r)
+
+
+def normalize(v):
+    length = _length(v)
+    if length < EPSILON:
+        return [0.0, 0.0, 0.0]
+    return [c / length for c in v]
+
+
+def cross(a, b):
+    return [a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0]]
+
+
+def dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def frame(primary, secondary):
+    """
+    Orthonormal frame whose first axis is primary and second axis is as close as possible to secondary
+    Returns the three axes
+    """
+    x = normalize(primary)
+    z = normalize(cross(x, secondary))
+    if _length(z) < EPSILON:
+        # Secondary is parallel to primary, use any perpendicular axis
+        other = [0.0, 1.0, 0.0] if abs(x[1]) < 0.9 else [1.0, 0.0, 0.0]
+        z = normalize(cross(x, other))
+    y = cross(z, x)
+    return x, y, z
+
+
+def aim_matrix(aim_vector, up_vector, aim, up):
+    """
+    Rotation matrix that points the local aim_vector along aim, and the local up_vector towards up
+    """
+    local = frame(aim_vector, up_vector)
+    world = frame(aim, up)
+
+    # local_axes * R = world_axes, local_axes is orthonormal so its inverse is the transpose
+    local_m = identity()
+    world_m = identity()
+    for i in range(3):
+        local_m[i * 4:i * 4 + 3] = local[i]
+        world_m[i * 4:i * 4 + 3] = world[i]
+
+    local_t = identity()
+    for i in range(3):
+        for j in range(3):
+            local_t[i * 4 + j] = local_m[j * 4 + i]
+
+    return mult(local_t, world_m)
+
+
+def quaternion(m):
+    """
+    Quaternion (x, y, z, w) of a rotation matrix without scale
+    """
+    trace = m[0] + m[5] + m[10]
+    if trace > 0:
+        s = math.sqrt(trace + 1.0) * 2
+        return [(m[6] - m[9]) / s, (m[8] - m[2]) / s, (m[1] - m[4]) / s, 0.25 * s]
+    if m[0] > m[5] and m[0] > m[10]:
+        s = math.sqrt(1.0 + m[0] - m[5] - m[10]) * 2
+        return [0.25 * s, (m[4] + m[1]) / s, (m[8] + m[2]) / s, (m[6] - m[9]) / s]
+    if m[5] > m[10]:
+        s = math.sqrt(1.0 + m[5] - m[0] - m[10]) * 2
+        return [(m[4] + m[1]) / s, 0.25 * s, (m[9] + m[6]) / s, (m[8] - m[2]) / s]
+    s = math.sqrt(1.0 + m[10] - m[0] - m[5]) * 2
+    return [(m[8] + m[2]) / s, (m[9] + m[6]) / s, 0.25 * s, (m[1] - m[4]) / s]
+
+
+def quaternion_matrix(q):
+    x, y, z, w = normalize_quat(q)
+    return [1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w), 0.0,
+            2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w), 0.0,
+            2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y), 0.0,
+            0.0, 0.0, 0.0, 1.0]
+
+
+def normalize_quat(q):
+    length = math.sqrt(sum(c * c for c in q))
+    if length < EPSILON:
+        return [0.0, 0.0, 0.0, 1.0]
+    return [c / length for c in q]
+
+
+def blend_matrices(matrices, weights):
+    """
+    Weighted blend of transforms, translation and scale are blended linearly, rotation with a normalized quaternion sum
+    """
+    total = sum(weights)
+    if total < EPSILON:
+        return identity()
+    weights = [w / total for w in weights]
+
+    t = [0.0, 0.0, 0.0]
+    s = [0.0, 0.0, 0.0]
+    q = [0.0, 0.0, 0.0, 0.0]
+    reference = None
+    for m, w in zip(matrices, weights):
+        mt, mr, ms = decompose(m)
+        mq = quaternion(rotate_matrix(mr))
+        if reference is None:
+            reference = mq
+        elif dot(reference, mq) < 0:
+            mq = [-c for c in mq]
+
+        t = [a + b * w for a, b in zip(t, mt)]
+        s = [a + b * w for a, b in zip(s, ms)]
+        q = [a + b * w for a, b in zip(q, mq)]
+
+    m = mult(scale_matrix(s), quaternion_matrix(q))
+    m[12:15] = t
+    return m
+
+
+def is_close(a, b, tolerance=1e-6):
+    return all(abs(x - y) <= tolerance for x, y in zip(a, b))
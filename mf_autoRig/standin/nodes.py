@@ -0,0 +1,883 @@
+"""
+Node types of the stand-in backend, with their attributes and computes.
+
+Only the node types and attributes the tool touches are modelled. Unknown attributes are created on use
+for every type except network, unknown node types can't be created.
+Transforms ignore pivots, shear and rotate order (always xyz).
+"""
+import math
+
+from mf_autoRig.standin import mmath
+from mf_autoRig.standin.graph import AttrSpec, NodeType, Plug, register
+
+
+def attr(name, short=None, type='double', default=None, **kwargs):
+    return AttrSpec(name, short, type, default, **kwargs)
+
+
+def compound(name, short, children, multi=False, compute=None, keyable=False):
+    return AttrSpec(name, short, 'compound', None, multi=multi, children=children, compute=compute, keyable=keyable)
+
+
+def vector(name, short, suffixes='XYZ', short_suffixes=None, default=0.0, type='double', multi=False, compute=None,
+           keyable=False, child_names=None):
+    """
+    double3 like attribute, eg. translate with translateX, translateY, translateZ
+    """
+    short_suffixes = short_suffixes or suffixes.lower()
+    if not isinstance(default, (list, tuple)):
+        default = [default] * len(suffixes)
+    if child_names is None:
+        child_names = [(name + s, short + ss) for s, ss in zip(suffixes, short_suffixes)]
+
+    children = [AttrSpec(n, sn, type, float(d), keyable=keyable) for (n, sn), d in zip(child_names, default)]
+    return AttrSpec(name, short, 'compound', None, multi=multi, children=children, compute=compute, keyable=keyable)
+
+
+def matrix(name, short=None, multi=False, compute=None):
+    return AttrSpec(name, short, 'matrix', multi=multi, compute=compute)
+
+
+# EVALUATION HELPERS
+def value(node, name, indices=()):
+    spec = node.find_spec(name)
+    return node.scene.get(Plug(node, spec, indices))
+
+
+def _child_value(node, plug, name):
+    """
+    Value of a sibling attribute of the same array element
+    """
+    spec = node.find_spec(name)
+    return node.scene.get(Plug(node, spec, plug.indices[:spec.depth()]))
+
+
+def elements(node, name, indices=()):
+    spec = node.find_spec(name)
+    return node.element_indices(Plug(node, spec, indices))
+
+
+def local_matrix(node):
+    """
+    scale * rotate * jointOrient * translate
+    """
+    jo = value(node, 'jointOrient') if node.type.is_a('joint') else None
+    return mmath.compose(value(node, 'translate'), value(node, 'rotate'), value(node, 'scale'), jo)
+
+
+def parent_matrix(node):
+    """
+    World matrix of the parent, including the offsetParentMatrix of the node
+    """
+    m = value(node, 'offsetParentMatrix') if node.type.is_a('transform') else mmath.identity()
+    if node.parent is not None and (not node.type.is_a('transform') or value(node, 'inheritsTransform')):
+        m = mmath.mult(m, world_matrix(node.parent))
+    return m
+
+
+def _world_plug(node):
+    return Plug(node, node.type.specs['worldMatrix'], (0,))
+
+
+def world_matrix(node):
+    scene = node.scene
+
+    # Evaluates the ancestors from the root down, pulling a deep hierarchy in one go hits the recursion limit
+    ancestors = []
+    parent = node.parent
+    while parent is not None and not scene.is_cached(_world_plug(parent)):
+        ancestors.append(parent)
+        parent = parent.parent
+    for ancestor in reversed(ancestors):
+        scene.get(_world_plug(ancestor))
+
+    return scene.get(_world_plug(node))
+
+
+def _world(node, plug):
+    if node.type.is_a('transform'):
+        return mmath.mult(local_matrix(node), parent_matrix(node))
+    if node.parent is not None:
+        return world_matrix(node.parent)
+    return mmath.identity()
+
+
+def _world_inverse(node, plug):
+    return mmath.inverse(world_matrix(node))
+
+
+def _parent_world(node, plug):
+    if node.parent is None:
+        return mmath.identity()
+    return world_matrix(node.parent)
+
+
+def _parent_inverse(node, plug):
+    return mmath.inverse(_parent_world(node, plug))
+
+
+def _local(node, plug):
+    return local_matrix(node)
+
+
+def _local_inverse(node, plug):
+    return mmath.inverse(local_matrix(node))
+
+
+# BASE TYPES
+depend_node = register(NodeType('dependNode', lenient=True, attrs=[
+    attr('message', 'msg', 'message'),
+    attr('caching', 'cch', 'bool'),
+    attr('nodeState', 'nds', 'enum'),
+    attr('isHistoricallyInteresting', 'ihi', 'long', 2),
+]))
+
+dag_node = register(NodeType('dagNode', depend_node, dag=True, attrs=[
+    attr('visibility', 'v', 'bool', True, keyable=True),
+    attr('template', 'tmp', 'bool'),
+    attr('intermediateObject', 'io', 'bool'),
+    attr('hiddenInOutliner', 'hio', 'bool'),
+    matrix('worldMatrix', 'wm', multi=True, compute=_world),
+    matrix('worldInverseMatrix', 'wim', multi=True, compute=_world_inverse),
+    matrix('parentMatrix', 'pm', multi=True, compute=_parent_world),
+    matrix('parentInverseMatrix', 'pim', multi=True, compute=_parent_inverse),
+    attr('overrideEnabled', 'ove', 'bool'),
+    attr('overrideDisplayType', 'ovdt', 'enum'),
+    attr('overrideRGBColors', 'ovrgbf', 'bool'),
+    attr('overrideColor', 'ovc', 'byte'),
+    vector('overrideColorRGB', 'ovrgb', 'RGB', 'rgb', type='float',
+           child_names=[('overrideColorR', 'ovcr'), ('overrideColorG', 'ovcg'), ('overrideColorB', 'ovcb')]),
+    attr('useOutlinerColor', 'uoc', 'bool'),
+    vector('outlinerColor', 'oc', 'RGB', 'rgb', type='float',
+           child_names=[('outlinerColorR', 'ocr'), ('outlinerColorG', 'ocg'), ('outlinerColorB', 'ocb')]),
+]))
+
+transform = register(NodeType('transform', dag_node, attrs=[
+    vector('translate', 't', keyable=True),
+    vector('rotate', 'r', keyable=True, type='doubleAngle'),
+    vector('scale', 's', default=1.0, keyable=True),
+    vector('shear', 'sh', ('XY', 'XZ', 'YZ'), ('xy', 'xz', 'yz')),
+    attr('rotateOrder', 'ro', 'enum'),
+    vector('rotateAxis', 'ra', type='doubleAngle'),
+    vector('rotatePivot', 'rp'),
+    vector('scalePivot', 'sp'),
+    attr('inheritsTransform', 'it', 'bool', True),
+    attr('displayLocalAxis', 'dla', 'bool'),
+    matrix('offsetParentMatrix', 'opm'),
+    matrix('matrix', 'm', compute=_local),
+    matrix('inverseMatrix', 'im', compute=_local_inverse),
+    matrix('xformMatrix', 'xm', compute=_local),
+]))
+
+joint = register(NodeType('joint', transform, attrs=[
+    vector('jointOrient', 'jo', type='doubleAngle'),
+    attr('radius', 'radi', default=1.0),
+    attr('segmentScaleCompensate', 'ssc', 'bool', True),
+    vector('inverseScale', 'is', default=1.0),
+    attr('drawStyle', 'ds', 'enum'),
+    attr('side', 'sd', 'enum'),
+    attr('otherType', 'otp', 'string'),
+    vector('preferredAngle', 'pa', type='doubleAngle'),
+    vector('stiffness', 'st'),
+]))
+
+network = register(NodeType('network', depend_node, lenient=False))
+
+
+# SHAPES
+def _curve_world_space(node, plug):
+    world = world_matrix(node)
+    points = value(node, 'controlPoints')
+    return [mmath.transform_point(p, world) for p in points]
+
+
+shape = register(NodeType('shape', dag_node, shape=True))
+
+locator = register(NodeType('locator', shape, attrs=[
+    vector('localPosition', 'lp'),
+    vector('localScale', 'los', default=1.0),
+]))
+
+nurbs_curve = register(NodeType('nurbsCurve', shape, attrs=[
+    vector('controlPoints', 'cp', child_names=[('xValue', 'xv'), ('yValue', 'yv'), ('zValue', 'zv')], multi=True),
+    attr('degree', 'd', 'long', 1),
+    attr('form', 'f', 'enum'),
+    attr('spans', 'sps', 'long'),
+    attr('lineWidth', 'lw', default=-1.0),
+    attr('alwaysDrawOnTop', 'adot', 'bool'),
+    attr('worldSpace', 'ws', 'generic', multi=True, compute=_curve_world_space),
+    attr('local', 'l', 'generic'),
+    attr('create', 'cr', 'generic'),
+]))
+
+nurbs_surface = register(NodeType('nurbsSurface', shape, attrs=[
+    attr('worldSpace', 'ws', 'generic', multi=True),
+    attr('create', 'cr', 'generic'),
+]))
+
+mesh = register(NodeType('mesh', shape, attrs=[
+    vector('pnts', 'pt', child_names=[('pntx', 'px'), ('pnty', 'py'), ('pntz', 'pz')], multi=True),
+    attr('outMesh', 'o', 'generic'),
+    attr('inMesh', 'i', 'generic'),
+    attr('worldMesh', 'w', 'generic', multi=True),
+]))
+
+
+# IK
+ik_handle = register(NodeType('ikHandle', transform, attrs=[
+    attr('startJoint', 'hsj', 'message'),
+    attr('endEffector', 'hee', 'message'),
+    attr('ikSolver', 'hsv', 'message'),
+    vector('poleVector', 'pv', default=[0.0, 0.0, 1.0]),
+    attr('twist', 'twi', 'doubleAngle', keyable=True),
+    attr('stickiness', 'stk', 'enum'),
+    attr('snapEnable', 'snp', 'bool', True),
+]))
+
+ik_effector = register(NodeType('ikEffector', transform, attrs=[
+    attr('handlePath', 'hp', 'message', multi=True),
+]))
+
+ik_solver = register(NodeType('ikSolver', depend_node))
+for _solver in ('ikRPsolver', 'ikSCsolver', 'ikSplineSolver'):
+    register(NodeType(_solver, ik_solver))
+
+
+# CONSTRAINTS
+def _targets(node):
+    """
+    (weight, target world matrix) of every target, maintain offset is already applied
+    """
+    targets = []
+    for i in elements(node, 'target'):
+        weight = value(node, 'targetWeight', (i,))
+        world = value(node, 'targetWorldMatrix', (i,))
+        offset = value(node, 'targetOffsetMatrix', (i,))
+        targets.append((weight, mmath.mult(offset, world)))
+    return targets
+
+
+def _driven_parent(node):
+    """
+    Matrix from the local space of the constrained object to world
+    """
+    return mmath.mult(value(node, 'constraintOffsetParentMatrix'),
+                      mmath.inverse(value(node, 'constraintParentInverseMatrix')))
+
+
+def _local_rotation(node, world_rotation):
+    """
+    Rotate values that give a world rotation, the joint orient of the constrained joint is taken out
+    """
+    parent = mmath.rotation_only(_driven_parent(node))
+    local = mmath.mult(world_rotation, mmath.inverse(parent))
+    jo = value(node, 'constraintJointOrient')
+    if any(jo):
+        local = mmath.mult(local, mmath.inverse(mmath.rotate_matrix(jo)))
+    return mmath.rotation_to_euler(local)
+
+
+def _local_position(node, point):
+    return mmath.transform_point(point, mmath.inverse(_driven_parent(node)))
+
+
+def _parent_constraint(node, plug):
+    targets = _targets(node)
+    if sum(w for w, _ in targets) < mmath.EPSILON:
+        return value(node, 'restTranslate' if plug.spec.name == 'constraintTranslate' else 'restRotate')
+
+    world = mmath.blend_matrices([m for _, m in targets], [w for w, _ in targets])
+    if plug.spec.name == 'constraintTranslate':
+        return _local_position(node, mmath.translation(world))
+    return _local_rotation(node, mmath.rotation_only(world))
+
+
+def _point_constraint(node, plug):
+    targets = _targets(node)
+    total = sum(w for w, _ in targets)
+    if total < mmath.EPSILON:
+        return value(node, 'restTranslate')
+
+    point = [0.0, 0.0, 0.0]
+    for weight, world in targets:
+        point = [p + t * weight / total for p, t in zip(point, mmath.translation(world))]
+
+    local = _local_position(node, point)
+    return [a + b for a, b in zip(local, value(node, 'offset'))]
+
+
+def _orient_constraint(node, plug):
+    targets = _targets(node)
+    if sum(w for w, _ in targets) < mmath.EPSILON:
+        return value(node, 'restRotate')
+
+    world = mmath.blend_matrices([mmath.rotation_only(m) for _, m in targets], [w for w, _ in targets])
+    return _local_rotation(node, mmath.rotation_only(world))
+
+
+# aimConstraint worldUpType enum
+WORLD_UP_TYPES = ('scene', 'object', 'objectrotation', 'vector', 'none')
+
+
+def _aim_constraint(node, plug):
+    targets = _targets(node)
+    total = sum(w for w, _ in targets)
+    if total < mmath.EPSILON:
+        return value(node, 'restRotate')
+
+    point = [0.0, 0.0, 0.0]
+    for weight, world in targets:
+        point = [p + t * weight / total for p, t in zip(point, mmath.translation(world))]
+
+    position = mmath.transform_point(value(node, 'constraintTranslate'), _driven_parent(node))
+    aim = [a - b for a, b in zip(point, position)]
+
+    up_type = WORLD_UP_TYPES[value(node, 'worldUpType')]
+    if up_type == 'scene':
+        up = [0.0, 1.0, 0.0]
+    elif up_type == 'object':
+        up = [a - b for a, b in zip(mmath.translation(value(node, 'worldUpMatrix')), position)]
+    elif up_type == 'objectrotation':
+        up = mmath.transform_vector(value(node, 'worldUpVector'), value(node, 'worldUpMatrix'))
+    elif up_type == 'vector':
+        up = value(node, 'worldUpVector')
+    else:
+        # No up, keep the current up of the aim vector frame
+        up = mmath.transform_vector(value(node, 'upVector'), mmath.rotation_only(_driven_parent(node)))
+
+    rotation = mmath.aim_matrix(value(node, 'aimVector'), value(node, 'upVector'), aim, up)
+    rotation = mmath.mult(mmath.rotate_matrix(value(node, 'offset')), rotation)
+    return _local_rotation(node, rotation)
+
+
+def _pole_vector_constraint(node, plug):
+    targets = _targets(node)
+    total = sum(w for w, _ in targets)
+    if total < mmath.EPSILON:
+        return value(node, 'restTranslate')
+
+    point = [0.0, 0.0, 0.0]
+    for weight, world in targets:
+        point = [p + t * weight / total for p, t in zip(point, mmath.translation(world))]
+
+    start = mmath.translation(value(node, 'pivotSpace'))
+    pole = [a - b for a, b in zip(point, start)]
+    return mmath.transform_vector(pole, value(node, 'constraintParentInverseMatrix'))
+
+
+def _constraint_attrs(compute_translate=None, compute_rotate=None):
+    return [
+        compound('target', 'tg', [
+            attr('targetWeight', 'tw', default=1.0),
+            matrix('targetWorldMatrix', 'twm'),
+            matrix('targetOffsetMatrix', 'tom'),
+        ], multi=True),
+        matrix('constraintParentInverseMatrix', 'cpim'),
+        matrix('constraintOffsetParentMatrix', 'copm'),
+        vector('constraintJointOrient', 'cjo', type='doubleAngle'),
+        vector('constraintTranslate', 'ct', compute=compute_translate),
+        vector('constraintRotate', 'cr', type='doubleAngle', compute=compute_rotate),
+        vector('restTranslate', 'rst'),
+        vector('restRotate', 'rsrr', type='doubleAngle'),
+        vector('offset', 'o'),
+        attr('enableRestPosition', 'erp', 'bool', True),
+        attr('interpType', 'int', 'enum', 1),
+    ]
+
+
+constraint = register(NodeType('constraint', transform))
+
+register(NodeType('parentConstraint', constraint,
+                  attrs=_constraint_attrs(_parent_constraint, _parent_constraint)))
+register(NodeType('pointConstraint', constraint, attrs=_constraint_attrs(_point_constraint)))
+register(NodeType('orientConstraint', constraint, attrs=_constraint_attrs(compute_rotate=_orient_constraint)))
+register(NodeType('aimConstraint', constraint, attrs=_constraint_attrs(compute_rotate=_aim_constraint) + [
+    vector('aimVector', 'a', default=[1.0, 0.0, 0.0]),
+    vector('upVector', 'u', default=[0.0, 1.0, 0.0]),
+    vector('worldUpVector', 'wu', default=[0.0, 1.0, 0.0]),
+    attr('worldUpType', 'wut', 'enum', 3),
+    matrix('worldUpMatrix', 'wum'),
+]))
+register(NodeType('poleVectorConstraint', constraint, attrs=_constraint_attrs(_pole_vector_constraint) + [
+    matrix('pivotSpace', 'ps'),
+]))
+
+
+# MATRIX NODES
+def _mult_matrix(node, plug):
+    out = mmath.identity()
+    for i in elements(node, 'matrixIn'):
+        out = mmath.mult(out, value(node, 'matrixIn', (i,)))
+    return out
+
+
+def _decompose_matrix(node, plug):
+    t, r, s = mmath.decompose(value(node, 'inputMatrix'))
+    name = plug.spec.name
+    if name == 'outputTranslate':
+        return t
+    if name == 'outputRotate':
+        return r
+    if name == 'outputScale':
+        return s
+    if name == 'outputQuat':
+        return mmath.quaternion(mmath.rotate_matrix(r))
+    return [0.0, 0.0, 0.0]
+
+
+def _compose_matrix(node, plug):
+    r = value(node, 'inputRotate')
+    if not value(node, 'useEulerRotation'):
+        rotation = mmath.quaternion_matrix(value(node, 'inputQuat'))
+        r = mmath.rotation_to_euler(rotation)
+    return mmath.compose(value(node, 'inputTranslate'), r, value(node, 'inputScale'))
+
+
+def _inverse_matrix(node, plug):
+    return mmath.inverse(value(node, 'inputMatrix'))
+
+
+def _pick_matrix(node, plug):
+    t, r, s = mmath.decompose(value(node, 'inputMatrix'))
+    if not value(node, 'useTranslate'):
+        t = [0.0, 0.0, 0.0]
+    if not value(node, 'useRotate'):
+        r = [0.0, 0.0, 0.0]
+    if not value(node, 'useScale'):
+        s = [1.0, 1.0, 1.0]
+    return mmath.compose(t, r, s)
+
+
+def _blend_matrix(node, plug):
+    """
+    Every target is blended over the result of the previous ones, the envelope blends the input and the result
+    """
+    base = value(node, 'inputMatrix')
+    result = base
+    for i in elements(node, 'target'):
+        weight = value(node, 'weight', (i,))
+        if weight <= 0:
+            continue
+        target = value(node, 'targetMatrix', (i,))
+        rt, rr, rs = mmath.decompose(result)
+        tt, tr, ts = mmath.decompose(target)
+        wt = weight * value(node, 'translateWeight', (i,))
+        wr = weight * value(node, 'rotateWeight', (i,))
+        ws = weight * value(node, 'scaleWeight', (i,))
+        t = [a + (b - a) * wt for a, b in zip(rt, tt)]
+        s = [a + (b - a) * ws for a, b in zip(rs, ts)]
+        rotation = mmath.blend_matrices([mmath.rotate_matrix(rr), mmath.rotate_matrix(tr)], [1.0 - wr, wr])
+        result = mmath.compose(t, mmath.rotation_to_euler(rotation), s)
+
+    envelope = value(node, 'envelope')
+    if envelope >= 1.0:
+        return result
+    return mmath.blend_matrices([base, result], [1.0 - envelope, envelope])
+
+
+register(NodeType('multMatrix', depend_node, attrs=[
+    matrix('matrixIn', 'i', multi=True),
+    matrix('matrixSum', 'o', compute=_mult_matrix),
+]))
+
+register(NodeType('decomposeMatrix', depend_node, attrs=[
+    matrix('inputMatrix', 'imat'),
+    attr('inputRotateOrder', 'ro', 'enum'),
+    vector('outputTranslate', 'ot', compute=_decompose_matrix),
+    vector('outputRotate', 'or', type='doubleAngle', compute=_decompose_matrix),
+    vector('outputScale', 'os', compute=_decompose_matrix),
+    vector('outputShear', 'osh', compute=_decompose_matrix),
+    vector('outputQuat', 'oq', 'XYZW', compute=_decompose_matrix),
+]))
+
+def _four_by_four_matrix(node, plug):
+    return [value(node, f'in{row}{column}') for row in range(4) for column in range(4)]
+
+
+register(NodeType('fourByFourMatrix', depend_node, attrs=[
+    *[attr(f'in{row}{column}', f'i{row}{column}', default=float(row == column))
+      for row in range(4) for column in range(4)],
+    matrix('output', 'o', compute=_four_by_four_matrix),
+]))
+
+register(NodeType('composeMatrix', depend_node, attrs=[
+    vector('inputTranslate', 'it'),
+    vector('inputRotate', 'ir', type='doubleAngle'),
+    vector('inputScale', 'is', default=1.0),
+    vector('inputShear', 'ish'),
+    vector('inputQuat', 'iq', 'XYZW', default=[0.0, 0.0, 0.0, 1.0]),
+    attr('useEulerRotation', 'uer', 'bool', True),
+    matrix('outputMatrix', 'omat', compute=_compose_matrix),
+]))
+
+register(NodeType('inverseMatrix', depend_node, attrs=[
+    matrix('inputMatrix', 'imat'),
+    matrix('outputMatrix', 'omat', compute=_inverse_matrix),
+]))
+
+register(NodeType('pickMatrix', depend_node, attrs=[
+    matrix('inputMatrix', 'imat'),
+    attr('useTranslate', 'ut', 'bool', True),
+    attr('useRotate', 'ur', 'bool', True),
+    attr('useScale', 'us', 'bool', True),
+    attr('useShear', 'ush', 'bool', True),
+    matrix('outputMatrix', 'omat', compute=_pick_matrix),
+]))
+
+register(NodeType('blendMatrix', depend_node, attrs=[
+    matrix('inputMatrix', 'imat'),
+    attr('envelope', 'env', default=1.0),
+    compound('target', 'tgt', [
+        matrix('targetMatrix', 'tmat'),
+        attr('weight', 'wgt', default=1.0),
+        attr('useMatrix', 'umt', 'bool', True),
+        attr('translateWeight', 'tw', default=1.0),
+        attr('rotateWeight', 'rw', default=1.0),
+        attr('scaleWeight', 'sw', default=1.0),
+        attr('shearWeight', 'shw', default=1.0),
+    ], multi=True),
+    matrix('outputMatrix', 'omat', compute=_blend_matrix),
+]))
+
+
+# QUATERNION NODES, the quatNodes plugin
+def _quat_normalize(node, plug):
+    return mmath.normalize_quat(value(node, 'inputQuat'))
+
+
+def _quat_to_euler(node, plug):
+    rotation = mmath.quaternion_matrix(value(node, 'inputQuat'))
+    return mmath.rotation_to_euler(rotation, int(value(node, 'inputRotateOrder')))
+
+
+register(NodeType('quatNormalize', depend_node, attrs=[
+    vector('inputQuat', 'iq', 'XYZW'),
+    vector('outputQuat', 'oq', 'XYZW', compute=_quat_normalize),
+]))
+
+register(NodeType('quatToEuler', depend_node, attrs=[
+    vector('inputQuat', 'iq', 'XYZW', default=[0.0, 0.0, 0.0, 1.0]),
+    attr('inputRotateOrder', 'iro', 'enum'),
+    vector('outputRotate', 'or', type='doubleAngle', compute=_quat_to_euler),
+]))
+
+
+# UTILITY NODES
+def _multiply_divide(node, plug):
+    operation = value(node, 'operation')
+    out = []
+    for a, b in zip(value(node, 'input1'), value(node, 'input2')):
+        if operation == 1:
+            out.append(a * b)
+        elif operation == 2:
+            out.append(a / b if b else 0.0)
+        elif operation == 3:
+            out.append(a ** b if a >= 0 or float(b).is_integer() else 0.0)
+        else:
+            out.append(a)
+    return out
+
+
+def _plus_minus_average(node, plug):
+    operation = value(node, 'operation')
+
+    def combine(values):
+        if not values:
+            return 0.0
+        if operation == 2:
+            return values[0] - sum(values[1:])
+        if operation == 3:
+            return sum(values) / len(values)
+        if operation == 0:
+            return values[0]
+        return sum(values)
+
+    if plug.spec.name == 'output1D':
+        return combine([value(node, 'input1D', (i,)) for i in elements(node, 'input1D')])
+
+    name, size = ('input3D', 3) if plug.spec.name == 'output3D' else ('input2D', 2)
+    inputs = [value(node, name, (i,)) for i in elements(node, name)]
+    return [combine([v[axis] for v in inputs]) for axis in range(size)]
+
+
+def _reverse(node, plug):
+    return [1.0 - v for v in value(node, 'input')]
+
+
+CONDITION_OPERATIONS = (
+    lambda a, b: a == b,
+    lambda a, b: a != b,
+    lambda a, b: a > b,
+    lambda a, b: a >= b,
+    lambda a, b: a < b,
+    lambda a, b: a <= b,
+)
+
+
+def _condition(node, plug):
+    operation = CONDITION_OPERATIONS[value(node, 'operation')]
+    if operation(value(node, 'firstTerm'), value(node, 'secondTerm')):
+        return value(node, 'colorIfTrue')
+    return value(node, 'colorIfFalse')
+
+
+def _choice(node, plug):
+    selector = value(node, 'selector')
+    if selector not in elements(node, 'input'):
+        return 0.0
+    return value(node, 'input', (selector,))
+
+
+def _distance_between(node, plug):
+    p1 = mmath.transform_point(value(node, 'point1'), value(node, 'inMatrix1'))
+    p2 = mmath.transform_point(value(node, 'point2'), value(node, 'inMatrix2'))
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(p1, p2)))
+
+
+def _remap(x, in_min, in_max, out_min, out_max):
+    if in_max == in_min:
+        t = 0.0
+    else:
+        t = min(max((x - in_min) / (in_max - in_min), 0.0), 1.0)
+    return out_min + (out_max - out_min) * t
+
+
+def _remap_value(node, plug):
+    args = [value(node, name) for name in ('inputMin', 'inputMax', 'outputMin', 'outputMax')]
+    if plug.spec.name == 'outColor':
+        return [_remap(value(node, 'inputValue'), *args)] * 3
+    return _remap(value(node, 'inputValue'), *args)
+
+
+def _mult_double_linear(node, plug):
+    return value(node, 'input1') * value(node, 'input2')
+
+
+def _add_double_linear(node, plug):
+    return value(node, 'input1') + value(node, 'input2')
+
+
+def _blend_colors(node, plug):
+    blender = value(node, 'blender')
+    return [a * blender + b * (1.0 - blender) for a, b in zip(value(node, 'color1'), value(node, 'color2'))]
+
+
+def _clamp(node, plug):
+    return [min(max(v, lo), hi) for v, lo, hi in zip(value(node, 'input'), value(node, 'min'), value(node, 'max'))]
+
+
+def _set_range(node, plug):
+    args = [value(node, name) for name in ('value', 'oldMin', 'oldMax', 'min', 'max')]
+    return [_remap(*channel) for channel in zip(*args)]
+
+
+def _vector_product(node, plug):
+    operation = value(node, 'operation')
+    a = value(node, 'input1')
+    b = value(node, 'input2')
+    if operation == 1:
+        out = [mmath.dot(a, b)] * 3
+    elif operation == 2:
+        out = mmath.cross(a, b)
+    elif operation == 3:
+        out = mmath.transform_vector(a, value(node, 'matrix'))
+    elif operation == 4:
+        out = mmath.transform_point(a, value(node, 'matrix'))
+    else:
+        out = list(a)
+    if value(node, 'normalizeOutput') and operation != 1:
+        out = mmath.normalize(out)
+    return out
+
+
+def _curve_info(node, plug):
+    points = value(node, 'inputCurve')
+    if not isinstance(points, list) or len(points) < 2:
+        return 0.0
+    return sum(math.sqrt(sum((a - b) ** 2 for a, b in zip(p, q))) for p, q in zip(points, points[1:]))
+
+
+register(NodeType('multiplyDivide', depend_node, attrs=[
+    attr('operation', 'op', 'enum', 1),
+    vector('input1', 'i1', keyable=True),
+    vector('input2', 'i2', default=1.0, keyable=True),
+    vector('output', 'o', compute=_multiply_divide),
+]))
+
+register(NodeType('plusMinusAverage', depend_node, attrs=[
+    attr('operation', 'op', 'enum', 1),
+    attr('input1D', 'i1', multi=True),
+    vector('input2D', 'i2', 'xy', multi=True, child_names=[('input2Dx', 'i2x'), ('input2Dy', 'i2y')]),
+    vector('input3D', 'i3', 'xyz', multi=True,
+           child_names=[('input3Dx', 'i3x'), ('input3Dy', 'i3y'), ('input3Dz', 'i3z')]),
+    attr('output1D', 'o1', compute=_plus_minus_average),
+    vector('output2D', 'o2', 'xy', compute=_plus_minus_average,
+           child_names=[('output2Dx', 'o2x'), ('output2Dy', 'o2y')]),
+    vector('output3D', 'o3', 'xyz', compute=_plus_minus_average,
+           child_names=[('output3Dx', 'o3x'), ('output3Dy', 'o3y'), ('output3Dz', 'o3z')]),
+]))
+
+register(NodeType('reverse', depend_node, attrs=[
+    vector('input', 'i'),
+    vector('output', 'o', compute=_reverse),
+]))
+
+register(NodeType('condition', depend_node, attrs=[
+    attr('operation', 'op', 'enum'),
+    attr('firstTerm', 'ft'),
+    attr('secondTerm', 'st'),
+    vector('colorIfTrue', 'ct', 'RGB', 'rgb', default=0.0),
+    vector('colorIfFalse', 'cf', 'RGB', 'rgb', default=1.0),
+    vector('outColor', 'oc', 'RGB', 'rgb', compute=_condition),
+]))
+
+register(NodeType('choice', depend_node, attrs=[
+    attr('selector', 's', 'long'),
+    attr('input', 'i', 'generic', multi=True),
+    attr('output', 'o', 'generic', compute=_choice),
+]))
+
+register(NodeType('distanceBetween', depend_node, attrs=[
+    vector('point1', 'p1'),
+    vector('point2', 'p2'),
+    matrix('inMatrix1', 'im1'),
+    matrix('inMatrix2', 'im2'),
+    attr('distance', 'd', compute=_distance_between),
+]))
+
+register(NodeType('remapValue', depend_node, attrs=[
+    attr('inputValue', 'i'),
+    attr('inputMin', 'imn'),
+    attr('inputMax', 'imx', default=1.0),
+    attr('outputMin', 'omn'),
+    attr('outputMax', 'omx', default=1.0),
+    attr('outValue', 'ov', compute=_remap_value),
+    vector('outColor', 'oc', 'RGB', 'rgb', compute=_remap_value),
+]))
+
+register(NodeType('multDoubleLinear', depend_node, attrs=[
+    attr('input1', 'i1'),
+    attr('input2', 'i2'),
+    attr('output', 'o', compute=_mult_double_linear),
+]))
+
+register(NodeType('addDoubleLinear', depend_node, attrs=[
+    attr('input1', 'i1'),
+    attr('input2', 'i2'),
+    attr('output', 'o', compute=_add_double_linear),
+]))
+
+register(NodeType('blendColors', depend_node, attrs=[
+    attr('blender', 'b', default=0.5),
+    vector('color1', 'c1', 'RGB', 'rgb', default=[1.0, 0.0, 0.0]),
+    vector('color2', 'c2', 'RGB', 'rgb', default=[0.0, 0.0, 1.0]),
+    vector('output', 'op', 'RGB', 'rgb', compute=_blend_colors),
+]))
+
+register(NodeType('clamp', depend_node, attrs=[
+    vector('min', 'mn', 'RGB', 'rgb'),
+    vector('max', 'mx', 'RGB', 'rgb'),
+    vector('input', 'ip', 'RGB', 'rgb'),
+    vector('output', 'op', 'RGB', 'rgb', compute=_clamp),
+]))
+
+register(NodeType('setRange', depend_node, attrs=[
+    vector('value', 'v'),
+    vector('min', 'n'),
+    vector('max', 'm'),
+    vector('oldMin', 'on'),
+    vector('oldMax', 'om'),
+    vector('outValue', 'o', compute=_set_range),
+]))
+
+register(NodeType('vectorProduct', depend_node, attrs=[
+    attr('operation', 'op', 'enum', 1),
+    vector('input1', 'i1'),
+    vector('input2', 'i2'),
+    matrix('matrix', 'm'),
+    attr('normalizeOutput', 'no', 'bool'),
+    vector('output', 'o', compute=_vector_product),
+]))
+
+register(NodeType('curveInfo', depend_node, attrs=[
+    attr('inputCurve', 'ic', 'generic'),
+    attr('arcLength', 'al', compute=_curve_info),
+]))
+
+
+# ANIMATION
+def _anim_curve(node, plug):
+    """
+    Linear interpolation of the keys, constant outside of them
+    """
+    keys = sorted(node.data.get('keys', {}).items())
+    if not keys:
+        return 0.0
+
+    x = value(node, 'input')
+    if x <= keys[0][0]:
+        return keys[0][1]
+    if x >= keys[-1][0]:
+        return keys[-1][1]
+    for (x0, y0), (x1, y1) in zip(keys, keys[1:]):
+        if x0 <= x <= x1:
+            return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+    return keys[-1][1]
+
+
+anim_curve = register(NodeType('animCurve', depend_node, attrs=[
+    attr('input', 'i'),
+    attr('output', 'o', compute=_anim_curve),
+]))
+for _curve_type in ('animCurveUU', 'animCurveUA', 'animCurveUL', 'animCurveTL', 'animCurveTA', 'animCurveTU'):
+    register(NodeType(_curve_type, anim_curve))
+
+
+# DEFORMERS
+def _cluster_point(node, plug):
+    """
+    Original point moved by the handle: point * inverse(rest handle matrix) * handle matrix, in the shape space
+    """
+    index = plug.indices[0]
+    point = node.data.get('points', {}).get(index)
+    if point is None:
+        return [0.0, 0.0, 0.0]
+
+    geometry = value(node, 'geomMatrix')
+    world = mmath.transform_point(point, geometry)
+    deformation = mmath.mult(value(node, 'bindPreMatrix'), value(node, 'matrix'))
+    return mmath.transform_point(mmath.transform_point(world, deformation), mmath.inverse(geometry))
+
+
+geometry_filter = register(NodeType('geometryFilter', depend_node, attrs=[
+    attr('envelope', 'en', default=1.0),
+]))
+
+register(NodeType('cluster', geometry_filter, attrs=[
+    matrix('matrix', 'ma'),
+    matrix('bindPreMatrix', 'pm'),
+    matrix('geomMatrix', 'gm'),
+    vector('outputPoint', 'opt', compute=_cluster_point, multi=True),
+]))
+
+register(NodeType('clusterHandle', shape))
+
+register(NodeType('skinCluster', geometry_filter, attrs=[
+    matrix('matrix', 'ma', multi=True),
+    matrix('bindPreMatrix', 'pm', multi=True),
+]))
+
+register(NodeType('tweak', geometry_filter))
+
+register(NodeType('uvPin', depend_node, attrs=[
+    attr('deformedGeometry', 'dg', 'generic'),
+    attr('originalGeometry', 'og', 'generic'),
+    compound('coordinate', 'c', [attr('coordinateU', 'cu'), attr('coordinateV', 'cv')], multi=True),
+    matrix('outputMatrix', 'om', multi=True),
+]))
+
+
+# CREATION HISTORY
+for _history in ('makeNurbCircle', 'makeNurbPlane', 'polyPlane', 'closestPointOnMesh', 'objectSet', 'groupId',
+                 'groupParts', 'unitConversion', 'time', 'reference'):
+    register(NodeType(_history, depend_node))
@@ -0,0 +1,985 @@
+"""
+Stand-in for pymel.core.nodetypes: PyNode, Attribute and Component on top of the stand-in scene.
+
+Like pymel, nodes and attributes behave as strings (name, replace, +...), every registered node type
+gets a class named after it (nurbsCurve -> NurbsCurve) and transforms forward unknown attributes to their shape.
+"""
+from mf_autoRig.standin import commands
+from mf_autoRig.standin import datatypes as dt
+from mf_autoRig.standin import mmath
+from mf_autoRig.standin.graph import NODE_TYPES, NUMERIC_TYPES, GraphError, Node, Plug
+
+
+class MayaObjectError(TypeError):
+    pass
+
+
+class MayaNodeError(MayaObjectError):
+    pass
+
+
+class MayaAttributeError(MayaObjectError, AttributeError):
+    pass
+
+
+# String methods forwarded to the name, pymel's ProxyUnicode does the same
+_STR_METHODS = ('replace', 'split', 'rsplit', 'startswith', 'endswith', 'lower', 'upper', 'strip', 'lstrip', 'rstrip',
+                'find', 'rfind', 'count', 'partition', 'rpartition', 'format', 'isdigit', 'zfill')
+
+
+def _proxy(method):
+    def func(self, *args, **kwargs):
+        return getattr(str(self), method)(*args, **kwargs)
+    func.__name__ = method
+    return func
+
+
+def wrap(obj):
+    """
+    PyNode for a graph Node or Plug
+    """
+    if obj is None:
+        return None
+    if isinstance(obj, Plug):
+        return Attribute(obj)
+    return _node_class(obj.type)._wrap(obj)
+
+
+def to_node(obj):
+    """
+    Graph Node of a PyNode, graph Node or name
+    """
+    if isinstance(obj, Node):
+        return obj
+    if isinstance(obj, Attribute):
+        return obj._plug.node
+    if isinstance(obj, PyNode):
+        return obj._node
+    node = commands.scene.find(str(obj))
+    if node is None:
+        raise MayaNodeError(f"No object matches name: {obj}")
+    return node
+
+
+def to_plug(obj):
+    if isinstance(obj, Attribute):
+        return obj._plug
+    if isinstance(obj, Plug):
+        return obj
+    return Attribute(str(obj))._plug
+
+
+class PyNode:
+    """
+    Base of every node and attribute, PyNode('name') returns the right subclass
+    """
+    def __new__(cls, *args, **kwargs):
+        if not args:
+            raise MayaNodeError("PyNode needs a name or an object")
+        obj = args[0]
+
+        if isinstance(obj, PyNode):
+            return obj
+        if isinstance(obj, (Node, Plug)):
+            return wrap(obj)
+
+        name = str(obj)
+        if '.' in name:
+            node_name, attr = name.split('.', 1)
+            if attr.split('[')[0] in Component.KINDS:
+                return Component(name)
+            return Attribute(name)
+
+        node = commands.scene.find(name)
+        if node is None:
+            raise MayaNodeError(f"No object matches name: {name}")
+        return wrap(node)
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def _wrap(cls, node):
+        obj = object.__new__(cls)
+        obj._node = node
+        return obj
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self.attr(name)
+
+    # STRING BEHAVIOUR
+    def __str__(self):
+        return self.name()
+
+    def __repr__(self):
+        return f"nt.{type(self).__name__}({self.name()!r})"
+
+    def __add__(self, other):
+        return str(self) + str(other)
+
+    def __radd__(self, other):
+        return str(other) + str(self)
+
+    def __len__(self):
+        return len(str(self))
+
+    def __contains__(self, item):
+        return item in str(self)
+
+    def __eq__(self, other):
+        if isinstance(other, PyNode):
+            return type(other) is not Attribute and self._node is other._node
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(id(self._node))
+
+
+for _method in _STR_METHODS:
+    setattr(PyNode, _method, _proxy(_method))
+
+
+class DependNode(PyNode):
+    def _check(self):
+        if not self._node.alive:
+            raise MayaNodeError(f"Object {self._node.name} doesn't exist anymore")
+        return self._node
+
+    def name(self, long=False):
+        return self._node.name
+
+    def nodeName(self):
+        return self._node.name
+
+    def longName(self):
+        return self._node.name
+
+    shortName = nodeName
+
+    def type(self):
+        return self._node.type.name
+
+    nodeType = type
+
+    def exists(self):
+        return self._node.alive
+
+    def rename(self, name):
+        commands.scene.rename(self._check(), name)
+        return self
+
+    def uuid(self):
+        return self._node.uuid
+
+    def isReferenced(self):
+        return False
+
+    # ATTRIBUTES
+    def attr(self, name):
+        node = self._check()
+        try:
+            return Attribute(node.plug(name))
+        except GraphError:
+            raise MayaAttributeError(f"Maya Attribute does not exist (or is not unique): '{node.name}.{name}'") from None
+
+    def hasAttr(self, name, checkShape=True):
+        try:
+            self._node.plug(name, create=False)
+            return True
+        except GraphError:
+            return False
+
+    def addAttr(self, name, **kwargs):
+        from mf_autoRig.standin import core
+        core.addAttr(self, longName=name, **kwargs)
+
+    def deleteAttr(self, name):
+        self._check().delete_attr(name)
+
+    def listAttr(self, userDefined=False, ud=False, keyable=False, k=False, **kwargs):
+        node = self._check()
+        specs = node.dynamic_order if (userDefined or ud) else node.attr_specs()
+        plugs = [Attribute(Plug(node, spec)) for spec in specs if not spec.implicit]
+        if keyable or k:
+            plugs = [p for p in plugs if p.isKeyable()]
+        return plugs
+
+    # CONNECTIONS
+    def listConnections(self, **kwargs):
+        return list_connections([self], **kwargs)
+
+    connections = listConnections
+
+    def inputs(self, **kwargs):
+        return list_connections([self], source=True, destination=False, **kwargs)
+
+    def outputs(self, **kwargs):
+        return list_connections([self], source=False, destination=True, **kwargs)
+
+
+class Network(DependNode):
+    pass
+
+
+class DagNode(DependNode):
+    def longName(self):
+        return self._node.long_name()
+
+    fullPath = longName
+
+    def getParent(self, generations=1):
+        node = self._check()
+        for _ in range(generations):
+            node = node.parent
+            if node is None:
+                return None
+        return wrap(node)
+
+    def getChildren(self, type=None, **kwargs):
+        return self.listRelatives(children=True, type=type, **kwargs)
+
+    def listRelatives(self, **kwargs):
+        from mf_autoRig.standin import core
+        return core.listRelatives(self, **kwargs)
+
+    def getAllParents(self):
+        return [wrap(node) for node in self._check().ancestors()]
+
+    def root(self):
+        node = self._check()
+        for node in node.ancestors():
+            pass
+        return wrap(node)
+
+    def setParent(self, *args, **kwargs):
+        from mf_autoRig.standin import core
+        return core.parent(self, *args, **kwargs)
+
+    def hide(self):
+        self.visibility.set(False)
+
+    def show(self):
+        self.visibility.set(True)
+
+    def isVisible(self):
+        node = self._check()
+        return all(n.get('visibility') for n in [node] + list(node.ancestors()))
+
+
+class Transform(DagNode):
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        node = self._check()
+        try:
+            return Attribute(node.plug(name, create=False))
+        except GraphError:
+            pass
+
+        # Like pymel, attributes and methods of the shape can be used from the transform
+        shape = self.getShape()
+        if shape is not None:
+            if hasattr(type(shape), name):
+                return getattr(shape, name)
+            try:
+                return Attribute(shape._node.plug(name, create=False))
+            except GraphError:
+                pass
+
+        return self.attr(name)
+
+    def getShape(self, **kwargs):
+        shapes = self.getShapes()
+        return shapes[0] if shapes else None
+
+    def getShapes(self, **kwargs):
+        return [wrap(node) for node in commands.get_shapes(self._check()) if not node.get('intermediateObject')]
+
+    # TRANSFORMS
+    def getTranslation(self, space='object', worldSpace=False):
+        node = self._check()
+        if worldSpace or space == 'world':
+            return dt.Vector(commands.world_translation(node))
+        return dt.Vector(node.get('translate'))
+
+    def setTranslation(self, vector, space='object', worldSpace=False):
+        node = self._check()
+        if worldSpace or space == 'world':
+            commands.set_world_translation(node, list(vector))
+        else:
+            commands.set_channel(node, 'translate', list(vector))
+
+    def getRotation(self, space='object', worldSpace=False):
+        node = self._check()
+        if worldSpace or space == 'world':
+            return dt.EulerRotation(commands.world_rotation(node))
+        return dt.EulerRotation(node.get('rotate'))
+
+    def setRotation(self, rotation, space='object', worldSpace=False):
+        from mf_autoRig.standin import core
+        core.xform(self, rotation=list(rotation), worldSpace=worldSpace or space == 'world')
+
+    def getScale(self):
+        return list(self._check().get('scale'))
+
+    def setScale(self, scale):
+        commands.set_channel(self._check(), 'scale', list(scale))
+
+    def getMatrix(self, worldSpace=False, objectSpace=False):
+        node = self._check()
+        if worldSpace:
+            return dt.Matrix(commands.world_matrix(node))
+        return dt.Matrix(commands.local_matrix(node))
+
+    def setMatrix(self, matrix, worldSpace=False, objectSpace=False):
+        node = self._check()
+        values = dt.Matrix(matrix).flat()
+        if worldSpace:
+            commands.set_world_matrix(node, values)
+        else:
+            commands.set_local_matrix(node, values)
+
+    def getRotatePivot(self, space='object', worldSpace=False):
+        return self.getTranslation(space, worldSpace) if (worldSpace or space == 'world') else dt.Vector()
+
+
+class Joint(Transform):
+    def getRadius(self):
+        return self.radius.get()
+
+    def setRadius(self, radius):
+        self.radius.set(radius)
+
+    def getOrientation(self):
+        return dt.EulerRotation(self._check().get('jointOrient'))
+
+    def setOrientation(self, rotation):
+        commands.set_channel(self._check(), 'jointOrient', list(rotation))
+
+
+class Constraint(Transform):
+    def getWeightAliasList(self):
+        return [Attribute(plug) for plug in commands.constraint_weights(self._check())]
+
+    def getTargetList(self):
+        return [wrap(node) for node in commands.constraint_targets(self._check())]
+
+    def getWeight(self, target):
+        target = to_node(target)
+        for node, weight in zip(commands.constraint_targets(self._check()), self.getWeightAliasList()):
+            if node is target:
+                return weight.get()
+        raise MayaNodeError(f"{target.name} is not a target of {self}")
+
+    def setWeight(self, weight, *targets):
+        targets = [to_node(t) for t in targets] or commands.constraint_targets(self._check())
+        for node, plug in zip(commands.constraint_targets(self._check()), self.getWeightAliasList()):
+            if node in targets:
+                plug.set(weight)
+
+
+class ParentConstraint(Constraint):
+    pass
+
+
+class PointConstraint(Constraint):
+    pass
+
+
+class OrientConstraint(Constraint):
+    pass
+
+
+class AimConstraint(Constraint):
+    pass
+
+
+class PoleVectorConstraint(PointConstraint):
+    pass
+
+
+class IkHandle(Transform):
+    def getStartJoint(self):
+        return self.startJoint.get()
+
+    def getEndEffector(self):
+        return self.endEffector.get()
+
+    def getSolver(self):
+        return self.ikSolver.get()
+
+
+class Shape(DagNode):
+    pass
+
+
+class NurbsCurve(Shape):
+    @property
+    def cv(self):
+        return Component(self, 'cv')
+
+    def numCVs(self):
+        return len(commands.curve_points(self._check()))
+
+    def numSpans(self):
+        return self.spans.get()
+
+    def degree(self):
+        return self._check().get('degree')
+
+    def form(self):
+        return ('open', 'closed', 'periodic')[self._check().get('form')]
+
+    def getCVs(self, space='preTransform'):
+        node = self._check()
+        points = commands.curve_points(node)
+        if space == 'world':
+            world = commands.world_matrix(node)
+            points = [mmath.transform_point(p, world) for p in points]
+        return [dt.Point(p) for p in points]
+
+    def setCVs(self, points, space='preTransform'):
+        node = self._check()
+        points = [list(p) for p in points]
+        if space == 'world':
+            inverse = mmath.inverse(commands.world_matrix(node))
+            points = [mmath.transform_point(p, inverse) for p in points]
+        commands.set_curve(node, points, node.get('degree'), node.get('form') == 2)
+
+    def getCV(self, index, space='preTransform'):
+        return self.getCVs(space)[index]
+
+    def setCV(self, index, point, space='preTransform'):
+        Component(self, 'cv', [index]).setPosition(point, space)
+
+    def updateCurve(self):
+        pass
+
+
+class Mesh(Shape):
+    @property
+    def vtx(self):
+        return Component(self, 'vtx')
+
+    def numVertices(self):
+        return len(self._check().element_indices(self._node.plug('pnts')))
+
+
+class Locator(Shape):
+    pass
+
+
+class ClusterHandle(Shape):
+    pass
+
+
+# Node type name: python class, filled for every registered node type
+_CLASSES = {
+    'dependNode': DependNode,
+    'network': Network,
+    'dagNode': DagNode,
+    'transform': Transform,
+    'joint': Joint,
+    'constraint': Constraint,
+    'parentConstraint': ParentConstraint,
+    'pointConstraint': PointConstraint,
+    'orientConstraint': OrientConstraint,
+    'aimConstraint': AimConstraint,
+    'poleVectorConstraint': PoleVectorConstraint,
+    'ikHandle': IkHandle,
+    'shape': Shape,
+    'nurbsCurve': NurbsCurve,
+    'mesh': Mesh,
+    'locator': Locator,
+    'clusterHandle': ClusterHandle,
+}
+
+
+def class_name(type_name):
+    return type_name[0].upper() + type_name[1:]
+
+
+def _node_class(node_type):
+    cls = _CLASSES.get(node_type.name)
+    if cls is None:
+        base = _node_class(node_type.parent) if node_type.parent is not None else DependNode
+        cls = type(class_name(node_type.name), (base,), {})
+        _CLASSES[node_type.name] = cls
+        globals()[cls.__name__] = cls
+    return cls
+
+
+def _register_classes():
+    for cls in list(_CLASSES.values()):
+        globals()[cls.__name__] = cls
+    for node_type in NODE_TYPES.values():
+        _node_class(node_type)
+
+
+# ATTRIBUTES
+class Attribute(PyNode):
+    """
+    A plug of a node, Attribute('node.attr') or node.attr
+    """
+    def __new__(cls, *args, **kwargs):
+        obj = args[0]
+        if isinstance(obj, Attribute):
+            return obj
+
+        if isinstance(obj, Plug):
+            plug = obj
+        else:
+            name = str(obj)
+            if '.' not in name:
+                raise MayaAttributeError(f"Invalid attribute name: {name}")
+            node_name, path = name.split('.', 1)
+            node = commands.scene.find(node_name)
+            if node is None:
+                raise MayaNodeError(f"No object matches name: {node_name}")
+            try:
+                plug = node.plug(path)
+            except GraphError:
+                raise MayaAttributeError(f"Maya Attribute does not exist: {name}") from None
+
+        self = object.__new__(Attribute)
+        self._plug = plug
+        return self
+
+    @property
+    def _node(self):
+        return self._plug.node
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        spec = self._plug.spec.find_child(name)
+        if spec is None:
+            raise MayaAttributeError(f"{self} has no child attribute {name}")
+
+        indices = self._plug.indices
+        if self._plug.spec.multi and not self._plug.is_indexed():
+            raise MayaAttributeError(f"{self} is an array, pick an element before the child {name}")
+        return Attribute(Plug(self._plug.node, spec, indices))
+
+    def __getitem__(self, index):
+        try:
+            return Attribute(self._plug.element(index))
+        except GraphError as e:
+            raise TypeError(str(e)) from None
+
+    def __iter__(self):
+        if not self.isMulti() or self._plug.is_indexed():
+            raise TypeError(f"{self} is not a multi attribute")
+        for i in self.getArrayIndices():
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, Attribute):
+            return self._plug == other._plug
+        if isinstance(other, str):
+            return str(self) == other
+        return False
+
+    def __hash__(self):
+        return hash(self._plug)
+
+    def __rshift__(self, other):
+        self.connect(other, force=True)
+
+    def __floordiv__(self, other):
+        self.disconnect(other)
+
+    def __repr__(self):
+        return f"Attribute({self.name()!r})"
+
+    # NAMES
+    def name(self, includeNode=True, longName=True, fullAttrPath=False, fullDagPath=False):
+        path = self._plug.path(long=longName)
+        return f'{self._plug.node.name}.{path}' if includeNode else path
+
+    def plugAttr(self, longName=False, fullPath=False):
+        if fullPath:
+            return self._plug.path(long=longName)
+        spec = self._plug.spec
+        name = spec.name if longName else spec.short
+        if spec.multi and self._plug.is_indexed():
+            name += f'[{self._plug.indices[-1]}]'
+        return name
+
+    def longName(self, fullPath=False):
+        return self.plugAttr(longName=True, fullPath=fullPath)
+
+    def shortName(self, fullPath=False):
+        return self.plugAttr(longName=False, fullPath=fullPath)
+
+    def attrName(self, longName=False, includeNode=False):
+        name = self._plug.spec.name if longName else self._plug.spec.short
+        return f'{self._plug.node.name}.{name}' if includeNode else name
+
+    def nodeName(self):
+        return self._plug.node.name
+
+    def node(self):
+        return wrap(self._plug.node)
+
+    plugNode = node
+
+    def exists(self):
+        return self._plug.node.alive
+
+    def type(self):
+        spec = self._plug.spec
+        if spec.children:
+            types = {child.type for child in spec.children}
+            if len(spec.children) == 3 and types <= set(NUMERIC_TYPES):
+                return 'float3' if types == {'float'} else 'double3'
+            return 'TdataCompound'
+        if spec.type == 'generic':
+            return 'typed'
+        return spec.type
+
+    # STRUCTURE
+    def isMulti(self):
+        return self._plug.spec.multi
+
+    isArray = isMulti
+
+    def isCompound(self):
+        return bool(self._plug.spec.children)
+
+    def isElement(self):
+        return self._plug.spec.multi and self._plug.is_indexed()
+
+    def isChild(self):
+        return self._plug.spec.parent is not None
+
+    def index(self):
+        return self._plug.index()
+
+    def array(self):
+        return Attribute(self._plug.array())
+
+    def parent(self):
+        parent = self._plug.parent()
+        return Attribute(parent) if parent is not None else None
+
+    getParent = parent
+
+    def getChildren(self):
+        return [Attribute(plug) for plug in self._plug.children()]
+
+    children = getChildren
+
+    def getArrayIndices(self):
+        return self._plug.node.element_indices(self._plug)
+
+    def numElements(self):
+        return len(self.getArrayIndices())
+
+    evaluateNumElements = numElements
+
+    def elements(self):
+        return [self[i].name(includeNode=False) for i in self.getArrayIndices()]
+
+    # VALUES
+    def get(self, **kwargs):
+        if kwargs.get('type'):
+            return self.type()
+        return to_python(self._plug, commands.scene.get(self._plug))
+
+    def set(self, *args, **kwargs):
+        value = args[0] if len(args) == 1 else list(args)
+        if kwargs.get('type') == 'string' and value is not None:
+            value = str(value)
+        commands.scene.set(self._plug, value)
+
+    def setMin(self, value):
+        self._plug.spec.min = value
+
+    def setMax(self, value):
+        self._plug.spec.max = value
+
+    def getMin(self):
+        return self._plug.spec.min
+
+    def getMax(self):
+        return self._plug.spec.max
+
+    def getRange(self):
+        return [self._plug.spec.min, self._plug.spec.max]
+
+    # STATE
+    def lock(self, checkReference=False):
+        commands.scene.lock(self._plug, True)
+
+    def unlock(self, checkReference=False):
+        commands.scene.lock(self._plug, False)
+
+    def setLocked(self, locked, checkReference=False):
+        commands.scene.lock(self._plug, locked)
+
+    def isLocked(self):
+        return commands.scene._locked(self._plug)
+
+    def setKeyable(self, keyable):
+        self._plug.node.keyable[self._plug.spec.name] = bool(keyable)
+
+    def isKeyable(self):
+        return self._plug.node.keyable.get(self._plug.spec.name, self._plug.spec.keyable)
+
+    def showInChannelBox(self, show):
+        self._plug.node.data.setdefault('channelBox', {})[self._plug.spec.name] = bool(show)
+
+    def isInChannelBox(self):
+        return self._plug.node.data.get('channelBox', {}).get(self._plug.spec.name, False)
+
+    def isSettable(self):
+        return not (commands.scene.is_driven(self._plug) or self.isLocked())
+
+    # CONNECTIONS
+    def connect(self, destination, force=False, f=False, **kwargs):
+        connect_attr(self, destination, force or f)
+
+    def disconnect(self, destination=None, **kwargs):
+        if destination is None:
+            for plug, src in commands.scene.plug_connections(self._plug, destination=False):
+                commands.scene.disconnect(src, plug)
+            for plug, dst in commands.scene.plug_connections(self._plug, source=False):
+                commands.scene.disconnect(plug, dst)
+            return
+        commands.scene.disconnect(self._plug, to_plug(destination))
+
+    def isConnectedTo(self, other, checkOtherArray=False, checkLocalArray=False, ignoreUnitConversion=False):
+        other = to_plug(other)
+        return (other.node.inputs.get(other.key) == self._plug or
+                self._plug.node.inputs.get(self._plug.key) == other)
+
+    def isConnected(self):
+        return bool(commands.scene.plug_connections(self._plug))
+
+    def isDestination(self):
+        return self._plug.key in self._plug.node.inputs
+
+    def isSource(self):
+        return bool(self._plug.node.outputs.get(self._plug.key))
+
+    def listConnections(self, **kwargs):
+        return list_connections([self], **kwargs)
+
+    def inputs(self, **kwargs):
+        return list_connections([self], source=True, destination=False, **kwargs)
+
+    def outputs(self, **kwargs):
+        return list_connections([self], source=False, destination=True, **kwargs)
+
+    def connections(self, **kwargs):
+        return list_connections([self], **kwargs)
+
+
+class Component(PyNode):
+    """
+    Curve CVs or mesh vertices, curve.cv[2] or Component('curveShape.cv[0:3]')
+    """
+    KINDS = {'cv': 'controlPoints', 'vtx': 'pnts'}
+
+    def __new__(cls, node, kind=None, indices=None):
+        if kind is None:
+            name = str(node)
+            node_name, rest = name.split('.', 1)
+            kind, _, selection = rest.partition('[')
+            node = PyNode(node_name)
+            indices = _parse_indices(selection.rstrip(']'), None)
+
+        node = wrap(to_node(node))
+        if isinstance(node, Transform):
+            node = node.getShape()
+
+        self = object.__new__(Component)
+        self._shape = node
+        self._kind = kind
+        self._indices = indices
+        return self
+
+    @property
+    def _node(self):
+        return self._shape._node
+
+    @property
+    def _attr(self):
+        return self.KINDS[self._kind]
+
+    def indices(self):
+        if self._indices is None:
+            return self._node.element_indices(self._node.plug(self._attr))
+        return list(self._indices)
+
+    def node(self):
+        return self._shape
+
+    def plugs(self):
+        return [self._node.plug(f'{self._attr}[{i}]') for i in self.indices()]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            all_indices = self.indices() if self._indices is not None else \
+                list(range(max(self.indices() or [-1]) + 1))
+            return Component(self._shape, self._kind, all_indices[index])
+        indices = self.indices() if self._indices is not None else None
+        if indices is not None:
+            return Component(self._shape, self._kind, [indices[index]])
+        if index < 0:
+            index = len(self.indices()) + index
+        return Component(self._shape, self._kind, [index])
+
+    def __iter__(self):
+        for i in self.indices():
+            yield Component(self._shape, self._kind, [i])
+
+    def __len__(self):
+        return len(self.indices())
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def name(self):
+        indices = self.indices()
+        if len(indices) == 1:
+            selection = str(indices[0])
+        elif indices and indices == list(range(indices[0], indices[-1] + 1)):
+            selection = f'{indices[0]}:{indices[-1]}'
+        else:
+            selection = '*'
+        return f'{self._node.name}.{self._kind}[{selection}]'
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name()!r})"
+
+    def currentItemIndex(self):
+        return self.indices()[0]
+
+    def getPosition(self, space='preTransform'):
+        points = [commands.scene.get(plug) for plug in self.plugs()]
+        if space == 'world':
+            world = commands.world_matrix(self._node)
+            points = [mmath.transform_point(p, world) for p in points]
+        return dt.Point(points[0]) if len(points) == 1 else [dt.Point(p) for p in points]
+
+    def setPosition(self, point, space='preTransform'):
+        point = list(point)
+        if space == 'world':
+            point = mmath.transform_point(point, mmath.inverse(commands.world_matrix(self._node)))
+        for plug in self.plugs():
+            commands.scene.set(plug, point, force=True)
+
+
+def _parse_indices(selection, count):
+    """
+    Indices of a component selection like 2, 0:3, * or :
+    """
+    selection = selection.strip()
+    if selection in ('*', ':', ''):
+        return None
+    if ':' in selection:
+        start, end = selection.split(':')
+        return list(range(int(start or 0), int(end) + 1))
+    return [int(selection)]
+
+
+# VALUES
+def to_python(plug, value):
+    """
+    Converts a graph value to what pymel returns: nodes, vectors and matrices
+    """
+    spec = plug.spec
+    if spec.type == 'message':
+        if isinstance(value, list):
+            return [wrap(node) for node in value]
+        return wrap(value)
+
+    if spec.multi and not plug.is_indexed():
+        return [to_python(plug.element(i), v) for i, v in zip(plug.node.element_indices(plug) or [0], value)]
+
+    if spec.children:
+        if len(spec.children) == 3 and all(child.type in NUMERIC_TYPES for child in spec.children):
+            return dt.Vector(value)
+        return tuple(value)
+
+    if spec.type == 'matrix':
+        return dt.Matrix(value)
+
+    return value
+
+
+def connect_attr(source, destination, force=False):
+    src = to_plug(source)
+    dst = to_plug(destination)
+    if dst.node.inputs.get(dst.key) == src or (not src.is_indexed() and dst.node.inputs.get(dst.key) == src.element(0)):
+        # pymel doesn't complain about connections that already exist
+        return
+    commands.scene.connect(src, dst, force=force)
+
+
+def list_connections(objects, source=True, destination=True, connections=False, plugs=False, type=None,
+                     shapes=False, exactType=False, skipConversionNodes=False, **kwargs):
+    """
+    listConnections on nodes or attributes, with the short flags in kwargs
+    """
+    source = kwargs.pop('s', source)
+    destination = kwargs.pop('d', destination)
+    connections = kwargs.pop('c', connections)
+    plugs = kwargs.pop('p', plugs)
+    type = kwargs.pop('t', type)
+    shapes = kwargs.pop('sh', shapes)
+
+    if isinstance(objects, (PyNode, str, Node, Plug)):
+        objects = [objects]
+
+    results = []
+    seen = set()
+    for obj in objects:
+        if isinstance(obj, Attribute) or isinstance(obj, Plug) or (isinstance(obj, str) and '.' in obj):
+            plug = to_plug(obj)
+            pairs = []
+            if source:
+                pairs += commands.scene.plug_connections(plug, source=True, destination=False)
+            if destination:
+                pairs += commands.scene.plug_connections(plug, source=False, destination=True)
+        else:
+            pairs = commands.scene.connections(to_node(obj), source, destination)
+
+        for mine, other in pairs:
+            other_node = other.node
+            if not shapes and other_node.type.shape and other_node.parent is not None and not plugs:
+                other_node = other_node.parent
+            if type is not None:
+                if exactType and other_node.type.name != type:
+                    continue
+                if not other_node.is_a(type):
+                    continue
+
+            if connections:
+                result = (Attribute(mine), Attribute(other) if plugs else wrap(other_node))
+            else:
+                result = Attribute(other) if plugs else wrap(other_node)
+                key = (id(other_node), other.key if plugs else None)
+                if key in seen:
+                    continue
+                seen.add(key)
+            results.append(result)
+
+    return results
+
+
+_register_classes()
@@ -0,0 +1,12 @@
+"""
+Stand-in for maya.standalone, initializing only starts from an empty scene.
+"""
+from mf_autoRig.standin import commands
+
+
+def initialize(name='python'):
+    commands.new_scene()
+
+
+def uninitialize():
+    pass
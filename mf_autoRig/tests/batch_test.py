@@ -0,0 +1,67 @@
+"""
+Batched MEL writes, MelBatch and the module metadata writer.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.Module import Module
+from mf_autoRig.utils.batch import MelBatch
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+    Module.instances.clear()
+
+
+def test_connect_force():
+    first = pm.createNode('transform', name='first')
+    second = pm.createNode('transform', name='second')
+    driven = pm.createNode('transform', name='driven')
+
+    batch = MelBatch()
+    batch.connect('first.translate', 'driven.translate')
+    assert batch.run() == 1
+
+    batch.connect('second.translate', 'driven.translate')
+    try:
+        batch.run()
+    except RuntimeError:
+        pass
+    else:
+        assert False, 'connect replaced an existing connection without force'
+    assert driven.translate.inputs() == [first]
+
+    batch.connect('second.translate', 'driven.translate', force=True)
+    batch.run()
+    assert driven.translate.inputs() == [second]
+
+
+def test_metadata_writes_changes():
+    arm = Limb('L_arm')
+    grp = pm.createNode('transform', name='L_arm_guide_grp')
+    arm.guide_grp = grp
+    arm.attach_index = 2
+
+    assert arm.meta_writer.write({'guide_grp': grp, 'attach_index': 2}) == 2
+    assert arm.meta_writer.write({'guide_grp': grp, 'attach_index': 2}) == 0
+    assert arm.meta_writer.write({'guide_grp': grp, 'attach_index': 3}) == 1
+    assert arm.metaNode.guide_grp.get() == grp and arm.metaNode.attach_index.get() == 3
+
+
+def test_metadata_keeps_connections():
+    arm = Limb('L_arm')
+    grp = pm.createNode('transform', name='L_arm_guide_grp')
+    other = pm.createNode('transform', name='other_grp')
+    arm.guide_grp = grp
+    arm.save_metadata()
+
+    # Another node still holds the link, it isn't replaced silently
+    arm.guide_grp = other
+    try:
+        arm.save_metadata()
+    except RuntimeError:
+        pass
+    else:
+        assert False, 'save_metadata replaced an existing metaNode connection'
+    assert arm.metaNode.guide_grp.get() == grp
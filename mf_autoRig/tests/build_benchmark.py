@@ -0,0 +1,317 @@
+"""
+Build benchmark for every module type.
+
+Builds each module at several sizes and records, for every stage, the wall time, the number of DG nodes created and
+how many world transform reads the build's transform cache served from memory against scene queries.
+Results are written as json, compare mode fails when a stage got slower than the baseline by more than the threshold.
+
+From the script editor:
+    import mf_autoRig.tests.build_benchmark as bench
+    bench.run(output='C:/tmp/bench.json')
+
+Headless, with mayapy:
+    mayapy build_benchmark.py run --output current.json --repeat 3
+    mayapy build_benchmark.py compare baseline.json current.json --threshold 0.2
+
+Without Maya, on the pure-Python stand-in (times aren't comparable with Maya ones):
+    python -m mf_autoRig.tests.build_benchmark run --backend standin --output standin.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+BENCHMARK_VERSION = 1
+
+STAGES = ('create_guides', 'connect', 'mirror', 'create_joints', 'rig')
+
+# moduleType: list of creation kwargs to build it with
+CASES = {
+    'Limb': [{}],
+    'Hand': [{'finger_num': n} for n in range(1, 6)] + [{'finger_num': 5, 'finger_joints_num': 6}],
+    'Spine': [{'num': n} for n in (3, 5, 10, 25, 50)],
+    'FKChain': [{'num': n} for n in (3, 10, 50, 100, 200)],
+    'IKFoot': [{}],
+    'Clavicle': [{}],
+    'BendyLimb': [{}],
+}
+
+# Middle modules can't be mirrored
+MIDDLE_MODULES = ('Spine',)
+
+# Stages faster than this are too noisy to compare
+MIN_TIME = 0.005
+
+
+def case_key(module_type, kwargs):
+    args = ', '.join(f'{key}={value}' for key, value in sorted(kwargs.items()))
+    return f'{module_type}({args})'
+
+
+def _node_count():
+    import maya.cmds as cmds
+    return len(cmds.ls())
+
+
+def _time_stage(func, cache, stage):
+    """
+    Runs func and returns (time, created nodes, error, cache stats)
+    """
+    nodes = _node_count()
+    start = time.perf_counter()
+    try:
+        with cache.stage(stage):
+            func()
+        error = None
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+
+    duration = time.perf_counter() - start
+    stats = cache.stats.get(stage, {'hits': 0, 'misses': 0, 'queries': 0})
+    return duration, _node_count() - nodes, error, dict(stats)
+
+
+def build_case(module_class, kwargs):
+    """
+    Builds one module in a new scene and times every stage.
+    The module it connects to is built before timing starts.
+
+    Returns:
+        dict: stage: {'time', 'nodes', 'error', 'cache'}, a stage that doesn't apply is None
+    """
+    import maya.cmds as cmds
+    from mf_autoRig.modules import module_tools
+    from mf_autoRig.utils import joint_hierarchy, transform_cache
+
+    cmds.file(new=True, f=True)
+    module_classes = module_tools.get_module_classes()
+
+    module_type = module_class.__name__
+    side = 'M' if module_type in MIDDLE_MODULES else 'L'
+
+    # Parent module to connect to
+    parent = None
+    for parent_type in getattr(module_class, 'connectable_to', []):
+        if parent_type in module_classes:
+            parent_side = 'M' if parent_type in MIDDLE_MODULES else side
+            parent = module_classes[parent_type](f'{parent_side}_benchParent')
+            parent.create_guides()
+            break
+
+    module = None
+    mirrored = None
+
+    def create_guides():
+        nonlocal module
+        module = module_class(f'{side}_bench', **kwargs)
+        module.create_guides()
+
+    def mirror():
+        nonlocal mirrored
+        mirrored = module.mirror_guides()
+
+    def create_joints():
+        module.create_joints()
+        if mirrored is not None:
+            mirrored.create_joints()
+
+    def rig():
+        module.rig()
+        if mirrored is not None:
+            mirrored.rig()
+
+    stages = {
+        'create_guides': create_guides,
+        'connect': (lambda: module.connect_guides(parent)) if parent is not None else None,
+        'mirror': mirror if side != 'M' else None,
+        'create_joints': create_joints,
+        'rig': rig,
+    }
+
+    results = {}
+    failed = False
+    with transform_cache.build_cache() as cache, joint_hierarchy.build_index():
+        for stage in STAGES:
+            func = stages[stage]
+            if func is None or failed:
+                results[stage] = None
+                continue
+
+            duration, nodes, error, cache_stats = _time_stage(func, cache, stage)
+            results[stage] = {'time': duration, 'nodes': nodes, 'error': error, 'cache': cache_stats}
+            if error is not None:
+                # Later stages depend on this one
+                failed = True
+
+    return results
+
+
+def run(output=None, repeat=1, module_types=None):
+    """
+    Runs every case repeat times and keeps the median time of each stage.
+
+    Args:
+        output (str): json file to write the results to.
+        repeat (int): Number of builds per case.
+        module_types (list): Only benchmark these module types, all of CASES if None.
+
+    Returns:
+        dict: The results
+    """
+    import maya.cmds as cmds
+    from mf_autoRig.modules import module_tools
+
+    module_classes = module_tools.get_module_classes()
+    results = {}
+
+    for module_type, cases in CASES.items():
+        if module_types is not None and module_type not in module_types:
+            continue
+
+        for kwargs in cases:
+            key = case_key(module_type, kwargs)
+            runs = [build_case(module_classes[module_type], kwargs) for _ in range(repeat)]
+
+            stages = {}
+            for stage in STAGES:
+                stage_runs = [r[stage] for r in runs if r[stage] is not None]
+                if not stage_runs:
+                    stages[stage] = None
+                    continue
+
+                errors = [r['error'] for r in stage_runs if r['error'] is not None]
+                stages[stage] = {
+                    'time': statistics.median(r['time'] for r in stage_runs),
+                    'nodes': stage_runs[-1]['nodes'],
+                    'cache': stage_runs[-1]['cache'],
+                    'error': errors[0] if errors else None,
+                }
+
+            results[key] = {'module': module_type, 'args': kwargs, 'stages': stages}
+            print(format_case(key, stages))
+
+    cmds.file(new=True, f=True)
+
+    data = {
+        'version': BENCHMARK_VERSION,
+        'maya': cmds.about(version=True),
+        'repeat': repeat,
+        'results': results,
+    }
+
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f'Benchmark written to {output}')
+
+    return data
+
+
+def format_case(key, stages):
+    parts = []
+    hits = reads = 0
+    for stage in STAGES:
+        result = stages[stage]
+        if result is None:
+            continue
+        if result['error'] is not None:
+            parts.append(f"{stage} FAILED ({result['error']})")
+        else:
+            parts.append(f"{stage} {result['time']:.3f}s/{result['nodes']}n")
+
+        cache = result.get('cache') or {}
+        hits += cache.get('hits', 0)
+        reads += cache.get('hits', 0) + cache.get('misses', 0)
+
+    if reads:
+        parts.append(f'cache {hits}/{reads} hits')
+    return f'{key:<24} ' + ', '.join(parts)
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Compares two benchmark results.
+    A stage regressed when it's more than threshold (0.2 = 20%) slower than the baseline,
+    when it creates more DG nodes, or when it started failing.
+
+    Returns:
+        list: Description of every regression
+    """
+    regressions = []
+    for key, base_case in baseline['results'].items():
+        case = current['results'].get(key)
+        if case is None:
+            continue
+
+        for stage in STAGES:
+            base = base_case['stages'].get(stage)
+            new = case['stages'].get(stage)
+            if base is None or new is None:
+                continue
+
+            if new['error'] is not None:
+                if base['error'] is None:
+                    regressions.append(f"{key} {stage}: now fails with {new['error']}")
+                continue
+            if base['error'] is not None:
+                continue
+
+            if new['time'] > MIN_TIME and new['time'] > base['time'] * (1 + threshold):
+                regressions.append(f"{key} {stage}: {base['time']:.4f}s -> {new['time']:.4f}s")
+
+            if new['nodes'] > base['nodes']:
+                regressions.append(f"{key} {stage}: {base['nodes']} -> {new['nodes']} nodes")
+
+    return regressions
+
+
+def compare_files(baseline_path, current_path, threshold=0.2):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+
+    regressions = compare(baseline, current, threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    print(f'{len(regressions)} regressions above {threshold:.0%}')
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig build benchmark')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run')
+    run_parser.add_argument('--output', required=True)
+    run_parser.add_argument('--repeat', type=int, default=1)
+    run_parser.add_argument('--modules', nargs='*', default=None)
+    run_parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+
+    compare_parser = sub.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        return 1 if compare_files(args.baseline, args.current, args.threshold) else 0
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.output, args.repeat, args.modules)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
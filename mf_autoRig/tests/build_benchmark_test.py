@@ -0,0 +1,107 @@
+"""
+Build benchmark stages, json output and compare mode.
+"""
+import json
+import os
+import tempfile
+
+import maya.cmds as cmds
+
+from mf_autoRig.modules.Clavicle import Clavicle
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.Spine import Spine
+from mf_autoRig.tests import build_benchmark as bench
+
+
+class BrokenClavicle(Clavicle):
+    def create_joints(self):
+        raise RuntimeError('no joints')
+
+
+def stage(time, nodes=10, error=None):
+    return {'time': time, 'nodes': nodes, 'error': error, 'cache': {'hits': 0, 'misses': 0, 'queries': 0}}
+
+
+def result(stages):
+    return {'version': bench.BENCHMARK_VERSION, 'results': {'Limb()': {'module': 'Limb', 'args': {},
+                                                                        'stages': stages}}}
+
+
+def write(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_build_case():
+    stages = bench.build_case(Limb, {})
+
+    assert list(stages) == list(bench.STAGES)
+    for name in bench.STAGES:
+        assert stages[name]['error'] is None, name
+        assert stages[name]['time'] >= 0
+    assert stages['create_guides']['nodes'] > 0 and stages['rig']['nodes'] > 0
+    assert stages['rig']['cache']['hits'] + stages['rig']['cache']['misses'] > 0
+
+
+def test_middle_module_skips_stages():
+    stages = bench.build_case(Spine, {'num': 3})
+    assert stages['mirror'] is None and stages['connect'] is None
+    assert stages['rig']['error'] is None
+
+
+def test_failed_stage_stops():
+    stages = bench.build_case(BrokenClavicle, {})
+    assert stages['create_joints']['error'] == 'RuntimeError: no joints'
+    assert stages['rig'] is None
+    assert stages['mirror']['error'] is None
+
+
+def test_run_writes_json():
+    path = os.path.join(tempfile.gettempdir(), 'mf_autoRig_build_benchmark.json')
+    data = bench.run(output=path, module_types=['Clavicle'])
+
+    with open(path) as f:
+        written = json.load(f)
+    assert written == json.loads(json.dumps(data))
+    assert written['version'] == bench.BENCHMARK_VERSION and written['repeat'] == 1
+    assert list(written['results']) == ['Clavicle()']
+    assert written['results']['Clavicle()']['stages']['rig']['error'] is None
+
+
+def test_compare():
+    baseline = result({'create_guides': stage(0.1), 'connect': None, 'mirror': stage(0.001),
+                       'create_joints': stage(0.1), 'rig': stage(0.1, error='ValueError: old')})
+
+    # Within the threshold, below MIN_TIME, or failing before
+    current = result({'create_guides': stage(0.11), 'connect': stage(5.0), 'mirror': stage(0.004),
+                      'create_joints': stage(0.1), 'rig': stage(1.0)})
+    assert bench.compare(baseline, current, threshold=0.2) == []
+
+    current = result({'create_guides': stage(0.2), 'connect': None, 'mirror': stage(0.001, nodes=11),
+                      'create_joints': stage(0.1, error='RuntimeError: new'), 'rig': None})
+    regressions = bench.compare(baseline, current, threshold=0.2)
+    assert regressions == ['Limb() create_guides: 0.1000s -> 0.2000s',
+                           'Limb() mirror: 10 -> 11 nodes',
+                           'Limb() create_joints: now fails with RuntimeError: new']
+
+    # Cases that aren't in both results are skipped
+    current['results'] = {'Spine(num=3)': current['results']['Limb()']}
+    assert bench.compare(baseline, current) == []
+
+
+def test_compare_exit_code():
+    directory = tempfile.gettempdir()
+    baseline_path = os.path.join(directory, 'mf_autoRig_baseline.json')
+    current_path = os.path.join(directory, 'mf_autoRig_current.json')
+
+    write(baseline_path, result({'rig': stage(0.1)}))
+    write(current_path, result({'rig': stage(0.1)}))
+    assert bench.main(['compare', baseline_path, current_path]) == 0
+
+    write(current_path, result({'rig': stage(0.2)}))
+    assert bench.main(['compare', baseline_path, current_path]) == 1
+    assert bench.main(['compare', baseline_path, current_path, '--threshold', '1.5']) == 0
@@ -0,0 +1,31 @@
+"""
+Backend setup shared by the tests.
+Without Maya the tests run on the pure-Python stand-in (mf_autoRig.standin), with mayapy a standalone session is
+started for them. From the script editor they run in the open Maya session:
+    import pytest
+    pytest.main(['<path to mf_autoRig>/tests'])
+"""
+import pytest
+
+# Installed when conftest is loaded, before the test modules import maya and pymel
+try:
+    import maya.cmds
+except ImportError:
+    from mf_autoRig import standin
+    standin.install()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def maya_session():
+    """
+    Starts maya.standalone when maya.cmds has no commands yet, eg. under mayapy
+    """
+    import maya.cmds as cmds
+    if hasattr(cmds, 'file'):
+        yield
+        return
+
+    import maya.standalone
+    maya.standalone.initialize()
+    yield
+    maya.standalone.uninitialize()
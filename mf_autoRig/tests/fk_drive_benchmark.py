@@ -0,0 +1,114 @@
+"""
+FK drive benchmark: per frame evaluation time of fk rigs, joints driven by parentConstraints vs by matrices.
+
+Every frame sets a rotation on all the fk ctrls, like playing back an animation, and queries the world matrix of
+all the driven joints the way a skinCluster pulls them. Each module is built in both drive modes.
+
+From the script editor:
+    import mf_autoRig.tests.fk_drive_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy fk_drive_benchmark.py --frames 200
+    python -m mf_autoRig.tests.fk_drive_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+DRIVES = ('constraint', 'matrix')
+
+# moduleType: creation kwargs
+CASES = {
+    'Hand': {'finger_num': 5},
+    'FKChain': {'num': 50},
+    'Spine': {'num': 10},
+    'Limb': {},
+}
+
+
+def build_rig(module_type, kwargs, drive):
+    """
+    Returns (fk ctrls, driven joints)
+    """
+    import maya.cmds as cmds
+    import pymel.core as pm
+    from mf_autoRig.modules import module_tools
+
+    cmds.file(new=True, f=True)
+    module = module_tools.get_module_classes()[module_type](f'M_bench{module_type}', **kwargs)
+    module.fk_drive = drive
+    module.create_guides()
+    module.create_joints()
+    module.rig()
+
+    ctrls = [str(ctrl) for ctrl in module.all_ctrls if ctrl is not None and cmds.objExists(str(ctrl))]
+    joints = cmds.ls(type='joint')
+    pm.select(clear=True)
+    return ctrls, joints
+
+
+def time_frames(ctrls, joints, frames):
+    """
+    Returns the average time of a frame
+    """
+    import maya.cmds as cmds
+
+    cmds.xform(joints, query=True, worldSpace=True, matrix=True)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        value = (frame % 30) - 15
+        for ctrl in ctrls:
+            if cmds.getAttr(f'{ctrl}.rotateZ', settable=True):
+                cmds.setAttr(f'{ctrl}.rotateZ', value)
+        cmds.xform(joints, query=True, worldSpace=True, matrix=True)
+
+    return (time.perf_counter() - start) / frames
+
+
+def run(frames=100, module_types=None):
+    import maya.cmds as cmds
+
+    results = {}
+    for module_type, kwargs in CASES.items():
+        if module_types is not None and module_type not in module_types:
+            continue
+
+        results[module_type] = {}
+        for drive in DRIVES:
+            ctrls, joints = build_rig(module_type, kwargs, drive)
+            constraints = len(cmds.ls(type='parentConstraint'))
+            results[module_type][drive] = time_frames(ctrls, joints, frames)
+            print(f'{module_type:<8} {drive:<10} {len(ctrls)} ctrls, {constraints} parentConstraints: '
+                  f'{results[module_type][drive] * 1000:.3f}ms per frame')
+
+        speedup = results[module_type]['constraint'] / results[module_type]['matrix']
+        print(f'{module_type:<8} matrix drive is {speedup:.1f}x faster')
+
+    cmds.file(new=True, f=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig fk drive benchmark')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--modules', nargs='*', default=None)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.frames, args.modules)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+FK ctrls driving their joints with matrices, the joints follow the ctrls like with the parentConstraint drive.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.utils import ik_fk_tools
+from mf_autoRig.utils.joint_tools import orient_joints
+
+TOLERANCE = 1e-4
+
+POSITIONS = [(0, 10, 0), (2, 14, 1), (3, 19, -1), (3.5, 23, 0)]
+
+
+def build_chain(name):
+    grp = pm.createNode('transform', name=f'{name}_grp')
+    grp.translate.set(1, 2, 3)
+    grp.rotateY.set(20)
+
+    joints = []
+    for i, p in enumerate(POSITIONS):
+        jnt = pm.createNode('joint', name=f'{name}{i + 1:02}_skin_jnt')
+        pm.move(jnt, p)
+        joints.append(jnt)
+    orient_joints(joints, aimVector=(0, 1, 0), upVector=(0, 0, 1), useNormal=True)
+    pm.parent(joints[0], grp)
+    return joints
+
+
+def world_matrices(nodes):
+    return np.reshape(pm.xform(nodes, q=True, ws=True, m=True), (-1, 4, 4))
+
+
+def pose(ctrls):
+    for i, ctrl in enumerate(ctrls):
+        ctrl.rotate.set(10 * (i + 1), -15, 25)
+    ctrls[0].getParent().translate.set(1, -2, 0.5)
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_matrix_drive_matches_constraint():
+    results = {}
+    for drive in ik_fk_tools.FK_DRIVES:
+        joints = build_chain(f'{drive}_chain')
+        rest = world_matrices(joints)
+        ctrls = ik_fk_tools.create_fk_ctrls(joints, drive=drive)
+
+        # Nothing moves when driving
+        assert np.allclose(world_matrices(joints), rest, atol=TOLERANCE)
+
+        pose(ctrls)
+        results[drive] = world_matrices(joints)
+
+    assert np.allclose(results['matrix'], results['constraint'], atol=TOLERANCE)
+
+    # Matrix driven joints don't have constraints, the end joint follows its parent
+    assert all(not jnt.listRelatives(type='parentConstraint') for jnt in pm.ls('matrix_chain*_skin_jnt'))
+    assert pm.PyNode('matrix_chain01_skin_jnt').offsetParentMatrix.isConnected()
+    assert not pm.PyNode('matrix_chain04_skin_jnt').offsetParentMatrix.isConnected()
+
+
+def test_single_joint():
+    jnt = pm.createNode('joint', name='hip_skin_jnt')
+    pm.move(jnt, (0, 10, 0))
+    jnt.jointOrient.set(0, 0, 30)
+
+    ctrl = ik_fk_tools.create_fk_ctrls(jnt, drive='matrix')
+    ctrl.translateX.set(2)
+    assert np.allclose(pm.xform(jnt, q=True, ws=True, t=True), pm.xform(ctrl, q=True, ws=True, t=True),
+                       atol=TOLERANCE)
+    assert not jnt.listRelatives(type='parentConstraint')
+
+
+def test_unknown_drive():
+    joints = build_chain('chain')
+    try:
+        ik_fk_tools.create_fk_ctrls(joints, drive='blend')
+    except ValueError:
+        pass
+    else:
+        assert False, 'create_fk_ctrls accepted an unknown drive'
@@ -0,0 +1,113 @@
+"""
+Forearm twist benchmark: per frame evaluation time of the forearm twist, aimConstraint and locator vs the swing twist
+decomposition of the hand matrix.
+
+Every frame twists and bends the hand ctrl, like playing back an animation, and queries the world matrix of the
+twist joints the way a skinCluster pulls them. The twist at the end of the animation is printed for both modes,
+the aim mode flips past 90 degrees.
+
+From the script editor:
+    import mf_autoRig.tests.forearm_twist_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy forearm_twist_benchmark.py --frames 200
+    python -m mf_autoRig.tests.forearm_twist_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+MODES = ('aim', 'matrix')
+
+
+def build_arm(mode, joints):
+    """
+    Returns (hand ctrl, twist joints)
+    """
+    import maya.cmds as cmds
+    import pymel.core as pm
+    from mf_autoRig.modules.Hand import Hand
+    from mf_autoRig.modules.Limb import Limb
+
+    cmds.file(new=True, f=True)
+    arm = Limb('L_arm')
+    arm.forearm_twist = True
+    arm.forearm_twist_mode = mode
+    arm.forearm_twist_joints = joints
+    arm.create_guides()
+    hand = Hand('L_hand', finger_num=5)
+    hand.create_guides()
+    hand.connect_guides(arm)
+
+    arm.create_joints()
+    hand.create_joints()
+    hand.rig()
+    arm.rig()
+
+    pm.select(clear=True)
+    return str(hand.hand_ctrl), cmds.ls('L_arm_twist*_skin_jnt')
+
+
+def time_frames(hand_ctrl, twist_jnts, frames):
+    """
+    Returns the average time of a frame
+    """
+    import maya.cmds as cmds
+
+    cmds.xform(twist_jnts, query=True, worldSpace=True, matrix=True)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        value = (frame % 30) - 15
+        cmds.setAttr(f'{hand_ctrl}.rotateY', value * 10)
+        cmds.setAttr(f'{hand_ctrl}.rotateX', value)
+        cmds.xform(twist_jnts, query=True, worldSpace=True, matrix=True)
+
+    return (time.perf_counter() - start) / frames
+
+
+def run(frames=100, joints=3):
+    import maya.cmds as cmds
+
+    results = {}
+    for mode in MODES:
+        hand_ctrl, twist_jnts = build_arm(mode, joints)
+        constraints = len(cmds.ls(type='constraint'))
+        results[mode] = time_frames(hand_ctrl, twist_jnts, frames)
+
+        cmds.setAttr(f'{hand_ctrl}.rotateX', 0)
+        cmds.setAttr(f'{hand_ctrl}.rotateY', 150)
+        twist = [round(cmds.getAttr(f'{jnt}.rotateY'), 1) for jnt in twist_jnts]
+        print(f'{mode:<7} {len(twist_jnts)} twist joints, {constraints} constraints: '
+              f'{results[mode] * 1000:.3f}ms per frame, hand twisted 150: {twist}')
+
+    speedup = results['aim'] / results['matrix']
+    print(f'matrix twist is {speedup:.1f}x faster')
+
+    cmds.file(new=True, f=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig forearm twist benchmark')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--joints', type=int, default=3)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.frames, args.joints)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Forearm twist from the swing twist decomposition of the hand, shared over the twist joints without flipping.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules.Hand import Hand
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.utils import twist_tools
+
+TOLERANCE = 1e-3
+
+
+def build_forearm(num):
+    """
+    Returns (elbow, wrist, hand driver, twist joints), the forearm goes up y
+    """
+    elbow = pm.createNode('joint', name='L_arm02_skin_jnt')
+    elbow.translate.set(1, 10, 0)
+    wrist = pm.createNode('joint', name='L_arm03_end_jnt', parent=elbow)
+    wrist.translate.set(0, 5, 0)
+
+    hand_grp = pm.createNode('transform', name='hand_grp')
+    hand_grp.translate.set(1, 15, 0)
+    hand = pm.createNode('joint', name='L_hand_skin_jnt', parent=hand_grp)
+    hand.jointOrient.set(10, 0, -20)
+
+    joints = twist_tools.create_twist_joints(elbow, wrist, num, 'L_arm')
+    twist_tools.drive_twist(hand, wrist, joints, (0, 1, 0), 'L_arm_forearm')
+    return elbow, wrist, hand_grp, joints
+
+
+def build_arm(mode, num):
+    arm = Limb('L_arm')
+    arm.forearm_twist = True
+    arm.forearm_twist_mode = mode
+    arm.forearm_twist_joints = num
+    arm.create_guides()
+    hand = Hand('L_hand', finger_num=3)
+    hand.create_guides()
+    hand.connect_guides(arm)
+
+    arm.create_joints()
+    hand.create_joints()
+    hand.rig()
+    arm.rig()
+    return arm, hand
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_twist_joints_placement():
+    elbow, wrist, hand_grp, joints = build_forearm(3)
+
+    assert [jnt.name() for jnt in joints] == ['L_arm_twist01_skin_jnt', 'L_arm_twist02_skin_jnt',
+                                              'L_arm_twist03_skin_jnt']
+    assert all(jnt.getParent() == elbow for jnt in joints)
+    assert np.allclose([jnt.translate.get() for jnt in joints], [(0, 1.25, 0), (0, 2.5, 0), (0, 3.75, 0)])
+
+
+def test_twist_shared_without_flipping():
+    elbow, wrist, hand_grp, joints = build_forearm(3)
+    weights = twist_tools.twist_weights(3)
+
+    # Past 90 and close to a half turn both ways
+    for angle in (30, 120, 170, -150):
+        hand_grp.rotateY.set(angle)
+        assert np.allclose([jnt.rotateY.get() for jnt in joints], np.multiply(weights, angle), atol=TOLERANCE)
+
+    # Swing doesn't twist, the twist stays when swinging
+    hand_grp.rotate.set(40, 0, 0)
+    assert np.allclose([jnt.rotateY.get() for jnt in joints], 0, atol=TOLERANCE)
+    hand_grp.rotate.set(0, 100, 35)
+    assert np.allclose([jnt.rotateY.get() for jnt in joints], np.multiply(weights, 100), atol=TOLERANCE)
+
+
+def test_limb_modes():
+    arm, hand = build_arm('matrix', 2)
+    assert not pm.ls(type='aimConstraint')
+    assert len(pm.ls('L_arm_twist0?_skin_jnt')) == 2
+
+    setup_function()
+    arm, hand = build_arm('aim', 1)
+    assert len(pm.ls(type='aimConstraint')) == 1
+    assert pm.PyNode('L_arm_twist_skin_jnt').rotateY.isConnected()
+
+    setup_function()
+    try:
+        build_arm('twist', 1)
+    except ValueError:
+        pass
+    else:
+        assert False, 'Limb accepted an unknown forearm twist mode'
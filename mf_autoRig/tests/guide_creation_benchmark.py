@@ -0,0 +1,85 @@
+"""
+Guide creation benchmark: time to create N guides under a group, one Guide at a time vs create_guides_batch.
+
+From the script editor:
+    import mf_autoRig.tests.guide_creation_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy guide_creation_benchmark.py
+    python -m mf_autoRig.tests.guide_creation_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+COUNTS = [10, 50, 100, 500, 1000]
+
+
+def create_per_guide(names, positions, parent):
+    """
+    Previous way of creating guides, one Guide each and then parenting them
+    """
+    import pymel.core as pm
+    from mf_autoRig.utils.guides_tools import Guide
+
+    guides = [Guide(name, pos).guide for name, pos in zip(names, positions)]
+    pm.parent(guides, parent)
+    return guides
+
+
+def create_batched(names, positions, parent):
+    from mf_autoRig.utils.guides_tools import create_guides_batch
+    return create_guides_batch(names, positions, parent=parent)
+
+
+def time_creation(count, create_func):
+    import maya.cmds as cmds
+    import pymel.core as pm
+
+    cmds.file(new=True, f=True)
+    parent = pm.createNode('transform', name='bench_guide_grp')
+    names = [f'bench_{i}_guide' for i in range(count)]
+    positions = [(i * 0.1, i, 0) for i in range(count)]
+
+    start = time.perf_counter()
+    create_func(names, positions, parent)
+    return time.perf_counter() - start
+
+
+def run(counts=None):
+    import maya.cmds as cmds
+
+    results = {}
+    for count in counts or COUNTS:
+        per_guide = time_creation(count, create_per_guide)
+        batched = time_creation(count, create_batched)
+
+        results[count] = (batched, per_guide)
+        print(f'{count:>5} guides: batched {batched:.4f}s, per guide {per_guide:.4f}s, {per_guide / batched:.1f}x')
+
+    cmds.file(new=True, f=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig guide creation benchmark')
+    parser.add_argument('--counts', type=int, nargs='*', default=None)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.counts)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
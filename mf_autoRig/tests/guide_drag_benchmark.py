@@ -0,0 +1,86 @@
+"""
+Guide drag benchmark: time to re-evaluate a guide curve while a guide is dragged, cluster vs matrix driven CVs.
+
+Every drag step moves one guide, like a manipulator drag, and queries all the CVs of the curve the way a viewport
+redraw pulls the curve. The guides are dragged in turn along the chain.
+
+From the script editor:
+    import mf_autoRig.tests.guide_drag_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy guide_drag_benchmark.py --guides 300 --steps 200
+    python -m mf_autoRig.tests.guide_drag_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+DRIVERS = ('cluster', 'matrix')
+
+
+def build_scene(guide_num, driver):
+    import maya.cmds as cmds
+    import pymel.core as pm
+    from mf_autoRig.utils.guides_tools import Guide, create_guide_curve
+
+    cmds.file(new=True, f=True)
+    parent = pm.createNode('transform', name='drag_guides_grp')
+    guides = [Guide(f'drag_{i}_guide', (0, i, 0)).guide for i in range(guide_num)]
+    pm.parent(guides, parent)
+
+    curve = create_guide_curve('drag', guides, parent=parent, driver=driver)
+    return [guide.name() for guide in guides], curve.name()
+
+
+def time_drag(guides, curve, steps):
+    """
+    Returns the average time of a drag step
+    """
+    import maya.cmds as cmds
+
+    cvs = f'{curve}.cv[*]'
+    cmds.xform(cvs, query=True, worldSpace=True, translation=True)
+
+    start = time.perf_counter()
+    for step in range(steps):
+        guide = guides[step % len(guides)]
+        cmds.setAttr(f'{guide}.translateX', (step % 7) * 0.1)
+        cmds.xform(cvs, query=True, worldSpace=True, translation=True)
+
+    return (time.perf_counter() - start) / steps
+
+
+def run(guide_num=300, steps=200):
+    results = {}
+    for driver in DRIVERS:
+        guides, curve = build_scene(guide_num, driver)
+        results[driver] = time_drag(guides, curve, steps)
+        print(f'{driver:<8} {guide_num} guides: {results[driver] * 1000:.3f}ms per drag step')
+
+    print(f'matrix driver is {results["cluster"] / results["matrix"]:.1f}x faster')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig guide drag benchmark')
+    parser.add_argument('--guides', type=int, default=300)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.guides, args.steps)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Guide creation: batched guides match Guide ones, guide curves follow their guides with the matrix and the
+cluster driver, and the middle guides of create_joint_chain are placed like the ribbon plane they used to be pinned to.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.utils.guides_tools import RIBBON_WIDTH, Guide, create_guide_curve, create_guides_batch, create_joint_chain
+
+TOLERANCE = 1e-4
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def build(driver):
+    parent = pm.createNode('transform', name=f'{driver}_grp')
+    parent.translate.set(2, 3, -1)
+    parent.rotate.set(10, 45, 0)
+    guides = [Guide(f'{driver}_{i}_guide', (i, i * 2, 0)).guide for i in range(4)]
+    pm.parent(guides, parent)
+
+    curve = create_guide_curve(driver, guides, parent=parent, driver=driver)
+    return parent, guides, curve
+
+
+def assert_follows(guides, curve):
+    guide_pos = [pm.xform(g, q=True, ws=True, t=True) for g in guides]
+    cv_pos = np.reshape(cmds.xform(f'{curve}.cv[*]', q=True, ws=True, t=True), (-1, 3))
+    assert np.allclose(cv_pos, guide_pos, atol=TOLERANCE)
+
+
+def test_batch_matches_guide():
+    parent = pm.createNode('transform', name='parent_grp')
+    parent.translate.set(1, 2, 3)
+    parent.rotate.set(0, 30, 45)
+    positions = [(0, 0, 0), (1, 5, -2), (3, 1, 4)]
+
+    old = [Guide(f'old_{i}_guide', p).guide for i, p in enumerate(positions)]
+    pm.parent(old, parent)
+    new = create_guides_batch([f'new_{i}_guide' for i in range(3)], positions, parent=parent)
+
+    assert [g.name() for g in new] == ['new_0_guide', 'new_1_guide', 'new_2_guide']
+    for o, n in zip(old, new):
+        assert n.getParent() == parent
+        assert np.allclose(pm.xform(n, q=True, ws=True, m=True), pm.xform(o, q=True, ws=True, m=True), atol=TOLERANCE)
+        for attr in ('radius', 'overrideEnabled', 'overrideRGBColors', 'overrideColorRGB'):
+            assert np.allclose(n.attr(attr).get(), o.attr(attr).get())
+
+
+def test_batch_parent_per_guide():
+    grp = pm.createNode('transform', name='grp')
+    grp.translate.set(0, 4, 0)
+    guides = create_guides_batch(['a_guide', 'b_guide'], [(1, 1, 1), (2, 2, 2)], parent=[grp, None], color='red')
+
+    assert guides[0].getParent() == grp and guides[1].getParent() is None
+    assert np.allclose(guides[0].translate.get(), (1, -3, 1))
+    assert np.allclose(guides[1].overrideColorRGB.get(), (1, 0, 0))
+
+
+def test_drivers_follow_guides():
+    for driver in ('matrix', 'cluster'):
+        parent, guides, curve = build(driver)
+        assert_follows(guides, curve)
+
+        guides[1].translate.set(4, -2, 5)
+        guides[3].rotate.set(0, 90, 0)
+        assert_follows(guides, curve)
+
+        # Moving the parent moves the guides, the curve doesn't get the parent transform twice
+        parent.rotate.set(0, -30, 20)
+        assert_follows(guides, curve)
+
+
+def test_matrix_driver_has_no_clusters():
+    build('matrix')
+    assert not cmds.ls(type='cluster')
+    assert len(cmds.ls(type='decomposeMatrix')) == 4
+
+
+def test_joint_chain_coords():
+    start, middle, end = create_joint_chain(3, 'bendy', (0, 10, 0), (1, 0, 2))
+    start.rotate.set(20, 0, 35)
+    middle.uCoord.set(30)
+    middle.vCoord.set(80)
+
+    # Point of the plane the skinned ribbon had there: the plane follows the start rotation on both edges
+    start_matrix = np.reshape(pm.xform(start, q=True, ws=True, m=True), (4, 4))
+    u, v = 0.3, 0.8
+    expected = ((1 - u) * start_matrix[3, :3] + u * np.array(pm.xform(end, q=True, ws=True, t=True))
+                + (RIBBON_WIDTH / 2 - RIBBON_WIDTH * v) * start_matrix[2, :3])
+    assert np.allclose(pm.xform(middle, q=True, ws=True, t=True), expected, atol=TOLERANCE)
+
+    assert not cmds.ls(type=['mesh', 'skinCluster', 'uvPin'])
+    assert_follows([start, middle, end], 'bendy_guide_crv')
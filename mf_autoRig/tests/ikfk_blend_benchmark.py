@@ -0,0 +1,114 @@
+"""
+IK FK blend benchmark: playback fps of a crowd character with 20 limbs, joints blended by parentConstraints vs by
+blendMatrix nodes.
+
+Every frame moves the ik ctrls, rotates the fk ctrls and sets the switches halfway, like playing back an animation,
+then queries the world matrix of all the bind joints the way a skinCluster pulls them.
+
+From the script editor:
+    import mf_autoRig.tests.ikfk_blend_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy ikfk_blend_benchmark.py --frames 200
+    python -m mf_autoRig.tests.ikfk_blend_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+BLENDS = ('constraint', 'matrix')
+
+LIMBS = 20
+
+
+def build_crowd(blend, limbs=LIMBS):
+    """
+    Returns (ik ctrls, fk ctrls, switches, bind joints)
+    """
+    import maya.cmds as cmds
+    import pymel.core as pm
+    from mf_autoRig.modules.Limb import Limb
+
+    cmds.file(new=True, f=True)
+    ik_ctrls, fk_ctrls, switches, joints = [], [], [], []
+    for i in range(limbs):
+        side = 'L' if i % 2 == 0 else 'R'
+        x = (i // 2 + 1) * 3 * (1 if side == 'L' else -1)
+        limb = Limb(f'{side}_crowd{i:02}')
+        limb.ikfk_blend = blend
+        limb.create_guides(pos=[(x, 10, 0), (x, 5, 1), (x, 0, 0)])
+        limb.create_joints()
+        limb.rig()
+
+        ik_ctrls.append(str(limb.ik_ctrls[0]))
+        fk_ctrls.extend(str(ctrl) for ctrl in limb.fk_ctrls)
+        switches.append(f'{limb.switch}.IkFkSwitch')
+        joints.extend(str(jnt) for jnt in limb.joints)
+
+    pm.select(clear=True)
+    return ik_ctrls, fk_ctrls, switches, joints
+
+
+def time_frames(ik_ctrls, fk_ctrls, switches, joints, frames):
+    """
+    Returns the average time of a frame
+    """
+    import maya.cmds as cmds
+
+    for switch in switches:
+        cmds.setAttr(switch, 0.5)
+    cmds.xform(joints, query=True, worldSpace=True, matrix=True)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        value = (frame % 30) - 15
+        for ctrl in ik_ctrls:
+            cmds.setAttr(f'{ctrl}.translateY', value * 0.1)
+        for ctrl in fk_ctrls:
+            cmds.setAttr(f'{ctrl}.rotateZ', value)
+        cmds.xform(joints, query=True, worldSpace=True, matrix=True)
+
+    return (time.perf_counter() - start) / frames
+
+
+def run(frames=100, limbs=LIMBS):
+    import maya.cmds as cmds
+
+    results = {}
+    for blend in BLENDS:
+        ik_ctrls, fk_ctrls, switches, joints = build_crowd(blend, limbs)
+        constraints = len(cmds.ls(type='parentConstraint'))
+        results[blend] = time_frames(ik_ctrls, fk_ctrls, switches, joints, frames)
+        print(f'{blend:<10} {limbs} limbs, {constraints} parentConstraints: '
+              f'{1.0 / results[blend]:.1f} fps ({results[blend] * 1000:.3f}ms per frame)')
+
+    speedup = results['constraint'] / results['matrix']
+    print(f'matrix blend is {speedup:.1f}x faster')
+
+    cmds.file(new=True, f=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig ik fk blend benchmark')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--limbs', type=int, default=LIMBS)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.frames, args.limbs)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
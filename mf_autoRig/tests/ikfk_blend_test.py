@@ -0,0 +1,78 @@
+"""
+IK FK blending with blendMatrix nodes, the joints follow the ik and fk chains like with the parentConstraint blend.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.utils import ik_fk_tools
+
+TOLERANCE = 1e-4
+
+
+def build_limb(blend):
+    limb = Limb(f'L_{blend}Arm')
+    limb.ikfk_blend = blend
+    limb.create_guides()
+    limb.create_joints()
+    limb.rig()
+    return limb
+
+
+def world_matrices(nodes):
+    return np.reshape(pm.xform(nodes, q=True, ws=True, m=True), (-1, 4, 4))
+
+
+def pose(limb):
+    limb.ik_ctrls[0].translate.set(1, -2, 1.5)
+    for i, ctrl in enumerate(limb.fk_ctrls):
+        ctrl.rotate.set(10 * (i + 1), -15, 25)
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_matrix_blend_matches_constraint():
+    limbs = {blend: build_limb(blend) for blend in ik_fk_tools.IKFK_BLENDS}
+    rest = {blend: world_matrices(limb.joints) for blend, limb in limbs.items()}
+    assert np.allclose(rest['matrix'], rest['constraint'], atol=TOLERANCE)
+
+    for limb in limbs.values():
+        pose(limb)
+
+    for value in (0, 1):
+        matrices = {}
+        for blend, limb in limbs.items():
+            limb.switch.IkFkSwitch.set(value)
+            matrices[blend] = world_matrices(limb.joints)
+        assert np.allclose(matrices['matrix'], matrices['constraint'], atol=TOLERANCE)
+
+    # Halfway both blend the positions linearly
+    positions = {}
+    for blend, limb in limbs.items():
+        limb.switch.IkFkSwitch.set(0.5)
+        positions[blend] = world_matrices(limb.joints)[:, 3, :3]
+    assert np.allclose(positions['matrix'], positions['constraint'], atol=TOLERANCE)
+
+
+def test_switch_is_plain_connection():
+    limb = build_limb('matrix')
+
+    assert not any(jnt.listRelatives(type='parentConstraint') for jnt in limb.joints)
+    for blend in limb.ikfk_constraints:
+        assert blend.type() == 'blendMatrix'
+        assert blend.target[0].weight.listConnections(plugs=True) == [limb.switch.IkFkSwitch]
+
+
+def test_unknown_blend():
+    limb = Limb('L_arm')
+    limb.create_guides()
+    limb.create_joints()
+    try:
+        ik_fk_tools.constraint_ikfk(limb.joints, limb.joints, limb.joints, blend='pair')
+    except ValueError:
+        pass
+    else:
+        assert False, 'constraint_ikfk accepted an unknown blend'
@@ -0,0 +1,143 @@
+"""
+Joint hierarchy index, lookups match listRelatives and stay right when the build reparents, adds or deletes joints.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules import module_tools
+from mf_autoRig.modules.Hand import Hand
+from mf_autoRig.utils import joint_hierarchy, transform_cache
+from mf_autoRig.utils.joint_tools import get_joint_hierarchy, mirrorJoints
+
+
+class RecordingHand(Hand):
+    """
+    Hand that keeps the joint hierarchy index active while it rigs
+    """
+    indexes = []
+
+    def rig(self, *args, **kwargs):
+        self.indexes.append(joint_hierarchy.active_index())
+        super().rig(*args, **kwargs)
+
+
+def build_chain(name, num, parent=None):
+    joints = []
+    for i in range(num):
+        chain_parent = joints[-1] if joints else parent
+        flags = {'parent': chain_parent} if chain_parent is not None else {}
+        jnt = pm.createNode('joint', name=f'{name}{i}_jnt', **flags)
+        jnt.translate.set(1, 0.5 * i, 0)
+        joints.append(jnt)
+    return joints
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_chain_parent_depth():
+    grp = pm.createNode('transform', name='chain_grp')
+    joints = build_chain('chain', 4, grp)
+    expected = get_joint_hierarchy(joints[0])
+
+    with joint_hierarchy.build_index() as index:
+        assert get_joint_hierarchy(joints[0]) == expected == joints
+        assert [index.depth(jnt) for jnt in joints] == [0, 1, 2, 3]
+        assert [index.parent(jnt) for jnt in joints] == [grp] + joints[:-1]
+        assert all(index.root(jnt) == joints[0] for jnt in joints)
+
+        # Every lookup after the first one is served from the index
+        assert index.stats['builds'] == 1
+        assert index.chain(joints[0]) == joints
+        assert index.stats['hits'] == 13
+
+        # Nested builds share the index
+        with joint_hierarchy.build_index() as nested:
+            assert nested is index
+
+    assert joint_hierarchy.active_index() is None
+
+
+def test_reparent_evicts():
+    joints = build_chain('chain', 4)
+    other = build_chain('other', 2)
+
+    with joint_hierarchy.build_index() as index:
+        index.chain(joints[0])
+        index.chain(other[0])
+
+        # Joint moved out of the chain
+        pm.parent(joints[2], world=True)
+        assert joints[0] not in index and other[0] in index
+        assert index.chain(joints[0]) == joints[:2]
+        assert index.parent(joints[2]) is None and index.depth(joints[3]) == 1
+
+        # Joint moved into a chain
+        pm.parent(joints[2], other[1])
+        assert index.chain(other[0]) == other + joints[2:]
+        assert index.depth(joints[3]) == 3
+
+        # A new joint under a chain joint
+        new = pm.createNode('joint', name='new_jnt', parent=joints[1])
+        assert index.chain(joints[0]) == joints[:2] + [new]
+
+        # Group in between, its joints are still part of the chain
+        grp = pm.group(new, name='between_grp')
+        assert index.chain(joints[0]) == joints[:2] + [new]
+        assert index.parent(new) == grp and index.depth(new) == 2
+
+
+def test_constraint_keeps_index():
+    joints = build_chain('chain', 3)
+    driver = pm.createNode('transform', name='driver_grp')
+
+    with joint_hierarchy.build_index() as index:
+        index.chain(joints[0])
+        pm.parentConstraint(driver, joints[1], maintainOffset=True)
+        assert joints[0] in index
+        assert index.chain(joints[0]) == joints
+
+
+def test_delete_evicts():
+    joints = build_chain('chain', 3)
+
+    with joint_hierarchy.build_index() as index:
+        index.chain(joints[0])
+        pm.delete(joints[2])
+        assert joints[0] not in index
+        assert index.chain(joints[0]) == joints[:2]
+
+
+def test_mirror_joints():
+    grp = pm.createNode('transform', name='chain_grp')
+    joints = build_chain('L_chain', 4, grp)
+    grp.translate.set(2, 1, 0)
+
+    expected = mirrorJoints(joints, ('L_', 'R_'))
+    matrices = [pm.xform(jnt, q=True, ws=True, m=True) for jnt in expected]
+    pm.delete(expected)
+
+    with joint_hierarchy.build_index():
+        mirrored = mirrorJoints(joints, ('L_', 'R_'))
+
+    assert [jnt.name() for jnt in mirrored] == ['R_chain0_jnt', 'R_chain1_jnt', 'R_chain2_jnt', 'R_chain3_jnt']
+    assert mirrored[0].getParent() == grp
+    assert np.allclose([pm.xform(jnt, q=True, ws=True, m=True) for jnt in mirrored], matrices)
+
+
+def test_build_entry_points():
+    RecordingHand.indexes = []
+    hand = RecordingHand('L_hand')
+    hand.create_guides()
+
+    # Rig button of the modify window, the fingers are listed through the index
+    module_tools.rig_modules([hand])
+    index = RecordingHand.indexes[0]
+    assert index is not None and index.stats['builds'] > 0
+    assert joint_hierarchy.active_index() is None and transform_cache.active_cache() is None
+
+    # Mirror then rig
+    hand.mirror()
+    assert RecordingHand.indexes[-1] is not None and RecordingHand.indexes[-1] is not index
@@ -0,0 +1,116 @@
+"""
+Lazy modules, meta attributes read from the metaNode the first time they're accessed.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+import mf_autoRig.modules.meta as mdata
+from mf_autoRig.modules import module_tools, presets
+from mf_autoRig.modules.Clavicle import Clavicle
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.Module import Module
+
+
+def build_arm():
+    arm = Limb('L_arm')
+    arm.create_guides()
+    arm.create_joints()
+    arm.rig()
+    return arm
+
+
+def load_lazy(metaNode):
+    Module.instances.clear()
+    mdata.reset_query_count()
+    return module_tools.createModule(metaNode, lazy=True)
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+    Module.instances.clear()
+
+
+def test_fetch_on_access():
+    arm = build_arm()
+    lazy = load_lazy(arm.metaNode)
+
+    # Only the name, the moduleType and the list of attributes to migrate are read
+    loaded = mdata.query_count
+    assert loaded <= 4
+    assert lazy.lazy and not lazy.is_loaded('fk_ctrls')
+
+    assert lazy.fk_ctrls == arm.fk_ctrls
+    assert mdata.query_count == loaded + 1 and lazy.is_loaded('fk_ctrls')
+
+    # Memoized
+    assert lazy.fk_ctrls == arm.fk_ctrls
+    assert lazy.jnt_orient_main == arm.jnt_orient_main
+    assert mdata.query_count == loaded + 2
+
+
+def test_count_without_loading():
+    arm = build_arm()
+    lazy = load_lazy(arm.metaNode)
+
+    assert lazy.count_meta('fk_ctrls') == len(arm.fk_ctrls) == 2
+    assert lazy.count_meta('guides') == 3
+    assert not lazy.is_loaded('fk_ctrls')
+
+
+def test_changed_node_fetched_again():
+    arm = build_arm()
+    lazy = load_lazy(arm.metaNode)
+
+    assert lazy.attach_index == arm.attach_index
+    arm.metaNode.attach_index.set(5)
+    assert not lazy.is_loaded('attach_index')
+    assert lazy.attach_index == 5
+
+
+def test_derived_attrs_materialize():
+    arm = build_arm()
+    lazy = load_lazy(arm.metaNode)
+
+    assert lazy.all_ctrls == arm.all_ctrls
+    assert not lazy.lazy
+    assert lazy.ikHandle == arm.ikHandle
+    assert lazy.guides == arm.guides
+
+
+def test_save_keeps_unread_attrs():
+    arm = build_arm()
+    lazy = load_lazy(arm.metaNode)
+
+    lazy.attach_index = 2
+    lazy.save_metadata()
+    assert arm.metaNode.attach_index.get() == 2
+    assert arm.metaNode.fk_ctrls.get() == arm.fk_ctrls
+    assert not lazy.is_loaded('fk_ctrls')
+
+
+def test_fetch_links_unresolved():
+    clavicle = Clavicle('L_clavicle')
+    arm = Limb('L_arm')
+    arm.connect_metadata(clavicle)
+    lazy = load_lazy(arm.metaNode)
+
+    assert lazy.fetch_meta('parent', resolve_links=False) == clavicle.metaNode
+    assert not lazy.is_loaded('parent')
+    assert lazy.parent.name == 'L_clavicle' and lazy.is_loaded('parent')
+
+
+def test_lazy_graph():
+    presets.biped()
+    Module.instances.clear()
+    eager = module_tools.load_module_graph()
+
+    Module.instances.clear()
+    lazy = module_tools.load_module_graph(lazy=True)
+
+    assert [module.name for module in lazy] == [module.name for module in eager]
+    assert all(module.lazy for module in lazy)
+    assert lazy.queries < eager.queries
+
+    by_name = {module.name: module for module in lazy}
+    assert by_name['L_arm'].parent is by_name['L_clavicle']
+    assert by_name['R_arm'].mirrored_from is by_name['L_arm']
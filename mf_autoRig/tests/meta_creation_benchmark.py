@@ -0,0 +1,65 @@
+from unload_packages import unload_packages
+unload_packages(silent=True, packages=["mf_autoRig"])
+import mf_autoRig.modules.meta as mdata
+from mf_autoRig.modules import module_tools
+import maya.cmds as cmds
+
+import time
+
+COUNTS = [1, 10, 500]
+
+def create_from_plan(name, moduleType, module_class):
+    """
+    Same as Module, all the attributes of the class MetaPlan in one batch
+    """
+    return mdata.create_metadata(name, moduleType, module_class.meta_plan, True)
+
+def create_per_attribute(name, moduleType, module_class):
+    """
+    Previous way of creating metaNodes, one addAttr per schema entry
+    """
+    import pymel.core as pm
+    meta_attrs = module_class.meta_args
+    metaNode = pm.createNode('network', name="META_" + name)
+    for typ in meta_attrs:
+        for key in meta_attrs[typ]:
+            attr = meta_attrs[typ][key]
+            metaNode.addAttr(key, **attr)
+            if attr.get('attributeType') == 'double3':
+                for axis in ['X', 'Y', 'Z']:
+                    metaNode.addAttr(key + axis, **{'attributeType': 'double', 'p': key})
+
+    metaNode.attr('name').set(name)
+    metaNode.moduleType.set(moduleType)
+    return metaNode
+
+def time_creation(module_class, count, create_func):
+    cmds.file(new=True, f=True)
+    module_type = module_class.__name__
+
+    start = time.perf_counter()
+    for i in range(count):
+        create_func(f'L_bench{i}', module_type, module_class)
+
+    return time.perf_counter() - start
+
+def main():
+    results = {}
+    for module_type, module_class in module_tools.get_module_classes().items():
+        if 'creation_attrs' not in module_class.meta_args:
+            # Old style modules without grouped meta_args
+            continue
+
+        for count in COUNTS:
+            compiled = time_creation(module_class, count, create_from_plan)
+            per_attr = time_creation(module_class, count, create_per_attribute)
+
+            results[(module_type, count)] = (compiled, per_attr)
+            print(f'{module_type:<10} {count:>4} modules: compiled {compiled:.4f}s, per attribute {per_attr:.4f}s, '
+                  f'{per_attr / compiled:.1f}x')
+
+    cmds.file(new=True, f=True)
+    return results
+
+if __name__ == '__main__':
+    main()
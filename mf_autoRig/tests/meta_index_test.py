@@ -0,0 +1,71 @@
+"""
+Index of the META_ nodes by moduleType and name.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+from mf_autoRig.modules.Clavicle import Clavicle
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.meta_index import get_index, rebuild_index
+from mf_autoRig.modules.Module import Module
+from mf_autoRig.modules.Spine import Spine
+
+NUM = 12
+
+
+def build_modules():
+    for i in range(NUM):
+        Limb(f'L_limb{i:02}')
+        Clavicle(f'L_clavicle{i:02}')
+        if i % 3 == 0:
+            Spine(f'M_spine{i:02}')
+
+
+def scene_order(module_types):
+    return [node for node in pm.ls('META_*', type='network') if node.moduleType.get() in module_types]
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+    Module.instances.clear()
+
+
+def test_scene_order():
+    build_modules()
+
+    for index in (get_index(), rebuild_index()):
+        assert index.get_nodes() == scene_order(('Limb', 'Clavicle', 'Spine'))
+        assert index.get_nodes('Limb') == scene_order(('Limb',))
+        assert index.get_nodes(['Spine', 'Limb']) == scene_order(('Limb', 'Spine'))
+        assert index.get_nodes_by_type()['Clavicle'] == scene_order(('Clavicle',))
+
+
+def test_removed_and_renamed():
+    build_modules()
+    index = get_index()
+    assert len(index) == NUM * 2 + NUM // 3
+
+    pm.delete('META_L_limb03')
+    limbs = index.get_nodes('Limb')
+    assert len(limbs) == NUM - 1 and limbs == scene_order(('Limb',))
+
+    # Renamed nodes keep their place
+    pm.rename('META_L_limb04', 'META_L_arm')
+    assert index.get_nodes('Limb')[3] == pm.PyNode('META_L_arm')
+    assert index.get_node('META_L_arm') == pm.PyNode('META_L_arm')
+    assert index.get_node('META_L_limb04') is None
+
+    # Not a META_ node anymore
+    pm.rename('META_L_arm', 'L_arm_network')
+    assert len(index.get_nodes('Limb')) == NUM - 2
+
+
+def test_new_scene():
+    build_modules()
+    assert len(get_index()) > 0
+
+    cmds.file(new=True, f=True)
+    assert len(get_index()) == 0
+
+    Spine('M_spine')
+    assert get_index().get_nodes('Spine') == [pm.PyNode('META_M_spine')]
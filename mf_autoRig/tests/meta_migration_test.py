@@ -0,0 +1,144 @@
+"""
+Loading META nodes created before an attribute was added to the module's meta_args.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+import mf_autoRig.modules.meta as mdata
+from mf_autoRig.modules import module_tools
+from mf_autoRig.modules.FKChain import FKChain
+from mf_autoRig.modules.Hand import Hand
+from mf_autoRig.modules.IKFoot import IKFoot
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.Module import Module
+from mf_autoRig.modules.Spine import Spine
+
+
+def create_old_metadata(name, module_class, removed):
+    """
+    Creates a metaNode for module_class without the removed attributes, like one saved by an older version
+    """
+    meta_args = {group: {key: spec for key, spec in attrs.items() if key not in removed}
+                 for group, attrs in module_class.meta_args.items()}
+    return mdata.create_metadata(name, module_class.__name__, mdata.compile_plan(meta_args), True)
+
+
+def has_attr(metaNode, attribute):
+    return pm.attributeQuery(attribute, node=str(metaNode), exists=True)
+
+
+def load(metaNode):
+    Module.instances.clear()
+    return module_tools.createModule(metaNode)
+
+
+def check_migrated(module_class, defaults):
+    """
+    Loads an old metaNode of module_class and checks the removed attributes got their default values,
+    and are only added to the node by save_metadata
+    """
+    metaNode = create_old_metadata(f'L_{module_class.__name__}', module_class, list(defaults))
+
+    module = load(metaNode)
+    for attribute, value in defaults.items():
+        assert getattr(module, attribute) == value, f'{module_class.__name__}.{attribute}'
+
+    # Loading doesn't write to the scene
+    assert not any(has_attr(metaNode, attribute) for attribute in defaults)
+
+    module.save_metadata()
+    for attribute, value in defaults.items():
+        assert has_attr(metaNode, attribute) and metaNode.attr(attribute).get() == value
+    assert mdata.missing_attrs(metaNode, module.meta_plan) == []
+
+    reloaded = load(metaNode)
+    assert all(getattr(reloaded, attribute) == value for attribute, value in defaults.items())
+
+    return module
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+    Module.instances.clear()
+
+
+def test_fk_drive():
+    for module_class in (Limb, Hand, Spine, FKChain):
+        check_migrated(module_class, {'fk_drive': 'constraint'})
+
+
+def test_ikfk_blend():
+    for module_class in (Limb, IKFoot):
+        check_migrated(module_class, {'ikfk_blend': 'constraint'})
+
+
+def test_ik_solver():
+    check_migrated(Limb, {'ik_solver': 'handle'})
+
+
+def test_forearm_twist():
+    check_migrated(Limb, {'forearm_twist_mode': 'aim', 'forearm_twist_joints': 1})
+
+
+def test_every_new_attr_missing():
+    module = check_migrated(Limb, {'forearm_twist_mode': 'aim', 'forearm_twist_joints': 1, 'fk_drive': 'constraint',
+                                   'ikfk_blend': 'constraint', 'ik_solver': 'handle'})
+    assert module.forearm_twist is False
+
+
+def test_rigged_module():
+    arm = Limb('L_arm')
+    arm.create_guides()
+    arm.create_joints()
+    arm.rig()
+    arm.metaNode.deleteAttr('ik_solver')
+
+    module = load(arm.metaNode)
+    assert module.ik_solver == 'handle'
+    assert module.ikHandle == arm.ikHandle and module.fk_ctrls == arm.fk_ctrls
+
+
+def test_changed_value_kept():
+    metaNode = create_old_metadata('L_arm', Limb, ['fk_drive'])
+    module = load(metaNode)
+
+    module.fk_drive = 'matrix'
+    module.save_metadata()
+    assert load(metaNode).fk_drive == 'matrix'
+
+
+def test_lazy_module():
+    metaNode = create_old_metadata('L_arm', Limb, ['fk_drive'])
+    Module.instances.clear()
+    module = module_tools.createModule(metaNode, lazy=True)
+
+    assert module.lazy and module.fk_drive == 'constraint'
+    assert not has_attr(metaNode, 'fk_drive')
+
+
+def test_missing_message_attr():
+    metaNode = create_old_metadata('L_arm', Limb, ['fk_ctrls'])
+    Module.instances.clear()
+    module = module_tools.createModule(metaNode, lazy=True)
+
+    assert module.count_meta('fk_ctrls') == 0 and module.fk_ctrls == []
+
+
+def test_migrate_metadata():
+    metaNode = create_old_metadata('L_arm', Limb, ['fk_drive', 'ik_solver'])
+    module = load(metaNode)
+    module.ik_solver = 'analytic'
+
+    assert sorted(module.migrate_metadata()) == ['fk_drive', 'ik_solver']
+    assert metaNode.fk_drive.get() == 'constraint' and metaNode.ik_solver.get() == 'analytic'
+    assert module.migrate_metadata() == []
+
+
+def test_module_graph():
+    create_old_metadata('M_spine', Spine, ['fk_drive'])
+    create_old_metadata('L_arm', Limb, ['fk_drive'])
+    Module.instances.clear()
+
+    modules = {module.name: module for module in module_tools.load_module_graph()}
+    assert modules['M_spine'].fk_drive == modules['L_arm'].fk_drive == 'constraint'
+    assert not any(has_attr(module.metaNode, 'fk_drive') for module in modules.values())
@@ -0,0 +1,75 @@
+"""
+META nodes built from the compiled meta_args of each module type.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+import mf_autoRig.modules.meta as mdata
+from mf_autoRig.modules import module_tools
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_compile_schema():
+    commands = mdata.compile_schema({
+        'creation_attrs': {'name': {'type': 'string'}},
+        'config_attrs': {
+            'jnt_orient_main': {'attributeType': 'double3'},
+            'finger_num': {'attributeType': 'long', 'dv': 5},
+        },
+        'info_attrs': {'all_ctrls': {'attributeType': 'message', 'm': True, 'w': False}},
+    })
+
+    assert commands == [
+        'addAttr -ln "name" -dt "string"',
+        'addAttr -ln "jnt_orient_main" -at "double3"',
+        'addAttr -ln "jnt_orient_mainX" -at "double" -p "jnt_orient_main"',
+        'addAttr -ln "jnt_orient_mainY" -at "double" -p "jnt_orient_main"',
+        'addAttr -ln "jnt_orient_mainZ" -at "double" -p "jnt_orient_main"',
+        'addAttr -ln "finger_num" -at "long" -dv 5',
+        'addAttr -ln "all_ctrls" -at "message" -m -w 0',
+    ]
+
+
+def test_unsupported_flag():
+    try:
+        mdata.compile_schema({'config_attrs': {'num': {'attributeType': 'long', 'hidden': True}}})
+    except ValueError:
+        pass
+    else:
+        assert False, 'compile_schema accepted an unknown addAttr flag'
+
+
+def test_node_has_every_attr():
+    for module_type, module_class in module_tools.get_module_classes().items():
+        plan = module_class.meta_plan
+        if 'moduleType' not in plan:
+            # FKFoot still has an old flat meta_args, without the creation attrs
+            continue
+
+        metaNode = mdata.create_metadata(f'M_{module_type}', module_type, plan, True)
+        node = str(metaNode)
+
+        assert metaNode.name() == f'META_M_{module_type}'
+        assert metaNode.attr('name').get() == f'M_{module_type}'
+        assert metaNode.moduleType.get() == module_type
+
+        for attr in plan:
+            assert pm.attributeQuery(attr.name, node=node, exists=True), f'{module_type} has no {attr.name}'
+            assert pm.attributeQuery(attr.name, node=node, attributeType=True) == attr.attr_type
+            assert pm.attributeQuery(attr.name, node=node, multi=True) == attr.multi
+            if attr.kind == 'vector':
+                assert pm.attributeQuery(attr.name, node=node, listChildren=True) == [attr.name + axis
+                                                                                     for axis in 'XYZ']
+
+
+def test_nodes_are_independent():
+    plan = module_tools.get_module_classes()['Limb'].meta_plan
+    first = mdata.create_metadata('L_arm', 'Limb', plan, True)
+    second = mdata.create_metadata('L_leg', 'Limb', plan, True)
+
+    first.attach_index.set(3)
+    assert second.attach_index.get() == 0
+    assert first.attr('name').get() == 'L_arm' and second.attr('name').get() == 'L_leg'
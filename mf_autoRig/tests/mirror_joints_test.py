@@ -0,0 +1,77 @@
+"""
+mirrorJoints against pm.mirrorJoint on every plane.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.utils import joint_tools
+
+TOLERANCE = 1e-4
+
+POSITIONS = [(15.31, 138.3, -2.84), (30.07, 115.57, -1.37), (41.86, 97.41, 12.15), (45, 90, 14)]
+
+PLANE_FLAGS = {'YZ': 'mirrorYZ', 'XZ': 'mirrorXZ', 'XY': 'mirrorXY'}
+
+
+def build_chain(parent=None):
+    pm.select(clear=True)
+    joints = []
+    for i, pos in enumerate(POSITIONS):
+        jnt = pm.createNode('joint', name=f'L_arm{i:02}_jnt')
+        pm.move(jnt, pos)
+        joints.append(jnt)
+    joint_tools.orient_joints(joints, (1, 0, 0), (0, 0, 1), useNormal=True)
+    joints[1].rotate.set(10, -25, 40)
+    if parent is not None:
+        pm.parent(joints[0], parent)
+    return joints
+
+
+def world_matrices(joints):
+    return np.array([pm.xform(jnt, q=True, ws=True, m=True) for jnt in joints])
+
+
+def check_plane(plane, parent=None):
+    joints = build_chain(parent)
+
+    # Leftover mirrorJoint would duplicate
+    locator = pm.spaceLocator(name='L_arm_loc')
+    pm.parent(locator, joints[1])
+
+    reference_names = pm.mirrorJoint(joints[0], mirrorBehavior=True, searchReplace=('L_', 'REF_'),
+                                     **{PLANE_FLAGS[plane]: True})
+    reference = [pm.PyNode(name) for name in reference_names if pm.nodeType(name) == 'joint']
+
+    nodes = len(cmds.ls())
+    mirrored = joint_tools.mirrorJoints(joints, ('L_', 'R_'), plane=plane)
+
+    assert [jnt.name() for jnt in mirrored] == [jnt.name().replace('L_', 'R_') for jnt in joints]
+    assert len(cmds.ls()) == nodes + len(joints)
+    assert np.allclose(world_matrices(mirrored), world_matrices(reference), atol=TOLERANCE), plane
+    assert np.allclose(mirrored[1].rotate.get(), joints[1].rotate.get(), atol=TOLERANCE)
+    assert mirrored[0].getParent() == joints[0].getParent()
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_planes():
+    for plane in PLANE_FLAGS:
+        setup_function()
+        check_plane(plane)
+
+
+def test_under_parent():
+    parent = pm.group(em=True, name='Joints_Grp')
+    parent.translate.set(0, 5, 2)
+    check_plane('YZ', parent)
+
+
+def test_partial_chain():
+    joints = build_chain()
+    mirrored = joint_tools.mirrorJoints([joints[0], joints[2]], ('L_', 'R_'))
+    assert mirrored[1].getParent() == mirrored[0]
+    x, y, z = pm.xform(joints[2], q=True, ws=True, t=True)
+    assert np.allclose(pm.xform(mirrored[1], q=True, ws=True, t=True), (-x, y, z), atol=TOLERANCE)
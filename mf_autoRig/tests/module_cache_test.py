@@ -0,0 +1,79 @@
+"""
+Module instances cached by metaNode uuid, with dirty tracking through node callbacks.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+from mf_autoRig.modules import module_tools
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.Module import Module
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+    Module.instances.clear()
+
+
+def test_hit_and_miss():
+    arm = Limb('L_arm')
+    cache = Module.instances
+
+    assert module_tools.createModule(arm.metaNode) is arm
+    assert cache.hits == 1 and cache.misses == 0
+
+    cache.remove(arm)
+    loaded = module_tools.createModule(arm.metaNode)
+    assert loaded is not arm and loaded.name == 'L_arm'
+    assert cache.misses == 1
+    assert module_tools.createModule(arm.metaNode) is loaded
+
+
+def test_dirty_on_change():
+    arm = Limb('L_arm')
+    arm.save_metadata()
+    cache = Module.instances
+    assert not cache.is_dirty(arm)
+
+    arm.metaNode.attach_index.set(3)
+    assert cache.is_dirty(arm)
+
+    # Rehydrated in place
+    assert module_tools.createModule(arm.metaNode) is arm
+    assert arm.attach_index == 3 and cache.misses == 1
+    assert not cache.is_dirty(arm)
+
+
+def test_save_marks_clean():
+    arm = Limb('L_arm')
+    arm.attach_index = 2
+    arm.save_metadata()
+
+    assert not Module.instances.is_dirty(arm)
+    assert module_tools.createModule(arm.metaNode) is arm
+    assert Module.instances.hits == 1
+
+
+def test_delete_evicts():
+    arm = Limb('L_arm')
+    assert arm.metaNode in Module.instances
+
+    pm.delete(arm.metaNode)
+    assert len(Module.instances) == 0
+    assert Module.instances.version(arm) is None
+
+
+def test_new_scene_clears():
+    arm = Limb('L_arm')
+    leg = Limb('L_leg')
+    assert len(Module.instances) == 2
+
+    cmds.file(new=True, f=True)
+    assert len(Module.instances) == 0
+    assert Module.instances.is_dirty(arm) and Module.instances.is_dirty(leg)
+
+    # A module with the same name in the new scene isn't the old one
+    arm = Limb('L_arm')
+    Module.instances.remove(arm)
+    loaded = module_tools.createModule(arm.metaNode)
+    assert loaded is not arm and loaded.metaNode.exists()
+    assert Module.instances.misses == 1
@@ -0,0 +1,132 @@
+"""
+Loading every module of the scene with module_tools.load_module_graph.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+
+from mf_autoRig.modules import module_tools, presets
+from mf_autoRig.modules.FKChain import FKChain
+from mf_autoRig.modules.Module import Module
+
+
+def build_chain(num):
+    """
+    Creates num FKChain metaNodes, each one connected to the previous one
+    """
+    modules = [FKChain(f'M_chain{i:02}', num=3) for i in range(num)]
+    for parent, child in zip(modules, modules[1:]):
+        child.connect_metadata(parent)
+    return modules
+
+
+def load_uncached(lazy=False):
+    Module.instances.clear()
+    return module_tools.load_module_graph(lazy=lazy)
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+    Module.instances.clear()
+
+
+def test_graph_links():
+    presets.biped()
+    graph = load_uncached()
+
+    assert len(graph) == 12
+    assert [module.name for module in graph.get_roots()] == ['M_spine']
+
+    by_name = {module.name: module for module in graph}
+    assert by_name['L_arm'].parent is by_name['L_clavicle']
+    assert by_name['L_hand'] in by_name['L_arm'].children
+    assert by_name['R_arm'].mirrored_from is by_name['L_arm']
+    assert by_name['L_arm'].mirrored_to is by_name['R_arm']
+    assert sorted(child.name for child in by_name['M_spine'].children) == ['L_clavicle', 'L_leg', 'M_neck',
+                                                                           'R_clavicle', 'R_leg']
+
+    # Parents and mirror sources come first
+    position = {module.name: i for i, module in enumerate(graph)}
+    for module in graph:
+        for source in (module.parent, module.mirrored_from):
+            if source is not None:
+                assert position[source.name] < position[module.name]
+
+
+def test_graph_matches_metadata():
+    presets.biped()
+    graph = load_uncached()
+
+    for module in graph:
+        parent = module.metaNode.parent.get()
+        assert (module.parent.metaNode if module.parent is not None else None) == parent
+        assert module.moduleType == module.metaNode.moduleType.get()
+        assert module.metaNode.name() == f'META_{module.name}'
+
+
+def test_cached_modules_reused():
+    build_chain(4)
+    first = load_uncached()
+    assert Module.instances.misses == 4
+
+    Module.instances.reset_stats()
+    second = module_tools.load_module_graph()
+    assert Module.instances.hits == 4 and Module.instances.misses == 0
+    assert all(a is b for a, b in zip(first, second))
+    assert second.queries < first.queries
+
+
+def test_queries_grow_linearly():
+    queries = []
+    for num in (4, 8, 12):
+        setup_function()
+        build_chain(num)
+        queries.append(load_uncached().queries)
+
+    assert queries[2] - queries[1] == queries[1] - queries[0]
+
+
+def test_nested_load_follows_links():
+    build_chain(3)
+    Module.instances.clear()
+    nested = []
+
+    # A module that loads another one while the graph is loading, eg. from derive_from_meta
+    original = FKChain.derive_from_meta
+
+    def derive_from_meta(self):
+        original(self)
+        if self.name == 'M_chain00':
+            module = module_tools.createModule(pm.PyNode('META_M_chain02'))
+            nested.append(module.parent)
+
+    FKChain.derive_from_meta = derive_from_meta
+    try:
+        graph = module_tools.load_module_graph()
+    finally:
+        FKChain.derive_from_meta = original
+
+    # The parent was there right away, not only once the graph wired it
+    assert nested[0] is not None and nested[0].name == 'M_chain01'
+    by_name = {module.name: module for module in graph}
+    assert by_name['M_chain02'].parent is by_name['M_chain01']
+
+
+def test_get_all_modules_by_type():
+    presets.biped()
+    Module.instances.clear()
+
+    modules = module_tools.get_all_modules(module_types=['Spine', 'Clavicle'], create=True)
+    assert sorted(module.name for module in modules) == ['L_clavicle', 'M_spine', 'R_clavicle']
+
+    # Only the matching modules are created, and lazily
+    assert len(Module.instances) == 3
+    assert all(module.lazy for module in modules)
+    spine = next(module for module in modules if module.name == 'M_spine')
+    assert len(spine.guides) == 4
+
+    assert module_tools.get_all_modules(module_types=['Spine'], create=True) == [spine]
+
+
+def test_empty_scene():
+    graph = load_uncached()
+    assert len(graph) == 0 and graph.get_roots() == []
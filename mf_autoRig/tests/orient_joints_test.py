@@ -0,0 +1,104 @@
+"""
+Parity of the analytic orient_joints with the aimConstraint based orient_joints_constraint.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules import Hand
+from mf_autoRig.utils import joint_tools, rig_math
+
+TOLERANCE = 1e-4
+
+CHAINS = {
+    'arm': [(15.31, 138.3, -2.84), (30.07, 115.57, -1.37), (41.86, 97.41, 12.15)],
+    'spine': [(0, 92.04, 0), (0, 108.33, 3.03), (0, 122.77, 1.79), (0, 136.34, -1.46), (0, 145, -3)],
+    'two': [(1, 2, 3), (4, 6, 3)],
+    'straight': [(0, 0, 0), (0, 5, 0), (0, 10, 0)],
+}
+
+VECTORS = [((1, 0, 0), (0, 0, 1)), ((0, 1, 0), (0, 0, 1)), ((0, -1, 0), (0, 0, -1))]
+
+
+def build_chain(name, positions, parent=None):
+    pm.select(clear=True)
+    joints = []
+    for i, pos in enumerate(positions):
+        jnt = pm.createNode('joint', name=f'{name}{i:02}_jnt')
+        pm.move(jnt, pos)
+        joints.append(jnt)
+    if parent is not None:
+        pm.parent(joints[0], parent)
+    return joints
+
+
+def world_matrices(joints):
+    return np.array([pm.xform(jnt, q=True, ws=True, m=True) for jnt in joints])
+
+
+def check_parity(name, positions, aim, up, use_normal, parent=None):
+    analytic = build_chain(f'{name}_analytic', positions, parent)
+    reference = build_chain(f'{name}_reference', positions, parent)
+
+    joint_tools.orient_joints(analytic, aim, up, useNormal=use_normal)
+    joint_tools.orient_joints_constraint(reference, aim, up, useNormal=use_normal)
+
+    assert np.allclose(world_matrices(analytic), world_matrices(reference), atol=TOLERANCE), name
+    for a, b in zip(analytic, reference):
+        assert str(a.getParent()).replace('analytic', 'reference') == str(b.getParent())
+        assert np.allclose(a.rotate.get(), (0, 0, 0), atol=TOLERANCE)
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_parity():
+    for name, positions in CHAINS.items():
+        for aim, up in VECTORS:
+            for use_normal in (True, False):
+                setup_function()
+                check_parity(name, positions, aim, up, use_normal)
+
+
+def test_parity_under_parent():
+    parent = pm.group(em=True, name='parent_grp')
+    parent.translate.set(3, -2, 1)
+    parent.rotate.set(20, 45, -10)
+    check_parity('arm', CHAINS['arm'], (1, 0, 0), (0, 0, 1), True, parent)
+
+
+def orient_finger_constraint(guides, orient_guide, aim, up):
+    """
+    Finger joints oriented like Hand did before the batched solver, one aimConstraint per joint
+    """
+    jnts = build_chain(f'{guides[0]}_reference', [pm.xform(g, q=True, ws=True, t=True) for g in guides])
+    for jnt, next_jnt in zip(jnts, jnts[1:]):
+        constraint = pm.aimConstraint(next_jnt, jnt, aim=aim, upVector=up, worldUpObject=orient_guide,
+                                      worldUpType='objectrotation', worldUpVector=[1, 0, 0])
+        pm.delete(constraint)
+        pm.makeIdentity(jnt, apply=True, r=True)
+        pm.parent(next_jnt, jnt)
+    pm.joint(jnts[-1], edit=True, orientJoint='none')
+    return jnts
+
+
+def test_hand_fingers_parity():
+    hand = Hand.Hand('L_hand')
+    hand.create_guides()
+    for orient_guide in hand.orient_guides:
+        pm.rotate(orient_guide, (15, -20, 5), objectSpace=True, relative=True)
+    hand.create_joints()
+
+    for finger_guide, orient_guide, root in zip(hand.jnt_guides, hand.orient_guides, hand.finger_jnts):
+        fingers = joint_tools.get_joint_hierarchy(root)
+        reference = orient_finger_constraint(finger_guide, orient_guide, hand.jnt_orient_main,
+                                             hand.jnt_orient_secondary)
+        assert len(fingers) == len(finger_guide)
+        assert np.allclose(world_matrices(fingers), world_matrices(reference), atol=TOLERANCE), root
+
+
+def test_euler_roundtrip():
+    angles = np.array([[10, 20, 30], [-170, 45, 89], [0, 0, 0], [90, -30, 180]])
+    matrices = rig_math.euler_to_matrix(angles)
+    assert np.allclose(rig_math.euler_to_matrix(rig_math.matrix_to_euler(matrices)), matrices)
@@ -0,0 +1,84 @@
+"""
+Pole vector placement, bent limbs match the previous dt.Vector projection and straight limbs use their orient plane.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.utils import ik_fk_tools, rig_math
+from mf_autoRig.utils.joint_tools import orient_joints
+
+TOLERANCE = 1e-4
+
+LIMBS = [
+    [(0, 10, 0), (0, 5, 1), (0, 0, 0)],
+    [(12, 140, -2), (38, 128, -6), (60, 118, 3)],
+    [(-9, 90, 0), (-10, 48, 3.5), (-11, 8, -2)],
+]
+
+
+def projection_pole(start, middle, end):
+    """
+    Previous create_pole_vector math
+    """
+    start, middle, end = (np.array(p, dtype=float) for p in (start, middle, end))
+    line = (end - start) / np.linalg.norm(end - start)
+    projected = line * np.dot(middle - start, line)
+    out = middle - start - projected
+    return out / np.linalg.norm(out) * np.linalg.norm(middle - start) * 1.3 + projected + start
+
+
+def build_limb(name, positions):
+    joints = []
+    for i, p in enumerate(positions):
+        jnt = pm.createNode('joint', name=f'{name}{i}_jnt')
+        pm.move(jnt, p)
+        joints.append(jnt)
+    orient_joints(joints, aimVector=(1, 0, 0), upVector=(0, 1, 0), useNormal=True)
+    return joints
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_bent_limbs():
+    expected = [projection_pole(*limb) for limb in LIMBS]
+    assert np.allclose(rig_math.pole_positions(LIMBS), expected)
+
+
+def test_straight_limb_uses_orient_plane():
+    straight = [(0, 10, 0), (0, 5, 0), (0, 0, 0)]
+    normal = (1, 0, 0)
+    pole = rig_math.pole_positions([straight], normal)[0]
+
+    assert np.all(np.isfinite(pole))
+    assert np.isclose(np.dot(pole - (0, 5, 0), (0, 1, 0)), 0) and np.isclose(np.dot(pole - (0, 5, 0), normal), 0)
+    assert np.isclose(np.linalg.norm(pole - (0, 5, 0)), 5 * rig_math.POLE_DISTANCE)
+
+    # Same side as a slightly bent limb with that chain normal, the one orient_joints uses
+    start, middle, end = np.array([(0, 10, 0), (0, 5, 1e-3), (0, 0, 0)], dtype=float)
+    bent_normal = np.cross(middle - start, middle - end)
+    bent = rig_math.pole_positions([[start, middle, end]])[0]
+    assert np.allclose(rig_math.pole_positions([straight], bent_normal / np.linalg.norm(bent_normal))[0], bent,
+                       atol=0.01)
+
+    # Without a normal there's still a pole
+    assert np.all(np.isfinite(rig_math.pole_positions([straight])))
+
+
+def test_solve_pole_vectors():
+    limbs = [build_limb(f'limb{i}', positions) for i, positions in enumerate(LIMBS)]
+    poles = ik_fk_tools.solve_pole_vectors(limbs, (0, 1, 0))
+    for limb, pole in zip(limbs, poles):
+        assert np.allclose(pole, ik_fk_tools.create_pole_vector(limb), atol=TOLERANCE)
+        assert np.allclose(pole, projection_pole(*[pm.xform(j, q=True, ws=True, t=True) for j in limb]), atol=TOLERANCE)
+
+
+def test_create_ik_straight_limb():
+    joints = build_limb('straight', [(0, 10, 0), (0, 5, 0), (0, 0, 0)])
+    ik_joints, ik_ctrls, ik_ctrl_grp, handle = ik_fk_tools.create_ik(joints, up_vector=(0, 1, 0))
+
+    pole = np.array(pm.xform(ik_ctrls[1], q=True, ws=True, t=True))
+    assert np.all(np.isfinite(pole))
+    assert np.isclose(np.linalg.norm(pole - (0, 5, 0)), 5 * rig_math.POLE_DISTANCE)
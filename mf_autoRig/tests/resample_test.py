@@ -0,0 +1,68 @@
+"""
+Arc-length resampling of guide chains.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules import Spine
+from mf_autoRig.utils import rig_math
+
+TOLERANCE = 1e-3
+
+CURVE = [(0, 92, 0), (0, 108, 3), (0, 123, 1.8), (0, 136, -1.5), (2, 150, -3)]
+
+
+def arc_spacing(points, method):
+    """
+    Arc length between consecutive resampled points, measured on a dense resample of the same spline
+    """
+    dense = rig_math.resample(CURVE, 2000, method)
+    steps = np.linalg.norm(np.diff(dense, axis=0), axis=1)
+    arc = np.concatenate([[0], np.cumsum(steps)])
+    nearest = [np.argmin(np.linalg.norm(dense - p, axis=1)) for p in points]
+    return np.diff(arc[nearest])
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_two_points_linear():
+    start, end = np.array([1.0, 2.0, 3.0]), np.array([4.0, -6.0, 3.5])
+    expected = [start + (end - start) * i / 9 for i in range(10)]
+    assert np.allclose(rig_math.resample([start, end], 10), expected)
+
+
+def test_even_arc_length():
+    for method in ('catmull_rom', 'bspline'):
+        points = rig_math.resample(CURVE, 40, method)
+        assert np.allclose(points[[0, -1]], [CURVE[0], CURVE[-1]])
+
+        spacing = arc_spacing(points, method)
+        assert np.allclose(spacing, spacing.mean(), rtol=0.02), method
+
+
+def test_catmull_rom_through_points():
+    # Evenly spaced input points are sampled back
+    line = [(0, 0, 0), (0, 1, 0), (0, 2, 0), (0, 3, 0)]
+    assert np.allclose(rig_math.resample(line, 4), line)
+
+
+def test_spine_from_curve():
+    spine = Spine.Spine('M_spine', num=25)
+    spine.create_guides(pos=CURVE)
+
+    assert len(spine.guides) == 25
+    positions = np.array([pm.xform(g, q=True, ws=True, t=True) for g in spine.guides])
+    assert np.allclose(positions, rig_math.resample(CURVE, 25), atol=TOLERANCE)
+
+
+def test_more_positions_than_guides():
+    spine = Spine.Spine('M_spine', num=3)
+    try:
+        spine.create_guides(pos=CURVE)
+    except ValueError:
+        pass
+    else:
+        assert False, 'create_guide_chain downsampled the positions'
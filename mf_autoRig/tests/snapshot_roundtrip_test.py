@@ -0,0 +1,107 @@
+"""
+Exporting the module graph to a snapshot file and importing it in an empty scene.
+"""
+import json
+import os
+import tempfile
+
+import pymel.core as pm
+import maya.cmds as cmds
+
+from mf_autoRig.modules import module_tools, presets
+from mf_autoRig.modules.Module import Module
+
+TOLERANCE = 1e-4
+
+
+def compare(first, second):
+    """
+    Returns a list of differences between two snapshots
+    """
+    errors = []
+    first_modules = {m['name']: m for m in first['modules']}
+    second_modules = {m['name']: m for m in second['modules']}
+
+    if set(first_modules) != set(second_modules):
+        errors.append(f"Modules differ: {sorted(set(first_modules) ^ set(second_modules))}")
+
+    for name in set(first_modules) & set(second_modules):
+        a, b = first_modules[name], second_modules[name]
+        for key in ['moduleType', 'creation_args', 'config', 'parent', 'mirrored_from']:
+            if a[key] != b[key]:
+                errors.append(f"{name} {key}: {a[key]} != {b[key]}")
+
+        if sorted(a['guides']['names']) != sorted(b['guides']['names']):
+            errors.append(f"{name}: guides differ")
+            continue
+
+        matrices = dict(zip(b['guides']['names'], b['guides']['matrices']))
+        for guide, mtx_a in zip(a['guides']['names'], a['guides']['matrices']):
+            if any(abs(x - y) > TOLERANCE for x, y in zip(mtx_a, matrices[guide])):
+                errors.append(f"{name} {guide}: matrix differs")
+
+    return errors
+
+
+def snapshot_path():
+    return os.path.join(tempfile.gettempdir(), 'mf_autoRig_snapshot.json')
+
+
+def export_biped():
+    presets.biped()
+    return module_tools.export_snapshot(snapshot_path())
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_round_trip():
+    exported = export_biped()
+
+    cmds.file(new=True, f=True)
+    modules = module_tools.import_snapshot(snapshot_path())
+    reexported = module_tools.export_snapshot(snapshot_path())
+
+    assert len(modules) == len(exported['modules']) == 12
+    assert compare(exported, reexported) == []
+
+
+def test_guides_skip_curves():
+    exported = export_biped()
+    spine = next(entry for entry in exported['modules'] if entry['name'] == 'M_spine')
+    assert spine['guides']['names'] == ['M_spine_3_guide', 'M_spine_2_guide', 'M_spine_1_guide', 'M_spine_0_guide']
+
+    for module in Module.instances.values():
+        for guide in module.get_guide_hierarchy():
+            assert not any(shape.type() == 'nurbsCurve' for shape in pm.listRelatives(guide, shapes=True) or [])
+
+
+def test_guide_mismatch_raises():
+    exported = export_biped()
+    spine = next(entry for entry in exported['modules'] if entry['name'] == 'M_spine')
+    spine['guides']['names'][0] = 'M_spine_9_guide'
+    with open(snapshot_path(), 'w') as f:
+        json.dump(exported, f)
+
+    cmds.file(new=True, f=True)
+    try:
+        module_tools.import_snapshot(snapshot_path())
+    except ValueError as e:
+        assert 'M_spine_9_guide' in str(e)
+    else:
+        assert False, 'import_snapshot placed guides the module did not create'
+
+
+def test_version_checked():
+    exported = export_biped()
+    exported['version'] = module_tools.SNAPSHOT_VERSION - 1
+    with open(snapshot_path(), 'w') as f:
+        json.dump(exported, f)
+
+    try:
+        module_tools.read_snapshot(snapshot_path())
+    except ValueError:
+        pass
+    else:
+        assert False, 'read_snapshot accepted an old version'
@@ -0,0 +1,130 @@
+"""
+Space switch benchmark: per frame evaluation time of ctrls with several spaces, a blendMatrix with a condition per
+space vs one choice node, and the time to set them up with parent_switch_matrix vs parent_switch_table.
+
+Every frame moves the space drivers, like playing back an animation, and queries the world matrix of all the ctrls.
+
+From the script editor:
+    import mf_autoRig.tests.space_switch_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy space_switch_benchmark.py --frames 200
+    python -m mf_autoRig.tests.space_switch_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+CTRLS = 100
+SPACES = 6
+
+
+def build_scene(ctrls=CTRLS, spaces=SPACES):
+    """
+    Returns (ctrls, drivers)
+    """
+    import maya.cmds as cmds
+    import pymel.core as pm
+
+    cmds.file(new=True, f=True)
+    drivers = []
+    for i in range(spaces):
+        driver = pm.createNode('transform', name=f'space{i:02}_loc')
+        driver.translate.set(i, i * 2, 0)
+        drivers.append(driver)
+
+    nodes = []
+    for i in range(ctrls):
+        grp = pm.createNode('transform', name=f'ctrl{i:03}_grp')
+        grp.translate.set(i % 10, 0, i // 10)
+        nodes.append(pm.createNode('transform', name=f'ctrl{i:03}', parent=grp))
+
+    return nodes, drivers
+
+
+def build_switches(mode, table, ctrls=CTRLS, spaces=SPACES):
+    """
+    Returns (ctrl names, driver names, build time)
+    """
+    from mf_autoRig.extras import parentSwitch
+
+    nodes, drivers = build_scene(ctrls, spaces)
+
+    start = time.perf_counter()
+    if table:
+        parentSwitch.parent_switch_table([(ctrl, [(driver.name(), driver) for driver in drivers]) for ctrl in nodes],
+                                         mode=mode)
+    else:
+        for ctrl in nodes:
+            parentSwitch.parent_switch_matrix(ctrl, drivers, mode=mode)
+    build = time.perf_counter() - start
+
+    for i, ctrl in enumerate(nodes):
+        ctrl.spaceSwitch.set(i % spaces)
+
+    return [str(ctrl) for ctrl in nodes], [str(driver) for driver in drivers], build
+
+
+def time_frames(ctrls, drivers, frames):
+    """
+    Returns the average time of a frame
+    """
+    import maya.cmds as cmds
+
+    cmds.xform(ctrls, query=True, worldSpace=True, matrix=True)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        value = ((frame % 30) - 15) * 0.1
+        for driver in drivers:
+            cmds.setAttr(f'{driver}.translateY', value)
+        cmds.xform(ctrls, query=True, worldSpace=True, matrix=True)
+
+    return (time.perf_counter() - start) / frames
+
+
+def run(frames=100, ctrls=CTRLS, spaces=SPACES):
+    import maya.cmds as cmds
+    from mf_autoRig.extras import parentSwitch
+
+    results = {}
+    for mode in parentSwitch.SWITCH_MODES:
+        names, drivers, build = build_switches(mode, False, ctrls, spaces)
+        nodes = sum(len(cmds.ls(type=node_type)) for node_type in ('condition', 'blendMatrix', 'choice'))
+        results[mode] = time_frames(names, drivers, frames)
+
+        names, drivers, table_build = build_switches(mode, True, ctrls, spaces)
+        print(f'{mode:<6} {ctrls} ctrls, {spaces} spaces, {nodes} switch nodes: '
+              f'{results[mode] * 1000:.3f}ms per frame, built in {build:.2f}s, {table_build:.2f}s from a table')
+
+    speedup = results['blend'] / results['choice']
+    print(f'choice switch is {speedup:.1f}x faster')
+
+    cmds.file(new=True, f=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig space switch benchmark')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--ctrls', type=int, default=CTRLS)
+    parser.add_argument('--spaces', type=int, default=SPACES)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.frames, args.ctrls, args.spaces)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
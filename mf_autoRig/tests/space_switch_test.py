@@ -0,0 +1,129 @@
+"""
+Space switching of ctrls through their offsetParentMatrix, one choice node vs a blendMatrix with conditions.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.extras import parentSwitch
+from mf_autoRig.modules.Hand import Hand
+from mf_autoRig.modules.Limb import Limb
+
+TOLERANCE = 1e-4
+
+
+def build_spaces():
+    """
+    Returns (ctrl, [(name, driver)]), the ctrl is under a group and the drivers are moved around
+    """
+    grp = pm.createNode('transform', name='ctrl_grp')
+    grp.translate.set(0, 2, 0)
+    ctrl = pm.createNode('transform', name='ctrl', parent=grp)
+    ctrl.translate.set(1, 0, 3)
+    ctrl.rotate.set(0, 30, 0)
+
+    spaces = []
+    for i, name in enumerate(('world', 'chest', 'hip')):
+        driver = pm.createNode('transform', name=f'{name}_space')
+        driver.translate.set(i, i * 2, 0)
+        driver.rotate.set(i * 20, 0, i * 10)
+        spaces.append((name, driver))
+    return ctrl, spaces
+
+
+def world_matrices(ctrl, spaces):
+    """
+    World matrix of the ctrl with each space on, after moving the drivers
+    """
+    for i, (name, driver) in enumerate(spaces):
+        driver.translate.set(i + 1, 3, -i)
+        driver.rotate.set(10, i * 45, 0)
+
+    matrices = []
+    for i in range(len(spaces)):
+        ctrl.spaceSwitch.set(i)
+        matrices.append(cmds.xform(str(ctrl), query=True, worldSpace=True, matrix=True))
+    return matrices
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_choice_matches_blend():
+    results = {}
+    for mode in parentSwitch.SWITCH_MODES:
+        setup_function()
+        ctrl, spaces = build_spaces()
+        rest = cmds.xform(str(ctrl), query=True, worldSpace=True, matrix=True)
+        parentSwitch.parent_switch_matrix(ctrl, [driver for _, driver in spaces], [name for name, _ in spaces],
+                                          mode=mode)
+
+        # Doesn't move when switched on
+        assert np.allclose(cmds.xform(str(ctrl), query=True, worldSpace=True, matrix=True), rest, atol=TOLERANCE)
+        results[mode] = world_matrices(ctrl, spaces)
+
+    assert np.allclose(results['choice'], results['blend'], atol=TOLERANCE)
+
+    # One node, no conditions
+    assert len(pm.ls(type='choice')) == 1
+    assert not pm.ls(type=['condition', 'blendMatrix'])
+
+
+def test_table_matches_single():
+    ctrl, spaces = build_spaces()
+    parentSwitch.parent_switch_matrix(ctrl, [driver for _, driver in spaces], [name for name, _ in spaces],
+                                      mode='choice')
+    single = world_matrices(ctrl, spaces)
+
+    for mode in parentSwitch.SWITCH_MODES:
+        setup_function()
+        ctrl, spaces = build_spaces()
+        switches = parentSwitch.parent_switch_table([(ctrl, spaces)], mode=mode)
+        assert list(switches) == [ctrl]
+        assert pm.attributeQuery('spaceSwitch', node=ctrl, listEnum=True)[0] == 'world:chest:hip'
+        assert np.allclose(world_matrices(ctrl, spaces), single, atol=TOLERANCE)
+
+
+def test_table_modules():
+    arm = Limb('L_arm')
+    arm.create_guides()
+    hand = Hand('L_hand', finger_num=3)
+    hand.create_guides()
+    hand.connect_guides(arm)
+    arm.create_joints()
+    hand.create_joints()
+    hand.rig()
+    arm.rig()
+
+    world = pm.createNode('transform', name='world_space')
+    chest = pm.createNode('transform', name='chest_space')
+    chest.translate.set(0, 12, 0)
+    ctrls = arm.space_ctrls() + hand.space_ctrls()
+    rest = [cmds.xform(str(ctrl), query=True, worldSpace=True, matrix=True) for ctrl in ctrls]
+
+    switches = parentSwitch.parent_switch_table([(arm, [('world', world), ('chest', chest)]),
+                                                 (hand, [('world', world), ('chest', chest)])])
+    assert list(switches) == ctrls == [arm.ik_ctrls[0], arm.ik_ctrls[1], hand.hand_ctrl]
+    assert len(pm.ls(type='choice')) == 3
+    assert np.allclose([cmds.xform(str(ctrl), query=True, worldSpace=True, matrix=True) for ctrl in ctrls], rest,
+                       atol=TOLERANCE)
+
+    # The ik ctrl follows the chest once switched to it
+    ik_ctrl = arm.ik_ctrls[0]
+    ik_ctrl.spaceSwitch.set(1)
+    chest.translateY.set(14)
+    assert np.allclose(np.subtract(cmds.xform(str(ik_ctrl), query=True, worldSpace=True, translation=True),
+                                   rest[0][12:15]), (0, 2, 0), atol=TOLERANCE)
+
+
+def test_unknown_mode():
+    ctrl, spaces = build_spaces()
+    for func, args in ((parentSwitch.parent_switch_matrix, (ctrl, [spaces[0][1]])),
+                       (parentSwitch.parent_switch_table, ([(ctrl, spaces)],))):
+        try:
+            func(*args, mode='condition')
+        except ValueError:
+            pass
+        else:
+            assert False, f'{func.__name__} accepted an unknown switch mode'
@@ -0,0 +1,113 @@
+"""
+Checks of the pure-Python Maya stand-in (mf_autoRig.standin), the backend is set up in conftest.py:
+    python -m pytest mf_autoRig/tests/standin_test.py
+"""
+import math
+
+import pymel.core as pm
+import maya.cmds as cmds
+
+from mf_autoRig.modules import presets
+from mf_autoRig.standin import mmath
+
+TOLERANCE = 1e-4
+
+
+def close(first, second, tolerance=TOLERANCE):
+    return all(abs(a - b) < tolerance for a, b in zip(first, second))
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_compose_decompose():
+    t, r, s = (1, 2, 3), (30, -45, 120), (1, 2, 0.5)
+    m = mmath.compose(t, r, s)
+    t2, r2, s2 = mmath.decompose(m)
+    assert close(t, t2) and close(s, s2)
+    assert close(mmath.compose(t2, r2, s2), m)
+    assert close(mmath.mult(m, mmath.inverse(m)), mmath.identity())
+
+
+def test_quat_to_euler_rotate_order():
+    cmds.loadPlugin('quatNodes', quiet=True)
+    node = cmds.createNode('quatToEuler')
+
+    # Half turn and a bit around y, past the -90, 90 of the middle axis
+    angle = math.radians(150)
+    cmds.setAttr(f'{node}.inputQuat', 0, math.sin(angle / 2), 0, math.cos(angle / 2))
+    cmds.setAttr(f'{node}.inputRotateOrder', 1)
+    assert close(cmds.getAttr(f'{node}.outputRotate')[0], (0, 150, 0))
+
+    # Every order composes back to the same rotation
+    r = (30, -45, 120)
+    for order, axes in enumerate(mmath.ROTATE_ORDERS):
+        angles = mmath.rotation_to_euler(mmath.rotate_matrix(r), order)
+        rotation = mmath.mult_all([mmath.rotate_matrix([angles[i] if i == axis else 0 for i in range(3)])
+                                   for axis in axes])
+        assert close(rotation, mmath.rotate_matrix(r))
+
+
+def test_parent_keeps_world_position():
+    grp = pm.group(em=True, name='grp')
+    grp.translate.set(5, 0, 0)
+    grp.rotate.set(0, 90, 0)
+    jnt = pm.createNode('joint', name='jnt')
+    pm.move(jnt, 1, 2, 3)
+
+    pm.parent(jnt, grp)
+    assert close(pm.xform(jnt, q=True, ws=True, t=True), (1, 2, 3))
+    assert close(jnt.translate.get(), (-3, 2, -4))
+    assert close(jnt.jointOrient.get(), (0, -90, 0))
+
+
+def test_parent_constraint_offset():
+    target = pm.spaceLocator(name='target')
+    driven = pm.group(em=True, name='driven')
+    target.translate.set(1, 0, 0)
+    driven.translate.set(0, 3, 0)
+
+    pm.parentConstraint(target, driven, mo=True)
+    assert close(driven.getTranslation(space='world'), (0, 3, 0))
+
+    target.rotate.set(0, 0, 90)
+    assert close(driven.getTranslation(space='world'), (-2, -1, 0))
+    assert close(pm.xform(driven, q=True, ws=True, ro=True), (0, 0, 90))
+
+
+def test_mirror_joint_behavior():
+    root = pm.joint(name='L_root_jnt', p=(2, 5, 0))
+    pm.joint(name='L_end_jnt', p=(4, 3, 1))
+    pm.joint(root, e=True, oj='xyz', sao='yup', ch=True)
+
+    mirrored = pm.mirrorJoint(root, mirrorYZ=True, mirrorBehavior=True, searchReplace=('L_', 'R_'))
+    assert mirrored == ['R_root_jnt', 'R_end_jnt']
+    assert close(pm.xform('R_end_jnt', q=True, ws=True, t=True), (-4, 3, 1))
+
+    # Mirrored behavior: the x axes point the opposite way
+    left_x = pm.xform('L_root_jnt', q=True, ws=True, m=True)[:3]
+    right_x = pm.xform('R_root_jnt', q=True, ws=True, m=True)[:3]
+    assert close(left_x, [a * b for a, b in zip(right_x, (1, -1, -1))])
+
+
+def test_ik_handle():
+    start = pm.joint(name='start', p=(0, 0, 0))
+    pm.joint(name='mid', p=(0, -5, 1))
+    end = pm.joint(name='end', p=(0, -10, 0))
+
+    handle, effector = pm.ikHandle(sj=start, ee=end, sol='ikRPsolver', name='chain_ikHandle')
+    assert handle.nodeType() == 'ikHandle' and effector.nodeType() == 'ikEffector'
+    assert close(handle.getTranslation(space='world'), (0, -10, 0))
+    assert pm.listConnections(handle.startJoint) == [start]
+
+
+def test_biped_guides():
+    presets.biped()
+
+    for side in ('L', 'R'):
+        assert cmds.objExists(f'META_{side}_arm')
+    left = pm.xform('L_arm_1_guide', q=True, ws=True, t=True)
+    right = pm.xform('R_arm_1_guide', q=True, ws=True, t=True)
+    assert close(left, (-right[0], right[1], right[2]))
+    assert math.isclose(left[1], presets.pos['arm'][1][1], abs_tol=TOLERANCE)
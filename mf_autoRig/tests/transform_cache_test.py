@@ -0,0 +1,187 @@
+"""
+Transform cache, reads match xform and a node is read again from the scene once it, a parent or a driver moved.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules import module_tools
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.utils import transform_cache
+
+
+class RecordingLimb(Limb):
+    """
+    Limb that keeps the transform cache active while it rigs
+    """
+    caches = []
+
+    def rig(self, *args, **kwargs):
+        self.caches.append(transform_cache.active_cache())
+        super().rig(*args, **kwargs)
+
+
+def xform_matrix(node):
+    return np.reshape(cmds.xform(str(node), q=True, ws=True, m=True), (4, 4))
+
+
+def build_chain():
+    root = pm.createNode('transform', name='root_grp')
+    joints = []
+    for i in range(3):
+        flags = {'parent': joints[-1] if joints else root}
+        jnt = pm.createNode('joint', name=f'chain{i}_jnt', **flags)
+        jnt.translate.set(2, i, 0)
+        jnt.rotate.set(0, 15 * i, 10)
+        joints.append(jnt)
+    return root, joints
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_matches_xform():
+    root, joints = build_chain()
+    root.scale.set(2, 2, 2)
+
+    with transform_cache.build_cache():
+        for _ in range(2):
+            matrices = transform_cache.world_matrices(joints)
+            assert np.allclose(matrices, [xform_matrix(jnt) for jnt in joints])
+
+        assert np.allclose(transform_cache.world_positions(joints),
+                           [cmds.xform(str(jnt), q=True, ws=True, t=True) for jnt in joints])
+
+        rotations = transform_cache.world_rotations(joints)
+        for jnt, rotation in zip(joints, rotations):
+            dup = pm.createNode('transform')
+            pm.xform(dup, ws=True, ro=rotation.tolist())
+            assert np.allclose(np.reshape(pm.xform(dup, q=True, ws=True, m=True), (4, 4))[:3, :3],
+                               xform_matrix(jnt)[:3, :3] / 2)
+
+    # Outside of a build it still works, from the scene
+    assert transform_cache.active_cache() is None
+    assert np.allclose(transform_cache.world_matrices(joints), [xform_matrix(jnt) for jnt in joints])
+
+
+def test_hits_and_misses():
+    root, joints = build_chain()
+
+    with transform_cache.build_cache() as cache:
+        with cache.stage('first'):
+            transform_cache.world_matrices(joints)
+        with cache.stage('second'):
+            transform_cache.world_matrices(joints)
+            transform_cache.world_positions(joints[:2])
+
+        # Nested builds share the cache
+        with transform_cache.build_cache() as nested:
+            assert nested is cache
+
+        assert cache.stats['first'] == {'hits': 0, 'misses': 3, 'queries': 1}
+        assert cache.stats['second'] == {'hits': 5, 'misses': 0, 'queries': 0}
+
+
+def test_evicted_when_moved():
+    root, joints = build_chain()
+
+    with transform_cache.build_cache() as cache:
+        transform_cache.world_matrices(joints)
+
+        # The node itself
+        joints[2].translateX.set(5)
+        assert joints[2] not in cache and joints[1] in cache
+        assert np.allclose(transform_cache.world_matrices(joints), [xform_matrix(jnt) for jnt in joints])
+
+        # A parent moves every child
+        root.rotateY.set(30)
+        assert not any(jnt in cache for jnt in joints)
+        assert np.allclose(transform_cache.world_matrices(joints), [xform_matrix(jnt) for jnt in joints])
+
+        # Reparented
+        pm.parent(joints[2], world=True)
+        pm.move(joints[2], (0, 3, 0), relative=True)
+        assert np.allclose(transform_cache.world_matrices(joints[2:]), [xform_matrix(joints[2])])
+
+
+def test_evicted_with_ancestors():
+    root, joints = build_chain()
+
+    with transform_cache.build_cache() as cache:
+        # Only the children are cached, the parent is watched
+        transform_cache.world_matrices(joints[1:])
+        assert root not in cache and joints[0] not in cache
+
+        joints[0].rotateZ.set(45)
+        assert not any(jnt in cache for jnt in joints)
+        assert np.allclose(transform_cache.world_matrices(joints[1:]), [xform_matrix(jnt) for jnt in joints[1:]])
+
+        # Evicting a node evicts the nodes under it
+        transform_cache.world_matrices(joints)
+        cache.evict(str(joints[1]))
+        assert joints[0] in cache and joints[2] not in cache
+
+        # An ancestor reparented under a group that moves
+        transform_cache.world_matrices(joints)
+        grp = pm.createNode('transform', name='offset_grp')
+        pm.parent(root, grp)
+        assert not any(jnt in cache for jnt in joints)
+        transform_cache.world_matrices(joints)
+        grp.translate.set(0, 10, 0)
+        assert np.allclose(transform_cache.world_matrices(joints), [xform_matrix(jnt) for jnt in joints])
+
+
+def test_evicted_when_driver_moves():
+    driver = pm.createNode('transform', name='driver_grp')
+    driven = pm.createNode('transform', name='driven_grp')
+    pm.parentConstraint(driver, driven)
+
+    with transform_cache.build_cache() as cache:
+        transform_cache.world_matrices([driven])
+        driver.translate.set(1, 2, 3)
+
+        assert driven not in cache
+        assert np.allclose(transform_cache.world_positions([driven])[0], (1, 2, 3))
+
+
+def test_renamed_and_deleted():
+    root, joints = build_chain()
+
+    with transform_cache.build_cache() as cache:
+        transform_cache.world_matrices(joints)
+        pm.rename(joints[0], 'renamed_jnt')
+        assert 'chain0_jnt' not in cache
+
+        pm.delete(joints[2])
+        assert 'chain2_jnt' not in cache
+
+        # A new node with the old name isn't read from memory
+        new = pm.createNode('transform', name='chain0_jnt')
+        new.translate.set(7, 0, 0)
+        assert np.allclose(transform_cache.world_positions(['chain0_jnt'])[0], (7, 0, 0))
+
+    assert len(cache) == 0
+
+
+def test_build_entry_points():
+    RecordingLimb.caches = []
+    arm = RecordingLimb('L_arm')
+    arm.create_guides()
+    leg = RecordingLimb('L_leg')
+    leg.create_guides()
+
+    # Rig button of the modify window
+    module_tools.rig_modules([arm, leg])
+    cache = RecordingLimb.caches[0]
+    assert cache is not None and RecordingLimb.caches == [cache, cache]
+    assert cache.stats['build']['hits'] > 0
+    assert transform_cache.active_cache() is None
+
+    # Already rigged modules are skipped
+    module_tools.rig_modules([arm])
+    assert len(RecordingLimb.caches) == 2
+
+    # Mirror then rig
+    arm.mirror()
+    assert RecordingLimb.caches[-1] is not None and RecordingLimb.caches[-1] is not cache
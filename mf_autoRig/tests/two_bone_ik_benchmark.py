@@ -0,0 +1,143 @@
+"""
+Two bone ik benchmark: per frame evaluation time of limbs solved by ikHandles vs by the analytic node network,
+and how the nodes of each rig are scheduled by parallel evaluation.
+
+Every frame moves the ik ctrls and the poles, like playing back an animation, and queries the world matrix of all
+the ik joints. Node types the evaluation manager doesn't run in parallel are listed with their scheduling,
+on the stand-in backend there is no evaluation manager and only the node counts are printed.
+The stand-in doesn't solve ikHandles, its handle timings are a lower bound.
+
+From the script editor:
+    import mf_autoRig.tests.two_bone_ik_benchmark as bench
+    bench.run()
+
+Headless, with mayapy or on the pure-Python stand-in:
+    mayapy two_bone_ik_benchmark.py --frames 200
+    python -m mf_autoRig.tests.two_bone_ik_benchmark --backend standin
+"""
+import argparse
+import sys
+import time
+
+SOLVERS = ('handle', 'analytic')
+
+LIMBS = 10
+
+# evaluationManager flags of the scheduling types that aren't parallel
+SCHEDULING_FLAGS = ('nodeTypeUntrusted', 'nodeTypeGloballySerialize', 'nodeTypeSerialize')
+
+
+def build_limbs(solver, limbs=LIMBS):
+    """
+    Returns (ik ctrls, pole ctrls, ik joints)
+    """
+    import maya.cmds as cmds
+    import pymel.core as pm
+    from mf_autoRig.modules.Limb import Limb
+
+    cmds.file(new=True, f=True)
+    ik_ctrls, poles, joints = [], [], []
+    for i in range(limbs):
+        side = 'L' if i % 2 == 0 else 'R'
+        x = (i // 2 + 1) * 3 * (1 if side == 'L' else -1)
+        limb = Limb(f'{side}_limb{i:02}')
+        limb.ik_solver = solver
+        limb.create_guides(pos=[(x, 10, 0), (x, 5, 1), (x, 0, 0)])
+        limb.create_joints()
+        limb.rig()
+
+        ik_ctrls.append(str(limb.ik_ctrls[0]))
+        poles.append(str(limb.ik_ctrls[1]))
+        joints.extend(str(jnt) for jnt in limb.ik_joints)
+
+    pm.select(clear=True)
+    return ik_ctrls, poles, joints
+
+
+def scheduling():
+    """
+    Returns {node type: scheduling flag} of the node types in the scene that don't evaluate in parallel,
+    None without an evaluation manager
+    """
+    import maya.cmds as cmds
+
+    if not hasattr(cmds, 'evaluationManager'):
+        return None
+
+    cmds.evaluationManager(mode='parallel')
+    cmds.evaluationManager(invalidate=True)
+
+    types = {}
+    for node_type in sorted(set(cmds.ls(showType=True)[1::2])):
+        for flag in SCHEDULING_FLAGS:
+            if cmds.evaluationManager(query=True, **{flag: node_type}):
+                types[node_type] = flag
+                break
+    return types
+
+
+def time_frames(ik_ctrls, poles, joints, frames):
+    """
+    Returns the average time of a frame
+    """
+    import maya.cmds as cmds
+
+    cmds.xform(joints, query=True, worldSpace=True, matrix=True)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        value = ((frame % 30) - 15) * 0.1
+        for ctrl in ik_ctrls:
+            cmds.setAttr(f'{ctrl}.translateY', value)
+        for pole in poles:
+            cmds.setAttr(f'{pole}.translateX', value)
+        cmds.xform(joints, query=True, worldSpace=True, matrix=True)
+
+    return (time.perf_counter() - start) / frames
+
+
+def run(frames=100, limbs=LIMBS):
+    import maya.cmds as cmds
+
+    results = {}
+    for solver in SOLVERS:
+        ik_ctrls, poles, joints = build_limbs(solver, limbs)
+        counts = {node_type: len(cmds.ls(type=node_type))
+                  for node_type in ('ikHandle', 'poleVectorConstraint', 'parentConstraint')}
+        results[solver] = time_frames(ik_ctrls, poles, joints, frames)
+
+        print(f'{solver:<9} {limbs} limbs, ' + ', '.join(f'{count} {node_type}' for node_type, count in counts.items())
+              + f': {results[solver] * 1000:.3f}ms per frame')
+        types = scheduling()
+        if types is not None:
+            print(f'{solver:<9} not parallel: ' + (', '.join(f'{t} ({flag})' for t, flag in types.items()) or 'none'))
+
+    speedup = results['handle'] / results['analytic']
+    print(f'analytic ik is {speedup:.1f}x faster')
+
+    cmds.file(new=True, f=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='mf_autoRig two bone ik benchmark')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--limbs', type=int, default=LIMBS)
+    parser.add_argument('--backend', choices=('maya', 'standin'), default='maya')
+    args = parser.parse_args(argv)
+
+    if args.backend == 'standin':
+        from mf_autoRig import standin
+        standin.install()
+
+    import maya.standalone
+    maya.standalone.initialize()
+    try:
+        run(args.frames, args.limbs)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Analytic two bone ik, the node network reaches the ik ctrl and bends towards the pole like the ikHandle does.
+"""
+import pymel.core as pm
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.modules import module_tools
+from mf_autoRig.modules.Limb import Limb
+from mf_autoRig.modules.Module import Module
+from mf_autoRig.utils import ik_fk_tools, rig_math
+
+TOLERANCE = 1e-4
+
+
+def build_limb(solver, name='L_arm'):
+    limb = Limb(name)
+    limb.ik_solver = solver
+    limb.create_guides(pos=[(2, 10, 0), (3, 5, 1.5), (2.5, 0, 0)])
+    limb.create_joints()
+    limb.rig()
+    return limb
+
+
+def world_matrices(nodes):
+    return np.reshape(pm.xform(nodes, q=True, ws=True, m=True), (-1, 4, 4))
+
+
+def setup_function():
+    cmds.file(new=True, f=True)
+
+
+def test_rest_pose_matches_handle():
+    rest = {solver: world_matrices(build_limb(solver, f'L_{solver}Arm').ik_joints) for solver in ik_fk_tools.IK_SOLVERS}
+    assert np.allclose(rest['analytic'], rest['handle'], atol=TOLERANCE)
+
+
+def test_reaches_goal():
+    limb = build_limb('analytic')
+    ik_ctrl, pole_ctrl = limb.ik_ctrls
+    rest = world_matrices(limb.ik_joints)[:, 3, :3]
+    upper, lower = np.linalg.norm(np.diff(rest, axis=0), axis=-1)
+
+    for translate, pole_translate in [((1, 2, 1), (0, 0, 0)), ((-2, 3, 2), (0, 2, -3)), ((0, -6, 0), (1, 0, 0))]:
+        ik_ctrl.translate.set(translate)
+        pole_ctrl.translate.set(pole_translate)
+        positions = world_matrices(limb.ik_joints)[:, 3, :3]
+        goal, pole = world_matrices([limb.ik_goal, pole_ctrl])[:, 3, :3]
+
+        # Bones keep their length, the middle joint is where the law of cosines puts it
+        assert np.allclose(np.linalg.norm(np.diff(positions, axis=0), axis=-1), (upper, lower), atol=TOLERANCE)
+        middle, normal = rig_math.two_bone_ik(positions[0], goal, pole, upper, lower)
+        assert np.allclose(positions[1], middle[0], atol=TOLERANCE)
+
+        # Reaches the goal, out of reach the chain is straight towards it
+        distance = np.linalg.norm(goal - positions[0])
+        if distance < upper + lower:
+            assert np.allclose(positions[2], goal, atol=TOLERANCE)
+        else:
+            assert np.allclose(rig_math.normalize(positions[2] - positions[0]),
+                               rig_math.normalize(goal - positions[0]), atol=TOLERANCE)
+
+
+def test_no_handle_and_switch():
+    limb = build_limb('analytic')
+
+    assert not pm.ls(type='ikHandle') and not pm.ls(type='poleVectorConstraint')
+    assert limb.ikHandle is None and limb.metaNode.ik_goal.listConnections() == [limb.ik_goal]
+    assert not pm.attributeQuery('startJoint', node=str(limb.ik_goal), exists=True)
+
+    # The goal is loaded from its own meta attribute
+    Module.instances.clear()
+    module = module_tools.createModule(limb.metaNode)
+    assert module.ik_goal == limb.ik_goal and module.ikHandle is None
+
+    # Ik fk switch works the same, in ik the joints follow the ik joints
+    limb.ik_ctrls[0].translate.set(1, 2, 1)
+    limb.switch.IkFkSwitch.set(0)
+    assert np.allclose(world_matrices(limb.joints), world_matrices(limb.ik_joints), atol=TOLERANCE)
+
+
+def test_unknown_solver():
+    limb = Limb('L_arm')
+    limb.create_guides()
+    limb.create_joints()
+    try:
+        ik_fk_tools.create_ik(limb.joints, solver='ikSCsolver')
+    except ValueError:
+        pass
+    else:
+        assert False, 'create_ik accepted an unknown solver'
@@ -12,10 +12,12 @@ from .guides_tools import (
     connect_guides,
     disconnect_guides,
     create_guide_curve,
+    drive_curve_points,
     create_joint_chain,
     create_joints_from_guides,
     mirror_guides_transforms,
-    create_guide_chain
+    create_guide_chain,
+    create_guides_batch
 )
 from .joint_tools import (
     get_joint_hierarchy,
@@ -28,12 +30,21 @@ from .ik_fk_tools import (
     create_fk_jnts,
     get_joint_orientation,
     create_fk_ctrls,
+    drive_with_matrices,
     create_pole_vector,
+    solve_pole_vectors,
     create_ik,
+    create_two_bone_ik,
     create_guide_curve_for_pole,
     constraint_ikfk,
+    connect_ikfk_weights,
     ikfk_switch
 )
+from .twist_tools import (
+    twist_weights,
+    create_twist_joints,
+    drive_twist
+)
 from .color_tools import (
     set_color,
     auto_color
@@ -0,0 +1,73 @@
+import maya.mel as mel
+import pymel.core as pm
+
+
+def mel_value(value):
+    """
+    Formats a python value as a MEL argument
+    """
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+        return f'"{escaped}"'
+
+    raise TypeError(f"Cannot format {value} as a MEL value")
+
+
+class MelBatch:
+    """
+    Collects MEL commands and runs all of them with a single mel.eval call.
+    Everything runs in one undo step, unlike going through the API.
+    """
+    def __init__(self):
+        self.commands = []
+
+    def add(self, command):
+        self.commands.append(command)
+
+    def connect(self, src, dst, force=False):
+        """
+        Adds a connectAttr, like connectAttr it fails if dst already has an input unless force is True
+        """
+        flag = '-f ' if force else ''
+        self.add(f'connectAttr {flag}{src} {dst};')
+
+    def set(self, plug, value):
+        """
+        Adds a setAttr, supports bool, int, float, str and 3 element vectors
+        """
+        if isinstance(value, str):
+            self.add(f'setAttr -type "string" {plug} {mel_value(value)};')
+        elif isinstance(value, (pm.dt.Vector, list, tuple)):
+            values = ' '.join(mel_value(float(v)) for v in value)
+            self.add(f'setAttr {plug} {values};')
+        else:
+            self.add(f'setAttr {plug} {mel_value(value)};')
+
+    def set_matrix(self, plug, values):
+        """
+        Adds a setAttr of a matrix attribute, values are the 16 values row by row
+        """
+        values = ' '.join(mel_value(float(v)) for v in values)
+        self.add(f'setAttr -type "matrix" {plug} {values};')
+
+    def run(self):
+        """
+        Runs the collected commands and clears them
+        Returns the number of commands that ran
+        """
+        count = len(self.commands)
+        if count == 0:
+            return 0
+
+        script = '\n'.join(self.commands)
+        self.commands = []
+        mel.eval(script)
+
+        return count
+
+    def __len__(self):
+        return len(self.commands)
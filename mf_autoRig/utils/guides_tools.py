@@ -1,9 +1,13 @@
+import maya.cmds as cmds
+import numpy as np
 import pymel.core as pm
 import mf_autoRig.utils.defaults as df
 from mf_autoRig.utils.general import lock_and_hide, get_group
 from mf_autoRig.utils.joint_tools import orient_joints
 from mf_autoRig.utils.general import lock_and_hide
-from mf_autoRig.utils.color_tools import set_color
+from mf_autoRig.utils.color_tools import colors, set_color
+from mf_autoRig.utils import rig_math, transform_cache
+from mf_autoRig.utils.batch import MelBatch
 
 def mirror_guides_old(guides, new_name, plane='YZ'):
     """
@@ -84,22 +88,25 @@ def __create_guides(pos):
     return joints
 
 
+# Distance the vCoord of create_joint_chain guides slides them across the segment, from +Z/2 to -Z/2 of the start guide
+RIBBON_WIDTH = 26
+
+
 def create_joint_chain(jnt_number, name, start_pos, end_pos, rot=None, defaultValue=51):
+    """
+    Creates a start and an end guide with jnt_number - 2 guides between them.
+    The middle guides slide along the segment with uCoord (0 at the start, 100 at the end) and across it,
+    along the start guide Z axis, with vCoord (50 is on the segment). Each one is placed by a setRange and a
+    blendMatrix, the same placement as pinning it to a ribbon plane skinned to the start and end guides.
+    """
     if rot is None:
         rot = [0, 0, 0]
 
-    # Create plane
-    plane = pm.polyPlane(name=f'tmp_{name}_Plane', w=2, h=26, sh=1, sw=1)[0]
-    plane.v.set(0)
     driven_grp = get_group(df.deprecated_driven_grp)
-    pm.parent(plane, driven_grp)
 
     joints = []
-    # Create joints and move them in position for skinning
     startJnt = pm.createNode('joint', name=f'{name}_start')
     endJnt = pm.createNode('joint', name=f'{name}_end')
-    pm.move(startJnt, (-1, 0, 0))
-    pm.move(endJnt, (1, 0, 0))
 
     pm.orientConstraint(startJnt, endJnt)
 
@@ -108,57 +115,34 @@ def create_joint_chain(jnt_number, name, start_pos, end_pos, rot=None, defaultVa
 
     joints.append(startJnt)
 
-    # Skin plane to jnts
-    influencers = [startJnt, endJnt]
-    skn_cluster = pm.skinCluster(influencers, plane, name=f'tmp_{name}_skinCluster', toSelectedBones=True, bindMethod=0, skinMethod=0, normalizeWeights=1)
-    pm.skinPercent(skn_cluster, plane.vtx[0], transformValue=[(startJnt, 1), (endJnt, 0)])
-    pm.skinPercent(skn_cluster, plane.vtx[2], transformValue=[(startJnt, 1), (endJnt, 0)])
-
-    pm.skinPercent(skn_cluster, plane.vtx[1], transformValue=[(startJnt, 0), (endJnt, 1)])
-    pm.skinPercent(skn_cluster, plane.vtx[3], transformValue=[(startJnt, 0), (endJnt, 1)])
-
-    planeShape = pm.listRelatives(plane)[0]
-    planeOrig = pm.listRelatives(plane)[1]
-
-    # Create middle joints and connect to uv pin
+    # Create middle joints, blended from the start to the end by uCoord and offset by vCoord
     for i in range(1, jnt_number-1):
-        # Create uv pin and connect to plane
-        UVpin = pm.createNode('uvPin', name=f'{name}{i}_uvPin')
-        planeShape.worldMesh.connect(UVpin.deformedGeometry)
-        planeOrig.outMesh.connect(UVpin.originalGeometry)
-
-        # Create jnt and coords attributes
         jnt = pm.createNode('joint', name=f'{name}{i}')
-        lock_and_hide(jnt)
         pm.parent(jnt, driven_grp)
-
         joints.append(jnt)
-        value = 100/(jnt_number-1)*i
-
-        for coord in ['uCoord', 'vCoord']:
-            rv = pm.createNode('remapValue', name=f'{name}{i}_{coord}_RV')
-
-            # Set min and max
-            rv.inputMax.set(100)
-            rv.outputMax.set(1)
 
-            # Connect to coords
-            if coord == 'uCoord':
-                pm.addAttr(jnt, ln=coord, at='float', max=100, min=0, dv=value, k=True)
-                jnt.uCoord.connect(rv.inputValue)
-                rv.outValue.connect(UVpin.coordinate[0].coordinateU)
-            elif coord == 'vCoord':
-                pm.addAttr(jnt, ln=coord, at='float', max=100, min=0, dv=defaultValue, k=True)
-                jnt.vCoord.connect(rv.inputValue)
-                rv.outValue.connect(UVpin.coordinate[0].coordinateV)
-
-        # Connect matrix from uv pin to jnt
-        pick_mtx = pm.createNode('pickMatrix')
-        pick_mtx.useScale.set(0)
-        pick_mtx.useShear.set(0)
-
-        UVpin.outputMatrix[0].connect(pick_mtx.inputMatrix)
-        pick_mtx.outputMatrix.connect(jnt.offsetParentMatrix)
+        pm.addAttr(jnt, ln='uCoord', at='float', max=100, min=0, dv=100/(jnt_number-1)*i, k=True)
+        pm.addAttr(jnt, ln='vCoord', at='float', max=100, min=0, dv=defaultValue, k=True)
+
+        # x: uCoord to the blend weight, y: vCoord to the offset
+        coords = pm.createNode('setRange', name=f'{name}{i}_coords_SR')
+        coords.oldMax.set(100, 100, 0)
+        coords.min.set(0, RIBBON_WIDTH / 2, 0)
+        coords.max.set(1, -RIBBON_WIDTH / 2, 0)
+        jnt.uCoord.connect(coords.valueX)
+        jnt.vCoord.connect(coords.valueY)
+
+        # The end is orient constrained to the start, only the position is blended
+        blend = pm.createNode('blendMatrix', name=f'{name}{i}_blendMatrix')
+        startJnt.worldMatrix[0].connect(blend.inputMatrix)
+        endJnt.worldMatrix[0].connect(blend.target[0].targetMatrix)
+        coords.outValueX.connect(blend.target[0].translateWeight)
+        blend.target[0].rotateWeight.set(0)
+        blend.target[0].scaleWeight.set(0)
+
+        blend.outputMatrix.connect(jnt.offsetParentMatrix)
+        coords.outValueY.connect(jnt.translateZ)
+        lock_and_hide(jnt)
 
     startJnt.translate.set(start_pos)
     startJnt.rx.set(rot[0])
@@ -177,10 +161,7 @@ def create_joint_chain(jnt_number, name, start_pos, end_pos, rot=None, defaultVa
     curve = pm.curve(d=1, p=pts, name=f'{name}_guide_crv')
 
     pm.parent(curve, driven_grp)
-    for i in range(curve.numCVs()):
-        cluster = pm.cluster(curve.cv[i], name=f'{curve.name()}_{i + 1:02}_cluster')[1]
-        cluster.visibility.set(0)
-        pm.parent(cluster, joints[i])
+    drive_curve_points(curve, joints)
 
     # color curve
 
@@ -210,7 +191,83 @@ class Guide:
         set_color(self.guide, viewport='cyan')
 
 
-def create_guide_curve(name, guides, display=2, parent: pm.nt.Transform = None):
+def create_guides_batch(names, positions, parent=None, color='cyan', radius=0.5):
+    """
+    Creates a guide joint per name, the batched version of Guide.
+    The joints are created with cmds and all their attributes are set with one MelBatch.
+
+    Args:
+        names: guide names
+        positions: (N, 3) world positions
+        parent: transform to create the guides under, or a list with one per guide, None for the world.
+            The guides keep their world position and orientation, like parenting them would.
+        color: predefined color or (r, g, b) from 0 to 255, see set_color
+
+    Returns:
+        list of guide joints
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    if len(names) != len(positions):
+        raise ValueError(f"Got {len(names)} names for {len(positions)} guide positions")
+
+    parents = list(parent) if isinstance(parent, (list, tuple)) else [parent] * len(names)
+    parent_info = {p: (p.longName(), np.reshape(pm.xform(p, query=True, matrix=True, worldSpace=True), (4, 4)))
+                   for p in set(parents) if p is not None}
+
+    world = np.broadcast_to(np.eye(4), (len(names), 4, 4)).copy()
+    world[:, 3, :3] = positions
+    parent_matrices = np.array([np.eye(4) if p is None else parent_info[p][1] for p in parents])
+    translates, orients = rig_math.joint_values(world, parent_matrices)
+
+    rgb = [c / 255 for c in (colors[color] if isinstance(color, str) else color)]
+
+    batch = MelBatch()
+    paths = []
+    for name, p, translate, orient in zip(names, parents, translates, orients):
+        if p is None:
+            node = cmds.createNode('joint', name=name, skipSelect=True)
+            paths.append(f'|{node}')
+        else:
+            node = cmds.createNode('joint', name=name, parent=parent_info[p][0], skipSelect=True)
+            paths.append(f'{parent_info[p][0]}|{node}')
+
+        batch.set(f'{paths[-1]}.translate', translate.tolist())
+        if np.any(np.abs(orient) > rig_math.EPSILON):
+            batch.set(f'{paths[-1]}.jointOrient', orient.tolist())
+        batch.set(f'{paths[-1]}.radius', radius)
+        batch.set(f'{paths[-1]}.overrideEnabled', True)
+        batch.set(f'{paths[-1]}.overrideRGBColors', True)
+        batch.set(f'{paths[-1]}.overrideColorRGB', rgb)
+    batch.run()
+
+    return [pm.PyNode(path) for path in paths]
+
+
+def drive_curve_points(curve, drivers):
+    """
+    Drives every CV of the curve with the world position of a transform, through a multMatrix and decomposeMatrix.
+    Unlike a cluster per CV there's no deformer chain to evaluate, dragging a guide only dirties its own CV.
+    """
+    shape = curve.getShape()
+    for i, driver in enumerate(drivers):
+        mult = pm.createNode('multMatrix', name=f'{curve.name()}_{i + 1:02}_multMatrix', skipSelect=True)
+        driver.worldMatrix[0].connect(mult.matrixIn[0])
+        curve.worldInverseMatrix[0].connect(mult.matrixIn[1])
+
+        decompose = pm.createNode('decomposeMatrix', name=f'{curve.name()}_{i + 1:02}_decomposeMatrix', skipSelect=True)
+        mult.matrixSum.connect(decompose.inputMatrix)
+        decompose.outputTranslate.connect(shape.controlPoints[i])
+
+
+def create_guide_curve(name, guides, display=2, parent: pm.nt.Transform = None, driver='matrix'):
+    """
+    Creates a linear curve through the guides that follows them.
+    driver: 'matrix' drives the CVs with matrix nodes (see drive_curve_points), 'cluster' with a cluster per CV
+    like older rigs did, it's much slower to evaluate while dragging guides
+    """
+    if driver not in ('matrix', 'cluster'):
+        raise ValueError(f"Unknown guide curve driver {driver}, use matrix or cluster")
+
     # Create curve driven by the guides
     crv_pts = []
     for guide in guides:
@@ -224,11 +281,13 @@ def create_guide_curve(name, guides, display=2, parent: pm.nt.Transform = None):
         pm.parent(curve, parent, relative=True)
         parent.worldInverseMatrix.connect(curve.offsetParentMatrix)
 
-    # Create clusters
-    for i in range(curve.numCVs()):
-        cluster = pm.cluster(curve.cv[i], name=f'{curve.name()}_{i + 1:02}_cluster')[1]
-        cluster.visibility.set(0)
-        pm.parent(cluster, guides[i])
+    if driver == 'matrix':
+        drive_curve_points(curve, guides)
+    else:
+        for i in range(curve.numCVs()):
+            cluster = pm.cluster(curve.cv[i], name=f'{curve.name()}_{i + 1:02}_cluster')[1]
+            cluster.visibility.set(0)
+            pm.parent(cluster, guides[i])
 
     curve.lineWidth.set(2)
     curve.alwaysDrawOnTop.set(1)
@@ -239,29 +298,24 @@ def create_guide_curve(name, guides, display=2, parent: pm.nt.Transform = None):
 
     return curve
 
-def create_guide_chain(name: str, number: int, pos: list, interpolate=True, parent = None):
-    if interpolate and len(pos) == 2 and number > len(pos):
-        new_pos = []
-        start = pm.dt.Vector(pos[0])
-        end = pm.dt.Vector(pos[1])
-        # interpolate between two points
-        for i in range(number):
-            p = start + (end - start) * i / (number - 1)
-            new_pos.append(p.get())
-
-        pos = new_pos
+def create_guide_chain(name: str, number: int, pos: list, interpolate=True, parent = None, method='catmull_rom'):
+    """
+    Creates a chain of guides with a guide curve.
+    If interpolate is set and there are fewer positions than number, the guides are spaced evenly by arc length
+    along a spline through the positions (method: catmull_rom or bspline, see rig_math.resample).
+    More positions than guides raise a ValueError, they aren't downsampled.
+    """
+    if interpolate and len(pos) >= 2 and number > len(pos):
+        pos = rig_math.resample(pos, number, method=method).tolist()
 
     if len(pos) != number:
         raise ValueError(f"Number of positions {len(pos)} does not match the number of guides {number}")
 
-    guides = []
-    for i in range(number):
-        guide = Guide(f'{name}_{i}_guide', pos[i])
-        guides.append(guide.guide)
-
     if parent is not None:
-        pm.matchTransform(parent, guides[0])
-        pm.parent(guides, parent)
+        # Parent at the first guide
+        pm.xform(parent, worldSpace=True, matrix=[1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, *pos[0], 1])
+
+    guides = create_guides_batch([f'{name}_{i}_guide' for i in range(number)], pos, parent=parent)
 
     create_guide_curve(name, guides, parent = parent)
     pm.select(clear=True)
@@ -270,8 +324,9 @@ def create_guide_chain(name: str, number: int, pos: list, interpolate=True, pare
 def create_joints_from_guides(name, guides, aimVector, upVector, suffix=None, endJnt=True):
     pm.select(clear=True)
     radius = guides[0].radius.get()
+    positions = transform_cache.world_positions(guides).tolist()
     joints = []
-    for i, tmp in enumerate(guides):
+    for i, (tmp, pos) in enumerate(zip(guides, positions)):
         if suffix is None:
             suffix = df.skin_sff
 
@@ -281,7 +336,7 @@ def create_joints_from_guides(name, guides, aimVector, upVector, suffix=None, en
 
         jnt = pm.createNode('joint', name=f'{name}{i + 1:02}{suffix}{df.jnt_sff}')
         jnt.radius.set(radius)
-        pm.matchTransform(jnt, tmp, pos=True)
+        jnt.translate.set(pos)
         joints.append(jnt)
 
     orient_joints(joints, aimVector=aimVector, upVector=upVector, useNormal=True)
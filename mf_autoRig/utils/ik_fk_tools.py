@@ -1,6 +1,9 @@
+import numpy as np
 import pymel.core as pm
 import pymel.core.datatypes as dt
 import mf_autoRig.utils.defaults as df
+from mf_autoRig.utils import rig_math, transform_cache
+from mf_autoRig.utils.batch import MelBatch
 from mf_autoRig.utils.controllers_tools import CtrlGrp
 from mf_autoRig.utils.general import get_base_name, get_group
 
@@ -25,9 +28,10 @@ def create_fk_jnts(joints):
 
 
 def get_joint_orientation(firstJnt, secondJnt):
-    A = pm.xform(firstJnt, worldSpace=True, matrix=True, q=True)
-    A_vector = dt.Vector(pm.xform(firstJnt, worldSpace=True, rotatePivot=True, q=True))
-    B_vector = dt.Vector(pm.xform(secondJnt, worldSpace=True, rotatePivot=True, q=True))
+    matrices = transform_cache.world_matrices([firstJnt, secondJnt])
+    A = matrices[0].flatten().tolist()
+    A_vector = dt.Vector(*matrices[0, 3, :3].tolist())
+    B_vector = dt.Vector(*matrices[1, 3, :3].tolist())
 
     AB = B_vector - A_vector
     AB = AB.normal()
@@ -51,7 +55,65 @@ def get_joint_orientation(firstJnt, secondJnt):
         return 0, 1, 0
 
 
-def create_fk_ctrls(joints, skipEnd=True, shape='circle', scale=1):
+FK_DRIVES = ('constraint', 'matrix')
+
+
+def drive_with_matrices(drivers, driven):
+    """
+    Drives each transform with the world matrix of its driver and keeps their current offset, what a
+    parentConstraint with maintainOffset does, without a constraint node.
+    A multMatrix of the offset, the driver worldMatrix and the driven parentInverseMatrix goes into the
+    offsetParentMatrix of the driven node, its translate, rotate, scale and jointOrient are reset.
+    The offset is left out when it's the identity. Parent the driven nodes before driving them.
+
+    Returns:
+        list: the multMatrix nodes
+    """
+    driven = list(driven)
+    matrices = np.reshape(pm.xform(driven + list(drivers), q=True, ws=True, m=True), (2, -1, 4, 4))
+    offsets = matrices[0] @ np.linalg.inv(matrices[1])
+
+    batch = MelBatch()
+    mults = []
+    for driver, node, offset in zip(drivers, driven, offsets):
+        name = node.longName()
+        mult = pm.createNode('multMatrix', name=f'{node.nodeName()}_drive_multMatrix', skipSelect=True)
+        mults.append(mult)
+
+        index = 0
+        if not np.allclose(offset, np.eye(4), atol=1e-6):
+            batch.set_matrix(f'{mult}.matrixIn[0]', offset.flatten().tolist())
+            index = 1
+        batch.connect(f'{driver.longName()}.worldMatrix[0]', f'{mult}.matrixIn[{index}]')
+        batch.connect(f'{name}.parentInverseMatrix[0]', f'{mult}.matrixIn[{index + 1}]')
+        batch.connect(f'{mult}.matrixSum', f'{name}.offsetParentMatrix')
+        _reset_channels(batch, node)
+    batch.run()
+
+    return mults
+
+
+def _reset_channels(batch, node):
+    """
+    Adds the setAttrs that reset a node driven through its offsetParentMatrix
+    """
+    name = node.longName()
+    batch.set(f'{name}.translate', [0, 0, 0])
+    batch.set(f'{name}.rotate', [0, 0, 0])
+    batch.set(f'{name}.scale', [1, 1, 1])
+    if isinstance(node, pm.nt.Joint):
+        batch.set(f'{name}.jointOrient', [0, 0, 0])
+
+
+def create_fk_ctrls(joints, skipEnd=True, shape='circle', scale=1, drive='constraint'):
+    """
+    Creates an fk ctrl chain for the joints.
+    drive: 'constraint' drives every joint with a parentConstraint from its ctrl, 'matrix' with its ctrl world matrix
+    in the joint offsetParentMatrix (see drive_with_matrices), it's much cheaper to evaluate
+    """
+    if drive not in FK_DRIVES:
+        raise ValueError(f"Unknown fk drive {drive}, use constraint or matrix")
+
     scale *= df.CTRL_SCALE
     # Exception case: only one joint
     if type(joints) == pm.nodetypes.Joint:
@@ -63,9 +125,12 @@ def create_fk_ctrls(joints, skipEnd=True, shape='circle', scale=1):
         # Create controller and controller group, parenting the two of them
         fk = CtrlGrp(base_name, shape, scale=scale)
 
-        # Match transforms and parent constrain controller to joint
+        # Match transforms and drive joint with the controller
         pm.matchTransform(fk.grp, jnt)
-        pm.parentConstraint(fk.ctrl, jnt, maintainOffset=True)
+        if drive == 'matrix':
+            drive_with_matrices([fk.ctrl], [jnt])
+        else:
+            pm.parentConstraint(fk.ctrl, jnt, maintainOffset=True)
 
         return fk.ctrl
 
@@ -91,7 +156,8 @@ def create_fk_ctrls(joints, skipEnd=True, shape='circle', scale=1):
 
         # Match transforms and parent constrain controller to joint
         pm.matchTransform(fk.grp, jnt)
-        pm.parentConstraint(fk.ctrl, jnt, maintainOffset=True)
+        if drive == 'constraint':
+            pm.parentConstraint(fk.ctrl, jnt, maintainOffset=True)
 
         # Parent previous group to the current controller
         if ctrl_previous is not None:
@@ -101,34 +167,55 @@ def create_fk_ctrls(joints, skipEnd=True, shape='circle', scale=1):
         # Add ctrl
         fk_ctrls.append(fk.ctrl)
 
+    # All the joints are driven at once, once every ctrl is in place
+    if drive == 'matrix':
+        drive_with_matrices(fk_ctrls, joints)
+
     # Clear selection
     pm.select(clear=True)
 
     return fk_ctrls
 
-def create_pole_vector(joints):
-    A = dt.Vector(pm.xform(joints[0], worldSpace=True, rotatePivot=True, q=True))
-    B = dt.Vector(pm.xform(joints[1], worldSpace=True, rotatePivot=True, q=True))
-    C = dt.Vector(pm.xform(joints[2], worldSpace=True, rotatePivot=True, q=True))
-    AC = C - A
-    AB = B - A
-
-    # T = AB projected onto AC
-    AC_n = AC.normal()
-    dotP = AB * AC_n
-    T = AC_n * dotP
-
-    # Build TB vector
-    TB = AB - T
-    # Create pole length
-    TB = TB.normal()
-    pole_len = AB.length() * 1.3
-    # Create pole position
-    pole = TB * pole_len + T + A
-
-    return pole
-
-def create_ik(joints, world_ik=False, create_new=True):
+def solve_pole_vectors(limbs, up_vector=None):
+    """
+    Pole vector positions of several limbs in one pass, see rig_math.pole_positions.
+
+    Args:
+        limbs: list of [start, middle, end] joints
+        up_vector: upVector the middle joints were oriented with, one for all limbs or one per limb.
+            It places the pole of straight limbs in their orient plane.
+
+    Returns:
+        list of dt.Vector
+    """
+    joints = [jnt for limb in limbs for jnt in limb[:3]]
+    matrices = transform_cache.world_matrices(joints).reshape(-1, 3, 4, 4)
+    positions = matrices[:, :, 3, :3]
+
+    normals = None
+    if up_vector is not None:
+        up_vectors = np.broadcast_to(np.asarray(up_vector, dtype=float).reshape(-1, 3), (len(limbs), 3))
+        normals = np.einsum('ni,nij->nj', up_vectors, matrices[:, 1, :3, :3])
+
+    return [dt.Vector(*pole) for pole in rig_math.pole_positions(positions, normals).tolist()]
+
+def create_pole_vector(joints, up_vector=None):
+    return solve_pole_vectors([joints], up_vector)[0]
+
+IK_SOLVERS = ('handle', 'analytic')
+
+
+def create_ik(joints, world_ik=False, create_new=True, up_vector=None, pole_position=None, solver='handle'):
+    """
+    Creates an ik chain with an ik and a pole vector controller.
+    The pole goes at pole_position, or is solved from the joints, up_vector is the one they were oriented with.
+    solver: 'handle' with an ikRPsolver ikHandle, 'analytic' with the node network of create_two_bone_ik.
+    The ik ctrl drives an ikHandle, or for the analytic solver a goal transform, returned in place of the handle.
+    The goal is a plain transform, keep it apart from ikHandles, eg. Limb stores it in ik_goal.
+    """
+    if solver not in IK_SOLVERS:
+        raise ValueError(f"Unknown ik solver {solver}, use handle or analytic")
+
     if len(joints) > 3:
         pm.error("Only joint chains of 3 supported")
 
@@ -154,8 +241,12 @@ def create_ik(joints, world_ik=False, create_new=True):
         base_name = get_base_name(ik_joints[-1].name())
 
     # Create ik handle
-    handle_name = base_name + '_ikHandle'
-    ikHandle = pm.ikHandle(name=handle_name, startJoint=ik_joints[0], endEffector=ik_joints[2], solver='ikRPsolver')
+    if solver == 'handle':
+        handle_name = base_name + '_ikHandle'
+        ikHandle = pm.ikHandle(name=handle_name, startJoint=ik_joints[0], endEffector=ik_joints[2],
+                               solver='ikRPsolver')[0]
+    else:
+        ikHandle = create_ik_goal(ik_joints, base_name + '_ikGoal')
 
     # Create group and controller for ikHandle
     ik = CtrlGrp(base_name + df.ik_sff, 'cube')
@@ -176,7 +267,7 @@ def create_ik(joints, world_ik=False, create_new=True):
         # pm.matchTransform(ik.grp, ik_joints[-1])
 
 
-    pm.parentConstraint(ik.ctrl, ikHandle[0], maintainOffset=True)
+    pm.parentConstraint(ik.ctrl, ikHandle, maintainOffset=True)
 
     # Pole Vector
     pole_name = base_name + df.pole_sff
@@ -185,9 +276,12 @@ def create_ik(joints, world_ik=False, create_new=True):
     pole = CtrlGrp(pole_name, 'joint_curve')
 
     # Place pole into position
-    pole_vector = create_pole_vector(joints)
+    pole_vector = pole_position if pole_position is not None else create_pole_vector(joints, up_vector)
     pole.grp.translate.set(pole_vector)
-    pm.poleVectorConstraint(pole.ctrl, ikHandle[0])
+    if solver == 'handle':
+        pm.poleVectorConstraint(pole.ctrl, ikHandle)
+    else:
+        create_two_bone_ik(ik_joints, ikHandle, pole.ctrl, base_name)
 
     # Add guide for pole vector
     create_guide_curve_for_pole(pole.ctrl, ik_joints[1])
@@ -196,12 +290,158 @@ def create_ik(joints, world_ik=False, create_new=True):
     ik_ctrls = [ik.ctrl, pole.ctrl]
     ik_ctrl_grp = pm.group(ik.grp, pole.grp, name=base_name + df.ik_sff + '_Control_Grp')
 
-    pm.parent(ikHandle[0], get_group('ikHandle_grp'))
+    pm.parent(ikHandle, get_group('ikHandle_grp'))
 
     # Clear selection
     pm.select(clear=True)
 
-    return ik_joints, ik_ctrls, ik_ctrl_grp, ikHandle[0]
+    return ik_joints, ik_ctrls, ik_ctrl_grp, ikHandle
+
+
+def create_ik_goal(joints, name):
+    """
+    Transform at the end joint for create_two_bone_ik, it takes the place of the ikHandle
+    """
+    goal = pm.createNode('transform', name=name, skipSelect=True)
+    pm.xform(goal, ws=True, t=pm.xform(joints[-1], q=True, ws=True, t=True))
+    return goal
+
+
+def create_two_bone_ik(joints, goal, pole, base_name):
+    """
+    Drives the rotate of the first two joints so the chain reaches the goal and bends towards the pole,
+    with a law of cosines network of math nodes instead of an ikHandle, see rig_math.two_bone_ik.
+    The bones don't stretch, the end joint follows its parent. Each joint keeps the offset it has at build time
+    from the frame solved for it, the aim of its bone and the bend plane normal.
+
+    Returns:
+        list: the created nodes
+    """
+    matrices = np.reshape(pm.xform(list(joints) + [goal, pole], q=True, ws=True, m=True), (-1, 4, 4))
+    root, middle, end, target, pole_position = matrices[:, 3, :3]
+    upper, lower = np.linalg.norm(middle - root), np.linalg.norm(end - middle)
+
+    # Frames of the rest pose, the network output at build time
+    solved, normal = rig_math.two_bone_ik(root, target, pole_position, upper, lower)
+    rest_frames = rig_math.frames([solved[0] - root, target - solved[0]], normal[0])
+    offsets = []
+    for i, frame in enumerate(rest_frames):
+        inverse_frame = np.eye(4)
+        inverse_frame[:3, :3] = frame.T
+        offsets.append(matrices[i] @ inverse_frame)
+
+    nodes = []
+    batch = MelBatch()
+
+    def node(node_type, purpose, **values):
+        new = pm.createNode(node_type, name=f'{base_name}_ik_{purpose}_{node_type}', skipSelect=True)
+        nodes.append(new)
+        for attr, value in values.items():
+            batch.set(f'{new}.{attr}', value)
+        return new
+
+    # Positions, the root one from the parent so it doesn't depend on the driven rotate
+    root_point = node('vectorProduct', 'root', operation=4)
+    batch.connect(f'{joints[0].longName()}.translate', f'{root_point}.input1')
+    batch.connect(f'{joints[0].longName()}.parentMatrix[0]', f'{root_point}.matrix')
+    target_point = node('decomposeMatrix', 'target')
+    batch.connect(f'{goal.longName()}.worldMatrix[0]', f'{target_point}.inputMatrix')
+    pole_point = node('decomposeMatrix', 'pole')
+    batch.connect(f'{pole.longName()}.worldMatrix[0]', f'{pole_point}.inputMatrix')
+
+    # Distance along the root to target line of the middle joint, (d^2 + upper^2 - lower^2) / 2d
+    reach = rig_math.ik_reach(upper, lower)
+    distance = node('distanceBetween', 'distance')
+    batch.connect(f'{root_point}.output', f'{distance}.point1')
+    batch.connect(f'{target_point}.outputTranslate', f'{distance}.point2')
+    clamp = node('clamp', 'distance', minR=float(reach[0]), maxR=float(reach[1]))
+    batch.connect(f'{distance}.distance', f'{clamp}.inputR')
+    square = node('multiplyDivide', 'distanceSquare', operation=3, input2X=2)
+    batch.connect(f'{clamp}.outputR', f'{square}.input1X')
+    numerator = node('plusMinusAverage', 'along')
+    batch.connect(f'{square}.outputX', f'{numerator}.input1D[0]')
+    batch.set(f'{numerator}.input1D[1]', float(upper ** 2 - lower ** 2))
+    twice_along = node('multiplyDivide', 'twiceAlong', operation=2)
+    batch.connect(f'{numerator}.output1D', f'{twice_along}.input1X')
+    batch.connect(f'{clamp}.outputR', f'{twice_along}.input2X')
+    along = node('multiplyDivide', 'along', input2X=0.5)
+    batch.connect(f'{twice_along}.outputX', f'{along}.input1X')
+
+    # Distance of the middle joint from the line, sqrt(upper^2 - along^2)
+    along_square = node('multiplyDivide', 'alongSquare')
+    batch.connect(f'{along}.outputX', f'{along_square}.input1X')
+    batch.connect(f'{along}.outputX', f'{along_square}.input2X')
+    height_square = node('plusMinusAverage', 'heightSquare', operation=2)
+    batch.set(f'{height_square}.input1D[0]', float(upper ** 2))
+    batch.connect(f'{along_square}.outputX', f'{height_square}.input1D[1]')
+    height_clamp = node('clamp', 'heightSquare', maxR=float(upper ** 2))
+    batch.connect(f'{height_square}.output1D', f'{height_clamp}.inputR')
+    height = node('multiplyDivide', 'height', operation=3, input2X=0.5)
+    batch.connect(f'{height_clamp}.outputR', f'{height}.input1X')
+
+    # Line and bend plane directions
+    to_target = node('plusMinusAverage', 'toTarget', operation=2)
+    batch.connect(f'{target_point}.outputTranslate', f'{to_target}.input3D[0]')
+    batch.connect(f'{root_point}.output', f'{to_target}.input3D[1]')
+    to_pole = node('plusMinusAverage', 'toPole', operation=2)
+    batch.connect(f'{pole_point}.outputTranslate', f'{to_pole}.input3D[0]')
+    batch.connect(f'{root_point}.output', f'{to_pole}.input3D[1]')
+    line = node('vectorProduct', 'line', operation=0, normalizeOutput=True)
+    batch.connect(f'{to_target}.output3D', f'{line}.input1')
+    normal_vector = node('vectorProduct', 'normal', operation=2, normalizeOutput=True)
+    batch.connect(f'{to_target}.output3D', f'{normal_vector}.input1')
+    batch.connect(f'{to_pole}.output3D', f'{normal_vector}.input2')
+    towards_pole = node('vectorProduct', 'towardsPole', operation=2, normalizeOutput=True)
+    batch.connect(f'{normal_vector}.output', f'{towards_pole}.input1')
+    batch.connect(f'{line}.output', f'{towards_pole}.input2')
+
+    # Middle joint position
+    line_offset = node('multiplyDivide', 'lineOffset')
+    batch.connect(f'{line}.output', f'{line_offset}.input1')
+    height_offset = node('multiplyDivide', 'heightOffset')
+    batch.connect(f'{towards_pole}.output', f'{height_offset}.input1')
+    for axis in 'XYZ':
+        batch.connect(f'{along}.outputX', f'{line_offset}.input2{axis}')
+        batch.connect(f'{height}.outputX', f'{height_offset}.input2{axis}')
+    middle_point = node('plusMinusAverage', 'middle')
+    batch.connect(f'{root_point}.output', f'{middle_point}.input3D[0]')
+    batch.connect(f'{line_offset}.output', f'{middle_point}.input3D[1]')
+    batch.connect(f'{height_offset}.output', f'{middle_point}.input3D[2]')
+
+    # Frame of each bone, rows are the aim, the normal and their cross product, it drives the joint rotate
+    segments = ((f'{middle_point}.output3D', f'{root_point}.output'),
+                (f'{target_point}.outputTranslate', f'{middle_point}.output3D'))
+    for i, (jnt, (end_plug, start_plug), offset) in enumerate(zip(joints, segments, offsets)):
+        name = jnt.longName()
+        bone = node('plusMinusAverage', f'bone{i}', operation=2)
+        batch.connect(end_plug, f'{bone}.input3D[0]')
+        batch.connect(start_plug, f'{bone}.input3D[1]')
+        aim = node('vectorProduct', f'aim{i}', operation=0, normalizeOutput=True)
+        batch.connect(f'{bone}.output3D', f'{aim}.input1')
+        side = node('vectorProduct', f'side{i}', operation=2, normalizeOutput=True)
+        batch.connect(f'{aim}.output', f'{side}.input1')
+        batch.connect(f'{normal_vector}.output', f'{side}.input2')
+
+        frame = node('fourByFourMatrix', f'frame{i}')
+        for row, plug in enumerate((f'{aim}.output', f'{normal_vector}.output', f'{side}.output')):
+            for column, axis in enumerate('XYZ'):
+                batch.connect(f'{plug}{axis}', f'{frame}.in{row}{column}')
+
+        # The rotate is what's left of the local matrix without the joint orient
+        inverse_orient = np.eye(4)
+        inverse_orient[:3, :3] = rig_math.euler_to_matrix(jnt.jointOrient.get()).T
+        local = node('multMatrix', f'local{i}')
+        batch.set_matrix(f'{local}.matrixIn[0]', offset.flatten().tolist())
+        batch.connect(f'{frame}.output', f'{local}.matrixIn[1]')
+        batch.connect(f'{name}.parentInverseMatrix[0]', f'{local}.matrixIn[2]')
+        batch.set_matrix(f'{local}.matrixIn[3]', inverse_orient.flatten().tolist())
+        rotate = node('decomposeMatrix', f'rotate{i}')
+        batch.connect(f'{local}.matrixSum', f'{rotate}.inputMatrix')
+        batch.connect(f'{name}.rotateOrder', f'{rotate}.inputRotateOrder')
+        batch.connect(f'{rotate}.outputRotate', f'{name}.rotate')
+    batch.run()
+
+    return nodes
 
 
 def create_guide_curve_for_pole(ctrl, joint):
@@ -231,11 +471,41 @@ def create_guide_curve_for_pole(ctrl, joint):
 
     decompose.outputTranslate.connect(shape.controlPoints[1])
 
-def constraint_ikfk(joints, ik_joints, fk_joints):
+IKFK_BLENDS = ('constraint', 'matrix')
+
+
+def constraint_ikfk(joints, ik_joints, fk_joints, blend='constraint'):
+    """
+    Drives the joints with the ik and the fk joints, see ikfk_switch for the weights.
+    blend: 'constraint' with a parentConstraint per joint, 'matrix' with a blendMatrix of the ik and fk joint world
+    matrices that goes into the joint offsetParentMatrix, its target weight is the fk weight.
+    Returns the parentConstraints or the blendMatrix nodes
+    """
+    if blend not in IKFK_BLENDS:
+        raise ValueError(f"Unknown ik fk blend {blend}, use constraint or matrix")
+
     fkik_constraints = []
     if not (len(joints) == len(fk_joints) == len(ik_joints) == 3):
         pm.error("Ik FK Joints not matching")
 
+    if blend == 'matrix':
+        batch = MelBatch()
+        for jnt, ik_jnt, fk_jnt in zip(joints, ik_joints, fk_joints):
+            name = jnt.longName()
+            blend_mtx = pm.createNode('blendMatrix', name=f'{jnt.nodeName()}_ikfk_blendMatrix', skipSelect=True)
+            mult = pm.createNode('multMatrix', name=f'{jnt.nodeName()}_ikfk_multMatrix', skipSelect=True)
+            fkik_constraints.append(blend_mtx)
+
+            batch.connect(f'{ik_jnt.longName()}.worldMatrix[0]', f'{blend_mtx}.inputMatrix')
+            batch.connect(f'{fk_jnt.longName()}.worldMatrix[0]', f'{blend_mtx}.target[0].targetMatrix')
+            batch.connect(f'{blend_mtx}.outputMatrix', f'{mult}.matrixIn[0]')
+            batch.connect(f'{name}.parentInverseMatrix[0]', f'{mult}.matrixIn[1]')
+            batch.connect(f'{mult}.matrixSum', f'{name}.offsetParentMatrix')
+            _reset_channels(batch, jnt)
+        batch.run()
+
+        return fkik_constraints
+
     for i in range(len(joints)):
         constraint = pm.parentConstraint(ik_joints[i], fk_joints[i], joints[i])
         fkik_constraints.append(constraint)
@@ -270,17 +540,7 @@ def ikfk_switch(ik_ctrls_grp, fk_ctrls, ikfk_constraints, endJnt):
     reverse_sw = pm.createNode('reverse', name=base_name + '_Ik_Fk_reverse')
     pm.connectAttr(switch.ctrl + f'.{df.ikfkSwitch_name}', reverse_sw + '.inputX')
 
-    # For each constraint get the weight names and connect them accrodingly
-    for constraint in ikfk_constraints:
-        weights = constraint.getWeightAliasList()
-        for weight in weights:
-            name = weight.longName(fullPath=False)
-            # If ik weight connect to reverse
-            if df.ik_sff in name:
-                pm.connectAttr(reverse_sw + '.outputX', weight)
-            # If fk weight connect to switch
-            if df.fk_sff in name:
-                pm.connectAttr(switch.ctrl + '.IkFkSwitch', weight)
+    connect_ikfk_weights(switch.ctrl.attr(df.ikfkSwitch_name), reverse_sw.outputX, ikfk_constraints)
 
     # Hide ik or fk ctrls based on switch
     pm.connectAttr(reverse_sw + '.outputX', ik_ctrls_grp + '.visibility')
@@ -290,3 +550,25 @@ def ikfk_switch(ik_ctrls_grp, fk_ctrls, ikfk_constraints, endJnt):
     # Clear selection
     pm.select(clear=True)
     return switch.ctrl
+
+
+def connect_ikfk_weights(switch_attr, reverse_attr, ikfk_constraints):
+    """
+    Connects the weights of constraint_ikfk nodes, the switch is the fk weight and reverse_attr the ik weight.
+    A blendMatrix only has the fk weight, it's a plain connection. Constraint weights are found by their alias.
+    """
+    for constraint in ikfk_constraints:
+        if constraint.type() == 'blendMatrix':
+            switch_attr.connect(constraint.target[0].weight)
+            continue
+
+        # For each constraint get the weight names and connect them accrodingly
+        weights = constraint.getWeightAliasList()
+        for weight in weights:
+            name = weight.longName(fullPath=False)
+            # If ik weight connect to reverse
+            if df.ik_sff in name:
+                reverse_attr.connect(weight)
+            # If fk weight connect to switch
+            if df.fk_sff in name:
+                switch_attr.connect(weight)
@@ -0,0 +1,180 @@
+"""
+Build scoped index of joint hierarchies.
+
+Inside build_index(), the chain under a root joint is listed once with one ls query and every joint of it gets
+its DAG parent and its depth in the chain, later lookups are dict reads. Parent added and removed messages evict
+the chains a reparented joint belongs to, or that got a new transform under one of their joints, and deleted joints
+evict theirs, so the next lookup lists the chain again. Outside of a build every call queries the scene.
+It's opened with transform_cache.build_cache() at the build entry points, eg. module_tools.rig_modules.
+
+    with joint_hierarchy.build_index() as index:
+        fingers = [index.chain(finger) for finger in finger_jnts]
+"""
+import contextlib
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import pymel.core as pm
+
+_active = None
+
+
+def _list_chain(root):
+    """
+    Long names of root and its joint descendants, depth first
+    """
+    root_name = root.longName()
+    long_names = cmds.ls(root_name, dag=True, type='joint', long=True) or []
+    if not long_names or long_names[0] != root_name:
+        long_names.insert(0, root_name)
+    return long_names
+
+
+class JointHierarchy:
+    """
+    Chains, parents and depths of joints keyed by PyNode, see the module docstring.
+
+    Attributes:
+        stats (dict): 'hits': lookups of an indexed joint, 'builds': chains listed from the scene
+    """
+    def __init__(self):
+        self._chains = {}
+        self._entries = {}
+        self._handles = {}
+        self._callbacks = [
+            om.MDagMessage.addParentAddedCallback(self._dag_changed),
+            om.MDagMessage.addParentRemovedCallback(self._dag_changed),
+            om.MDGMessage.addNodeRemovedCallback(self._node_removed, 'joint'),
+        ]
+
+        self.stats = {'hits': 0, 'builds': 0}
+
+    def chain(self, root):
+        """
+        root and its joint descendants, parent -> children like get_joint_hierarchy
+        """
+        if root in self._chains:
+            self.stats['hits'] += 1
+        else:
+            self._index(root)
+        return list(self._chains[root][0])
+
+    def parent(self, joint):
+        """
+        DAG parent of the joint, None under the world
+        """
+        return self._entry(joint)[1]
+
+    def depth(self, joint):
+        """
+        Number of joints above the joint in its chain, 0 for the root
+        """
+        return self._entry(joint)[2]
+
+    def root(self, joint):
+        return self._entry(joint)[0]
+
+    def evict(self, root):
+        joints, handles = self._chains.pop(root, ([], []))
+        for jnt in joints:
+            if jnt in self._entries and self._entries[jnt][0] == root:
+                del self._entries[jnt]
+        for handle in handles:
+            roots = self._handles.get(handle)
+            if roots is not None:
+                roots.discard(root)
+                if not roots:
+                    del self._handles[handle]
+
+    def clear(self):
+        for root in list(self._chains):
+            self.evict(root)
+
+    def close(self):
+        self.clear()
+        om.MMessage.removeCallbacks(self._callbacks)
+        self._callbacks = []
+
+    def __contains__(self, joint):
+        return joint in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, joint):
+        if joint in self._entries:
+            self.stats['hits'] += 1
+        else:
+            self._index(joint)
+        return self._entries[joint]
+
+    def _index(self, root):
+        self.stats['builds'] += 1
+
+        long_names = _list_chain(root)
+        joints = [root] + (pm.ls(long_names[1:]) if len(long_names) > 1 else [])
+        by_name = dict(zip(long_names, joints))
+
+        sel = om.MSelectionList()
+        for name in long_names:
+            sel.add(name)
+        handles = [om.MObjectHandle(sel.getDependNode(i)).hashCode() for i in range(len(long_names))]
+
+        for name, jnt in zip(long_names, joints):
+            parent_name = name.rsplit('|', 1)[0]
+            if jnt is root:
+                parent = root.getParent()
+                depth = 0
+            else:
+                parent = by_name[parent_name] if parent_name in by_name else pm.PyNode(parent_name)
+                # Depth counts the joints of the chain above, a group in between isn't one
+                ancestor = parent_name
+                while ancestor not in by_name:
+                    ancestor = ancestor.rsplit('|', 1)[0]
+                depth = self._entries[by_name[ancestor]][2] + 1
+            self._entries[jnt] = (root, parent, depth)
+
+        for handle in handles:
+            self._handles.setdefault(handle, set()).add(root)
+        self._chains[root] = (joints, handles)
+
+    def _roots_of(self, mobj):
+        return self._handles.get(om.MObjectHandle(mobj).hashCode(), ())
+
+    def _dag_changed(self, child, parent, client_data):
+        child_obj = child.node()
+        roots = set(self._roots_of(child_obj))
+        # Constraints and shapes under a joint don't change the chain, a transform could have joints under it
+        if child_obj.hasFn(om.MFn.kTransform) and not child_obj.hasFn(om.MFn.kConstraint):
+            roots.update(self._roots_of(parent.node()))
+        for root in roots:
+            self.evict(root)
+
+    def _node_removed(self, mobj, client_data):
+        for root in list(self._roots_of(mobj)):
+            self.evict(root)
+
+
+@contextlib.contextmanager
+def build_index():
+    """
+    Activates a joint hierarchy index for the with block, nested blocks use the outer one
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+
+    _active = JointHierarchy()
+    try:
+        yield _active
+    finally:
+        _active.close()
+        _active = None
+
+
+def active_index():
+    """
+    Returns the index of the current build, None outside of build_index()
+    """
+    return _active
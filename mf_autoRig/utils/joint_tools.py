@@ -1,12 +1,19 @@
 import pymel.core as pm
 import pymel.core.datatypes as dt
+import numpy as np
+
+from mf_autoRig.utils import joint_hierarchy, rig_math, transform_cache
+from mf_autoRig.utils.batch import MelBatch
 
 def get_joint_hierarchy(joint):
     """
     Returns joint children of the passed object, including it
-    The order is parent -> children
+    The order is parent -> children, inside a build it comes from the joint hierarchy index
     """
-    #jnt = pm.PyNode(joint)
+    index = joint_hierarchy.active_index()
+    if index is not None:
+        return index.chain(joint)
+
     jnts = pm.listRelatives(joint, typ='joint', ad=True)
     jnts.append(joint)
     jnts.reverse()
@@ -32,15 +39,59 @@ def __get_joint_normal(joints):
     """
     # This function gets the perpendicular vector of the plane created by the three joints.
     # In 3D terms, this is the normal of that "plane". This is a much more elegant way, compared to the get_plane_normal function.
-    v1 = dt.Vector(joints[1].getTranslation(space='world') - joints[0].getTranslation(space='world'))
-    v2 = dt.Vector(joints[1].getTranslation(space='world') - joints[2].getTranslation(space='world'))
+    p0, p1, p2 = (dt.Vector(*p) for p in transform_cache.world_positions(joints).tolist())
+    v1 = p1 - p0
+    v2 = p1 - p2
 
     normal = dt.cross(v1, v2).normal()
 
     return normal
 
+def __get_world_up(joints, useNormal):
+    if useNormal:
+        if len(joints) >= 3:
+            return __get_joint_normal(joints[0:3])
+        return (0, 1, 0) #Orient so that z is facing forward
+    return (0, 0, 1)
+
 def orient_joints(joints, aimVector, upVector, useNormal=False):
     """
+    Orients the joints as a chain, each joint aims at the next one and the last one is oriented to the world.
+    The orientation is solved with rig_math and written in one batch, see orient_joints_constraint for the
+    node based version it matches.
+    """
+    if len(joints) < 2:
+        raise ValueError("Need at least two joints to orient")
+
+    parent = joints[0].getParent()
+    positions = transform_cache.world_positions(joints)
+    parent_matrix = transform_cache.world_matrices([parent])[0] if parent is not None else None
+
+    translates, orients = rig_math.solve_joint_orients(positions, aimVector, upVector,
+                                                      __get_world_up(joints, useNormal), parent_matrix)
+
+    # Build the chain, values are set afterwards so relative parenting is enough
+    for i, jnt in enumerate(joints):
+        chain_parent = joints[i - 1] if i > 0 else parent
+        if jnt.getParent() == chain_parent:
+            continue
+        if chain_parent is None:
+            pm.parent(jnt, world=True, relative=True)
+        else:
+            pm.parent(jnt, chain_parent, relative=True)
+
+    batch = MelBatch()
+    for jnt, translate, orient in zip(joints, translates, orients):
+        name = jnt.longName()
+        batch.set(f'{name}.translate', translate.tolist())
+        batch.set(f'{name}.rotate', (0, 0, 0))
+        batch.set(f'{name}.jointOrient', orient.tolist())
+    batch.run()
+
+def orient_joints_constraint(joints, aimVector, upVector, useNormal=False):
+    """
+    Orients the joints with a temporary aimConstraint per joint, kept as the reference for orient_joints.
+
     Created this based on info from:
     https://www.riggingdojo.com/2014/10/03/everything-thought-knew-maya-joint-orient-wrong/
 
@@ -58,13 +109,7 @@ def orient_joints(joints, aimVector, upVector, useNormal=False):
         pm.parent(jnt, parent)
 
     # Get the world up vector
-    if useNormal:
-        if len(joints) >= 3:
-            worldUpVector = __get_joint_normal(joints[0:3])
-        else:
-            worldUpVector = (0, 1, 0) #Orient so that z is facing forward
-    else:
-        worldUpVector = (0, 0, 1)
+    worldUpVector = __get_world_up(joints, useNormal)
 
     # Orient joints
     for i in range(len(joints) - 1):
@@ -86,40 +131,55 @@ def orient_joints(joints, aimVector, upVector, useNormal=False):
 
 def mirrorJoints(joints, searchReplace, plane='YZ'):
     """
-    Wrapper for pm.mirrorJoint that deletes redundant constraints or leftovers
+    Mirrors the joints across the YZ, XZ or XY plane with behavior mirroring, like pm.mirrorJoint.
+    Only the given joints are created, their children and constraints aren't duplicated.
+    A joint goes under the mirror of its closest mirrored ancestor, or under the parent of the first joint.
     Returns mirrored joints PyNodes
     """
     if not isinstance(joints, list):
         joints = [joints]
 
-    if plane == 'YZ':
-        mirrored_jnts = pm.mirrorJoint(joints[0], mirrorYZ=True, mirrorBehavior=True,
-                                       searchReplace=searchReplace)
-    #TODO: add other planes
-
-    # objs = list(map(pm.PyNode, mirrored_jnts))
-    #
-    # print(objs)
-    # print(joints)
+    plane = plane.upper()
+    root_parent = joints[0].getParent()
 
-    joints_newNames = []
+    # Parent of every joint as an index in joints, None for root_parent
+    hierarchy = joint_hierarchy.active_index()
+    get_parent = hierarchy.parent if hierarchy is not None else lambda node: node.getParent()
+    index = {jnt: i for i, jnt in enumerate(joints)}
+    parents = []
     for jnt in joints:
-        name = jnt.name().replace(searchReplace[0], searchReplace[1])
-        joints_newNames.append(name)
-
-    dup_joints = []
-    for mir_jnt in mirrored_jnts:
-        if mir_jnt in joints_newNames:
-            obj = pm.PyNode(mir_jnt)
-            dup_joints.append(obj)
-        else:
-            try:
-                obj = pm.PyNode(mir_jnt)
-                pm.delete(obj)
-            except pm.MayaNodeError:
-                pass
-
-    return dup_joints
+        parent = get_parent(jnt)
+        while parent is not None and parent != root_parent and parent not in index:
+            parent = get_parent(parent)
+        parents.append(index.get(parent))
+
+    mirrored = rig_math.mirror_matrices(np.reshape(pm.xform(joints, q=True, ws=True, m=True), (-1, 4, 4)), plane)
+    root_matrix = np.eye(4)
+    if root_parent is not None:
+        root_matrix = np.reshape(pm.xform(root_parent, q=True, ws=True, m=True), (4, 4))
+    parent_matrices = np.array([root_matrix if p is None else mirrored[p] for p in parents])
+
+    rotates = [jnt.rotate.get() for jnt in joints]
+    translates, orients = rig_math.joint_values(mirrored, parent_matrices, rotates)
+
+    # Parents are created before their children
+    mirrored_jnts = [None] * len(joints)
+    for i in sorted(range(len(joints)), key=lambda i: joints[i].longName().count('|')):
+        parent = root_parent if parents[i] is None else mirrored_jnts[parents[i]]
+        flags = {'parent': parent} if parent is not None else {}
+        name = joints[i].nodeName().replace(searchReplace[0], searchReplace[1])
+        mirrored_jnts[i] = pm.createNode('joint', name=name, skipSelect=True, **flags)
+
+    batch = MelBatch()
+    for jnt, mir_jnt, translate, rotate, orient in zip(joints, mirrored_jnts, translates, rotates, orients):
+        name = mir_jnt.longName()
+        batch.set(f'{name}.radius', jnt.radius.get())
+        batch.set(f'{name}.translate', translate.tolist())
+        batch.set(f'{name}.rotate', rotate)
+        batch.set(f'{name}.jointOrient', orient.tolist())
+    batch.run()
+
+    return mirrored_jnts
 
 def duplicate_joints(joints, suffix):
         orig_names = []
@@ -152,19 +212,18 @@ def joint_inbetweener(start_jnt, end_jnt, num, name=None, duplicate_jnts=True, s
     pm.select(clear=True)
     if duplicate_jnts:
         dup = [pm.joint(radius=start_jnt.radius.get()), pm.joint(radius=start_jnt.radius.get())]
-        pm.matchTransform(dup[0], start_jnt, pos=True)
-        pm.matchTransform(dup[1], end_jnt, pos=True)
+        for jnt, pos in zip(dup, transform_cache.world_positions([start_jnt, end_jnt]).tolist()):
+            pm.xform(jnt, t=pos, ws=True)
         start_jnt = dup[0]
         end_jnt = dup[1]
 
     joints.append(start_jnt)
 
     # positions
-    start_jnt_v = dt.Vector(pm.xform(start_jnt, q=True, t=True, ws=True))
-    end_jnt_v = dt.Vector(pm.xform(end_jnt, q=True, t=True, ws=True))
+    start_jnt_v, end_jnt_v = (dt.Vector(*p) for p in transform_cache.world_positions([start_jnt, end_jnt]).tolist())
 
     # rotations
-    start_jnt_rot = pm.xform(start_jnt, q=True, ro=True, ws=True)
+    start_jnt_rot = transform_cache.world_rotations([start_jnt])[0].tolist()
 
     for i in range(num):
         jnt = pm.joint()
@@ -0,0 +1,353 @@
+"""
+NumPy math used to place and orient joints without building temporary nodes.
+
+Matrices follow Maya: row vectors, a point is transformed with point @ matrix, and euler angles are degrees
+in the xyz rotate order (rotation = Rx @ Ry @ Rz). Nothing here imports Maya.
+"""
+import numpy as np
+
+EPSILON = 1e-8
+
+
+def normalize(vectors):
+    """
+    Normalizes the last axis, zero vectors are left as they are
+    """
+    vectors = np.asarray(vectors, dtype=float)
+    length = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(length < EPSILON, 1.0, length)
+
+
+def euler_to_matrix(angles):
+    """
+    (..., 3) xyz euler angles in degrees to (..., 3, 3) rotation matrices
+    """
+    x, y, z = np.moveaxis(np.radians(np.asarray(angles, dtype=float)), -1, 0)
+    cx, sx, cy, sy, cz, sz = np.cos(x), np.sin(x), np.cos(y), np.sin(y), np.cos(z), np.sin(z)
+
+    m = np.empty(x.shape + (3, 3))
+    m[..., 0, 0] = cy * cz
+    m[..., 0, 1] = cy * sz
+    m[..., 0, 2] = -sy
+    m[..., 1, 0] = sx * sy * cz - cx * sz
+    m[..., 1, 1] = sx * sy * sz + cx * cz
+    m[..., 1, 2] = sx * cy
+    m[..., 2, 0] = cx * sy * cz + sx * sz
+    m[..., 2, 1] = cx * sy * sz - sx * cz
+    m[..., 2, 2] = cx * cy
+    return m
+
+
+def matrix_to_euler(matrices):
+    """
+    (..., 3, 3) rotation matrices without scale to (..., 3) xyz euler angles in degrees
+    """
+    m = np.asarray(matrices, dtype=float)
+    sy = np.clip(-m[..., 0, 2], -1.0, 1.0)
+    y = np.arcsin(sy)
+
+    locked = np.abs(np.cos(y)) < 1e-6
+    x = np.where(locked, np.arctan2(m[..., 1, 0] * sy, m[..., 1, 1]), np.arctan2(m[..., 1, 2], m[..., 2, 2]))
+    z = np.where(locked, 0.0, np.arctan2(m[..., 0, 1], m[..., 0, 0]))
+
+    return np.degrees(np.stack([x, y, z], axis=-1))
+
+
+def frames(primary, secondary):
+    """
+    (N, 3, 3) orthonormal frames, the rows are the axes.
+    The first axis is primary, the second is as close as possible to secondary.
+    Where they are parallel any perpendicular axis is used, like the aimConstraint.
+    """
+    primary = normalize(primary)
+    secondary = np.broadcast_to(np.asarray(secondary, dtype=float), primary.shape)
+
+    third = np.cross(primary, secondary)
+    parallel = np.linalg.norm(third, axis=-1) < EPSILON
+    if parallel.any():
+        other = np.where(np.abs(primary[..., 1:2]) < 0.9, [0.0, 1.0, 0.0], [1.0, 0.0, 0.0])
+        third = np.where(parallel[..., None], np.cross(primary, other), third)
+    third = normalize(third)
+
+    return np.stack([primary, np.cross(third, primary), third], axis=-2)
+
+
+def solve_joint_orients(positions, aim_vector, up_vector, world_up, parent_matrix=None):
+    """
+    Orients a joint chain in one pass, the same result as aiming every joint at the next one,
+    freezing the rotation and parenting the joints back into a chain. The last joint is oriented to the world.
+
+    Args:
+        positions: (N, 3) world positions of the joints
+        aim_vector: local axis that points down the chain
+        up_vector: local axis that points towards world_up
+        world_up: world up vector
+        parent_matrix: world matrix of the parent of the first joint, None for the world
+
+    Returns:
+        (translates, orients): (N, 3) local translate and jointOrient values, rotate is zero
+    """
+    if len(positions) < 2:
+        raise ValueError("Need at least two joints to orient")
+
+    parent_matrices = None if parent_matrix is None else [parent_matrix]
+    return solve_chains_orients([positions], aim_vector, up_vector, [world_up], parent_matrices)[0]
+
+
+def solve_chains_orients(chains, aim_vector, up_vector, world_ups, parent_matrices=None):
+    """
+    solve_joint_orients for several chains at once, eg. all the fingers of a hand.
+    The chains can have different lengths, all their joints are solved together as one stacked array.
+
+    Args:
+        chains: list of (N, 3) world positions, one per chain
+        world_ups: (C, 3) world up vector of every chain
+        parent_matrices: world matrix of the parent of every chain, None for the world
+
+    Returns:
+        list of (translates, orients) per chain
+    """
+    lengths = np.array([len(chain) for chain in chains])
+    p = np.concatenate([np.asarray(chain, dtype=float).reshape(-1, 3) for chain in chains])
+    chain_ids = np.repeat(np.arange(len(chains)), lengths)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+    is_root = np.zeros(len(p), dtype=bool)
+    is_root[starts] = True
+    is_end = np.zeros(len(p), dtype=bool)
+    is_end[starts + lengths - 1] = True
+
+    # Every joint but the last one of a chain aims at the next one, the last ones are oriented to the world
+    aiming = ~is_end
+    # local axes @ R = world axes, local is orthonormal so its inverse is its transpose
+    local = frames(np.asarray(aim_vector, dtype=float)[None], up_vector)[0]
+    world_ups = np.asarray(world_ups, dtype=float).reshape(-1, 3)
+    world = np.broadcast_to(np.eye(3), (len(p), 3, 3)).copy()
+    world[aiming] = local.T @ frames(p[1:][aiming[:-1]] - p[aiming], world_ups[chain_ids[aiming]])
+
+    if parent_matrices is None:
+        parent_matrices = [None] * len(chains)
+    root_matrices = np.array([np.eye(4) if m is None else np.asarray(m, dtype=float).reshape(4, 4)
+                              for m in parent_matrices])
+
+    # Rotation of the parent of every joint, the previous joint or the parent of the chain
+    parents = np.empty_like(world)
+    parents[~is_root] = world[:-1][~is_root[1:]]
+    parents[is_root] = normalize(root_matrices[:, :3, :3])
+    orients = matrix_to_euler(world @ np.swapaxes(parents, -1, -2))
+
+    translates = np.empty_like(p)
+    translates[~is_root] = np.einsum('ni,nji->nj', p[1:][~is_root[1:]] - p[:-1][~is_root[1:]], parents[~is_root])
+    roots = np.concatenate([p[is_root], np.ones((len(chains), 1))], axis=1)
+    translates[is_root] = np.einsum('ni,nij->nj', roots, np.linalg.inv(root_matrices))[:, :3]
+
+    return [(translates[start:start + length], orients[start:start + length])
+            for start, length in zip(starts, lengths)]
+
+
+# Distance of a pole vector from its limb, relative to the length of the first segment
+POLE_DISTANCE = 1.3
+
+
+def pole_positions(limbs, plane_normals=None, distance=POLE_DISTANCE):
+    """
+    Pole vector positions of several limbs at once.
+    The pole is in the plane of the limb, out from the middle joint perpendicular to the start-end line.
+
+    Straight limbs have no plane, their pole is placed in the joint orient plane instead, perpendicular to the limb
+    and to the normal of the plane the middle joint bends in. Without a normal, or with one along the limb,
+    any perpendicular direction is used like frames does.
+
+    Args:
+        limbs: (L, 3, 3) start, middle and end positions of every limb
+        plane_normals: (L, 3) or (3,) bend plane normals, pointing like the chain normal orient_joints uses
+        distance: distance from the limb relative to the length of the first segment
+
+    Returns:
+        (L, 3) array
+    """
+    limbs = np.asarray(limbs, dtype=float).reshape(-1, 3, 3)
+    start, middle, end = limbs[:, 0], limbs[:, 1], limbs[:, 2]
+    upper = middle - start
+    upper_length = np.linalg.norm(upper, axis=-1)
+
+    # Middle joint projected on the start-end line
+    line = normalize(end - start)
+    projected = start + line * np.einsum('ni,ni->n', upper, line)[:, None]
+    direction = middle - projected
+
+    straight = np.linalg.norm(direction, axis=-1) <= 1e-6 * upper_length
+    if straight.any():
+        normals = np.zeros((len(limbs), 3)) if plane_normals is None else np.broadcast_to(
+            np.asarray(plane_normals, dtype=float).reshape(-1, 3), (len(limbs), 3))
+        # The third axis of the frame is line x normal, a bent limb points the other way for that normal
+        direction[straight] = -frames(line[straight], normals[straight])[:, 2]
+
+    return projected + normalize(direction) * (upper_length * distance)[:, None]
+
+
+def two_bone_ik(roots, targets, poles, upper, lower):
+    """
+    Law of cosines two bone ik of several limbs at once, like ikRPsolver without twist.
+    The distance to the target is clamped to what the bones reach, the middle joint goes in the plane of the
+    pole on its side. Same math as the node network of ik_fk_tools.create_ik with solver='analytic'.
+
+    Args:
+        roots, targets, poles: (L, 3) start joint, goal and pole positions
+        upper, lower: (L,) or scalar bone lengths
+
+    Returns:
+        (middle, normals) (L, 3) arrays, middle joint positions and bend plane normals (target - root) x (pole - root)
+    """
+    roots, targets, poles = (np.asarray(a, dtype=float).reshape(-1, 3) for a in (roots, targets, poles))
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), len(roots))
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), len(roots))
+
+    distance = np.clip(np.linalg.norm(targets - roots, axis=-1), *ik_reach(upper, lower))
+    along = (distance ** 2 + upper ** 2 - lower ** 2) / (2 * distance)
+    height = np.sqrt(np.clip(upper ** 2 - along ** 2, 0.0, None))
+
+    line = normalize(targets - roots)
+    normals = normalize(np.cross(targets - roots, poles - roots))
+    towards_pole = normalize(np.cross(normals, line))
+
+    return roots + line * along[:, None] + towards_pole * height[:, None], normals
+
+
+def ik_reach(upper, lower):
+    """
+    Shortest and longest distances a two bone chain can reach, the shortest is kept off 0 for equal bones
+    """
+    upper, lower = np.asarray(upper, dtype=float), np.asarray(lower, dtype=float)
+    return np.maximum(np.abs(upper - lower), 1e-4 * (upper + lower)), upper + lower
+
+
+# Axis negated by each mirror plane
+MIRROR_PLANES = {'YZ': 0, 'XZ': 1, 'XY': 2}
+
+
+def mirror_matrices(matrices, plane='YZ'):
+    """
+    Mirrors (..., 4, 4) world matrices across a plane through the origin with behavior mirroring,
+    the axes are reflected and negated like mirrorJoint -mirrorBehavior does.
+    """
+    if plane not in MIRROR_PLANES:
+        raise ValueError(f"Mirror plane must be one of {', '.join(MIRROR_PLANES)}, not {plane}")
+
+    reflect = np.ones(3)
+    reflect[MIRROR_PLANES[plane]] = -1.0
+
+    m = np.asarray(matrices, dtype=float)
+    mirrored = m.copy()
+    mirrored[..., :3, :3] = -m[..., :3, :3] * reflect
+    mirrored[..., 3, :3] = m[..., 3, :3] * reflect
+    return mirrored
+
+
+def joint_values(world_matrices, parent_matrices, rotates=None):
+    """
+    Local translate and jointOrient that put joints at the given world matrices, keeping their rotate values.
+
+    Args:
+        world_matrices: (N, 4, 4) world matrices of the joints, without scale
+        parent_matrices: (N, 4, 4) world matrices of their parents
+        rotates: (N, 3) rotate values, zero if None
+
+    Returns:
+        (translates, orients): (N, 3) arrays
+    """
+    world = np.asarray(world_matrices, dtype=float)
+    local = world @ np.linalg.inv(np.asarray(parent_matrices, dtype=float))
+    rotation = normalize(local[:, :3, :3])
+
+    if rotates is not None:
+        # local rotation = rotate @ jointOrient
+        rotation = np.swapaxes(euler_to_matrix(rotates), -1, -2) @ rotation
+
+    return local[:, 3, :3], matrix_to_euler(rotation)
+
+
+# Cubic basis matrices, a segment is [u^3, u^2, u, 1] @ basis @ (4 control points)
+CATMULL_ROM_BASIS = 0.5 * np.array([[-1.0, 3.0, -3.0, 1.0],
+                                    [2.0, -5.0, 4.0, -1.0],
+                                    [-1.0, 0.0, 1.0, 0.0],
+                                    [0.0, 2.0, 0.0, 0.0]])
+
+B_SPLINE_BASIS = np.array([[-1.0, 3.0, -3.0, 1.0],
+                           [3.0, -6.0, 3.0, 0.0],
+                           [-3.0, 0.0, 3.0, 0.0],
+                           [1.0, 4.0, 1.0, 0.0]]) / 6.0
+
+# Samples per spline segment used to measure the arc length
+ARC_LENGTH_SAMPLES = 64
+
+
+def _spline_controls(points, method):
+    """
+    Control points padded so the spline starts and ends on the first and last point
+    """
+    if method == 'catmull_rom':
+        # Mirrored end points, a straight line stays a straight line
+        return np.concatenate([2 * points[:1] - points[1:2], points, 2 * points[-1:] - points[-2:-1]])
+    if method == 'bspline':
+        # Tripled end points clamp the spline to them
+        return np.concatenate([points[:1], points[:1], points, points[-1:], points[-1:]])
+
+    raise ValueError(f"Unknown spline method {method}, use catmull_rom or bspline")
+
+
+def evaluate_spline(points, params, method='catmull_rom'):
+    """
+    Evaluates a uniform cubic spline through (catmull_rom) or near (bspline) the points.
+
+    Args:
+        points: (P, 3) points
+        params: (N,) parameters from 0 to the number of segments
+
+    Returns:
+        (N, 3) positions
+    """
+    controls = _spline_controls(np.asarray(points, dtype=float), method)
+    basis = CATMULL_ROM_BASIS if method == 'catmull_rom' else B_SPLINE_BASIS
+    segments = len(controls) - 3
+
+    params = np.asarray(params, dtype=float)
+    segment = np.clip(np.floor(params).astype(int), 0, segments - 1)
+    u = (params - segment)[:, None]
+    powers = np.concatenate([u ** 3, u ** 2, u, np.ones_like(u)], axis=1)
+
+    # (N, 4) weights of the 4 control points of every segment
+    weights = powers @ basis
+    windows = controls[segment[:, None] + np.arange(4)]
+    return np.einsum('nk,nkj->nj', weights, windows)
+
+
+def resample(points, n, method='catmull_rom'):
+    """
+    n points spaced evenly by arc length along a spline fit of the points, the first and last points are kept.
+    Two points give an even linear interpolation.
+
+    Args:
+        points: (P, 3) points, P >= 2
+        n: number of points to return
+        method: catmull_rom goes through every point, bspline is smoother but only touches the ends
+
+    Returns:
+        (n, 3) array
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) < 2:
+        raise ValueError("Need at least two points to resample")
+    if n < 2:
+        raise ValueError("Need to resample to at least two points")
+
+    segments = len(_spline_controls(points, method)) - 3
+    dense_params = np.linspace(0, segments, segments * ARC_LENGTH_SAMPLES + 1)
+    dense = evaluate_spline(points, dense_params, method)
+
+    arc_length = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(dense, axis=0), axis=1))])
+    if arc_length[-1] < EPSILON:
+        return np.repeat(points[:1], n, axis=0)
+
+    params = np.interp(np.linspace(0, arc_length[-1], n), arc_length, dense_params)
+    return evaluate_spline(points, params, method)
@@ -0,0 +1,248 @@
+"""
+Build scoped cache of world matrices.
+
+Inside build_cache(), world_matrices and world_positions fetch the nodes that aren't cached with one xform query
+and serve the others from memory. Every cached node gets a dirty plug callback and is evicted as soon as its
+worldMatrix gets dirty, so anything the build does to it (moving it, a driver, constraining it) makes the next read
+query the scene again. Its DAG ancestors are watched too: moving, reparenting or deleting one evicts every cached
+node under it, and evicting a node evicts the cached nodes under it. Outside of a build every call queries the scene.
+The build entry points open one: module_tools.rig_modules, Module.rebuild_rig, the mirror methods, Body and the presets.
+
+    with transform_cache.build_cache() as cache:
+        with cache.stage('rig'):
+            module.rig()
+    print(cache.stats)
+"""
+import contextlib
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+
+from mf_autoRig.utils import rig_math
+
+_active = None
+
+
+class TransformCache:
+    """
+    World matrices of transforms keyed by node name, see the module docstring.
+    The DAG path a node had when it was cached finds the cached nodes under an ancestor.
+
+    Attributes:
+        stats (dict): stage: {'hits': nodes read from memory, 'misses': nodes read from the scene,
+            'queries': xform calls}
+    """
+    def __init__(self):
+        self._matrices = {}
+        self._callbacks = {}
+        self._paths = {}
+        # Long name of an ancestor: keys cached under it, and its callbacks
+        self._below = {}
+        self._watches = {}
+        self._dag_callbacks = [
+            om.MDagMessage.addParentAddedCallback(self._parent_changed),
+            om.MDagMessage.addParentRemovedCallback(self._parent_changed),
+        ]
+        self._stage = 'build'
+
+        self.stats = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Counts the reads in the with block under name
+        """
+        previous = self._stage
+        self._stage = name
+        try:
+            yield self
+        finally:
+            self._stage = previous
+
+    def world_matrices(self, nodes):
+        """
+        (N, 4, 4) world matrices of the nodes
+        """
+        keys = [str(node) for node in nodes]
+        if not keys:
+            return np.empty((0, 4, 4))
+        missing = [key for key in dict.fromkeys(keys) if key not in self._matrices]
+
+        stats = self.stats.setdefault(self._stage, {'hits': 0, 'misses': 0, 'queries': 0})
+        stats['hits'] += len(keys) - len(missing)
+        stats['misses'] += len(missing)
+
+        if missing:
+            stats['queries'] += 1
+            values = np.reshape(cmds.xform(missing, query=True, worldSpace=True, matrix=True), (-1, 4, 4))
+            for key, matrix in zip(missing, values):
+                self._matrices[key] = matrix
+                self._add_callbacks(key)
+
+        return np.array([self._matrices[key] for key in keys])
+
+    def evict(self, key):
+        """
+        Drops a node and the cached nodes under it
+        """
+        self._matrices.pop(key, None)
+        ids = self._callbacks.pop(key, [])
+        if ids:
+            om.MMessage.removeCallbacks(ids)
+
+        path = self._paths.pop(key, None)
+        if path is None:
+            return
+
+        for ancestor in _ancestors(path):
+            keys = self._below.get(ancestor)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    self._unwatch(ancestor)
+
+        self.evict_below(path)
+
+    def evict_below(self, path):
+        """
+        Drops the cached nodes under the long name path
+        """
+        for key in list(self._below.get(path, ())):
+            self.evict(key)
+
+    def clear(self):
+        for key in list(self._callbacks):
+            self.evict(key)
+        for path in list(self._watches):
+            self._unwatch(path)
+        self._matrices = {}
+
+    def close(self):
+        self.clear()
+        om.MMessage.removeCallbacks(self._dag_callbacks)
+        self._dag_callbacks = []
+
+    def __contains__(self, node):
+        return str(node) in self._matrices
+
+    def __len__(self):
+        return len(self._matrices)
+
+    def _add_callbacks(self, key):
+        sel = om.MSelectionList()
+        sel.add(key)
+        mobj = sel.getDependNode(0)
+        path = sel.getDagPath(0).fullPathName()
+
+        def dirty(node, plug, client_data):
+            if plug.partialName(useLongNames=True).startswith('worldMatrix'):
+                self.evict(client_data)
+
+        def name_changed(node, prev_name, client_data):
+            self.evict(client_data)
+
+        def pre_removal(node, client_data):
+            self.evict(client_data)
+
+        self._callbacks[key] = [
+            om.MNodeMessage.addNodeDirtyPlugCallback(mobj, dirty, key),
+            om.MNodeMessage.addNameChangedCallback(mobj, name_changed, key),
+            om.MNodeMessage.addNodePreRemovalCallback(mobj, pre_removal, key),
+        ]
+
+        self._paths[key] = path
+        for ancestor in _ancestors(path):
+            self._below.setdefault(ancestor, set()).add(key)
+            if ancestor not in self._watches:
+                self._watch(ancestor)
+
+    def _watch(self, path):
+        sel = om.MSelectionList()
+        sel.add(path)
+        mobj = sel.getDependNode(0)
+
+        def dirty(node, plug, client_data):
+            if plug.partialName(useLongNames=True).startswith('worldMatrix'):
+                self.evict_below(client_data)
+
+        def pre_removal(node, client_data):
+            self.evict_below(client_data)
+
+        self._watches[path] = [
+            om.MNodeMessage.addNodeDirtyPlugCallback(mobj, dirty, path),
+            om.MNodeMessage.addNodePreRemovalCallback(mobj, pre_removal, path),
+        ]
+
+    def _unwatch(self, path):
+        self._below.pop(path, None)
+        ids = self._watches.pop(path, [])
+        if ids:
+            om.MMessage.removeCallbacks(ids)
+
+    def _parent_changed(self, child, parent, client_data):
+        # The child and everything under it moved, its long name already changed so match the watched ancestors by
+        # their last name
+        key = child.partialPathName()
+        self.evict(key)
+        short_name = key.rsplit('|', 1)[-1]
+        for path in [path for path in self._watches if path.rsplit('|', 1)[-1] == short_name]:
+            self.evict_below(path)
+
+
+def _ancestors(path):
+    """
+    Long names of the DAG ancestors of the long name path, from the root down
+    """
+    parts = path.split('|')
+    return ['|'.join(parts[:i]) for i in range(2, len(parts))]
+
+
+@contextlib.contextmanager
+def build_cache():
+    """
+    Activates a transform cache for the with block, nested blocks use the outer one
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+
+    _active = TransformCache()
+    try:
+        yield _active
+    finally:
+        _active.close()
+        _active = None
+
+
+def active_cache():
+    """
+    Returns the cache of the current build, None outside of build_cache()
+    """
+    return _active
+
+
+def world_matrices(nodes):
+    """
+    (N, 4, 4) world matrices of the nodes, from the build cache if there's one
+    """
+    if _active is not None:
+        return _active.world_matrices(nodes)
+    if not nodes:
+        return np.empty((0, 4, 4))
+    return np.reshape(cmds.xform([str(node) for node in nodes], query=True, worldSpace=True, matrix=True), (-1, 4, 4))
+
+
+def world_positions(nodes):
+    """
+    (N, 3) world positions of the nodes, the rotate pivot of joints and of transforms without pivots
+    """
+    return world_matrices(nodes)[:, 3, :3]
+
+
+def world_rotations(nodes):
+    """
+    (N, 3) world xyz euler rotations of the nodes, without scale
+    """
+    return rig_math.matrix_to_euler(rig_math.normalize(world_matrices(nodes)[:, :3, :3]))
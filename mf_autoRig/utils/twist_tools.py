@@ -0,0 +1,86 @@
+"""
+Twist joints and the twist extracted from a driver, eg. the forearm twisting with the hand.
+"""
+import maya.cmds as cmds
+import numpy as np
+import pymel.core as pm
+import mf_autoRig.utils.defaults as df
+from mf_autoRig.utils import transform_cache
+from mf_autoRig.utils.batch import MelBatch
+
+
+def twist_weights(num):
+    """
+    Share of the twist of each of num twist joints, evenly spaced between two joints
+    """
+    return [(i + 1) / (num + 1) for i in range(num)]
+
+
+def create_twist_joints(start_jnt, end_jnt, num, name):
+    """
+    Creates num joints evenly spaced between start_jnt and end_jnt, under start_jnt with its orientation.
+    A single joint is named {name}_twist_skin_jnt, more are numbered from the start joint.
+    """
+    start_matrix, end_matrix = transform_cache.world_matrices([start_jnt, end_jnt])
+    offset = (end_matrix[3] @ np.linalg.inv(start_matrix))[:3]
+    radius = start_jnt.radius.get()
+
+    joints = []
+    for i, weight in enumerate(twist_weights(num)):
+        number = '' if num == 1 else f'{i + 1:02}'
+        jnt = pm.createNode('joint', name=f'{name}_twist{number}{df.skin_sff}{df.jnt_sff}', parent=start_jnt,
+                            skipSelect=True)
+        jnt.translate.set((offset * weight).tolist())
+        jnt.radius.set(radius)
+        joints.append(jnt)
+
+    return joints
+
+
+def drive_twist(driver, reference, joints, axis, name):
+    """
+    Rotates the twist joints around axis by their share of the twist of driver relative to reference, see
+    twist_weights. Swing twist decomposition: the rotation of the driver from its build time offset, in reference
+    space, goes to a quaternion, its axis and w components are the twist. quatToEuler turns it into an angle with
+    the twist axis first in the rotate order, so it goes the full -180, 180 without flipping at 90.
+
+    Args:
+        axis: twist axis of the reference and the joints, eg. the joint aim vector (0, 1, 0)
+
+    Returns:
+        list: the created nodes
+    """
+    cmds.loadPlugin('quatNodes', quiet=True)
+
+    index = int(np.argmax(np.abs(axis)))
+    component = 'XYZ'[index]
+    driver_matrix, reference_matrix = transform_cache.world_matrices([driver, reference])
+    inverse_offset = reference_matrix @ np.linalg.inv(driver_matrix)
+
+    batch = MelBatch()
+    mult = pm.createNode('multMatrix', name=f'{name}_twist_multMatrix', skipSelect=True)
+    decompose = pm.createNode('decomposeMatrix', name=f'{name}_twist_decomposeMatrix', skipSelect=True)
+    twist = pm.createNode('quatNormalize', name=f'{name}_twist_quatNormalize', skipSelect=True)
+    euler = pm.createNode('quatToEuler', name=f'{name}_twist_quatToEuler', skipSelect=True)
+    nodes = [mult, decompose, twist, euler]
+
+    batch.set_matrix(f'{mult}.matrixIn[0]', inverse_offset.flatten().tolist())
+    batch.connect(f'{driver.longName()}.worldMatrix[0]', f'{mult}.matrixIn[1]')
+    batch.connect(f'{reference.longName()}.worldInverseMatrix[0]', f'{mult}.matrixIn[2]')
+    batch.connect(f'{mult}.matrixSum', f'{decompose}.inputMatrix')
+    for attr in (component, 'W'):
+        batch.connect(f'{decompose}.outputQuat{attr}', f'{twist}.inputQuat{attr}')
+    batch.connect(f'{twist}.outputQuat', f'{euler}.inputQuat')
+    # xyz, yzx or zxy, the rotate order starting with the axis
+    batch.set(f'{euler}.inputRotateOrder', index)
+
+    for jnt, weight in zip(joints, twist_weights(len(joints))):
+        share = pm.createNode('multiplyDivide', name=jnt.nodeName().replace(df.skin_sff + df.jnt_sff, '_mult'),
+                               skipSelect=True)
+        nodes.append(share)
+        batch.connect(f'{euler}.outputRotate{component}', f'{share}.input1X')
+        batch.set(f'{share}.input2X', weight)
+        batch.connect(f'{share}.outputX', f'{jnt.longName()}.rotate{component}')
+    batch.run()
+
+    return nodes